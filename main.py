@@ -74,7 +74,8 @@ class TradingSystemApp:
 
             self.running = True
             logger.info(
-                f"Server starting on {host or self.settings.host}:{port or self.settings.port}"
+                f"Server starting on {host or self.settings.host}:"
+                f"{port or self.settings.port}"
             )
 
             await server.serve()
@@ -128,6 +129,10 @@ Examples:
   python main.py --host 0.0.0.0 --port 8080  # Custom host/port
   python main.py --reload                   # Enable auto-reload for development
   python main.py --config custom.env         # Use custom config file
+  python main.py import-history XAUUSD_M15.csv --instrument XAUUSD
+  python main.py import-history XAUUSD240.hst --replace
+  python main.py load-test --scenario nfp --rate 5000 --duration 300
+  python main.py load-test --target ws://localhost:8001 --rate 2000 --count 1000000
         """,
     )
 
@@ -161,9 +166,211 @@ Examples:
         "--version", action="version", version="XAUUSD Gold Trading System 1.0.0"
     )
 
+    subparsers = parser.add_subparsers(dest="command")
+
+    import_parser = subparsers.add_parser(
+        "import-history",
+        help="Bulk import MT5 CSV or MT4 HST history into price_history",
+    )
+    import_parser.add_argument("files", nargs="+", help="History export files")
+    import_parser.add_argument(
+        "--instrument",
+        default=None,
+        help="Instrument (default: XAUUSD for CSV, header symbol for HST)",
+    )
+    import_parser.add_argument(
+        "--timeframe",
+        default=None,
+        help="Timeframe (default: from HST header or file name)",
+    )
+    import_parser.add_argument(
+        "--format",
+        dest="file_format",
+        choices=["auto", "csv", "hst"],
+        default="auto",
+        help="File format (default: by extension)",
+    )
+    import_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100_000,
+        help="Rows per COPY batch (default: 100000)",
+    )
+    import_parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Overwrite existing bars instead of skipping them",
+    )
+    import_parser.add_argument(
+        "--candle-store",
+        default=None,
+        help="Also write imported bars to this candle store directory",
+    )
+    import_parser.add_argument(
+        "--dry-run", action="store_true", help="Only read and validate the files"
+    )
+
+    load_parser = subparsers.add_parser(
+        "load-test",
+        help="Drive synthetic XAUUSD ticks into the processor or WebSocket server",
+    )
+    load_parser.add_argument(
+        "--target",
+        default="processor",
+        help="'processor' for an in-process MarketDataProcessor, or a ws:// URI",
+    )
+    load_parser.add_argument(
+        "--scenario",
+        choices=["normal", "nfp", "stress"],
+        default="normal",
+        help="Market scenario (default: normal)",
+    )
+    load_parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Ticks per second (default: as fast as possible)",
+    )
+    load_parser.add_argument(
+        "--duration", type=float, default=None, help="Seconds to run"
+    )
+    load_parser.add_argument("--count", type=int, default=None, help="Ticks to send")
+    load_parser.add_argument(
+        "--tick-rate-scale",
+        type=float,
+        default=1.0,
+        help="Multiplier of the session tick rates in market time (default: 1)",
+    )
+    load_parser.add_argument("--symbol", default="XAUUSD", help="Symbol to generate")
+    load_parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    load_parser.add_argument(
+        "--output", default=None, help="Write the JSON report to this file"
+    )
+
     return parser
 
 
+async def load_test(args) -> int:
+    """
+    Run the load-test command.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Process exit code
+    """
+    import json
+
+    from src.backtest.synthetic_market import (
+        LoadGenerator,
+        SyntheticMarket,
+        scenario_config,
+    )
+
+    if args.count is None and args.duration is None:
+        logger.error("load-test needs --count or --duration")
+        return 1
+
+    market = SyntheticMarket(
+        scenario_config(args.scenario, None, args.tick_rate_scale, args.symbol),
+        seed=args.seed,
+    )
+    generator = LoadGenerator(
+        market,
+        rate=args.rate,
+        live_timestamps=True,
+        scenario=args.scenario,
+    )
+
+    if args.target == "processor":
+        from src.analysis.market_data_processor import MarketDataProcessor
+
+        processor = MarketDataProcessor()
+        await processor.start()
+        try:
+            report = await generator.to_processor(processor, args.count, args.duration)
+        finally:
+            await processor.stop()
+    else:
+        report = await generator.to_websocket(args.target, args.count, args.duration)
+
+    result = report.to_dict()
+    print(
+        f"{report.ticks_sent:,} ticks to {report.target} in "
+        f"{report.elapsed_seconds:.1f}s ({report.ticks_per_second:,.0f} ticks/s, "
+        f"max lag {report.max_lag_seconds:.2f}s), RSS {report.rss_start_mb:.0f} -> "
+        f"{report.rss_end_mb:.0f} MB (peak {report.rss_peak_mb:.0f} MB)"
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+def import_history(args) -> int:
+    """
+    Run the import-history command.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Process exit code
+    """
+    from src.database.history_import import HistoryImporter
+
+    def show_progress(stats):
+        sys.stderr.write(
+            f"\r{stats.path}: {stats.rows_read:,} rows read, "
+            f"{stats.rows_rejected:,} rejected, "
+            f"{stats.rows_per_second:,.0f} rows/s"
+        )
+        sys.stderr.flush()
+
+    candle_store = None
+    if args.candle_store:
+        from src.storage import CandleStore
+
+        candle_store = CandleStore(args.candle_store)
+
+    importer = HistoryImporter(
+        chunk_rows=args.chunk_size,
+        replace=args.replace,
+        dry_run=args.dry_run,
+        candle_store=candle_store,
+        progress=show_progress,
+    )
+
+    for path in args.files:
+        instrument = args.instrument
+        if instrument is None and not path.lower().endswith(".hst"):
+            instrument = "XAUUSD"
+        try:
+            stats = importer.import_file(
+                path, instrument, args.timeframe, args.file_format
+            )
+        except (OSError, ValueError) as e:
+            sys.stderr.write("\n")
+            logger.error(f"Failed to import {path}: {e}")
+            return 1
+
+        sys.stderr.write("\n")
+        if args.dry_run:
+            outcome = f"{stats.rows_loaded:,} valid"
+        else:
+            outcome = (
+                f"{stats.rows_inserted:,} inserted, {stats.duplicates:,} duplicates"
+            )
+        print(
+            f"{path}: {stats.instrument} {stats.timeframe} "
+            f"{stats.rows_read:,} read, {stats.rows_rejected:,} rejected, {outcome} "
+            f"in {stats.elapsed_seconds:.2f}s ({stats.rows_per_second:,.0f} rows/s)"
+        )
+
+    return 0
+
+
 def main():
     """Main entry point."""
     parser = create_parser()
@@ -181,6 +388,14 @@ def main():
 
         os.environ["LOG_LEVEL"] = args.log_level
 
+    if args.command == "import-history":
+        setup_logging()
+        sys.exit(import_history(args))
+
+    if args.command == "load-test":
+        setup_logging()
+        sys.exit(asyncio.run(load_test(args)))
+
     # Create and start application
     app = TradingSystemApp()
 
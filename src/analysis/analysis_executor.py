@@ -0,0 +1,222 @@
+"""
+Analysis executor for XAUUSD Gold Trading System.
+
+Runs confluence analysis in a process pool so CPU-bound detector
+work does not block tick ingestion or API requests on the event loop.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from decimal import Decimal
+from typing import List, Optional
+import logging
+
+from ..config import get_settings
+from ..core.synchronization import SemaphoreManager
+from ..monitoring.metrics import get_registry
+from .candle_buffer import CandleArrays
+from .confluence_analyzer import ConfluenceAnalysis, ConfluenceAnalyzer
+from .fvg_detector import FairValueGap
+from .zone_index import PriceZoneIndex
+
+
+def _init_worker():
+    """Load settings once per worker process."""
+    get_settings()
+
+
+def run_confluence_analysis(
+    h4: CandleArrays,
+    h1: CandleArrays,
+    m15: CandleArrays,
+    current_price: Optional[str],
+    instrument: str,
+    fvgs: Optional[List[FairValueGap]] = None,
+    zone_index: Optional[PriceZoneIndex] = None,
+    ob_index: Optional[PriceZoneIndex] = None,
+    pool_index: Optional[PriceZoneIndex] = None,
+) -> ConfluenceAnalysis:
+    """
+    Run confluence analysis on columnar candle data.
+
+    Module-level so it can be sent to worker processes.
+
+    Args:
+        h4: H4 candle arrays
+        h1: H1 candle arrays
+        m15: M15 candle arrays
+        current_price: Current price as string (None if unknown)
+        instrument: Trading instrument
+        fvgs: Open H1 gaps from a tracker (detected from ``h1`` if None)
+        zone_index: The tracker's live index of ``fvgs`` (in-process only)
+        ob_index: Live order block index (in-process only)
+        pool_index: Live liquidity pool index (in-process only)
+
+    Returns:
+        Confluence analysis
+    """
+    return ConfluenceAnalyzer().analyze_confluence(
+        h4_candles=h4.to_candles(),
+        h1_candles=h1.to_candles(),
+        m15_candles=m15.to_candles(),
+        current_price=Decimal(current_price) if current_price is not None else None,
+        instrument=instrument,
+        fvgs=fvgs,
+        zone_index=zone_index,
+        ob_index=ob_index,
+        pool_index=pool_index,
+    )
+
+
+class AnalysisExecutor:
+    """
+    Process pool executor for confluence analysis.
+
+    Candle windows are sent as compact NumPy arrays and results are
+    awaited asynchronously. Concurrent runs are bounded by an in-flight
+    limit; with zero workers, or if the pool breaks, analysis runs inline.
+    """
+
+    def __init__(
+        self, max_workers: int = 2, max_in_flight: int = 4, timeout: float = 30.0
+    ):
+        """
+        Initialize analysis executor.
+
+        Args:
+            max_workers: Worker processes (0 runs analysis inline)
+            max_in_flight: Maximum concurrent analysis runs
+            timeout: Maximum seconds to wait for a slot or a result
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._semaphore = SemaphoreManager(
+            max_concurrent=max_in_flight, name="analysis"
+        )
+
+        registry = get_registry()
+        self.duration_histogram = registry.histogram(
+            "analysis_duration_seconds",
+            "Confluence analysis duration including queueing",
+            labels=["mode"],
+        )
+        self.failures_counter = registry.counter(
+            "analysis_executor_failures_total",
+            "Analysis executor failures",
+            labels=["type"],
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """Get number of running analyses."""
+        return self._semaphore.current_count()
+
+    def start(self):
+        """Start worker pool."""
+        if self.max_workers > 0 and self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_init_worker
+            )
+            self.logger.info(f"Analysis pool started with {self.max_workers} workers")
+
+    async def shutdown(self):
+        """Shut down worker pool without blocking the event loop."""
+        if self._pool is None:
+            return
+
+        pool, self._pool = self._pool, None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, lambda: pool.shutdown(wait=True, cancel_futures=True)
+        )
+        self.logger.info("Analysis pool stopped")
+
+    async def analyze(
+        self,
+        h4: CandleArrays,
+        h1: CandleArrays,
+        m15: CandleArrays,
+        current_price: Optional[Decimal],
+        instrument: str = "XAUUSD",
+        fvgs: Optional[List[FairValueGap]] = None,
+        zone_index: Optional[PriceZoneIndex] = None,
+        ob_index: Optional[PriceZoneIndex] = None,
+        pool_index: Optional[PriceZoneIndex] = None,
+    ) -> ConfluenceAnalysis:
+        """
+        Run confluence analysis.
+
+        Arrays must own their data (see ``CandleArrays.copy``) because
+        the ring buffer keeps changing while the analysis runs.
+
+        Args:
+            h4: H4 candle arrays
+            h1: H1 candle arrays
+            m15: M15 candle arrays
+            current_price: Current market price
+            instrument: Trading instrument
+            fvgs: Open H1 gaps from a tracker (detected from ``h1`` if None)
+            zone_index: The tracker's live index of ``fvgs``; only used
+                inline, as workers get a snapshot and scan it
+            ob_index: Live order block index; only used inline
+            pool_index: Live liquidity pool index; only used inline
+
+        Returns:
+            Confluence analysis
+
+        Raises:
+            TimeoutError: If no slot or result is available within the timeout
+        """
+        price = str(current_price) if current_price is not None else None
+        args = (h4, h1, m15, price, instrument, fvgs)
+        indexes = (zone_index, ob_index, pool_index)
+
+        async with self._semaphore.acquire(timeout=self.timeout):
+            start_time = time.perf_counter()
+
+            if self._pool is None:
+                result = run_confluence_analysis(*args, *indexes)
+                self.duration_histogram.observe(
+                    time.perf_counter() - start_time, mode="inline"
+                )
+                return result
+
+            loop = asyncio.get_running_loop()
+            try:
+                result = await asyncio.wait_for(
+                    loop.run_in_executor(self._pool, run_confluence_analysis, *args),
+                    timeout=self.timeout,
+                )
+            except BrokenProcessPool:
+                self.failures_counter.inc(type="broken_pool")
+                self.logger.error("Analysis pool broken, restarting and running inline")
+                self._restart_pool()
+                result = run_confluence_analysis(*args, *indexes)
+                self.duration_histogram.observe(
+                    time.perf_counter() - start_time, mode="inline"
+                )
+                return result
+            except asyncio.TimeoutError:
+                self.failures_counter.inc(type="timeout")
+                raise TimeoutError(
+                    f"Analysis for {instrument} exceeded {self.timeout}s"
+                )
+
+            self.duration_histogram.observe(
+                time.perf_counter() - start_time, mode="process"
+            )
+            return result
+
+    def _restart_pool(self):
+        """Replace a broken worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.start()
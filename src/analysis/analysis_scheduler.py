@@ -0,0 +1,211 @@
+"""
+Analysis scheduler for XAUUSD Gold Trading System.
+
+Schedules SMC analysis from candle close events, deduplicating
+closes per bar and coalescing pending runs per symbol.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+import logging
+
+from ..monitoring.metrics import get_registry
+from ..monitoring.tracing import TraceContext, get_tracer
+from .candle_aggregator import TIMEFRAME_SECONDS, CandleCloseEvent
+
+
+@dataclass
+class AnalysisRequest:
+    """
+    Pending analysis run for a symbol.
+
+    Attributes:
+        symbol: Trading symbol
+        timeframe: Highest timeframe whose close triggered the run
+        bar_timestamp: Open time of the triggering bar
+        timeframes: All timeframes that closed since the last run
+        trace: Latency trace started at the closing tick's arrival
+    """
+
+    symbol: str
+    timeframe: str
+    bar_timestamp: datetime
+    timeframes: Tuple[str, ...] = ()
+    trace: Optional[TraceContext] = None
+
+
+class AnalysisScheduler:
+    """
+    Event-driven analysis scheduler.
+
+    Candle closes are deduplicated per (symbol, timeframe, bar timestamp).
+    At most one run is pending per symbol: a newer close replaces the
+    stale pending request instead of queueing another full analysis, so
+    an H4 close that coincides with H1 and M15 closes costs a single run.
+
+    Different symbols run concurrently up to ``max_concurrent``; a symbol
+    never has more than one run in progress.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[AnalysisRequest], Awaitable[None]],
+        timeframes: Iterable[str] = ("M15", "H1", "H4"),
+        max_concurrent: int = 1,
+    ):
+        """
+        Initialize analysis scheduler.
+
+        Args:
+            handler: Async callback that performs the analysis
+            timeframes: Timeframes whose closes trigger analysis
+            max_concurrent: Maximum symbols analyzed at the same time
+        """
+        self.handler = handler
+        self.timeframes = set(timeframes)
+        self.max_concurrent = max_concurrent
+        self.logger = logging.getLogger(__name__)
+        self.tracer = get_tracer()
+
+        self._pending: Dict[str, AnalysisRequest] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._last_bar: Dict[Tuple[str, str], datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.is_running = False
+
+        registry = get_registry()
+        self.requests_counter = registry.counter(
+            "analysis_requests_total",
+            "Candle closes handled by the analysis scheduler",
+            labels=["symbol", "result"],
+        )
+
+    def schedule(self, event: CandleCloseEvent) -> bool:
+        """
+        Schedule analysis for a candle close.
+
+        Gap-filled candles carry no new price action and are ignored.
+
+        Args:
+            event: Candle close event
+
+        Returns:
+            True if the close was accepted
+        """
+        if event.timeframe not in self.timeframes or event.filled:
+            return False
+
+        key = (event.symbol, event.timeframe)
+        bar_timestamp = event.candle.timestamp
+        last_bar = self._last_bar.get(key)
+        if last_bar is not None and bar_timestamp <= last_bar:
+            self.requests_counter.inc(symbol=event.symbol, result="duplicate")
+            return False
+        self._last_bar[key] = bar_timestamp
+
+        pending = self._pending.get(event.symbol)
+        if pending is None:
+            self._pending[event.symbol] = AnalysisRequest(
+                symbol=event.symbol,
+                timeframe=event.timeframe,
+                bar_timestamp=bar_timestamp,
+                timeframes=(event.timeframe,),
+                trace=self.tracer.start_trace(
+                    "analysis",
+                    force=True,
+                    started_at=event.received_at,
+                    symbol=event.symbol,
+                    timeframe=event.timeframe,
+                ),
+            )
+            self.requests_counter.inc(symbol=event.symbol, result="scheduled")
+        else:
+            # Merge into the pending run, keeping the highest timeframe
+            if event.timeframe not in pending.timeframes:
+                pending.timeframes += (event.timeframe,)
+            if TIMEFRAME_SECONDS[event.timeframe] >= TIMEFRAME_SECONDS[
+                pending.timeframe
+            ]:
+                pending.timeframe = event.timeframe
+                pending.bar_timestamp = bar_timestamp
+            self.requests_counter.inc(symbol=event.symbol, result="coalesced")
+
+        self._wakeup.set()
+        return True
+
+    def pending_count(self) -> int:
+        """Get number of pending analysis runs."""
+        return len(self._pending)
+
+    async def run_pending(self):
+        """
+        Run all pending requests inline, in scheduling order.
+
+        Used by replays instead of the scheduler loop so analysis
+        completes before the next tick is applied.
+        """
+        while self._pending:
+            symbol = next(iter(self._pending))
+            await self._run(self._pending.pop(symbol))
+
+    async def start(self):
+        """Start scheduler loop."""
+        self.is_running = True
+        self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self):
+        """Stop scheduler loop, cancel running analyses and discard pending runs."""
+        self.is_running = False
+
+        tasks = list(self._running.values())
+        if self._task:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._task = None
+        self._running.clear()
+        self._pending.clear()
+
+    async def _run_loop(self):
+        """Dispatch pending analysis requests."""
+        while self.is_running:
+            try:
+                ready = [s for s in self._pending if s not in self._running]
+                if not ready or len(self._running) >= self.max_concurrent:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                request = self._pending.pop(ready[0])
+                self._running[request.symbol] = asyncio.create_task(
+                    self._run(request)
+                )
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error in analysis scheduler: {e}")
+
+    async def _run(self, request: AnalysisRequest):
+        """
+        Run a single analysis request.
+
+        Args:
+            request: Analysis request
+        """
+        try:
+            await self.handler(request)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error analyzing {request.symbol}: {e}")
+        finally:
+            self._running.pop(request.symbol, None)
+            self._wakeup.set()
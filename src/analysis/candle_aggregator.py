@@ -0,0 +1,325 @@
+"""
+Multi-timeframe candle aggregator for XAUUSD Gold Trading System.
+
+Floors every tick into clock-aligned buckets for all configured
+timeframes in a single pass and emits close events when a bucket ends.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from ..models.candle import Candle
+from ..models.market_data import Tick
+from ..models.price import from_price_units, to_price_units
+from .candle_buffer import datetime_to_ns, ns_to_datetime
+
+
+NANOS_PER_SECOND = 1_000_000_000
+
+# Timeframe durations in seconds, ordered from lowest to highest
+TIMEFRAME_SECONDS: Dict[str, int] = {
+    "M1": 60,
+    "M5": 5 * 60,
+    "M15": 15 * 60,
+    "H1": 60 * 60,
+    "H4": 4 * 60 * 60,
+    "D1": 24 * 60 * 60,
+}
+
+
+def floor_timestamp_ns(timestamp_ns: int, timeframe: str) -> int:
+    """
+    Floor an epoch-nanosecond timestamp to its bucket start.
+
+    Buckets are aligned to the UTC clock (H4 at 00/04/08..., D1 at midnight).
+
+    Args:
+        timestamp_ns: Epoch nanoseconds
+        timeframe: Timeframe identifier
+
+    Returns:
+        Bucket start in epoch nanoseconds
+    """
+    period = TIMEFRAME_SECONDS[timeframe] * NANOS_PER_SECOND
+    return timestamp_ns - timestamp_ns % period
+
+
+@dataclass
+class CandleCloseEvent:
+    """
+    Candle close event emitted by the aggregator.
+
+    Attributes:
+        symbol: Trading symbol
+        timeframe: Timeframe of the closed candle
+        candle: Closed candle
+        filled: True if the candle was synthesized for an empty bucket
+        received_at: ``time.perf_counter`` arrival time of the tick that
+            closed the candle (None if closed by the clock)
+    """
+
+    symbol: str
+    timeframe: str
+    candle: Candle
+    filled: bool = False
+    received_at: Optional[float] = None
+
+    @property
+    def bar_timestamp(self) -> datetime:
+        """Get open time of the closed candle."""
+        return self.candle.timestamp
+
+
+class _BarState:
+    """Mutable in-progress bar for a single timeframe."""
+
+    __slots__ = ("start_ns", "open", "high", "low", "close", "volume", "ticks")
+
+    def __init__(self, start_ns: int, price, volume: int):
+        self.start_ns = start_ns
+        self.open = price
+        self.high = price
+        self.low = price
+        self.close = price
+        self.volume = volume
+        self.ticks = 1
+
+
+class _TimeframeState:
+    """Aggregation state for a single timeframe."""
+
+    __slots__ = ("timeframe", "period_ns", "bar", "last_close", "next_start_ns")
+
+    def __init__(self, timeframe: str):
+        self.timeframe = timeframe
+        self.period_ns = TIMEFRAME_SECONDS[timeframe] * NANOS_PER_SECOND
+        self.bar: Optional[_BarState] = None
+        self.last_close = None
+        self.next_start_ns: Optional[int] = None
+
+
+class MultiTimeframeAggregator:
+    """
+    Clock-aligned multi-timeframe candle aggregator.
+
+    Maintains one in-progress bar per timeframe for a single symbol.
+    Each tick is applied to every timeframe in O(1) and completed
+    buckets are returned as CandleCloseEvent objects.
+
+    With ``fixed_point`` enabled, bar prices are kept as integer price
+    units and only converted back to Decimal when a candle is built.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        timeframes: Optional[Iterable[str]] = None,
+        fill_gaps: bool = True,
+        max_gap_fill_bars: int = 30,
+        fixed_point: bool = False,
+    ):
+        """
+        Initialize aggregator.
+
+        Args:
+            symbol: Trading symbol
+            timeframes: Timeframes to build (all supported if None)
+            fill_gaps: Emit flat candles for empty buckets
+            max_gap_fill_bars: Largest gap (in bars) that is filled; longer
+                gaps such as weekends are treated as session breaks
+            fixed_point: Aggregate prices as integer price units
+        """
+        timeframes = list(timeframes) if timeframes else list(TIMEFRAME_SECONDS)
+        unknown = [tf for tf in timeframes if tf not in TIMEFRAME_SECONDS]
+        if unknown:
+            raise ValueError(f"Unsupported timeframes: {unknown}")
+
+        self.symbol = symbol
+        self.fill_gaps = fill_gaps
+        self.max_gap_fill_bars = max_gap_fill_bars
+        self.fixed_point = fixed_point
+        self.timeframes = sorted(timeframes, key=TIMEFRAME_SECONDS.get)
+        self._states = [_TimeframeState(tf) for tf in self.timeframes]
+
+        self.late_ticks = 0
+
+    def update(self, tick: Tick) -> List[CandleCloseEvent]:
+        """
+        Apply a tick to all timeframes.
+
+        Args:
+            tick: New tick (bid price is aggregated)
+
+        Returns:
+            Close events for buckets completed by this tick, oldest first
+        """
+        timestamp_ns = datetime_to_ns(tick.timestamp)
+        # Quotes finer than one price unit are rounded half-even, like the
+        # tick journal, rather than rejected mid-batch
+        price = to_price_units(tick.bid, exact=False) if self.fixed_point else tick.bid
+        volume = tick.volume or 0
+        events: List[CandleCloseEvent] = []
+
+        for state in self._states:
+            start_ns = timestamp_ns - timestamp_ns % state.period_ns
+            bar = state.bar
+
+            if bar is not None and start_ns == bar.start_ns:
+                if price > bar.high:
+                    bar.high = price
+                elif price < bar.low:
+                    bar.low = price
+                bar.close = price
+                bar.volume += volume
+                bar.ticks += 1
+                continue
+
+            if bar is not None and start_ns < bar.start_ns:
+                self.late_ticks += 1
+                continue
+
+            if (
+                bar is None
+                and state.next_start_ns is not None
+                and start_ns < state.next_start_ns
+            ):
+                # Tick belongs to a bucket that was already closed
+                self.late_ticks += 1
+                continue
+
+            self._close_through(state, start_ns, events)
+            state.bar = _BarState(start_ns, price, volume)
+
+        return events
+
+    def opens_bucket(self, tick: Tick) -> bool:
+        """
+        Check if a tick would open a new bucket on any timeframe.
+
+        Such a tick closes the open bucket (if any) before it, so
+        replays use it to apply ticks in runs that end at each close.
+
+        Args:
+            tick: Tick not yet applied
+
+        Returns:
+            True if ``update`` would start a new bar
+        """
+        # Buckets are clock-aligned, so every bucket boundary of a longer
+        # timeframe is also one of the shortest
+        state = self._states[0]
+        timestamp_ns = datetime_to_ns(tick.timestamp)
+        start_ns = timestamp_ns - timestamp_ns % state.period_ns
+        if state.bar is not None:
+            return start_ns > state.bar.start_ns
+        return state.next_start_ns is None or start_ns >= state.next_start_ns
+
+    def advance_to(self, timestamp: datetime) -> List[CandleCloseEvent]:
+        """
+        Close buckets that ended before the given time.
+
+        Used during quiet periods so candles close (and empty buckets
+        are filled) without waiting for the next tick.
+
+        Args:
+            timestamp: Current time (naive UTC)
+
+        Returns:
+            Close events, oldest first
+        """
+        timestamp_ns = datetime_to_ns(timestamp)
+        events: List[CandleCloseEvent] = []
+        for state in self._states:
+            self._close_through(state, timestamp_ns, events)
+        return events
+
+    def current_candle(self, timeframe: str) -> Optional[Candle]:
+        """
+        Get a snapshot of the in-progress candle.
+
+        Args:
+            timeframe: Timeframe identifier
+
+        Returns:
+            Candle snapshot or None
+        """
+        for state in self._states:
+            if state.timeframe == timeframe and state.bar is not None:
+                return self._build_candle(state, state.bar)
+        return None
+
+    def _close_through(
+        self, state: _TimeframeState, timestamp_ns: int, events: List[CandleCloseEvent]
+    ):
+        """
+        Close the current bar and fill empty buckets ending at or before a time.
+
+        Args:
+            state: Timeframe state
+            timestamp_ns: Epoch nanoseconds
+            events: Output list of close events
+        """
+        bar = state.bar
+        if bar is not None:
+            if timestamp_ns < bar.start_ns + state.period_ns:
+                return
+            events.append(
+                CandleCloseEvent(
+                    self.symbol, state.timeframe, self._build_candle(state, bar)
+                )
+            )
+            state.last_close = bar.close
+            state.next_start_ns = bar.start_ns + state.period_ns
+            state.bar = None
+
+        if not self.fill_gaps or state.last_close is None:
+            return
+
+        # Fill buckets that ended without any ticks
+        missing = (timestamp_ns - state.next_start_ns) // state.period_ns
+        if missing <= 0:
+            return
+        if missing > self.max_gap_fill_bars:
+            state.next_start_ns += missing * state.period_ns
+            return
+
+        price = self._to_price(state.last_close)
+        for _ in range(missing):
+            candle = Candle.from_trusted(
+                timestamp=ns_to_datetime(state.next_start_ns),
+                open=price,
+                high=price,
+                low=price,
+                close=price,
+                volume=0,
+                timeframe=state.timeframe,
+                instrument=self.symbol,
+                tick_volume=0,
+            )
+            events.append(
+                CandleCloseEvent(self.symbol, state.timeframe, candle, filled=True)
+            )
+            state.next_start_ns += state.period_ns
+
+    def _build_candle(self, state: _TimeframeState, bar: _BarState) -> Candle:
+        """Create a candle object from bar state."""
+        to_price = self._to_price
+        return Candle.from_trusted(
+            timestamp=ns_to_datetime(bar.start_ns),
+            open=to_price(bar.open),
+            high=to_price(bar.high),
+            low=to_price(bar.low),
+            close=to_price(bar.close),
+            volume=bar.volume,
+            timeframe=state.timeframe,
+            instrument=self.symbol,
+            tick_volume=bar.ticks,
+        )
+
+    def _to_price(self, price) -> Decimal:
+        """Convert an internal bar price to Decimal."""
+        return from_price_units(price) if self.fixed_point else price
@@ -0,0 +1,601 @@
+"""
+Columnar candle storage for XAUUSD Gold Trading System.
+
+Keeps OHLCV data and timestamps in preallocated NumPy arrays
+so detectors can work on contiguous views instead of building
+Candle objects on every analysis run.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+from typing import List, Optional, Sequence
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+
+from ..models.candle import Candle
+from ..models.price import PRICE_SCALE, from_price_units, to_price_units
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def datetime_to_ns(value: datetime) -> int:
+    """
+    Convert datetime to integer nanoseconds since epoch.
+
+    Naive datetimes are treated as UTC, matching the rest of the system.
+
+    Args:
+        value: Datetime to convert
+
+    Returns:
+        Nanoseconds since 1970-01-01 UTC
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - EPOCH
+    return (
+        (delta.days * 86400 + delta.seconds) * 1_000_000_000
+        + delta.microseconds * 1000
+    )
+
+
+def ns_to_datetime(value: int) -> datetime:
+    """
+    Convert integer nanoseconds since epoch to naive UTC datetime.
+
+    Args:
+        value: Nanoseconds since epoch
+
+    Returns:
+        Naive UTC datetime (microsecond precision)
+    """
+    return EPOCH + timedelta(microseconds=int(value) // 1000)
+
+
+def _float_to_decimal(value: float) -> Decimal:
+    """Convert a float column value to Decimal via its shortest repr."""
+    return Decimal(str(float(value)))
+
+
+class CandleArrays:
+    """
+    Columnar view over a sequence of candles.
+
+    Prices are float64, or int64 price units when ``fixed_point`` is set
+    (see ``models.price``).
+
+    Attributes:
+        timestamp: Candle open time in epoch nanoseconds (int64)
+        open: Opening prices
+        high: Highest prices
+        low: Lowest prices
+        close: Closing prices
+        volume: Volumes (int64)
+        instrument: Trading instrument
+        timeframe: Candle timeframe
+        fixed_point: True if prices are int64 price units
+    """
+
+    __slots__ = (
+        "timestamp",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "instrument",
+        "timeframe",
+        "fixed_point",
+    )
+
+    def __init__(
+        self,
+        timestamp: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        instrument: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        fixed_point: bool = False,
+    ):
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.instrument = instrument
+        self.timeframe = timeframe
+        self.fixed_point = fixed_point
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def empty(
+        cls,
+        instrument: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        fixed_point: bool = False,
+    ) -> "CandleArrays":
+        """
+        Create arrays with no rows.
+
+        Args:
+            instrument: Trading instrument
+            timeframe: Candle timeframe
+            fixed_point: Use int64 price units
+
+        Returns:
+            Empty CandleArrays
+        """
+        price_dtype = np.int64 if fixed_point else np.float64
+        return cls(
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=price_dtype),
+            np.empty(0, dtype=price_dtype),
+            np.empty(0, dtype=price_dtype),
+            np.empty(0, dtype=price_dtype),
+            np.empty(0, dtype=np.int64),
+            instrument,
+            timeframe,
+            fixed_point,
+        )
+
+    @classmethod
+    def from_candles(
+        cls,
+        candles: Sequence[Candle],
+        instrument: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        fixed_point: bool = False,
+    ) -> "CandleArrays":
+        """
+        Build columnar arrays from candle objects.
+
+        Args:
+            candles: Candles to convert
+            instrument: Instrument override (defaults to first candle)
+            timeframe: Timeframe override (defaults to first candle)
+            fixed_point: Store prices as int64 price units
+
+        Returns:
+            New CandleArrays owning its data
+        """
+        price_dtype = np.int64 if fixed_point else np.float64
+        convert = to_price_units if fixed_point else float
+
+        def column(name: str) -> np.ndarray:
+            return np.array(
+                [convert(getattr(candle, name)) for candle in candles],
+                dtype=price_dtype,
+            )
+
+        count = len(candles)
+        return cls(
+            timestamp=np.array(
+                [datetime_to_ns(candle.timestamp) for candle in candles],
+                dtype=np.int64,
+            ),
+            open=column("open"),
+            high=column("high"),
+            low=column("low"),
+            close=column("close"),
+            volume=np.array(
+                [candle.volume or 0 for candle in candles], dtype=np.int64
+            ),
+            instrument=instrument or (candles[0].instrument if count else None),
+            timeframe=timeframe or (candles[0].timeframe if count else None),
+            fixed_point=fixed_point,
+        )
+
+    def copy(self) -> "CandleArrays":
+        """Return a copy that no longer aliases the source buffer."""
+        return CandleArrays(
+            self.timestamp.copy(),
+            self.open.copy(),
+            self.high.copy(),
+            self.low.copy(),
+            self.close.copy(),
+            self.volume.copy(),
+            self.instrument,
+            self.timeframe,
+            self.fixed_point,
+        )
+
+    def slice(self, start: int, stop: int) -> "CandleArrays":
+        """
+        Get rows ``start:stop`` as views over the same arrays.
+
+        Args:
+            start: First row
+            stop: Row after the last
+
+        Returns:
+            CandleArrays aliasing this object's data
+        """
+        return CandleArrays(
+            self.timestamp[start:stop],
+            self.open[start:stop],
+            self.high[start:stop],
+            self.low[start:stop],
+            self.close[start:stop],
+            self.volume[start:stop],
+            self.instrument,
+            self.timeframe,
+            self.fixed_point,
+        )
+
+    def price_units(self, column: str) -> np.ndarray:
+        """
+        Get a price column as int64 price units.
+
+        Args:
+            column: Column name (open, high, low, close)
+
+        Returns:
+            Price units (the column itself when already fixed-point)
+        """
+        values = getattr(self, column)
+        if self.fixed_point:
+            return values
+        return np.rint(values * PRICE_SCALE).astype(np.int64)
+
+    def candle(self, index: int) -> Candle:
+        """
+        Materialize a single candle.
+
+        Args:
+            index: Position in the arrays (negative indexes allowed)
+
+        Returns:
+            Candle object
+        """
+        convert = from_price_units if self.fixed_point else _float_to_decimal
+        return Candle.from_trusted(
+            timestamp=ns_to_datetime(self.timestamp[index]),
+            open=convert(self.open[index]),
+            high=convert(self.high[index]),
+            low=convert(self.low[index]),
+            close=convert(self.close[index]),
+            volume=int(self.volume[index]),
+            timeframe=self.timeframe,
+            instrument=self.instrument,
+        )
+
+    def to_candles(self) -> List[Candle]:
+        """Materialize all rows as candle objects."""
+        return [self.candle(i) for i in range(len(self))]
+
+
+class CandleRingBuffer:
+    """
+    Fixed-capacity columnar ring buffer for candles.
+
+    Every value is written twice, at ``pos`` and ``pos + capacity``,
+    so the most recent ``n`` rows are always contiguous and can be
+    returned as zero-copy NumPy views.
+
+    Views returned by ``latest`` alias the buffer memory and are only
+    stable until the next append; call ``CandleArrays.copy`` to keep them.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        instrument: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        keep_objects: bool = False,
+        fixed_point: bool = False,
+    ):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity: Maximum number of candles retained
+            instrument: Trading instrument
+            timeframe: Candle timeframe
+            keep_objects: Also retain Candle references for object callers
+            fixed_point: Store prices as int64 price units
+        """
+        if capacity <= 0:
+            raise ValueError(f"Capacity must be positive, got {capacity}")
+
+        self.capacity = capacity
+        self.instrument = instrument
+        self.timeframe = timeframe
+        self.fixed_point = fixed_point
+
+        price_dtype = np.int64 if fixed_point else np.float64
+        self._timestamp = np.zeros(2 * capacity, dtype=np.int64)
+        self._open = np.zeros(2 * capacity, dtype=price_dtype)
+        self._high = np.zeros(2 * capacity, dtype=price_dtype)
+        self._low = np.zeros(2 * capacity, dtype=price_dtype)
+        self._close = np.zeros(2 * capacity, dtype=price_dtype)
+        self._volume = np.zeros(2 * capacity, dtype=np.int64)
+        self._objects: Optional[List[Optional[Candle]]] = (
+            [None] * (2 * capacity) if keep_objects else None
+        )
+
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def is_full(self) -> bool:
+        """Check if buffer has wrapped at least once."""
+        return self._count >= self.capacity
+
+    @property
+    def total_appended(self) -> int:
+        """Total number of candles appended since creation."""
+        return self._count
+
+    def append(
+        self,
+        timestamp_ns: int,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: int = 0,
+    ):
+        """
+        Append a candle from raw column values.
+
+        Prices must already be in the buffer's representation
+        (price units when ``fixed_point`` is set).
+
+        Args:
+            timestamp_ns: Candle open time in epoch nanoseconds
+            open: Opening price
+            high: Highest price
+            low: Lowest price
+            close: Closing price
+            volume: Volume
+        """
+        pos = self._count % self.capacity
+        mirror = pos + self.capacity
+
+        self._timestamp[pos] = self._timestamp[mirror] = timestamp_ns
+        self._open[pos] = self._open[mirror] = open
+        self._high[pos] = self._high[mirror] = high
+        self._low[pos] = self._low[mirror] = low
+        self._close[pos] = self._close[mirror] = close
+        self._volume[pos] = self._volume[mirror] = volume
+
+        if self._objects is not None:
+            self._objects[pos] = self._objects[mirror] = None
+
+        self._count += 1
+
+    def append_candle(self, candle: Candle):
+        """
+        Append a candle object.
+
+        Args:
+            candle: Candle to append
+        """
+        pos = self._count % self.capacity
+        convert = to_price_units if self.fixed_point else float
+        self.append(
+            datetime_to_ns(candle.timestamp),
+            convert(candle.open),
+            convert(candle.high),
+            convert(candle.low),
+            convert(candle.close),
+            candle.volume or 0,
+        )
+        if self._objects is not None:
+            self._objects[pos] = self._objects[pos + self.capacity] = candle
+
+    def extend(self, arrays: CandleArrays):
+        """
+        Append candles from columnar arrays in one vectorized write.
+
+        Only the last ``capacity`` rows are kept. Prices are converted
+        if the arrays use a different representation than the buffer.
+
+        Args:
+            arrays: Candles in time order
+        """
+        count = len(arrays)
+        if count == 0:
+            return
+
+        skipped = max(0, count - self.capacity)
+        if skipped:
+            arrays = arrays.slice(skipped, count)
+
+        prices = []
+        for name in ("open", "high", "low", "close"):
+            if self.fixed_point and not arrays.fixed_point:
+                prices.append(arrays.price_units(name))
+            elif arrays.fixed_point and not self.fixed_point:
+                prices.append(getattr(arrays, name) / PRICE_SCALE)
+            else:
+                prices.append(getattr(arrays, name))
+
+        positions = (self._count + skipped + np.arange(len(arrays))) % self.capacity
+        mirrors = positions + self.capacity
+        for column, values in zip(
+            (
+                self._timestamp,
+                self._open,
+                self._high,
+                self._low,
+                self._close,
+                self._volume,
+            ),
+            (arrays.timestamp, *prices, arrays.volume),
+        ):
+            column[positions] = values
+            column[mirrors] = values
+
+        if self._objects is not None:
+            for pos in positions.tolist():
+                self._objects[pos] = self._objects[pos + self.capacity] = None
+
+        self._count += count
+
+    def _bounds(self, count: Optional[int]) -> tuple:
+        """Get [start, end) slice of the contiguous mirror for latest rows."""
+        size = len(self)
+        count = size if count is None else max(0, min(count, size))
+        if size == 0:
+            return 0, 0
+        end = (self._count - 1) % self.capacity + self.capacity + 1
+        return end - count, end
+
+    def latest(self, count: Optional[int] = None) -> CandleArrays:
+        """
+        Get zero-copy views over the latest candles (oldest first).
+
+        Args:
+            count: Number of candles (all retained candles if None)
+
+        Returns:
+            Read-only CandleArrays views
+        """
+        start, end = self._bounds(count)
+        columns = []
+        for column in (
+            self._timestamp,
+            self._open,
+            self._high,
+            self._low,
+            self._close,
+            self._volume,
+        ):
+            view = column[start:end]
+            view.flags.writeable = False
+            columns.append(view)
+
+        return CandleArrays(
+            *columns,
+            instrument=self.instrument,
+            timeframe=self.timeframe,
+            fixed_point=self.fixed_point,
+        )
+
+    def latest_candles(self, count: Optional[int] = None) -> List[Candle]:
+        """
+        Get latest candles as objects (oldest first).
+
+        Uses retained references when available and materializes
+        from the arrays otherwise.
+
+        Args:
+            count: Number of candles (all retained candles if None)
+
+        Returns:
+            List of candles
+        """
+        start, end = self._bounds(count)
+        if self._objects is None:
+            return self.latest(count).to_candles()
+
+        candles = self._objects[start:end]
+        if None in candles:
+            arrays = self.latest(count)
+            candles = [
+                candle if candle is not None else arrays.candle(i)
+                for i, candle in enumerate(candles)
+            ]
+        return candles
+
+    def clear(self):
+        """Remove all candles from the buffer."""
+        self._count = 0
+        if self._objects is not None:
+            self._objects = [None] * (2 * self.capacity)
+
+
+class RollingWindow:
+    """
+    Rolling window for candle data.
+
+    Adapter over CandleRingBuffer: existing callers keep receiving
+    Candle objects while detectors can read the columnar arrays.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        instrument: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        fixed_point: bool = False,
+    ):
+        """
+        Initialize rolling window.
+
+        Args:
+            size: Window size
+            instrument: Trading instrument
+            timeframe: Candle timeframe
+            fixed_point: Store prices as int64 price units
+        """
+        self.size = size
+        self.buffer = CandleRingBuffer(
+            size,
+            instrument=instrument,
+            timeframe=timeframe,
+            keep_objects=True,
+            fixed_point=fixed_point,
+        )
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    @property
+    def is_full(self) -> bool:
+        """Check if window holds ``size`` candles."""
+        return self.buffer.is_full
+
+    def add(self, candle: Candle):
+        """
+        Add candle to rolling window.
+
+        Args:
+            candle: Candle to add
+        """
+        self.buffer.append_candle(candle)
+
+    def extend(self, arrays: CandleArrays):
+        """
+        Add candles from columnar arrays.
+
+        Args:
+            arrays: Candles in time order
+        """
+        self.buffer.extend(arrays)
+
+    def get_latest(self, count: int = 1) -> List[Candle]:
+        """
+        Get latest candles from window.
+
+        Args:
+            count: Number of candles to get
+
+        Returns:
+            List of latest candles
+        """
+        return self.buffer.latest_candles(count)
+
+    def get_arrays(self, count: Optional[int] = None) -> CandleArrays:
+        """
+        Get zero-copy columnar views of the latest candles.
+
+        Args:
+            count: Number of candles (whole window if None)
+
+        Returns:
+            Read-only CandleArrays
+        """
+        return self.buffer.latest(count)
@@ -14,11 +14,13 @@ from datetime import datetime
 from ..models.candle import Candle
 from ..models.market_data import PriceLevel
 from ..config import get_settings
+from ..core.clock import utcnow
 
 from .fvg_detector import FairValueGap, FairValueGapDetector
 from .order_block_detector import OrderBlock, OrderBlockDetector
 from .liquidity_analyzer import LiquidityPool, LiquiditySweep, LiquidityAnalyzer
 from .structure_analyzer import MarketStructure, StructureBreak
+from .zone_index import PriceZoneIndex, ZoneKind
 
 
 class ConfluenceFactor:
@@ -40,7 +42,7 @@ class ConfluenceFactor:
         self.score = score
         self.description = description
         self.weight = weight
-        self.timestamp = datetime.utcnow()
+        self.timestamp = utcnow()
 
         # Validate
         self._validate_factor()
@@ -81,7 +83,7 @@ class TimeframeAnalysis:
         self.structure_score = 0.0
         self.overall_score = 0.0
         self.factors = []
-        self.timestamp = datetime.utcnow()
+        self.timestamp = utcnow()
 
     def add_factor(self, factor: ConfluenceFactor):
         """
@@ -164,7 +166,7 @@ class ConfluenceAnalysis:
         self.setup_type = "UNKNOWN"
         self.market_structure = "UNKNOWN"
         self.confluence_factors = []
-        self.timestamp = datetime.utcnow()
+        self.timestamp = utcnow()
 
         # Analysis components
         self.fvgs: List[FairValueGap] = []
@@ -172,6 +174,23 @@ class ConfluenceAnalysis:
         self.liquidity_pools: List[LiquidityPool] = []
         self.liquidity_sweeps: List[LiquiditySweep] = []
         self.market_structure_obj: Optional[MarketStructure] = None
+        self.zone_index: Optional[PriceZoneIndex] = None
+        self.ob_index: Optional[PriceZoneIndex] = None
+        self.pool_index: Optional[PriceZoneIndex] = None
+
+    def __getstate__(self) -> dict:
+        """Drop per-run detectors so results pickle compactly across processes."""
+        state = self.__dict__.copy()
+        for key in (
+            "_fvg_detector",
+            "_ob_detector",
+            "_config",
+            "zone_index",
+            "ob_index",
+            "pool_index",
+        ):
+            state.pop(key, None)
+        return state
 
     def analyze(
         self,
@@ -180,6 +199,10 @@ class ConfluenceAnalysis:
         m15_candles: List[Candle],
         current_price: Decimal,
         market_structure: Optional[MarketStructure] = None,
+        fvgs: Optional[List[FairValueGap]] = None,
+        zone_index: Optional[PriceZoneIndex] = None,
+        ob_index: Optional[PriceZoneIndex] = None,
+        pool_index: Optional[PriceZoneIndex] = None,
     ) -> Dict[str, Any]:
         """
         Perform complete confluence analysis.
@@ -190,16 +213,24 @@ class ConfluenceAnalysis:
             m15_candles: M15 timeframe candles
             current_price: Current market price
             market_structure: Optional market structure object
+            fvgs: Open H1 gaps from a ``FairValueGapTracker``; detected
+                from ``h1_candles`` if None
+            zone_index: Long-lived index of ``fvgs`` (the tracker's
+                ``zone_index``); active gaps are scanned if None
+            ob_index: Long-lived order block index, synced with the
+                blocks detected here; blocks are scanned if None
+            pool_index: Long-lived liquidity pool index, synced with
+                the pools identified here; pools are scanned if None
 
         Returns:
             Complete analysis results
         """
         settings = get_settings()
-        config = settings.smc
+        self._config = settings.smc
 
         # Initialize detectors
-        fvg_detector = FairValueGapDetector()
-        ob_detector = OrderBlockDetector()
+        self._fvg_detector = FairValueGapDetector()
+        self._ob_detector = OrderBlockDetector()
         liquidity_analyzer = LiquidityAnalyzer()
 
         # Use provided market structure or create new one
@@ -210,21 +241,44 @@ class ConfluenceAnalysis:
             for candle in h1_candles:  # Use H1 for structure
                 self.market_structure_obj.update_with_candle(candle)
 
-        # Detect FVGs
-        self.fvgs = fvg_detector.detect_fvgs(h1_candles)
+        # Detect FVGs unless a tracker already maintains them
+        if fvgs is None:
+            fvgs = self._fvg_detector.detect_fvgs(h1_candles)
+        self.fvgs = fvgs
+        self.zone_index = zone_index
+        self.ob_index = ob_index
+        self.pool_index = pool_index
 
         # Detect Order Blocks
-        swing_points = (
-            self.market_structure_obj.swing_highs + self.market_structure_obj.swing_lows
+        swing_points = [
+            *self.market_structure_obj.swing_highs,
+            *self.market_structure_obj.swing_lows,
+        ]
+        self.order_blocks = self._ob_detector.detect_order_blocks(
+            h1_candles, swing_points
         )
-        self.order_blocks = ob_detector.detect_order_blocks(h1_candles, swing_points)
+        if ob_index is not None:
+            ob_index.sync(
+                self.order_blocks,
+                ZoneKind.ORDER_BLOCK,
+                bounds=lambda ob: (ob.low, ob.high),
+                key=lambda ob: (ob.type, ob.timestamp),
+            )
 
         # Analyze liquidity
         self.liquidity_pools = liquidity_analyzer.identify_liquidity_pools(
             swing_points, current_price
         )
+        if pool_index is not None:
+            pool_index.sync(
+                self.liquidity_pools,
+                ZoneKind.LIQUIDITY,
+                bounds=lambda pool: (pool.price, pool.price),
+                key=lambda pool: (pool.type, pool.price, pool.timestamp),
+            )
+
         self.liquidity_sweeps = liquidity_analyzer.detect_liquidity_sweeps(
-            self.liquidity_pools, h1_candles, current_price
+            self.liquidity_pools, h1_candles, current_price, pool_index
         )
 
         # Analyze each timeframe
@@ -247,15 +301,19 @@ class ConfluenceAnalysis:
             return
 
         # Get active FVGs
-        active_fvgs = fvg_detector.get_active_fvgs(
+        active_fvgs = self._fvg_detector.get_active_fvgs(
             self.fvgs,
             current_price,
             max_age_minutes=1440,  # 24 hours
+            index=self.zone_index,
         )
 
         # Get active order blocks
-        active_obs = ob_detector.get_active_order_blocks(
-            self.order_blocks, current_price, max_age_minutes=1440
+        active_obs = self._ob_detector.get_active_order_blocks(
+            self.order_blocks,
+            current_price,
+            max_age_minutes=1440,
+            index=self.ob_index,
         )
 
         # Add FVG factors
@@ -264,7 +322,7 @@ class ConfluenceAnalysis:
                 factor_type="FVG",
                 score=fvg.strength,
                 description=f"FVG at {fvg.mid_price:.5f}",
-                weight=config.fvg_weight / 100.0,
+                weight=self._config.fvg_weight / 100.0,
             )
             self.h4_analysis.add_factor(factor)
 
@@ -274,7 +332,7 @@ class ConfluenceAnalysis:
                 factor_type="ORDER_BLOCK",
                 score=ob.strength,
                 description=f"OB at {ob.price:.5f}",
-                weight=config.ob_weight / 100.0,
+                weight=self._config.ob_weight / 100.0,
             )
             self.h4_analysis.add_factor(factor)
 
@@ -284,15 +342,19 @@ class ConfluenceAnalysis:
             return
 
         # Get active FVGs
-        active_fvgs = fvg_detector.get_active_fvgs(
+        active_fvgs = self._fvg_detector.get_active_fvgs(
             self.fvgs,
             current_price,
             max_age_minutes=720,  # 12 hours
+            index=self.zone_index,
         )
 
         # Get active order blocks
-        active_obs = ob_detector.get_active_order_blocks(
-            self.order_blocks, current_price, max_age_minutes=720
+        active_obs = self._ob_detector.get_active_order_blocks(
+            self.order_blocks,
+            current_price,
+            max_age_minutes=720,
+            index=self.ob_index,
         )
 
         # Add FVG factors
@@ -301,7 +363,7 @@ class ConfluenceAnalysis:
                 factor_type="FVG",
                 score=fvg.strength,
                 description=f"FVG at {fvg.mid_price:.5f}",
-                weight=config.fvg_weight / 100.0,
+                weight=self._config.fvg_weight / 100.0,
             )
             self.h1_analysis.add_factor(factor)
 
@@ -311,7 +373,7 @@ class ConfluenceAnalysis:
                 factor_type="ORDER_BLOCK",
                 score=ob.strength,
                 description=f"OB at {ob.price:.5f}",
-                weight=config.ob_weight / 100.0,
+                weight=self._config.ob_weight / 100.0,
             )
             self.h1_analysis.add_factor(factor)
 
@@ -321,7 +383,7 @@ class ConfluenceAnalysis:
                 factor_type="LIQUIDITY_SWEEP",
                 score=sweep.strength,
                 description=f"Liquidity sweep at {sweep.pool_price:.5f}",
-                weight=config.liquidity_weight / 100.0,
+                weight=self._config.liquidity_weight / 100.0,
             )
             self.h1_analysis.add_factor(factor)
 
@@ -331,15 +393,19 @@ class ConfluenceAnalysis:
             return
 
         # Get active FVGs
-        active_fvgs = fvg_detector.get_active_fvgs(
+        active_fvgs = self._fvg_detector.get_active_fvgs(
             self.fvgs,
             current_price,
             max_age_minutes=240,  # 4 hours
+            index=self.zone_index,
         )
 
         # Get active order blocks
-        active_obs = ob_detector.get_active_order_blocks(
-            self.order_blocks, current_price, max_age_minutes=240
+        active_obs = self._ob_detector.get_active_order_blocks(
+            self.order_blocks,
+            current_price,
+            max_age_minutes=240,
+            index=self.ob_index,
         )
 
         # Add FVG factors
@@ -348,7 +414,7 @@ class ConfluenceAnalysis:
                 factor_type="FVG",
                 score=fvg.strength,
                 description=f"FVG at {fvg.mid_price:.5f}",
-                weight=config.fvg_weight / 100.0,
+                weight=self._config.fvg_weight / 100.0,
             )
             self.m15_analysis.add_factor(factor)
 
@@ -358,7 +424,7 @@ class ConfluenceAnalysis:
                 factor_type="ORDER_BLOCK",
                 score=ob.strength,
                 description=f"OB at {ob.price:.5f}",
-                weight=config.ob_weight / 100.0,
+                weight=self._config.ob_weight / 100.0,
             )
             self.m15_analysis.add_factor(factor)
 
@@ -504,6 +570,9 @@ class ConfluenceAnalysis:
             "order_blocks": [ob.to_dict() for ob in self.order_blocks[:5]],
             "liquidity_pools": [lp.to_dict() for lp in self.liquidity_pools[:5]],
             "liquidity_sweeps": [ls.to_dict() for ls in self.liquidity_sweeps[:5]],
+            "zone_index": (
+                self.zone_index.get_status() if self.zone_index is not None else None
+            ),
             "timestamp": self.timestamp.isoformat(),
         }
 
@@ -528,6 +597,11 @@ class ConfluenceAnalyzer:
         m15_candles: List[Candle],
         current_price: Decimal,
         market_structure: Optional[MarketStructure] = None,
+        instrument: str = "XAUUSD",
+        fvgs: Optional[List[FairValueGap]] = None,
+        zone_index: Optional[PriceZoneIndex] = None,
+        ob_index: Optional[PriceZoneIndex] = None,
+        pool_index: Optional[PriceZoneIndex] = None,
     ) -> ConfluenceAnalysis:
         """
         Perform complete confluence analysis.
@@ -538,14 +612,28 @@ class ConfluenceAnalyzer:
             m15_candles: M15 timeframe candles
             current_price: Current market price
             market_structure: Optional market structure object
+            instrument: Trading instrument
+            fvgs: Open H1 gaps from a ``FairValueGapTracker``
+            zone_index: The tracker's live index of ``fvgs``
+            ob_index: Live order block index to sync and query
+            pool_index: Live liquidity pool index to sync and query
 
         Returns:
             Complete confluence analysis
         """
-        analysis = ConfluenceAnalysis()
-        return analysis.analyze(
-            h4_candles, h1_candles, m15_candles, current_price, market_structure
+        analysis = ConfluenceAnalysis(instrument)
+        analysis.analyze(
+            h4_candles,
+            h1_candles,
+            m15_candles,
+            current_price,
+            market_structure,
+            fvgs,
+            zone_index,
+            ob_index,
+            pool_index,
         )
+        return analysis
 
     def calculate_signal_quality(
         self, analysis: ConfluenceAnalysis
@@ -619,7 +707,8 @@ class ConfluenceAnalyzer:
         if not analysis.meets_threshold(self.config.confluence_threshold):
             validation["is_valid"] = False
             validation["errors"].append(
-                f"Confluence score {analysis.overall_score} below threshold {self.config.confluence_threshold}"
+                f"Confluence score {analysis.overall_score} below threshold "
+                f"{self.config.confluence_threshold}"
             )
 
         # Check multi-timeframe requirement
@@ -7,13 +7,21 @@ that indicate potential reversal zones.
 
 # Copyright (c) 2024 Simon Callaghan. All rights reserved.
 
-from typing import List, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
+
+import numpy as np
 
 from ..models.candle import Candle
 from ..models.market_data import PriceLevel
 from ..config import get_settings
+from ..core.clock import utcnow
+from .candle_aggregator import TIMEFRAME_SECONDS
+from .candle_buffer import CandleArrays
+from .zone_index import PriceZoneIndex, ZoneKind
 
 
 class FairValueGapType:
@@ -87,12 +95,12 @@ class FairValueGap:
 
         # Validate pattern
         if self.type == FairValueGapType.BULLISH:
-            # Bullish FVG: middle candle should close below gap
-            if candle.close >= self.bottom_price:
+            # Bullish FVG: middle candle should close above the gap bottom
+            if candle.close <= self.bottom_price:
                 raise ValueError("Invalid bullish FVG pattern")
         else:  # BEARISH
-            # Bearish FVG: middle candle should close above gap
-            if candle.close <= self.top_price:
+            # Bearish FVG: middle candle should close below the gap top
+            if candle.close >= self.top_price:
                 raise ValueError("Invalid bearish FVG pattern")
 
     def calculate_strength(self, avg_volume: float, current_volume: float) -> float:
@@ -232,12 +240,60 @@ class FairValueGap:
         }
 
 
+def fvg_strengths(
+    size_pips: np.ndarray,
+    current_volume: np.ndarray,
+    avg_volume: float,
+    body_percentage: np.ndarray,
+    config,
+) -> np.ndarray:
+    """
+    Score gaps as array expressions.
+
+    Same weighting as ``FairValueGap.calculate_strength``.
+
+    Args:
+        size_pips: Gap sizes in pips
+        current_volume: Third candle volumes (average volume if missing)
+        avg_volume: Average volume over the lookback period
+        body_percentage: Middle candle body as a percentage of its range
+        config: FVG configuration
+
+    Returns:
+        Strength per gap (0.0 to 1.0)
+    """
+    size_strength = np.where(
+        (size_pips >= config.min_size_pips) & (size_pips <= config.max_size_pips),
+        1.0,
+        np.where(size_pips < config.min_size_pips, 0.2, 0.5),
+    )
+
+    if config.require_volume_spike:
+        volume_multiplier = (
+            current_volume / avg_volume
+            if avg_volume > 0
+            else np.ones(len(size_pips))
+        )
+        volume_strength = np.minimum(1.0, volume_multiplier / config.volume_multiplier)
+    else:
+        volume_strength = 1.0
+
+    wick_strength = np.maximum(0.3, 1.0 - body_percentage / 100.0)
+
+    strength = size_strength * 0.4 + volume_strength * 0.3 + wick_strength * 0.3
+    return np.clip(strength, 0.0, 1.0)
+
+
 class FairValueGapDetector:
     """
     Fair Value Gap detector implementation.
 
     Scans candle sequences to identify three-candle patterns
-    that create price imbalances.
+    that create price imbalances. A bullish gap is left when the
+    third candle's low is above the first candle's high and the
+    middle candle closes above that high; a bearish gap mirrors it.
+    All windows are screened at once with NumPy and gap objects are
+    only built for gaps that reach ``min_strength``.
     """
 
     def __init__(self):
@@ -261,28 +317,178 @@ class FairValueGapDetector:
         if len(candles) < 3:
             return []
 
+        # Float conversion keeps the order of the quoted prices, so the
+        # screen is exact; survivors are measured on their Decimal prices
+        highs = np.array([float(c.high) for c in candles])
+        lows = np.array([float(c.low) for c in candles])
+        bullish = lows[2:] > highs[:-2]
+        bearish = highs[2:] < lows[:-2]
+
+        patterns = []
+        for i in np.flatnonzero(bullish | bearish).tolist():
+            first, second, third = candles[i], candles[i + 1], candles[i + 2]
+            if bullish[i]:
+                top, bottom = third.low, first.high
+                if second.close <= bottom:
+                    continue
+            else:
+                top, bottom = first.low, third.high
+                if second.close >= top:
+                    continue
+            patterns.append((i, bool(bullish[i]), top, bottom))
+
+        if not patterns:
+            return []
+
+        strengths = fvg_strengths(
+            np.array([float((top - bottom) * 10000) for _, _, top, bottom in patterns]),
+            np.array(
+                [candles[i + 2].volume or avg_volume for i, _, _, _ in patterns],
+                dtype=np.float64,
+            ),
+            avg_volume,
+            np.array([candles[i + 1].body_percentage for i, _, _, _ in patterns]),
+            self.config,
+        )
+
         fvgs = []
+        min_strength = self.config.min_strength
+        for (i, is_bullish, top, bottom), strength in zip(
+            patterns, strengths.tolist()
+        ):
+            if strength >= min_strength:
+                pattern = candles[i : i + 3]
+                fvgs.append(self._build(is_bullish, top, bottom, pattern, strength))
+        return fvgs
 
-        # Scan for three-candle patterns
-        for i in range(len(candles) - 2):
-            pattern_candles = candles[i : i + 3]
+    def scan(
+        self, arrays: CandleArrays, avg_volume: float = 0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Find gaps in candle arrays without building objects.
 
-            # Check if we have a valid pattern
-            if len(pattern_candles) < 3:
-                continue
+        Args:
+            arrays: Candles in time order
+            avg_volume: Average volume for strength calculation
+
+        Returns:
+            Arrays per valid gap: ``index`` (first candle), ``bullish``,
+            ``top`` and ``bottom`` (int64 price units) and ``strength``
+        """
+        if len(arrays) < 3:
+            empty = np.empty(0, dtype=np.int64)
+            return {
+                "index": empty,
+                "bullish": np.empty(0, dtype=bool),
+                "top": empty,
+                "bottom": empty,
+                "strength": np.empty(0, dtype=np.float64),
+            }
+
+        high = arrays.price_units("high")
+        low = arrays.price_units("low")
+        close = arrays.price_units("close")
+        middle_close = close[1:-1]
+        bullish = (low[2:] > high[:-2]) & (middle_close > high[:-2])
+        bearish = (high[2:] < low[:-2]) & (middle_close < low[:-2])
+
+        index = np.flatnonzero(bullish | bearish)
+        is_bullish = bullish[index]
+        top = np.where(is_bullish, low[index + 2], low[index])
+        bottom = np.where(is_bullish, high[index], high[index + 2])
+
+        middle = index + 1
+        body = np.abs(close[middle] - arrays.price_units("open")[middle])
+        total_range = high[middle] - low[middle]
+        body_percentage = np.divide(
+            body * 100.0,
+            total_range,
+            out=np.zeros(len(index)),
+            where=total_range > 0,
+        )
+        volume = arrays.volume[index + 2].astype(np.float64)
+        volume[volume == 0] = avg_volume
+
+        # One pip is 1e-4, ten price units
+        strength = fvg_strengths(
+            (top - bottom) / 10.0, volume, avg_volume, body_percentage, self.config
+        )
+        keep = strength >= self.config.min_strength
+        return {
+            "index": index[keep],
+            "bullish": is_bullish[keep],
+            "top": top[keep],
+            "bottom": bottom[keep],
+            "strength": strength[keep],
+        }
+
+    def detect_fvgs_arrays(
+        self, arrays: CandleArrays, avg_volume: float = 0
+    ) -> List[FairValueGap]:
+        """
+        Detect Fair Value Gaps in candle arrays.
+
+        Candles are only materialized for the gaps found.
 
-            fvg = self._analyze_pattern(pattern_candles, avg_volume)
-            if fvg and fvg.is_valid(self.config.min_strength):
-                fvgs.append(fvg)
+        Args:
+            arrays: Candles in time order
+            avg_volume: Average volume for strength calculation
 
+        Returns:
+            List of detected FVGs
+        """
+        found = self.scan(arrays, avg_volume)
+        fvgs = []
+        # Neighbouring gaps share candles; materialize each only once
+        materialized: Dict[int, Candle] = {}
+        for i, is_bullish, strength in zip(
+            found["index"].tolist(),
+            found["bullish"].tolist(),
+            found["strength"].tolist(),
+        ):
+            pattern = []
+            for j in (i, i + 1, i + 2):
+                candle = materialized.get(j)
+                if candle is None:
+                    candle = materialized[j] = arrays.candle(j)
+                pattern.append(candle)
+            if is_bullish:
+                top, bottom = pattern[2].low, pattern[0].high
+            else:
+                top, bottom = pattern[0].low, pattern[2].high
+            fvgs.append(self._build(is_bullish, top, bottom, pattern, strength))
         return fvgs
 
+    @staticmethod
+    def _build(
+        is_bullish: bool,
+        top: Decimal,
+        bottom: Decimal,
+        pattern: Sequence[Candle],
+        strength: float,
+    ) -> FairValueGap:
+        """Create a gap object for a screened pattern."""
+        fvg = FairValueGap(
+            gap_type=(
+                FairValueGapType.BULLISH if is_bullish else FairValueGapType.BEARISH
+            ),
+            top_price=top,
+            bottom_price=bottom,
+            start_candle=pattern[0],
+            end_candle=pattern[2],
+        )
+        fvg.middle_candle = pattern[1]
+        fvg.strength = strength
+        return fvg
+
     def _analyze_pattern(
         self, candles: List[Candle], avg_volume: float
     ) -> Optional[FairValueGap]:
         """
         Analyze three-candle pattern for FVG.
 
+        Scalar reference for ``detect_fvgs``.
+
         Args:
             candles: Three consecutive candles
             avg_volume: Average volume for context
@@ -296,58 +502,42 @@ class FairValueGapDetector:
         first, second, third = candles
 
         # Check for bullish FVG (gap up)
-        if second.low > first.high and third.low > second.high:
-            gap_top = min(first.high, second.high)
-            gap_bottom = max(second.low, third.low)
-
-            if gap_bottom > gap_top:
-                return None  # Invalid gap
-
+        if third.low > first.high and second.close > first.high:
             fvg = FairValueGap(
                 gap_type=FairValueGapType.BULLISH,
-                top_price=gap_bottom,
-                bottom_price=gap_top,
+                top_price=third.low,
+                bottom_price=first.high,
                 start_candle=first,
                 end_candle=third,
             )
-            fvg.add_middle_candle(second)
-
-            # Calculate strength
-            current_volume = third.volume if third.volume else avg_volume
-            fvg.calculate_strength(avg_volume, current_volume)
-
-            return fvg
 
         # Check for bearish FVG (gap down)
-        elif second.high < first.low and third.high < second.low:
-            gap_top = max(first.low, second.low)
-            gap_bottom = min(second.high, third.high)
-
-            if gap_bottom >= gap_top:
-                return None  # Invalid gap
-
+        elif third.high < first.low and second.close < first.low:
             fvg = FairValueGap(
                 gap_type=FairValueGapType.BEARISH,
-                top_price=gap_top,
-                bottom_price=gap_bottom,
+                top_price=first.low,
+                bottom_price=third.high,
                 start_candle=first,
                 end_candle=third,
             )
-            fvg.add_middle_candle(second)
 
-            # Calculate strength
-            current_volume = third.volume if third.volume else avg_volume
-            fvg.calculate_strength(avg_volume, current_volume)
+        else:
+            return None
+
+        fvg.add_middle_candle(second)
 
-            return fvg
+        # Calculate strength
+        current_volume = third.volume if third.volume else avg_volume
+        fvg.calculate_strength(avg_volume, current_volume)
 
-        return None
+        return fvg
 
     def get_active_fvgs(
         self,
         fvgs: List[FairValueGap],
         current_price: Decimal,
         max_age_minutes: int = 240,
+        index: Optional[PriceZoneIndex] = None,
     ) -> List[FairValueGap]:
         """
         Get active (unfilled) FVGs within age limit.
@@ -356,12 +546,24 @@ class FairValueGapDetector:
             fvgs: List of all detected FVGs
             current_price: Current market price
             max_age_minutes: Maximum age in minutes
+            index: Zone index holding the gaps; only gaps on the unfilled
+                side of the price are checked
 
         Returns:
             List of active FVGs
         """
+        if index is not None:
+            # Unfilled bullish gaps sit below the price, bearish above
+            tolerance = Decimal("2") / Decimal("10000")
+            below = index.between(None, current_price - tolerance, ZoneKind.FVG)
+            above = index.between(current_price + tolerance, None, ZoneKind.FVG)
+            fvgs = index.in_order(
+                [fvg for fvg in below if fvg.type == FairValueGapType.BULLISH]
+                + [fvg for fvg in above if fvg.type == FairValueGapType.BEARISH]
+            )
+
         active_fvgs = []
-        current_time = datetime.utcnow()
+        current_time = utcnow()
 
         for fvg in fvgs:
             # Check age
@@ -448,3 +650,216 @@ class FairValueGapDetector:
             "strongest_fvg": max(fvgs, key=lambda x: x.strength) if fvgs else None,
             "weakest_fvg": min(fvgs, key=lambda x: x.strength) if fvgs else None,
         }
+
+
+class FairValueGapTracker:
+    """
+    Incremental tracker of open Fair Value Gaps.
+
+    Each closed candle is checked together with the two before it, so
+    only the gap it completes is added. Open gaps are kept sorted by
+    fill threshold on each side; bearish thresholds are negated so the
+    gaps a price fills are always a suffix of the list. A price update
+    compares against the last threshold and pops what it fills, costing
+    O(log n) plus the gaps filled. Gaps retire once filled or older
+    than ``max_age_minutes`` on the candle timeline.
+
+    Open gaps are also kept in a long-lived ``zone_index`` for price
+    lookups by the confluence analysis.
+    """
+
+    def __init__(
+        self,
+        timeframe: str = "H1",
+        max_age_minutes: int = 1440,
+        tolerance_pips: Decimal = Decimal("2"),
+        avg_volume: float = 0,
+        detector: Optional[FairValueGapDetector] = None,
+    ):
+        """
+        Initialize FVG tracker.
+
+        Args:
+            timeframe: Timeframe of the candles gaps are detected on
+            max_age_minutes: Age after which open gaps are retired
+            tolerance_pips: Fill tolerance (as in ``FairValueGap.is_filled``)
+            avg_volume: Average volume for strength calculation
+            detector: Detector used for new patterns
+        """
+        self.timeframe = timeframe
+        self.period = timedelta(seconds=TIMEFRAME_SECONDS[timeframe])
+        self.max_age = timedelta(minutes=max_age_minutes)
+        self.tolerance = tolerance_pips / Decimal("10000")
+        self.avg_volume = avg_volume
+        self.detector = detector or FairValueGapDetector()
+
+        self._recent: Deque[Candle] = deque(maxlen=3)
+        self._keys: Dict[str, List[Decimal]] = {
+            FairValueGapType.BULLISH: [],
+            FairValueGapType.BEARISH: [],
+        }
+        self._gaps: Dict[str, List[FairValueGap]] = {
+            FairValueGapType.BULLISH: [],
+            FairValueGapType.BEARISH: [],
+        }
+        # Every tracked gap in time order; filled gaps are skipped lazily
+        self._by_age: Deque[FairValueGap] = deque()
+        self.zone_index = PriceZoneIndex()
+
+        self.added = 0
+        self.filled = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        """Get number of open gaps."""
+        return sum(len(gaps) for gaps in self._gaps.values())
+
+    def _key(self, fvg: FairValueGap) -> Decimal:
+        """Get a gap's sort key (price at which it fills, negated if bearish)."""
+        if fvg.type == FairValueGapType.BULLISH:
+            return fvg.bottom_price + self.tolerance
+        return self.tolerance - fvg.top_price
+
+    def on_candle(self, candle: Candle) -> List[FairValueGap]:
+        """
+        Update with a closed candle.
+
+        The candle's range is checked for fills first, so gaps filled
+        between price updates (or during hydration) are retired before
+        the gap the candle completes is added.
+
+        Args:
+            candle: Closed candle (other timeframes are ignored)
+
+        Returns:
+            Gaps added by this candle
+        """
+        if candle.timeframe != self.timeframe:
+            return []
+
+        self._expire(candle.timestamp + self.period)
+        self._fill(FairValueGapType.BULLISH, candle.low, candle.low, candle.timestamp)
+        self._fill(
+            FairValueGapType.BEARISH, -candle.high, candle.high, candle.timestamp
+        )
+
+        self._recent.append(candle)
+        if len(self._recent) < 3:
+            return []
+
+        # A single window is cheaper to check directly than to vectorize
+        config = self.detector.config
+        fvg = self.detector._analyze_pattern(list(self._recent), self.avg_volume)
+        if fvg is None or not fvg.is_valid(config.min_strength):
+            return []
+        if config.ignore_small_fvgs and fvg.size * 10000 < config.min_size_pips:
+            return []
+
+        key = self._key(fvg)
+        index = bisect_right(self._keys[fvg.type], key)
+        self._keys[fvg.type].insert(index, key)
+        self._gaps[fvg.type].insert(index, fvg)
+        self._by_age.append(fvg)
+        self.zone_index.insert(fvg, fvg.bottom_price, fvg.top_price, ZoneKind.FVG)
+        self.added += 1
+        return [fvg]
+
+    def on_price(self, price: Decimal, timestamp: datetime) -> List[FairValueGap]:
+        """
+        Check open gaps against a price.
+
+        Args:
+            price: Current market price
+            timestamp: Price time
+
+        Returns:
+            Gaps filled by this price
+        """
+        bullish = self._fill(FairValueGapType.BULLISH, price, price, timestamp)
+        bearish = self._fill(FairValueGapType.BEARISH, -price, price, timestamp)
+        return bullish + bearish if bearish else bullish
+
+    def hydrate(self, arrays: CandleArrays) -> int:
+        """
+        Replay historical closed candles.
+
+        Only candles recent enough to leave gaps younger than
+        ``max_age_minutes`` are replayed.
+
+        Args:
+            arrays: Closed candles of the tracker timeframe in time order
+
+        Returns:
+            Number of open gaps
+        """
+        if not len(arrays):
+            return len(self)
+
+        span = int((self.max_age + 3 * self.period) / self.period)
+        recent = arrays.slice(max(0, len(arrays) - span), len(arrays))
+        for candle in recent.to_candles():
+            self.on_candle(candle)
+        return len(self)
+
+    def open_gaps(self) -> List[FairValueGap]:
+        """
+        Get open gaps.
+
+        Returns:
+            Unfilled gaps in time order
+        """
+        return [fvg for fvg in self._by_age if not fvg.filled]
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get tracker status information.
+
+        Returns:
+            Status dictionary
+        """
+        return {
+            "timeframe": self.timeframe,
+            "open_bullish": len(self._gaps[FairValueGapType.BULLISH]),
+            "open_bearish": len(self._gaps[FairValueGapType.BEARISH]),
+            "added": self.added,
+            "filled": self.filled,
+            "expired": self.expired,
+            "zone_index": self.zone_index.get_status(),
+        }
+
+    def _fill(
+        self, gap_type: str, key: Decimal, price: Decimal, timestamp: datetime
+    ) -> List[FairValueGap]:
+        """Pop and mark the gaps of one side whose key is at or above ``key``."""
+        keys = self._keys[gap_type]
+        if not keys or keys[-1] < key:
+            return []
+
+        start = bisect_left(keys, key)
+        gaps = self._gaps[gap_type]
+        filled = gaps[start:]
+        del keys[start:]
+        del gaps[start:]
+        for fvg in filled:
+            fvg.mark_filled(timestamp, price)
+            self.zone_index.retire(fvg)
+        self.filled += len(filled)
+        return filled
+
+    def _expire(self, now: datetime):
+        """Retire open gaps older than the age limit."""
+        cutoff = now - self.max_age
+        while self._by_age and self._by_age[0].timestamp < cutoff:
+            fvg = self._by_age.popleft()
+            if fvg.filled:
+                continue
+
+            keys = self._keys[fvg.type]
+            gaps = self._gaps[fvg.type]
+            index = bisect_left(keys, self._key(fvg))
+            while gaps[index] is not fvg:
+                index += 1
+            del keys[index]
+            del gaps[index]
+            self.zone_index.retire(fvg)
+            self.expired += 1
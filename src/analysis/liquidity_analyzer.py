@@ -14,6 +14,8 @@ from datetime import datetime
 from ..models.candle import Candle
 from ..models.market_data import PriceLevel, SwingPoint
 from ..config import get_settings
+from ..core.clock import utcnow
+from .zone_index import PriceZoneIndex, ZoneKind
 
 
 class LiquidityPool:
@@ -350,7 +352,7 @@ class LiquidityAnalyzer:
         )
 
         # 2. Time since last touch (more recent = stronger)
-        current_time = datetime.utcnow()
+        current_time = utcnow()
         sp1_age = (current_time - sp1.timestamp).total_seconds() / 3600  # Hours
         sp2_age = (current_time - sp2.timestamp).total_seconds() / 3600
 
@@ -389,7 +391,11 @@ class LiquidityAnalyzer:
             return "SIDE"
 
     def detect_liquidity_sweeps(
-        self, pools: List[LiquidityPool], candles: List[Candle], current_price: Decimal
+        self,
+        pools: List[LiquidityPool],
+        candles: List[Candle],
+        current_price: Decimal,
+        index: Optional[PriceZoneIndex] = None,
     ) -> List[LiquiditySweep]:
         """
         Detect liquidity sweeps from pools and price action.
@@ -398,10 +404,24 @@ class LiquidityAnalyzer:
             pools: Identified liquidity pools
             candles: Recent candles for context
             current_price: Current market price
+            index: Zone index holding ``pools``; only those the price has
+                moved beyond by the sweep extension are checked
 
         Returns:
             List of detected sweeps
         """
+        if index is not None:
+            extension = Decimal(str(self.config.sweep_extension_pips))
+            below = index.between(
+                None, current_price - extension, ZoneKind.LIQUIDITY
+            )
+            above = index.between(
+                current_price + extension, None, ZoneKind.LIQUIDITY
+            )
+            beyond = {id(pool) for pool in below if pool.type == "HIGH"}
+            beyond.update(id(pool) for pool in above if pool.type == "LOW")
+            pools = [pool for pool in pools if id(pool) in beyond]
+
         sweeps = []
 
         for pool in pools:
@@ -460,7 +480,7 @@ class LiquidityAnalyzer:
             sweep_type=sweep_type,
             pool_price=pool.price,
             sweep_price=sweep_price,
-            sweep_time=datetime.utcnow(),
+            sweep_time=utcnow(),
         )
 
         # Calculate strength
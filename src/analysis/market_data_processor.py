@@ -8,57 +8,24 @@ and triggers SMC analysis on new candle closes.
 # Copyright (c) 2024 Simon Callaghan. All rights reserved.
 
 import asyncio
+import time
 from typing import List, Optional, Callable, Dict, Any
 from datetime import datetime, timedelta
 from decimal import Decimal
-from collections import deque
 import logging
 
 from ..models.candle import Candle
 from ..models.market_data import Tick, MarketSnapshot
 from ..models.signal import TradingSignal
 from .confluence_analyzer import ConfluenceAnalyzer
+from .analysis_executor import AnalysisExecutor
+from .analysis_scheduler import AnalysisRequest, AnalysisScheduler
+from .candle_aggregator import CandleCloseEvent
+from .candle_buffer import CandleArrays, RollingWindow
+from .symbol_shard import SymbolShard
 from ..config import get_settings
-
-
-class RollingWindow:
-    """Rolling window for candle data."""
-
-    def __init__(self, size: int):
-        """
-        Initialize rolling window.
-
-        Args:
-            size: Window size
-        """
-        self.size = size
-        self.data = deque(maxlen=size)
-        self.is_full = False
-
-    def add(self, candle: Candle):
-        """
-        Add candle to rolling window.
-
-        Args:
-            candle: Candle to add
-        """
-        self.data.append(candle)
-        if len(self.data) >= self.size:
-            self.is_full = True
-        else:
-            self.is_full = False
-
-    def get_latest(self, count: int = 1) -> List[Candle]:
-        """
-        Get latest candles from window.
-
-        Args:
-            count: Number of candles to get
-
-        Returns:
-            List of latest candles
-        """
-        return list(self.data)[-count:] if self.data else []
+from ..core.clock import SimulatedClock, get_clock
+from ..monitoring.tracing import get_tracer
 
 
 class MarketDataProcessor:
@@ -66,45 +33,50 @@ class MarketDataProcessor:
     Market data processor implementation.
 
     Handles real-time tick processing, candle aggregation,
-    and SMC analysis triggering.
+    and SMC analysis triggering. Ticks are routed to a SymbolShard
+    per symbol, each with its own queue, candle state and worker.
     """
 
     def __init__(self):
         """Initialize market data processor."""
         self.settings = get_settings()
+        self.market_data_config = self.settings.market_data
         self.logger = logging.getLogger(__name__)
 
-        # Initialize rolling windows for different timeframes
-        self.m15_window = RollingWindow(size=200)
-        self.h1_window = RollingWindow(size=200)
-        self.h4_window = RollingWindow(size=200)
-
-        # Current candles
-        self.current_m15 = None
-        self.current_h1 = None
-        self.current_h4 = None
+        # Per-symbol shards
+        self.shards: Dict[str, SymbolShard] = {}
 
         # Tick processing
-        self.pending_ticks = deque(maxlen=1000)
         self.current_tick = None
         self.last_tick_time = None
 
-        # SMC analyzer
+        # SMC analysis, scheduled on candle closes and run off the event loop
+        smc_config = self.settings.smc
         self.confluence_analyzer = ConfluenceAnalyzer()
+        self.tracer = get_tracer()
+        self.analysis_executor = AnalysisExecutor(
+            max_workers=smc_config.analysis_workers,
+            max_in_flight=smc_config.analysis_max_in_flight,
+            timeout=smc_config.analysis_timeout_seconds,
+        )
+        self.analysis_scheduler = AnalysisScheduler(
+            self._trigger_smc_analysis,
+            max_concurrent=smc_config.analysis_max_in_flight,
+        )
 
         # Event callbacks
         self.on_new_candle_callbacks: List[Callable[[Candle], None]] = []
+        self.on_candle_close_callbacks: List[
+            Callable[[CandleCloseEvent], None]
+        ] = []
         self.on_signal_callbacks: List[Callable[[TradingSignal], None]] = []
         self.on_trade_update_callbacks: List[Callable[[Dict], None]] = []
 
         # Processing state
         self.is_running = False
         self.processed_ticks = 0
-
-        # Initialize last update time
-        self.last_m15_update = datetime.utcnow()
-        self.last_h1_update = datetime.utcnow()
-        self.last_h4_update = datetime.utcnow()
+        self.hydration: Optional[Dict[str, Any]] = None
+        self._clock_task: Optional[asyncio.Task] = None
 
     def add_new_candle_callback(self, callback: Callable[[Candle], None]):
         """
@@ -115,6 +87,20 @@ class MarketDataProcessor:
         """
         self.on_new_candle_callbacks.append(callback)
 
+    def add_candle_close_callback(
+        self, callback: Callable[[CandleCloseEvent], None]
+    ):
+        """
+        Add callback for candle close events.
+
+        Unlike new candle callbacks, these receive the full event, so
+        they can tell synthesized gap-fill candles from real ones.
+
+        Args:
+            callback: Callback function
+        """
+        self.on_candle_close_callbacks.append(callback)
+
     def add_signal_callback(self, callback: Callable[[TradingSignal], None]):
         """
         Add callback for signal generation events.
@@ -136,11 +122,31 @@ class MarketDataProcessor:
     async def start(self):
         """Start market data processing."""
         self.is_running = True
+        self.analysis_executor.start()
+        await self.analysis_scheduler.start()
+        for shard in self.shards.values():
+            await shard.start()
+        self._clock_task = asyncio.create_task(self._candle_clock_loop())
         self.logger.info("Market data processor started")
 
     async def stop(self):
         """Stop market data processing."""
         self.is_running = False
+
+        if self._clock_task:
+            self._clock_task.cancel()
+            try:
+                await self._clock_task
+            except asyncio.CancelledError:
+                pass
+            self._clock_task = None
+
+        for shard in list(self.shards.values()):
+            await shard.stop()
+
+        await self.analysis_scheduler.stop()
+        await self.analysis_executor.shutdown()
+
         self.logger.info("Market data processor stopped")
 
     async def process_tick(self, tick: Tick):
@@ -157,261 +163,236 @@ class MarketDataProcessor:
         self.last_tick_time = tick.timestamp
         self.processed_ticks += 1
 
-        # Add to pending ticks for processing
-        self.pending_ticks.append(tick)
-
-        # Process tick batch if window is full
-        if len(self.pending_ticks) >= 10:
-            await self._process_tick_batch()
+        # Queue on the symbol shard; its worker aggregates the ticks
+        shard = self.shards.get(tick.symbol)
+        if shard is None:
+            shard = await self._create_shard(tick.symbol)
+        await shard.submit(tick)
 
-    async def _process_tick_batch(self):
+    async def ingest(self, ticks: List[Tick]):
         """
-        Process batch of pending ticks.
-        """
-        if not self.pending_ticks:
-            return
+        Process ticks synchronously and run triggered analysis inline.
 
-        # Get ticks to process
-        ticks_to_process = list(self.pending_ticks)
-        self.pending_ticks.clear()
+        Bypasses the shard queues and the scheduler loop so replays and
+        backfills produce the same candles and signals on every run.
+        The processor does not need to be started.
 
-        # Group ticks by symbol
-        symbol_ticks = {}
-        for tick in ticks_to_process:
-            if tick.symbol not in symbol_ticks:
-                symbol_ticks[tick.symbol] = []
-            symbol_ticks[tick.symbol].append(tick)
+        Ticks are applied in runs ending at each tick that opens a new
+        bucket, and analysis triggered by a close runs before the next
+        run, as if the ticks had arrived one at a time. A simulated
+        global clock is moved to each run's last tick, so results do
+        not depend on how the ticks are batched.
 
-        # Process each symbol
-        for symbol, ticks in symbol_ticks.items():
-            await self._process_symbol_ticks(symbol, ticks)
+        Args:
+            ticks: Ticks in time order (any symbols)
+        """
+        start = 0
+        shard = None
+        for i, tick in enumerate(ticks):
+            if shard is None or shard.symbol != tick.symbol:
+                shard = self.shards.get(tick.symbol)
+                if shard is None:
+                    shard = await self._create_shard(tick.symbol)
+            if shard.aggregator.opens_bucket(tick):
+                await self._ingest_run(ticks[start : i + 1])
+                start = i + 1
+        if start < len(ticks):
+            await self._ingest_run(ticks[start:])
 
-    async def _process_symbol_ticks(self, symbol: str, ticks: List[Tick]):
+    async def _ingest_run(self, ticks: List[Tick]):
         """
-        Process ticks for a specific symbol.
+        Apply a run of ticks in which only the last may close candles.
 
         Args:
-            symbol: Trading symbol
-            ticks: List of ticks to process
+            ticks: Ticks in time order (any symbols)
         """
-        if not ticks:
-            return
+        clock = get_clock()
+        if isinstance(clock, SimulatedClock):
+            clock.set(ticks[-1].timestamp)
 
-        # Sort ticks by timestamp
-        ticks.sort(key=lambda t: t.timestamp)
-
-        # Process ticks to update candles
+        by_symbol: Dict[str, List[Tick]] = {}
         for tick in ticks:
-            await self._update_candles_from_tick(tick)
+            by_symbol.setdefault(tick.symbol, []).append(tick)
+
+        self.current_tick = ticks[-1]
+        self.last_tick_time = ticks[-1].timestamp
+        self.processed_ticks += len(ticks)
+
+        for symbol, symbol_ticks in by_symbol.items():
+            await self.shards[symbol].ingest(symbol_ticks)
 
-        # Trigger analysis on new candle closes
-        await self._check_and_trigger_analysis()
+        await self.analysis_scheduler.run_pending()
 
-    async def _update_candles_from_tick(self, tick: Tick):
+    async def advance_to(self, timestamp: datetime):
         """
-        Update candle windows from tick data.
+        Close candles on all shards up to a time and run triggered analysis.
 
         Args:
-            tick: Current tick data
+            timestamp: Time on the tick timeline (naive UTC)
         """
-        timestamp = tick.timestamp
+        for shard in list(self.shards.values()):
+            await shard.advance_to(timestamp)
+        await self.analysis_scheduler.run_pending()
 
-        # Update M15 candles (1-minute aggregation)
-        new_m15 = await self._update_timeframe_candle(
-            self.m15_window, tick, self.current_m15, timedelta(minutes=1)
-        )
-        if new_m15:
-            self.current_m15 = new_m15
-            self.last_m15_update = timestamp
+    async def hydrate(
+        self, symbol: str, candles: Dict[str, CandleArrays]
+    ) -> Dict[str, int]:
+        """
+        Fill a symbol's candle windows with historical closed candles.
 
-            # Trigger callbacks
-            for callback in self.on_new_candle_callbacks:
-                try:
-                    await callback(new_m15)
-                except Exception as e:
-                    self.logger.error(f"Error in new M15 candle callback: {e}")
+        Args:
+            symbol: Trading symbol
+            candles: Closed candles per timeframe, oldest first
 
-        # Update H1 candles (1-hour aggregation)
-        new_h1 = await self._update_timeframe_candle(
-            self.h1_window, tick, self.current_h1, timedelta(hours=1)
-        )
-        if new_h1:
-            self.current_h1 = new_h1
-            self.last_h1_update = timestamp
+        Returns:
+            Candles retained per timeframe
+        """
+        shard = self.shards.get(symbol)
+        if shard is None:
+            shard = await self._create_shard(symbol)
 
-        # Update H4 candles (4-hour aggregation)
-        new_h4 = await self._update_timeframe_candle(
-            self.h4_window, tick, self.current_h4, timedelta(hours=4)
-        )
-        if new_h4:
-            self.current_h4 = new_h4
-            self.last_h4_update = timestamp
+        return {
+            timeframe: shard.hydrate(timeframe, arrays)
+            for timeframe, arrays in candles.items()
+        }
 
-    async def _update_timeframe_candle(
-        self,
-        window: RollingWindow,
-        tick: Tick,
-        current_candle: Optional[Candle],
-        period: timedelta,
-    ) -> Optional[Candle]:
+    async def _create_shard(self, symbol: str) -> SymbolShard:
         """
-        Update candle for specific timeframe.
+        Create and start a shard for a new symbol.
 
         Args:
-            window: Rolling window for timeframe
-            tick: Current tick data
-            current_candle: Current candle for timeframe
-            period: Time period for candle
+            symbol: Trading symbol
 
         Returns:
-            Updated candle or None
-        """
-        # Get OHLC from tick
-        ohlc = {
-            "open": tick.bid,
-            "high": tick.bid,
-            "low": tick.bid,
-            "close": tick.bid,
-            "volume": tick.volume,
-        }
-
-        # If no current candle, create new one
-        if not current_candle:
-            candle = Candle(
-                timestamp=tick.timestamp,
-                open=ohlc["open"],
-                high=ohlc["high"],
-                low=ohlc["low"],
-                close=ohlc["close"],
-                volume=ohlc["volume"],
-                instrument=tick.symbol,
-                timeframe=self._get_timeframe_from_period(period),
-            )
-            window.add(candle)
-            return candle
-
-        # Update existing candle
-        candle = current_candle
-        candle.high = max(candle.high, tick.bid)
-        candle.low = min(candle.low, tick.bid)
-        candle.volume = (candle.volume or 0) + (tick.volume or 0)
-        candle.close = tick.bid
-
-        # Check if candle period is complete
-        if tick.timestamp >= candle.timestamp + period:
-            # Add to window and create new candle
-            window.add(candle)
-            new_candle = Candle(
-                timestamp=candle.timestamp + period,
-                open=ohlc["close"],
-                high=ohlc["high"],
-                low=ohlc["low"],
-                close=ohlc["close"],
-                volume=0,  # Will be updated with ticks
-                instrument=tick.symbol,
-                timeframe=self._get_timeframe_from_period(period),
-            )
-            return new_candle
-
-        return None
+            Symbol shard
+        """
+        shard = SymbolShard(symbol, self.market_data_config, self._on_shard_batch)
+        self.shards[symbol] = shard
+        if self.is_running:
+            await shard.start()
+        self.logger.info(f"Created market data shard for {symbol}")
+        return shard
 
-    def _get_timeframe_from_period(self, period: timedelta) -> str:
+    async def _on_shard_batch(self, shard: SymbolShard, events: List[CandleCloseEvent]):
         """
-        Get timeframe string from period.
+        Handle candle closes produced by a shard batch.
 
         Args:
-            period: Time period
-
-        Returns:
-            Timeframe string
+            shard: Shard that processed the batch
+            events: Candle close events, oldest first
         """
-        total_minutes = period.total_seconds() / 60
+        for event in events:
+            for callback in self.on_new_candle_callbacks:
+                try:
+                    await callback(event.candle)
+                except Exception as e:
+                    self.logger.error(
+                        f"Error in new {event.timeframe} candle callback: {e}"
+                    )
+            for callback in self.on_candle_close_callbacks:
+                try:
+                    await callback(event)
+                except Exception as e:
+                    self.logger.error(
+                        f"Error in {event.timeframe} candle close callback: {e}"
+                    )
 
-        if total_minutes < 30:
-            return "M15"
-        elif total_minutes < 240:
-            return "H1"
-        elif total_minutes < 1440:
-            return "H4"
-        else:
-            return "D1"
+            # Schedule analysis on candle close
+            self.analysis_scheduler.schedule(event)
 
-    async def _check_and_trigger_analysis(self):
+    async def _candle_clock_loop(self):
         """
-        Check for new candles and trigger SMC analysis.
+        Close candles on the wall clock during quiet periods.
+
+        Buckets are closed once their end time plus a grace period
+        has passed, so late ticks still land in the right candle.
         """
-        current_time = datetime.utcnow()
+        interval = self.market_data_config.candle_clock_interval_seconds
+        grace = timedelta(seconds=self.market_data_config.close_grace_seconds)
 
-        # Check M15 timeframe
-        if self.last_m15_update and current_time >= self.last_m15_update + timedelta(
-            minutes=1
-        ):
-            await self._trigger_smc_analysis("M15")
+        while self.is_running:
+            try:
+                await asyncio.sleep(interval)
 
-        # Check H1 timeframe
-        if self.last_h1_update and current_time >= self.last_h1_update + timedelta(
-            hours=1
-        ):
-            await self._trigger_smc_analysis("H1")
+                for shard in list(self.shards.values()):
+                    await shard.advance_clock(grace)
 
-        # Check H4 timeframe
-        if self.last_h4_update and current_time >= self.last_h4_update + timedelta(
-            hours=4
-        ):
-            await self._trigger_smc_analysis("H4")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error in candle clock loop: {e}")
 
-    async def _trigger_smc_analysis(self, timeframe: str):
+    async def _trigger_smc_analysis(self, request: AnalysisRequest):
         """
-        Trigger SMC analysis for specific timeframe.
+        Run SMC analysis for a scheduled candle close.
 
         Args:
-            timeframe: Timeframe that triggered analysis
-        """
+            request: Scheduled analysis request
+        """
+        timeframe = request.timeframe
+        trace = request.trace
+        if trace is not None:
+            trace.attributes["timeframes"] = list(request.timeframes)
+            self.tracer.record_span(
+                trace, "analysis.scheduled", trace.started_at, time.perf_counter()
+            )
+
         try:
-            # Get candles for analysis
-            if timeframe == "M15":
-                candles = self.m15_window.get_latest(50)
-                current_candle = self.current_m15
-            elif timeframe == "H1":
-                candles = self.h1_window.get_latest(50)
-                current_candle = self.current_h1
-            elif timeframe == "H4":
-                candles = self.h4_window.get_latest(50)
-                current_candle = self.current_h4
-            else:
-                self.logger.warning(f"Unknown timeframe for analysis: {timeframe}")
+            shard = self.shards.get(request.symbol)
+            if shard is None:
                 return
 
-            if not candles or len(candles) < 20:
-                self.logger.warning(f"Insufficient candles for {timeframe} analysis")
+            # Snapshot candle arrays; workers get their own copies
+            with self.tracer.span("analysis.snapshot", trace):
+                h4_arrays = shard.windows["H4"].get_arrays(50).copy()
+                h1_arrays = shard.windows["H1"].get_arrays(50).copy()
+                m15_arrays = shard.windows["M15"].get_arrays(50).copy()
+
+            if len(h1_arrays) < 20:
+                self.logger.warning(
+                    f"Insufficient candles for {request.symbol} {timeframe} analysis"
+                )
                 return
 
             # Get current price
-            current_price = self.current_tick.mid_price if self.current_tick else None
-
-            # Perform confluence analysis
-            analysis = self.confluence_analyzer.analyze_confluence(
-                h4_candles=candles,
-                h1_candles=candles,
-                m15_candles=candles,
-                current_price=current_price,
+            current_price = (
+                shard.current_tick.mid_price if shard.current_tick else None
             )
 
+            # Perform confluence analysis in the worker pool
+            with self.tracer.span("analysis.confluence", trace):
+                analysis = await self.analysis_executor.analyze(
+                    h4_arrays,
+                    h1_arrays,
+                    m15_arrays,
+                    current_price,
+                    instrument=request.symbol,
+                    fvgs=shard.fvg_tracker.open_gaps(),
+                    zone_index=shard.fvg_tracker.zone_index,
+                    ob_index=shard.order_block_index,
+                    pool_index=shard.liquidity_index,
+                )
+
             # Check if signal should be generated
             if analysis.meets_threshold(self.settings.smc.confluence_threshold):
                 # Generate trading signal
-                signal = await self._generate_signal(analysis, current_price)
+                with self.tracer.span("signal.generate", trace):
+                    signal = await self._generate_signal(analysis, current_price)
 
                 if signal:
                     self.logger.info(
                         f"Signal generated: {signal.signal_id} - "
                         f"{signal.direction} {signal.instrument} at {signal.entry_price}"
                     )
+                    if trace is not None:
+                        trace.attributes["signal_id"] = signal.signal_id
 
                     # Trigger signal callbacks
                     for callback in self.on_signal_callbacks:
+                        name = getattr(callback, "__qualname__", repr(callback))
                         try:
-                            await callback(signal)
+                            with self.tracer.span(f"callback.{name}", trace):
+                                await callback(signal)
                         except Exception as e:
                             self.logger.error(f"Error in signal callback: {e}")
             else:
@@ -423,6 +404,40 @@ class MarketDataProcessor:
         except Exception as e:
             self.logger.error(f"Error in SMC analysis for {timeframe}: {e}")
 
+        finally:
+            self.tracer.finish_trace(trace)
+
+    async def get_candles(
+        self, symbol: str, timeframe: str, limit: int = 100
+    ) -> List[Candle]:
+        """
+        Get latest closed candles for a symbol.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe identifier
+            limit: Maximum number of candles
+
+        Returns:
+            List of candles (oldest first)
+        """
+        shard = self.shards.get(symbol)
+        return shard.get_candles(timeframe, limit) if shard else []
+
+    async def get_recent_ticks(self, symbol: str, limit: int = 100) -> List[Tick]:
+        """
+        Get latest ticks for a symbol.
+
+        Args:
+            symbol: Trading symbol
+            limit: Maximum number of ticks
+
+        Returns:
+            List of ticks (oldest first)
+        """
+        shard = self.shards.get(symbol)
+        return shard.get_recent_ticks(limit) if shard else []
+
     async def _generate_signal(
         self, analysis, current_price: Decimal
     ) -> Optional[TradingSignal]:
@@ -452,20 +467,11 @@ class MarketDataProcessor:
         return {
             "is_running": self.is_running,
             "processed_ticks": self.processed_ticks,
-            "m15_window_size": len(self.m15_window.data),
-            "h1_window_size": len(self.h1_window.data),
-            "h4_window_size": len(self.h4_window.data),
-            "last_m15_update": self.last_m15_update.isoformat()
-            if self.last_m15_update
-            else None,
-            "last_h1_update": self.last_h1_update.isoformat()
-            if self.last_h1_update
-            else None,
-            "last_h4_update": self.last_h4_update.isoformat()
-            if self.last_h4_update
-            else None,
             "current_tick": self.current_tick.to_dict() if self.current_tick else None,
-            "current_m15": self.current_m15.to_dict() if self.current_m15 else None,
-            "current_h1": self.current_h1.to_dict() if self.current_h1 else None,
-            "current_h4": self.current_h4.to_dict() if self.current_h4 else None,
+            "pending_analysis": self.analysis_scheduler.pending_count(),
+            "running_analysis": self.analysis_executor.in_flight,
+            "hydration": self.hydration,
+            "shards": {
+                symbol: shard.get_status() for symbol, shard in self.shards.items()
+            },
         }
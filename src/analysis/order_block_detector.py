@@ -7,13 +7,19 @@ where significant price movements originate.
 
 # Copyright (c) 2024 Simon Callaghan. All rights reserved.
 
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
 
+import numpy as np
+
 from ..models.candle import Candle
 from ..models.market_data import PriceLevel, SwingPoint
+from ..models.price import PRICE_SCALE
 from ..config import get_settings
+from ..core.clock import utcnow
+from .candle_buffer import CandleArrays
+from .zone_index import PriceZoneIndex, ZoneKind
 
 
 class OrderBlockType:
@@ -85,10 +91,10 @@ class OrderBlock:
         # Strong rejection at one end
         if self.candle.is_bullish:
             # Bullish rejection: strong upper wick
-            return self.candle.upper_wick > (self.candle.body_size * 0.8)
+            return self.candle.upper_wick > (self.candle.body_size * Decimal("0.8"))
         else:
             # Bearish rejection: strong lower wick
-            return self.candle.lower_wick > (self.candle.body_size * 0.8)
+            return self.candle.lower_wick > (self.candle.body_size * Decimal("0.8"))
 
     def _is_near_round_number(self) -> bool:
         """
@@ -140,7 +146,7 @@ class OrderBlock:
 
         # Range-based strength (significant price movement)
         avg_range = 50.0  # Would calculate from historical data
-        range_strength = min(1.0, self.range_size / avg_range)
+        range_strength = min(1.0, float(self.range_size) / avg_range)
 
         # Wick-based strength (rejection pattern)
         wick_strength = 1.0
@@ -189,6 +195,7 @@ class OrderBlock:
         Returns:
             True if order block is valid
         """
+        config = get_settings().smc.order_block
         return (
             self.strength >= min_strength
             and self.wick_ratio <= config.wick_ratio_threshold
@@ -233,12 +240,44 @@ class OrderBlock:
         }
 
 
+def rolling_volume_stats(
+    volume: np.ndarray, periods: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and standard deviation of the volumes before each candle.
+
+    Computed from running sums of volumes and squared volumes, which
+    are exact in int64, so each window costs O(1).
+
+    Args:
+        volume: Candle volumes
+        periods: Window length (shorter for the first candles)
+
+    Returns:
+        Mean and population standard deviation of up to ``periods``
+        preceding volumes per candle (zero for the first candle)
+    """
+    volume = volume.astype(np.int64)
+    sums = np.concatenate(([0], np.cumsum(volume)))
+    squares = np.concatenate(([0], np.cumsum(volume * volume)))
+
+    end = np.arange(len(volume))
+    start = np.maximum(end - periods, 0)
+    count = np.maximum(end - start, 1)
+    total = sums[end] - sums[start]
+    variance = count * (squares[end] - squares[start]) - total * total
+    return total / count, np.sqrt(np.maximum(variance, 0)) / count
+
+
 class OrderBlockDetector:
     """
     Order block detector implementation.
 
     Scans candle sequences to identify institutional order blocks
-    and accumulation zones.
+    and accumulation zones. Every candidate condition is evaluated for
+    all candles at once on int64 price units, with volume spikes
+    measured against rolling volume statistics; ``OrderBlock`` objects
+    are only built for the candles that pass.
     """
 
     def __init__(self):
@@ -262,55 +301,148 @@ class OrderBlockDetector:
         if len(candles) < self.config.lookback_candles:
             return []
 
-        order_blocks = []
-        avg_volume = self._calculate_avg_volume(candles)
+        # Quoted prices have at most five decimals, so float columns
+        # convert to price units exactly
+        arrays = CandleArrays.from_candles(candles)
+        return self._build(self.scan(arrays), candles.__getitem__, arrays.volume)
 
-        # Scan for order block patterns
-        for i in range(self.config.lookback_candles, len(candles)):
-            candle = candles[i]
+    def detect_order_blocks_arrays(self, arrays: CandleArrays) -> List[OrderBlock]:
+        """
+        Detect order blocks in candle arrays.
 
-            # Check if this could be an order block
-            if self._is_potential_order_block(candle, candles, i):
-                ob = OrderBlock(
-                    block_type=self._determine_block_type(candle, candles, i),
-                    candle=candle,
-                )
-                ob.calculate_strength(avg_volume)
+        Candles are only materialized for the blocks found.
 
-                if ob.is_valid(self.config.min_candle_range):
-                    order_blocks.append(ob)
+        Args:
+            arrays: Candles in time order
 
-        return order_blocks
+        Returns:
+            List of detected order blocks
+        """
+        return self._build(self.scan(arrays), arrays.candle, arrays.volume)
 
-    def _calculate_avg_volume(self, candles: List[Candle]) -> float:
+    def scan(self, arrays: CandleArrays) -> Dict[str, np.ndarray]:
         """
-        Calculate average volume over lookback period.
+        Find order block candles without building objects.
+
+        A candle qualifies when the next candle moves at least half its
+        range, its range is significant, its volume is a spike over the
+        preceding ``avg_volume_periods`` candles, and it shows
+        accumulation against the previous candle.
 
         Args:
-            candles: List of candles
+            arrays: Candles in time order
 
         Returns:
-            Average volume
+            Arrays per candidate: ``index`` and ``bullish`` (block type)
+        """
+        config = self.config
+        count = len(arrays)
+        index = np.arange(config.lookback_candles, count - 1)
+        if count < config.lookback_candles or not len(index):
+            return {"index": index[:0], "bullish": np.empty(0, dtype=bool)}
+
+        open = arrays.price_units("open")
+        high = arrays.price_units("high")
+        low = arrays.price_units("low")
+        close = arrays.price_units("close")
+        volume = arrays.volume
+        total_range = high - low
+        mean, std = rolling_volume_stats(volume, config.avg_volume_periods)
+
+        current, prev, after = index, index - 1, index + 1
+        candle_range = total_range[current]
+        spike = mean[current] + config.volume_spike_std * std[current]
+        mask = (
+            # Strong move: next close at least half a range away
+            (2 * np.abs(close[after] - close[current]) >= candle_range)
+            # Significant range
+            & (candle_range >= round(config.min_candle_range * PRICE_SCALE))
+            # Volume spike
+            & (volume[current] > 0)
+            & (volume[current] >= spike)
+            # Accumulation: small body, overlapping the previous candle,
+            # closing within 30% of the range of the previous close
+            & (5 * np.abs(close[current] - open[current]) <= 2 * candle_range)
+            & (
+                np.minimum(high[current], high[prev])
+                >= np.maximum(low[current], low[prev])
+            )
+            & (10 * np.abs(close[current] - close[prev]) < 3 * candle_range)
+        )
+        index = index[mask]
+
+        # Block type from the direction of the next three candles,
+        # defaulting to bullish near the end of the data
+        bullish_candle = close > open
+        bullish_total = np.concatenate(([0], np.cumsum(bullish_candle)))
+        bullish_next = (
+            bullish_total[np.minimum(index + 4, count)] - bullish_total[index + 1]
+        )
+        bearish_next = 3 - bullish_next
+        bullish = np.where(
+            bullish_next > bearish_next * 1.5,
+            True,
+            np.where(bearish_next > bullish_next * 1.5, False, bullish_candle[index]),
+        )
+        bullish[index + 4 >= count] = True
+        return {"index": index, "bullish": bullish}
+
+    def _build(
+        self,
+        found: Dict[str, np.ndarray],
+        candle_at: Callable[[int], Candle],
+        volume: np.ndarray,
+    ) -> List[OrderBlock]:
+        """Create and score order blocks for scanned candles."""
+        if not len(found["index"]):
+            return []
+
+        avg_volume = self._average_volume(volume)
+        order_blocks = []
+        for i, bullish in zip(found["index"].tolist(), found["bullish"].tolist()):
+            block_type = OrderBlockType.BULLISH if bullish else OrderBlockType.BEARISH
+            ob = OrderBlock(block_type=block_type, candle=candle_at(i))
+            ob.calculate_strength(avg_volume)
+
+            if ob.is_valid():
+                order_blocks.append(ob)
+
+        return order_blocks
+
+    def _average_volume(self, volume: np.ndarray) -> float:
         """
-        if not candles:
-            return 0.0
+        Calculate average volume over lookback period.
 
-        start_idx = max(0, len(candles) - self.config.avg_volume_periods)
-        relevant_candles = candles[start_idx:]
+        Args:
+            volume: Candle volumes
 
-        volumes = [c.volume for c in relevant_candles if c.volume]
-        return sum(volumes) / len(volumes) if volumes else 0.0
+        Returns:
+            Average of the non-zero volumes of the latest
+            ``avg_volume_periods`` candles
+        """
+        recent = volume[-self.config.avg_volume_periods :]
+        recent = recent[recent > 0]
+        return float(recent.mean()) if len(recent) else 0.0
 
     def _is_potential_order_block(
-        self, candle: Candle, candles: List[Candle], index: int
+        self,
+        candle: Candle,
+        candles: List[Candle],
+        index: int,
+        volume_mean: float = 0.0,
+        volume_std: float = 0.0,
     ) -> bool:
         """
         Check if candle could be an order block.
 
+        Scalar reference for ``scan``.
+
         Args:
             candle: Candle to check
             candles: Full candle sequence
             index: Index of candle in sequence
+            volume_mean: Mean volume of the preceding candles
+            volume_std: Standard deviation of the preceding volumes
 
         Returns:
             True if candle could be order block
@@ -329,7 +461,7 @@ class OrderBlockDetector:
         # Check if this candle has characteristics of order block
         return (
             self._has_significant_range(candle)
-            and self._has_volume_spike(candle)
+            and self._has_volume_spike(candle, volume_mean, volume_std)
             and self._shows_accumulation(candle, prev_candle, next_candle)
         )
 
@@ -346,7 +478,7 @@ class OrderBlockDetector:
         """
         # Strong move: significant price change in direction away from current
         price_change = abs(next_candle.close - current_candle.close)
-        threshold = current_candle.total_range * 0.5  # 50% of current range
+        threshold = current_candle.total_range * Decimal("0.5")  # 50% of range
 
         return price_change >= threshold
 
@@ -360,14 +492,18 @@ class OrderBlockDetector:
         Returns:
             True if range is significant
         """
-        return candle.total_range >= self.config.min_candle_range
+        return candle.total_range >= Decimal(str(self.config.min_candle_range))
 
-    def _has_volume_spike(self, candle: Candle) -> bool:
+    def _has_volume_spike(
+        self, candle: Candle, volume_mean: float = 0.0, volume_std: float = 0.0
+    ) -> bool:
         """
         Check if candle has volume spike.
 
         Args:
             candle: Candle to evaluate
+            volume_mean: Mean volume of the preceding candles
+            volume_std: Standard deviation of the preceding volumes
 
         Returns:
             True if volume spike detected
@@ -375,9 +511,7 @@ class OrderBlockDetector:
         if not candle.volume:
             return False
 
-        # Would compare with average volume here
-        # For now, assume significant volume if above 0
-        return candle.volume > 0
+        return candle.volume >= volume_mean + self.config.volume_spike_std * volume_std
 
     def _shows_accumulation(
         self, candle: Candle, prev_candle: Candle, next_candle: Candle
@@ -402,7 +536,8 @@ class OrderBlockDetector:
         return (
             candle.body_percentage <= 40  # Small body
             and body_overlap  # Overlapping ranges
-            and abs(candle.close - prev_candle.close) < candle.total_range * 0.3
+            and abs(candle.close - prev_candle.close)
+            < candle.total_range * Decimal("0.3")
         )
 
     def _determine_block_type(
@@ -447,6 +582,7 @@ class OrderBlockDetector:
         order_blocks: List[OrderBlock],
         current_price: Decimal,
         max_age_minutes: int = 240,
+        index: Optional[PriceZoneIndex] = None,
     ) -> List[OrderBlock]:
         """
         Get active (unbroken) order blocks within age limit.
@@ -455,12 +591,25 @@ class OrderBlockDetector:
             order_blocks: List of all detected order blocks
             current_price: Current market price
             max_age_minutes: Maximum age in minutes
+            index: Zone index holding the blocks, used to find the
+                blocks the price touches
 
         Returns:
             List of active order blocks
         """
         active_obs = []
-        current_time = datetime.utcnow()
+        current_time = utcnow()
+        tolerance = Decimal("0.0010")  # 10 pips tolerance
+
+        # A block's close lies inside its range, so every touched block
+        # is in its range widened by the tolerance
+        touched = None
+        if index is not None:
+            touched = {
+                id(ob)
+                for ob in index.stab(current_price, tolerance, ZoneKind.ORDER_BLOCK)
+                if abs(current_price - ob.price) <= tolerance
+            }
 
         for ob in order_blocks:
             # Check age
@@ -473,8 +622,11 @@ class OrderBlockDetector:
                 continue
 
             # Check if price is near
-            tolerance = Decimal("0.0010")  # 10 pips tolerance
-            if abs(current_price - ob.price) <= tolerance:
+            if touched is not None:
+                near = id(ob) in touched
+            else:
+                near = abs(current_price - ob.price) <= tolerance
+            if near:
                 ob.add_touch(current_time)
 
             active_obs.append(ob)
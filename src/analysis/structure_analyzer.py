@@ -7,13 +7,15 @@ breaks (BOS and CHoCH) for context.
 
 # Copyright (c) 2024 Simon Callaghan. All rights reserved.
 
-from typing import List, Optional, Tuple
+from collections import deque
+from typing import Deque, List, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime, timedelta
 
 from ..models.candle import Candle
 from ..models.market_data import SwingPoint
 from ..config import get_settings
+from ..core.clock import utcnow
 
 
 class MarketStructureState:
@@ -83,12 +85,81 @@ class StructureBreak:
         }
 
 
+class _SwingSeries:
+    """
+    Ring buffer of one side's swing points.
+
+    Keeps the candle range of each stored swing alongside it, and a
+    running score of how consistently the last ``period`` swings
+    progress (higher highs, or lower lows).
+    """
+
+    def __init__(self, capacity: int, period: int, higher_is_progress: bool):
+        """
+        Initialize empty series.
+
+        Args:
+            capacity: Maximum number of swing points kept
+            period: Number of recent swing points scored for progression
+            higher_is_progress: Whether a higher swing scores as progression
+        """
+        self.points: Deque[SwingPoint] = deque(maxlen=capacity)
+        self.ranges: Deque[Decimal] = deque(maxlen=capacity)
+        self.steps: Deque[float] = deque(maxlen=period - 1)
+        self.step_sum = 0.0
+        self.higher_is_progress = higher_is_progress
+
+    def __len__(self) -> int:
+        """Get number of stored swing points."""
+        return len(self.points)
+
+    def push(
+        self, swing: SwingPoint, candle_range: Decimal
+    ) -> Optional[Tuple[SwingPoint, Decimal]]:
+        """
+        Add a swing point.
+
+        Args:
+            swing: New swing point
+            candle_range: Range of the pivot candle
+
+        Returns:
+            Evicted (swing point, range), or None if the buffer had room
+        """
+        if self.points:
+            previous = self.points[-1].price
+            step = 0.0
+            if swing.price != previous:
+                progressed = (swing.price > previous) == self.higher_is_progress
+                step = 1.0 if progressed else -0.5
+            if len(self.steps) == self.steps.maxlen:
+                self.step_sum -= self.steps[0]
+            self.steps.append(step)
+            self.step_sum += step
+
+        evicted = None
+        if len(self.points) == self.points.maxlen:
+            evicted = (self.points[0], self.ranges[0])
+        self.points.append(swing)
+        self.ranges.append(candle_range)
+        return evicted
+
+
 class MarketStructure:
     """
     Market structure data structure.
 
     Contains trend information, swing points,
     and structure breaks for analysis.
+
+    Swing points are N-bar fractals: a candle whose high (low) is above
+    (below) the ``swing_span`` candles before it and not exceeded by the
+    ``swing_span`` candles after it, so a run of equal prices yields
+    only its first candle. A pivot is confirmed once ``swing_span``
+    later candles have closed, using monotonic deques over the candle
+    window. Swing points live in fixed-size ring buffers with running
+    sums for the averages and trend strength, so each update is O(1)
+    amortized.
     """
 
     def __init__(self, instrument: str = "XAUUSD"):
@@ -98,19 +169,38 @@ class MarketStructure:
         Args:
             instrument: Trading instrument
         """
+        config = get_settings().smc.structure
+        self._config = config
+
+        # Analysis parameters
+        self.min_swing_points = config.min_swing_points
+        self.trend_period = config.trend_period
+        self.structure_break_threshold = config.structure_break_threshold
+        self.swing_span = config.swing_span
+
         self.instrument = instrument
-        self.swing_highs: List[SwingPoint] = []
-        self.swing_lows: List[SwingPoint] = []
+        max_swing_points = self.trend_period * 2
+        self._highs = _SwingSeries(max_swing_points, self.trend_period, True)
+        self._lows = _SwingSeries(max_swing_points, self.trend_period, False)
+        self.swing_highs: Deque[SwingPoint] = self._highs.points
+        self.swing_lows: Deque[SwingPoint] = self._lows.points
         self.structure_breaks: List[StructureBreak] = []
         self.current_state = MarketStructureState.RANGING
         self.trend_strength = 0.0
         self.trend_direction = None
-        self.last_update = datetime.utcnow()
+        self.last_update = utcnow()
 
-        # Analysis parameters
-        self.min_swing_points = 3
-        self.trend_period = 20
-        self.structure_break_threshold = 0.8
+        # Pivot window: the last 2N+1 candles, plus (index, price) of the
+        # window's highs (falling) and lows (rising) as monotonic deques
+        self._candles: Deque[Candle] = deque(maxlen=2 * self.swing_span + 1)
+        self._window_highs: Deque[Tuple[int, Decimal]] = deque()
+        self._window_lows: Deque[Tuple[int, Decimal]] = deque()
+        self._candle_count = 0
+
+        # Running sums over the stored swing points
+        self._volume_sum = 0
+        self._volume_count = 0
+        self._range_sum = Decimal("0")
 
     def update_with_candle(self, candle: Candle):
         """
@@ -121,100 +211,101 @@ class MarketStructure:
         """
         self.last_update = candle.timestamp
 
-        # Update swing points
-        self._update_swing_points(candle)
-
-        # Update trend analysis
-        self._update_trend_analysis()
+        # Update swing points; the trend only changes with a new swing
+        if self._update_swing_points(candle):
+            self._update_trend_analysis()
 
         # Check for structure breaks
         self._check_structure_breaks(candle)
 
-    def _update_swing_points(self, candle: Candle):
+    def _update_swing_points(self, candle: Candle) -> bool:
         """
         Update swing points with new candle.
 
-        Args:
-            candle: New candle data
-        """
-        settings = get_settings()
-        config = settings.smc.structure
-
-        # Check if this candle forms a new swing high
-        if self._is_swing_high(candle):
-            swing_high = SwingPoint(
-                price=candle.high,
-                timestamp=candle.timestamp,
-                point_type="HIGH",
-                strength=self._calculate_swing_strength(candle, "HIGH"),
-                instrument=self.instrument,
-            )
-            self.swing_highs.append(swing_high)
-
-        # Check if this candle forms a new swing low
-        elif self._is_swing_low(candle):
-            swing_low = SwingPoint(
-                price=candle.low,
-                timestamp=candle.timestamp,
-                point_type="LOW",
-                strength=self._calculate_swing_strength(candle, "LOW"),
-                instrument=self.instrument,
-            )
-            self.swing_lows.append(swing_low)
-
-        # Remove old swing points (keep only recent ones)
-        max_swing_points = config.trend_period * 2
-        if len(self.swing_highs) > max_swing_points:
-            self.swing_highs = self.swing_highs[-max_swing_points:]
-        if len(self.swing_lows) > max_swing_points:
-            self.swing_lows = self.swing_lows[-max_swing_points:]
-
-    def _is_swing_high(self, candle: Candle) -> bool:
-        """
-        Check if candle forms a swing high.
+        Confirms the candle ``swing_span`` bars back as a swing high or
+        low once the candles after it have closed.
 
         Args:
-            candle: Candle to evaluate
+            candle: New candle data
 
         Returns:
-            True if swing high
-        """
-        if not self.swing_lows:
-            return False
-
-        # Check if this high is higher than recent lows
-        recent_lows = self.swing_lows[-self.trend_period :]
-        if not recent_lows:
+            True if a swing point was added
+        """
+        index = self._candle_count
+        self._candle_count += 1
+        self._candles.append(candle)
+        oldest = index - 2 * self.swing_span
+
+        # Equal prices are kept, so the front is the window's earliest extreme
+        highs = self._window_highs
+        while highs and highs[-1][1] < candle.high:
+            highs.pop()
+        highs.append((index, candle.high))
+        if highs[0][0] < oldest:
+            highs.popleft()
+
+        lows = self._window_lows
+        while lows and lows[-1][1] > candle.low:
+            lows.pop()
+        lows.append((index, candle.low))
+        if lows[0][0] < oldest:
+            lows.popleft()
+
+        if oldest < 0:
             return False
 
-        max_low_price = max(low.price for low in recent_lows)
-        return candle.high > max_low_price
+        # The pivot candidate sits in the middle of the window and is a
+        # swing only if it is the window's earliest extreme
+        pivot_index = index - self.swing_span
+        pivot = self._candles[self.swing_span]
+        added = False
+        if highs[0][0] == pivot_index:
+            self._add_swing(pivot, "HIGH")
+            added = True
+        if lows[0][0] == pivot_index:
+            self._add_swing(pivot, "LOW")
+            added = True
+        return added
 
-    def _is_swing_low(self, candle: Candle) -> bool:
+    def _add_swing(self, candle: Candle, point_type: str):
         """
-        Check if candle forms a swing low.
+        Store a confirmed swing point.
 
         Args:
-            candle: Candle to evaluate
-
-        Returns:
-            True if swing low
+            candle: Pivot candle
+            point_type: HIGH or LOW
         """
-        if not self.swing_highs:
-            return False
-
-        # Check if this low is lower than recent highs
-        recent_highs = self.swing_highs[-self.trend_period :]
-        if not recent_highs:
-            return False
-
-        min_high_price = min(high.price for high in recent_highs)
-        return candle.low < min_high_price
+        swing = SwingPoint(
+            price=candle.high if point_type == "HIGH" else candle.low,
+            timestamp=candle.timestamp,
+            point_type=point_type,
+            strength=self._calculate_swing_strength(candle, point_type),
+            volume=candle.volume,
+            instrument=self.instrument,
+            confirmed=True,
+        )
+
+        series = self._highs if point_type == "HIGH" else self._lows
+        evicted = series.push(swing, candle.total_range)
+        self._range_sum += candle.total_range
+        if swing.volume:
+            self._volume_sum += swing.volume
+            self._volume_count += 1
+
+        if evicted:
+            old_swing, old_range = evicted
+            self._range_sum -= old_range
+            if old_swing.volume:
+                self._volume_sum -= old_swing.volume
+                self._volume_count -= 1
 
     def _calculate_swing_strength(self, candle: Candle, point_type: str) -> float:
         """
         Calculate swing point strength.
 
+        Volume and range are scored against the stored swing points;
+        the first swing, with nothing to compare to, scores in full.
+
         Args:
             candle: Candle containing swing point
             point_type: HIGH or LOW
@@ -227,13 +318,17 @@ class MarketStructure:
         # Volume-based strength
         if candle.volume and candle.volume > 0:
             avg_volume = self._get_average_volume()
-            volume_strength = min(1.0, candle.volume / avg_volume)
+            volume_strength = (
+                min(1.0, candle.volume / avg_volume) if avg_volume else 1.0
+            )
             strength += volume_strength * 0.4
 
         # Range-based strength
         if candle.total_range > 0:
             avg_range = self._get_average_range()
-            range_strength = min(1.0, candle.total_range / avg_range)
+            range_strength = (
+                min(1.0, float(candle.total_range) / avg_range) if avg_range else 1.0
+            )
             strength += range_strength * 0.3
 
         # Wick-based strength (rejection)
@@ -243,28 +338,15 @@ class MarketStructure:
         return min(1.0, max(0.0, strength))
 
     def _get_average_volume(self) -> float:
-        """Get average volume of recent swing points."""
-        if not self.swing_highs and not self.swing_lows:
+        """Get average volume of stored swing points."""
+        if not self._volume_count:
             return 0.0
-
-        swing_volumes = []
-        for swing in self.swing_highs + self.swing_lows:
-            if swing.volume:
-                swing_volumes.append(swing.volume)
-
-        return sum(swing_volumes) / len(swing_volumes) if swing_volumes else 0.0
+        return self._volume_sum / self._volume_count
 
     def _get_average_range(self) -> float:
-        """Get average range of recent swing points."""
-        if not self.swing_highs and not self.swing_lows:
-            return 0.0
-
-        swing_ranges = []
-        for swing in self.swing_highs + self.swing_lows:
-            if hasattr(swing, "range_size"):
-                swing_ranges.append(swing.range_size)
-
-        return sum(swing_ranges) / len(swing_ranges) if swing_ranges else 0.0
+        """Get average candle range of stored swing points."""
+        count = len(self._highs) + len(self._lows)
+        return float(self._range_sum) / count if count else 0.0
 
     def _update_trend_analysis(self):
         """Update trend direction and strength."""
@@ -277,18 +359,9 @@ class MarketStructure:
             self.trend_strength = 0.0
             return
 
-        # Get recent swing points for trend analysis
-        recent_highs = self.swing_highs[-self.trend_period :]
-        recent_lows = self.swing_lows[-self.trend_period :]
-
-        if not recent_highs or not recent_lows:
-            return
-
         # Calculate trend direction
-        last_high = recent_highs[-1]
-        last_low = recent_lows[-1]
-        prev_high = recent_highs[-2] if len(recent_highs) >= 2 else None
-        prev_low = recent_lows[-2] if len(recent_lows) >= 2 else None
+        last_high, prev_high = self.swing_highs[-1], self.swing_highs[-2]
+        last_low, prev_low = self.swing_lows[-1], self.swing_lows[-2]
 
         # Determine trend
         if last_high.price > prev_high.price and last_low.price > prev_low.price:
@@ -305,46 +378,27 @@ class MarketStructure:
             self.trend_direction = None
 
         # Calculate trend strength
-        self.trend_strength = self._calculate_trend_strength(recent_highs, recent_lows)
+        self.trend_strength = self._calculate_trend_strength()
 
-    def _calculate_trend_strength(
-        self, highs: List[SwingPoint], lows: List[SwingPoint]
-    ) -> float:
+    def _calculate_trend_strength(self) -> float:
         """
         Calculate trend strength based on swing point progression.
 
-        Args:
-            highs: Recent swing highs
-            lows: Recent swing lows
+        Uses the running progression scores over the last
+        ``trend_period`` swing highs and lows.
 
         Returns:
             Trend strength (0.0 to 1.0)
         """
-        if len(highs) < 2 or len(lows) < 2:
+        high_count = min(len(self._highs), self.trend_period)
+        low_count = min(len(self._lows), self.trend_period)
+        if high_count < 2 or low_count < 2:
             return 0.0
 
-        # Calculate trend consistency
-        high_trend_strength = 0.0
-        low_trend_strength = 0.0
-
-        # Check high progression
-        for i in range(1, len(highs)):
-            if highs[i].price > highs[i - 1].price:
-                high_trend_strength += 1.0
-            elif highs[i].price < highs[i - 1].price:
-                high_trend_strength -= 0.5
-
-        # Check low progression
-        for i in range(1, len(lows)):
-            if lows[i].price < lows[i - 1].price:
-                low_trend_strength += 1.0
-            elif lows[i].price > lows[i - 1].price:
-                low_trend_strength -= 0.5
-
         # Normalize and combine
-        max_possible_strength = max(len(highs), len(lows)) - 1
-        high_strength = max(0.0, high_trend_strength / max_possible_strength)
-        low_strength = max(0.0, low_trend_strength / max_possible_strength)
+        max_possible_strength = max(high_count, low_count) - 1
+        high_strength = max(0.0, self._highs.step_sum / max_possible_strength)
+        low_strength = max(0.0, self._lows.step_sum / max_possible_strength)
 
         # Overall trend strength
         return (high_strength + low_strength) / 2.0
@@ -356,8 +410,7 @@ class MarketStructure:
         Args:
             candle: New candle data
         """
-        settings = get_settings()
-        config = settings.smc.structure
+        config = self._config
 
         if len(self.swing_highs) < 2 or len(self.swing_lows) < 2:
             return
@@ -478,7 +531,7 @@ class MarketStructure:
         Returns:
             List of recent breaks
         """
-        cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
+        cutoff_time = utcnow() - timedelta(hours=max_age_hours)
         recent_breaks = [
             sb for sb in self.structure_breaks if sb.timestamp >= cutoff_time
         ]
@@ -499,15 +552,15 @@ class MarketStructure:
             return None
 
         # Get recent swing points
-        recent_highs = self.swing_highs[-lookback:]
-        recent_lows = self.swing_lows[-lookback:]
+        recent_highs = list(self.swing_highs)[-lookback:]
+        recent_lows = list(self.swing_lows)[-lookback:]
 
         if not recent_highs or not recent_lows:
             return None
 
         # Calculate linear regression for highs
-        high_points = [(sp.timestamp.timestamp(), sp.price) for sp in recent_highs]
-        low_points = [(sp.timestamp.timestamp(), sp.price) for sp in recent_lows]
+        high_points = [(sp.timestamp, sp.price) for sp in recent_highs]
+        low_points = [(sp.timestamp, sp.price) for sp in recent_lows]
 
         # Simple trend line calculation
         if self.current_state == MarketStructureState.UPTREND and high_points:
@@ -544,10 +597,10 @@ class MarketStructure:
         x2_num = x2.timestamp()
 
         # Calculate slope (price per second)
-        slope = (y2 - y1) / (x2_num - x1_num)
+        slope = float(y2 - y1) / (x2_num - x1_num)
 
         # Calculate intercept
-        intercept = y1 - (slope * x1_num)
+        intercept = float(y1) - (slope * x1_num)
 
         return {
             "slope": float(slope),
@@ -568,8 +621,8 @@ class MarketStructure:
             "current_state": self.current_state,
             "trend_direction": self.trend_direction,
             "trend_strength": self.trend_strength,
-            "swing_highs": [sh.to_dict() for sh in self.swing_highs[-10:]],
-            "swing_lows": [sl.to_dict() for sl in self.swing_lows[-10:]],
+            "swing_highs": [sh.to_dict() for sh in list(self.swing_highs)[-10:]],
+            "swing_lows": [sl.to_dict() for sl in list(self.swing_lows)[-10:]],
             "structure_breaks": [sb.to_dict() for sb in self.structure_breaks[-10:]],
             "last_update": self.last_update.isoformat(),
             "trend_line": self.get_trend_line(),
@@ -0,0 +1,431 @@
+"""
+Per-symbol market data shard for XAUUSD Gold Trading System.
+
+Each shard owns the tick queue, candle aggregator, rolling windows
+and worker task for one symbol, so symbols are processed independently.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import logging
+
+from ..config.market_data import MarketDataConfig
+from ..core.synchronization import AsyncBoundedQueue
+from ..models.candle import Candle
+from ..models.market_data import Tick
+from ..monitoring.metrics import get_registry
+from ..monitoring.tracing import current_trace, get_tracer
+from ..storage.tick_journal import TickJournalWriter
+from .candle_aggregator import (
+    TIMEFRAME_SECONDS,
+    CandleCloseEvent,
+    MultiTimeframeAggregator,
+)
+from .candle_buffer import CandleArrays, RollingWindow, ns_to_datetime
+from .fvg_detector import FairValueGapTracker
+from .zone_index import PriceZoneIndex
+
+
+class SymbolShard:
+    """
+    Market data shard for a single symbol.
+
+    Ticks are queued with their arrival time (``time.perf_counter``) and
+    trace context, and consumed by a dedicated worker in micro-batches
+    bounded by size and latency.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        config: MarketDataConfig,
+        on_batch: Callable[["SymbolShard", List[CandleCloseEvent]], Awaitable[None]],
+    ):
+        """
+        Initialize symbol shard.
+
+        Args:
+            symbol: Trading symbol
+            config: Market data configuration
+            on_batch: Async callback invoked with the candle close events
+                produced by each processed batch
+        """
+        self.symbol = symbol
+        self.config = config
+        self.on_batch = on_batch
+        self.logger = logging.getLogger(f"{__name__}.{symbol}")
+
+        self.queue = AsyncBoundedQueue(
+            maxsize=config.shard_queue_size, overflow=config.shard_overflow_policy
+        )
+        self.max_batch_size = config.max_batch_size
+        self.max_batch_latency = config.max_batch_latency_ms / 1000
+
+        # Candle state
+        self.aggregator = MultiTimeframeAggregator(
+            symbol,
+            timeframes=config.timeframes,
+            fill_gaps=config.fill_gaps,
+            max_gap_fill_bars=config.max_gap_fill_bars,
+            fixed_point=config.fixed_point_prices,
+        )
+        self.windows: Dict[str, RollingWindow] = {
+            timeframe: RollingWindow(
+                size=config.window_size,
+                instrument=symbol,
+                timeframe=timeframe,
+                fixed_point=config.fixed_point_prices,
+            )
+            for timeframe in config.timeframes
+        }
+        self.last_close: Dict[str, datetime] = {}
+        self.fvg_tracker = FairValueGapTracker("H1")
+        # Synced by inline confluence analysis (see ConfluenceAnalysis.analyze)
+        self.order_block_index = PriceZoneIndex()
+        self.liquidity_index = PriceZoneIndex()
+
+        # Tick state
+        self.current_tick: Optional[Tick] = None
+        self._last_processed: Optional[tuple] = None
+        self.recent_ticks = deque(maxlen=config.tick_history_size)
+        self.processed_ticks = 0
+        self.failed_ticks = 0
+        self.journal: Optional[TickJournalWriter] = (
+            TickJournalWriter(
+                config.journal_directory,
+                symbol,
+                segment_ticks=config.journal_segment_ticks,
+            )
+            if config.journal_enabled
+            else None
+        )
+
+        # Worker state
+        self.is_running = False
+        self._worker_task: Optional[asyncio.Task] = None
+        self._unprocessed: List[tuple] = []
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        registry = get_registry()
+        self.batch_size_histogram = registry.histogram(
+            "market_data_batch_size",
+            "Ticks processed per micro-batch",
+            buckets=[1, 2, 5, 10, 25, 50, 100, 250, 500, 1000],
+            labels=["symbol"],
+        )
+        self.batch_wait_histogram = registry.histogram(
+            "market_data_batch_wait_seconds",
+            "Queue wait of the oldest tick in each micro-batch",
+            buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0],
+            labels=["symbol"],
+        )
+        self.dropped_counter = registry.counter(
+            "market_data_ticks_dropped_total",
+            "Ticks dropped by shard backpressure",
+            labels=["symbol"],
+        )
+        self.tracer = get_tracer()
+
+    async def start(self):
+        """Start shard worker."""
+        if self.journal is not None:
+            self.journal.open()
+        self.is_running = True
+        self._worker_task = asyncio.create_task(self._worker_loop())
+
+    async def stop(self):
+        """Stop shard worker and drain queued ticks."""
+        self.is_running = False
+
+        if self._worker_task:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+
+        unprocessed, self._unprocessed = self._unprocessed, []
+        await self._process_batch(unprocessed)
+        while not self.queue.is_empty():
+            await self._process_batch(
+                await self.queue.get_batch(self.max_batch_size, timeout=0)
+            )
+
+        if self.journal is not None:
+            self.journal.close()
+
+    async def submit(self, tick: Tick) -> bool:
+        """
+        Queue a tick for processing.
+
+        The tick is journaled (if enabled) before queueing, so ticks
+        dropped by backpressure are still captured. Applies the
+        configured overflow policy when the queue is full; with the
+        block policy the caller waits for space.
+
+        Args:
+            tick: New tick data
+
+        Returns:
+            True if the tick was queued
+        """
+        self.current_tick = tick
+        self.recent_ticks.append(tick)
+
+        if self.journal is not None:
+            try:
+                self.journal.append(tick)
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Disabling {self.symbol} tick journal: {e}")
+                self.journal.close()
+                self.journal = None
+
+        dropped = self.queue.dropped
+        accepted = await self.queue.put((tick, time.perf_counter(), current_trace()))
+        if self.queue.dropped != dropped:
+            self.dropped_counter.inc(self.queue.dropped - dropped, symbol=self.symbol)
+        return accepted
+
+    async def _worker_loop(self):
+        """
+        Consume queued ticks in micro-batches.
+
+        A batch is processed as soon as it reaches ``max_batch_size`` or
+        when its oldest tick has waited ``max_batch_latency``, whichever
+        comes first.
+        """
+        while self.is_running:
+            batch = []
+            try:
+                batch = await self.queue.get_batch(self.max_batch_size)
+                if not batch:
+                    continue
+
+                deadline = batch[0][1] + self.max_batch_latency
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    more = await self.queue.get_batch(
+                        self.max_batch_size - len(batch), timeout=remaining
+                    )
+                    if not more:
+                        break
+                    batch.extend(more)
+
+                ready, batch = batch, []
+                await self._process_batch(ready)
+
+            except asyncio.CancelledError:
+                # Keep ticks collected but not yet processed for stop()
+                self._unprocessed.extend(batch)
+                raise
+            except Exception as e:
+                self.logger.error(f"Error in {self.symbol} shard worker: {e}")
+
+    async def _process_batch(self, batch: List[tuple]):
+        """
+        Aggregate a batch of ticks into candles.
+
+        Args:
+            batch: List of (tick, enqueue time, trace) tuples
+        """
+        if not batch:
+            return
+
+        async with self._lock:
+            started = time.perf_counter()
+            self.batch_size_histogram.observe(len(batch), symbol=self.symbol)
+            self.batch_wait_histogram.observe(
+                started - batch[0][1], symbol=self.symbol
+            )
+
+            events: List[CandleCloseEvent] = []
+            tracker = self.fvg_tracker
+            for tick, received_at, _ in batch:
+                # A bad tick is skipped; it must not discard the closes and
+                # tracker updates of the rest of the batch
+                try:
+                    closed = self.aggregator.update(tick)
+                except Exception as e:
+                    self.failed_ticks += 1
+                    self.logger.error(f"Error aggregating {self.symbol} tick: {e}")
+                    continue
+                for event in closed:
+                    event.received_at = received_at
+                events.extend(closed)
+                try:
+                    for event in closed:
+                        tracker.on_candle(event.candle)
+                    tracker.on_price(tick.mid_price, tick.timestamp)
+                except Exception as e:
+                    self.failed_ticks += 1
+                    self.logger.error(f"Error tracking {self.symbol} FVGs: {e}")
+            self.processed_ticks += len(batch)
+            self._last_processed = batch[-1]
+
+            self._store_closes(events)
+            updated = time.perf_counter()
+            await self.on_batch(self, events)
+
+            traces = [item for item in batch if item[2] is not None]
+            if traces:
+                finished = time.perf_counter()
+                for _, received_at, trace in traces:
+                    self.tracer.record_span(
+                        trace, "shard.queue_wait", received_at, started
+                    )
+                    self.tracer.record_span(
+                        trace, "shard.candle_update", started, updated
+                    )
+                    self.tracer.record_span(
+                        trace, "shard.dispatch", updated, finished
+                    )
+                    trace.attributes["batch_size"] = len(batch)
+                    trace.attributes["candle_closes"] = len(events)
+                    self.tracer.finish_trace(trace)
+
+    async def advance_clock(self, grace: timedelta):
+        """
+        Close candles whose buckets have ended.
+
+        Time is measured on the tick timeline (last processed tick
+        timestamp plus the wall time elapsed since it arrived), so broker
+        clock offsets, queued backlogs and historical replays do not
+        close buckets early.
+
+        Args:
+            grace: Delay after a bucket ends before it is closed
+        """
+        if self._last_processed is None:
+            return
+
+        tick, received_at, _ = self._last_processed
+        elapsed = timedelta(seconds=time.perf_counter() - received_at)
+        await self.advance_to(tick.timestamp + elapsed - grace)
+
+    async def advance_to(self, timestamp: datetime):
+        """
+        Close candles whose buckets ended at or before a time.
+
+        Args:
+            timestamp: Time on the tick timeline (naive UTC)
+        """
+        async with self._lock:
+            events = self.aggregator.advance_to(timestamp)
+            if events:
+                for event in events:
+                    self.fvg_tracker.on_candle(event.candle)
+                self._store_closes(events)
+                await self.on_batch(self, events)
+
+    async def ingest(self, ticks: List[Tick]):
+        """
+        Process ticks immediately, bypassing the queue.
+
+        Used by replays and backfills, where ticks must be applied in
+        a deterministic order rather than on the worker's schedule.
+
+        Args:
+            ticks: Ticks for this symbol, oldest first
+        """
+        if not ticks:
+            return
+
+        self.current_tick = ticks[-1]
+        self.recent_ticks.extend(ticks)
+        received_at = time.perf_counter()
+        await self._process_batch([(tick, received_at, None) for tick in ticks])
+
+    def hydrate(self, timeframe: str, arrays: CandleArrays) -> int:
+        """
+        Fill a rolling window with historical closed candles.
+
+        Meant to run before live ticks arrive; the candles are not
+        reported as closes and trigger no analysis.
+
+        Args:
+            timeframe: Timeframe identifier
+            arrays: Closed candles in time order
+
+        Returns:
+            Number of candles retained in the window
+        """
+        window = self.windows.get(timeframe)
+        if window is None or not len(arrays):
+            return 0
+
+        window.extend(arrays)
+        if timeframe == self.fvg_tracker.timeframe:
+            self.fvg_tracker.hydrate(arrays)
+        self.last_close[timeframe] = ns_to_datetime(arrays.timestamp[-1]) + timedelta(
+            seconds=TIMEFRAME_SECONDS[timeframe]
+        )
+        return min(len(arrays), window.size)
+
+    def _store_closes(self, events: List[CandleCloseEvent]):
+        """Append closed candles to the rolling windows."""
+        for event in events:
+            self.windows[event.timeframe].add(event.candle)
+            self.last_close[event.timeframe] = event.candle.timestamp + timedelta(
+                seconds=TIMEFRAME_SECONDS[event.timeframe]
+            )
+
+    def get_candles(self, timeframe: str, count: int) -> List[Candle]:
+        """
+        Get latest closed candles.
+
+        Args:
+            timeframe: Timeframe identifier
+            count: Number of candles
+
+        Returns:
+            List of candles (oldest first)
+        """
+        window = self.windows.get(timeframe)
+        return window.get_latest(count) if window else []
+
+    def get_recent_ticks(self, count: int) -> List[Tick]:
+        """
+        Get latest received ticks.
+
+        Args:
+            count: Number of ticks
+
+        Returns:
+            List of ticks (oldest first)
+        """
+        if count <= 0:
+            return []
+        return list(self.recent_ticks)[-count:]
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get shard status information.
+
+        Returns:
+            Status dictionary
+        """
+        return {
+            "symbol": self.symbol,
+            "is_running": self.is_running,
+            "processed_ticks": self.processed_ticks,
+            "queued_ticks": self.queue.size(),
+            "dropped_ticks": self.queue.dropped,
+            "late_ticks": self.aggregator.late_ticks,
+            "failed_ticks": self.failed_ticks,
+            "journaled_ticks": self.journal.written if self.journal else None,
+            "window_sizes": {tf: len(w) for tf, w in self.windows.items()},
+            "last_close": {tf: ts.isoformat() for tf, ts in self.last_close.items()},
+            "fvg_tracker": self.fvg_tracker.get_status(),
+            "order_block_index": self.order_block_index.get_status(),
+            "liquidity_index": self.liquidity_index.get_status(),
+            "current_tick": self.current_tick.to_dict() if self.current_tick else None,
+        }
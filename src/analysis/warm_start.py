@@ -0,0 +1,276 @@
+"""
+Warm start for XAUUSD Gold Trading System.
+
+Fills the market data processor's candle windows with recent
+closed candles at boot, so analysis can run on the first candle
+close instead of waiting for the windows to fill from live ticks.
+Candles come from the local candle store, topped up from the
+database with anything newer than the store holds.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from ..core.clock import utcnow
+from .candle_aggregator import TIMEFRAME_SECONDS
+from .candle_buffer import CandleArrays, ns_to_datetime
+
+
+@dataclass
+class HydrationResult:
+    """
+    Candles loaded for one symbol and timeframe.
+
+    Attributes:
+        symbol: Trading symbol
+        timeframe: Candle timeframe
+        store_candles: Candles read from the candle store
+        database_candles: Candles read from the database
+        hydrated: Candles placed in the rolling window
+        last_candle: Open time of the newest candle
+        elapsed_seconds: Load time
+        error: Load error, if any
+    """
+
+    symbol: str
+    timeframe: str
+    store_candles: int = 0
+    database_candles: int = 0
+    hydrated: int = 0
+    last_candle: Optional[datetime] = None
+    elapsed_seconds: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert hydration result to dictionary."""
+        return {
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "store_candles": self.store_candles,
+            "database_candles": self.database_candles,
+            "hydrated": self.hydrated,
+            "last_candle": self.last_candle.isoformat() if self.last_candle else None,
+            "elapsed_seconds": round(self.elapsed_seconds, 4),
+            "error": self.error,
+        }
+
+
+@dataclass
+class HydrationReport:
+    """
+    Outcome of a warm start.
+
+    Attributes:
+        started_at: Start time on the active clock
+        elapsed_seconds: Total hydration time
+        results: Per symbol and timeframe results
+    """
+
+    started_at: datetime
+    elapsed_seconds: float = 0.0
+    results: List[HydrationResult] = field(default_factory=list)
+
+    @property
+    def hydrated(self) -> int:
+        """Total candles placed in rolling windows."""
+        return sum(result.hydrated for result in self.results)
+
+    @property
+    def errors(self) -> List[HydrationResult]:
+        """Results whose load failed."""
+        return [result for result in self.results if result.error]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert hydration report to dictionary."""
+        return {
+            "started_at": self.started_at.isoformat(),
+            "elapsed_seconds": round(self.elapsed_seconds, 4),
+            "hydrated": self.hydrated,
+            "results": [result.to_dict() for result in self.results],
+        }
+
+
+def _concat(first: CandleArrays, second: CandleArrays) -> CandleArrays:
+    """Append newer candles to older ones, dropping overlapping rows."""
+    if not len(first):
+        return second
+    if not len(second):
+        return first
+
+    second = second.slice(
+        int(np.searchsorted(second.timestamp, first.timestamp[-1], side="right")),
+        len(second),
+    )
+    return CandleArrays(
+        *(
+            np.concatenate([getattr(first, name), getattr(second, name)])
+            for name in ("timestamp", "open", "high", "low", "close", "volume")
+        ),
+        instrument=first.instrument,
+        timeframe=first.timeframe,
+    )
+
+
+class WarmStart:
+    """
+    Loads recent closed candles into a MarketDataProcessor.
+
+    Every symbol/timeframe series is loaded concurrently in worker
+    threads. The candle store is read first; the database then
+    supplies candles newer than the store's last one (or the whole
+    window when there is no store). Candles that have not closed
+    yet are never loaded.
+    """
+
+    def __init__(
+        self,
+        processor: Any,
+        candle_store: Optional[Any] = None,
+        database: Optional[Any] = None,
+        bars: Optional[int] = None,
+        timeout: float = 30.0,
+    ):
+        """
+        Initialize warm start.
+
+        Args:
+            processor: MarketDataProcessor to hydrate
+            candle_store: Optional CandleStore to read from first
+            database: Optional database manager to top up from
+            bars: Candles per timeframe (defaults to the window size)
+            timeout: Seconds to wait for all loads
+        """
+        self.processor = processor
+        self.candle_store = candle_store
+        self.database = database
+        self.bars = bars or processor.market_data_config.window_size
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+
+    async def run(self, symbols: Iterable[str]) -> HydrationReport:
+        """
+        Hydrate the processor's windows for several symbols.
+
+        Args:
+            symbols: Trading symbols
+
+        Returns:
+            Hydration report (also kept on ``processor.hydration``)
+        """
+        now = utcnow()
+        report = HydrationReport(started_at=now)
+        started = time.perf_counter()
+
+        series = [
+            (symbol, timeframe)
+            for symbol in symbols
+            for timeframe in self.processor.market_data_config.timeframes
+        ]
+        loads = [
+            asyncio.to_thread(self.load, symbol, timeframe, now)
+            for symbol, timeframe in series
+        ]
+        try:
+            loaded = await asyncio.wait_for(
+                asyncio.gather(*loads, return_exceptions=True), self.timeout
+            )
+        except asyncio.TimeoutError:
+            self.logger.error(f"Warm start timed out after {self.timeout}s")
+            loaded = [asyncio.TimeoutError("timed out")] * len(series)
+
+        candles: Dict[str, Dict[str, CandleArrays]] = {}
+        for (symbol, timeframe), outcome in zip(series, loaded):
+            if isinstance(outcome, BaseException):
+                result = HydrationResult(symbol, timeframe, error=str(outcome))
+                self.logger.error(
+                    f"Failed to load {symbol} {timeframe} history: {outcome}"
+                )
+            else:
+                arrays, result = outcome
+                candles.setdefault(symbol, {})[timeframe] = arrays
+            report.results.append(result)
+
+        for symbol, by_timeframe in candles.items():
+            hydrated = await self.processor.hydrate(symbol, by_timeframe)
+            for result in report.results:
+                if result.symbol == symbol and result.timeframe in hydrated:
+                    result.hydrated = hydrated[result.timeframe]
+
+        report.elapsed_seconds = time.perf_counter() - started
+        self.processor.hydration = report.to_dict()
+        self.logger.info(
+            f"Warm start hydrated {report.hydrated} candles for "
+            f"{len(candles)} symbols in {report.elapsed_seconds * 1000:.1f}ms"
+        )
+        return report
+
+    def load(
+        self, symbol: str, timeframe: str, now: Optional[datetime] = None
+    ) -> Tuple[CandleArrays, HydrationResult]:
+        """
+        Load the latest closed candles of one series.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            now: Current time (defaults to the active clock)
+
+        Returns:
+            (candles oldest first, load result)
+        """
+        started = time.perf_counter()
+        result = HydrationResult(symbol, timeframe)
+        # Newest candle open time that has fully closed by now
+        period = timedelta(seconds=TIMEFRAME_SECONDS[timeframe])
+        last_open = (now or utcnow()) - period
+
+        arrays = CandleArrays.empty(symbol, timeframe)
+        if self.candle_store is not None:
+            arrays = self.candle_store.tail(symbol, timeframe, self.bars, last_open)
+            result.store_candles = len(arrays)
+
+        if self.database is not None:
+            after = ns_to_datetime(arrays.timestamp[-1]) if len(arrays) else None
+            try:
+                recent = self._load_database(symbol, timeframe, after, last_open)
+            except Exception as e:
+                # Keep whatever the store had; the windows fill up live
+                result.error = f"Database load failed: {e}"
+                self.logger.warning(f"{symbol} {timeframe}: {result.error}")
+            else:
+                result.database_candles = len(recent)
+                arrays = _concat(arrays, recent)
+
+        arrays = arrays.slice(max(0, len(arrays) - self.bars), len(arrays))
+        if len(arrays):
+            result.last_candle = ns_to_datetime(arrays.timestamp[-1])
+        result.elapsed_seconds = time.perf_counter() - started
+        return arrays, result
+
+    def _load_database(
+        self,
+        symbol: str,
+        timeframe: str,
+        after: Optional[datetime],
+        last_open: datetime,
+    ) -> CandleArrays:
+        """Load up to ``bars`` closed candles newer than ``after``."""
+        from ..database.repositories import PriceHistoryRepository
+        from ..storage.candle_sync import rows_to_arrays
+
+        with self.database.get_session() as session:
+            repository = PriceHistoryRepository(session)
+            start = after + timedelta(microseconds=1) if after else datetime.min
+            rows = repository.get_candles_by_timeframe(
+                symbol, timeframe, start, last_open, limit=self.bars
+            )
+            # Query returns newest first
+            return rows_to_arrays(list(reversed(rows)), symbol, timeframe)
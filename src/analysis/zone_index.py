@@ -0,0 +1,440 @@
+"""
+Price zone index for Smart Money Concepts.
+
+Keeps Fair Value Gaps, order blocks and liquidity pools as price
+intervals sorted by their bottom and top, so "which zones contain or
+sit near this price" is answered with binary searches instead of
+scanning every zone.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import heapq
+import math
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class ZoneKind:
+    """Zone kind enumeration."""
+
+    FVG = "FVG"
+    ORDER_BLOCK = "ORDER_BLOCK"
+    LIQUIDITY = "LIQUIDITY"
+
+
+@dataclass(slots=True)
+class PriceZone:
+    """Price interval [bottom, top] of an indexed analysis object."""
+
+    bottom: Decimal
+    top: Decimal
+    kind: str
+    item: Any
+    seq: int
+
+    def distance(self, price: Decimal) -> Decimal:
+        """Get distance from a price to the zone (0 if inside)."""
+        if price < self.bottom:
+            return self.bottom - price
+        if price > self.top:
+            return price - self.top
+        return Decimal("0")
+
+
+class _SortedZones:
+    """Zones kept sorted by one boundary, with the keys in a parallel list."""
+
+    def __init__(self, boundary: str):
+        """
+        Initialize empty list.
+
+        Args:
+            boundary: Zone attribute to sort by (``bottom`` or ``top``)
+        """
+        self.boundary = boundary
+        self.keys: List[Decimal] = []
+        self.zones: List[PriceZone] = []
+        # Widest zone ever inserted; bounds the bottoms a stab has to check
+        self.max_width = Decimal("0")
+
+    def __len__(self) -> int:
+        """Get number of zones."""
+        return len(self.zones)
+
+    def insert(self, zone: PriceZone):
+        """Add a zone."""
+        key = getattr(zone, self.boundary)
+        index = bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.zones.insert(index, zone)
+        self.max_width = max(self.max_width, zone.top - zone.bottom)
+
+    def remove(self, zone: PriceZone):
+        """Remove a zone."""
+        index = bisect_left(self.keys, getattr(zone, self.boundary))
+        while self.zones[index] is not zone:
+            index += 1
+        del self.keys[index]
+        del self.zones[index]
+        if not self.zones:
+            self.max_width = Decimal("0")
+
+
+class _ZoneSet:
+    """
+    Zones of one kind sorted by bottom and by top.
+
+    For bounded overlap queries zones are also banded by width (powers
+    of four), so a few wide zones do not widen the bottoms every stab
+    has to check.
+    """
+
+    def __init__(self):
+        """Initialize empty zone set."""
+        self.by_bottom = _SortedZones("bottom")
+        self.by_top = _SortedZones("top")
+        self.bands: Dict[Optional[int], _SortedZones] = {}
+
+    def __len__(self) -> int:
+        """Get number of zones."""
+        return len(self.by_bottom)
+
+    @staticmethod
+    def _band(zone: PriceZone) -> Optional[int]:
+        """Get a zone's width band (None for single price levels)."""
+        width = zone.top - zone.bottom
+        return math.frexp(float(width))[1] // 2 if width > 0 else None
+
+    def insert(self, zone: PriceZone):
+        """Add a zone to the sorted lists."""
+        self.by_bottom.insert(zone)
+        self.by_top.insert(zone)
+        band = self._band(zone)
+        if band not in self.bands:
+            self.bands[band] = _SortedZones("bottom")
+        self.bands[band].insert(zone)
+
+    def remove(self, zone: PriceZone):
+        """Remove a zone from the sorted lists."""
+        self.by_bottom.remove(zone)
+        self.by_top.remove(zone)
+        band = self._band(zone)
+        self.bands[band].remove(zone)
+        if not self.bands[band]:
+            del self.bands[band]
+
+    def between(
+        self, low: Optional[Decimal], high: Optional[Decimal]
+    ) -> List[PriceZone]:
+        """Get zones overlapping [low, high] (None bounds are open)."""
+        if low is None:
+            if high is None:
+                return list(self.by_bottom.zones)
+            bottoms = self.by_bottom
+            return bottoms.zones[: bisect_right(bottoms.keys, high)]
+        if high is None:
+            tops = self.by_top
+            return tops.zones[bisect_left(tops.keys, low) :]
+
+        found = []
+        for band in self.bands.values():
+            start = bisect_left(band.keys, low - band.max_width)
+            end = bisect_right(band.keys, high)
+            found.extend(zone for zone in band.zones[start:end] if zone.top >= low)
+        return found
+
+    def nearest(self, price: Decimal, k: int) -> List[PriceZone]:
+        """Get up to ``k`` zones closest to a price, closest first."""
+        found = self.between(price, price)[:k]
+
+        # Walk outwards: zones above by rising bottom, below by falling top
+        bottoms, tops = self.by_bottom, self.by_top
+        above = bisect_right(bottoms.keys, price)
+        below = bisect_left(tops.keys, price) - 1
+        while len(found) < k:
+            up = bottoms.keys[above] - price if above < len(bottoms) else None
+            down = price - tops.keys[below] if below >= 0 else None
+            if up is None and down is None:
+                break
+            if down is None or (up is not None and up <= down):
+                found.append(bottoms.zones[above])
+                above += 1
+            else:
+                found.append(tops.zones[below])
+                below -= 1
+        return found
+
+
+class PriceZoneIndex:
+    """
+    Interval index of price zones.
+
+    Zones are grouped by kind (see ``ZoneKind``), each kept in two
+    sorted lists: by bottom and by top. Overlap and stabbing queries
+    bisect the bottoms of each width band, widened by the band's widest
+    zone, and nearest-k queries walk outwards from the price on both
+    lists. Query counts and timings are recorded for ``get_status``.
+    """
+
+    def __init__(self):
+        """Initialize zone index."""
+        self._sets: Dict[str, _ZoneSet] = {}
+        self._zones: Dict[int, PriceZone] = {}
+        self._seq = 0
+        self.inserted = 0
+        self.retired = 0
+        self._timings: Dict[str, List[float]] = {}
+
+    def __len__(self) -> int:
+        """Get number of indexed zones."""
+        return len(self._zones)
+
+    def __contains__(self, item: Any) -> bool:
+        """Check if an object is indexed."""
+        return id(item) in self._zones
+
+    def insert(
+        self, item: Any, bottom: Decimal, top: Decimal, kind: str
+    ) -> PriceZone:
+        """
+        Index an object's price zone.
+
+        Args:
+            item: Object the zone belongs to (FVG, order block, pool)
+            bottom: Lower zone boundary
+            top: Upper zone boundary (equal to ``bottom`` for a level)
+            kind: Zone kind
+
+        Returns:
+            Indexed zone
+
+        Raises:
+            ValueError: If the zone is inverted or the object is indexed
+        """
+        if top < bottom:
+            raise ValueError(f"Zone top {top} is below bottom {bottom}")
+        if id(item) in self._zones:
+            raise ValueError("Object is already indexed")
+
+        zone = PriceZone(bottom, top, kind, item, self._seq)
+        self._seq += 1
+        zone_set = self._sets.get(kind)
+        if zone_set is None:
+            zone_set = self._sets[kind] = _ZoneSet()
+        zone_set.insert(zone)
+        self._zones[id(item)] = zone
+        self.inserted += 1
+        return zone
+
+    def retire(self, item: Any) -> bool:
+        """
+        Remove an object's zone, e.g. once a gap fills or a pool is swept.
+
+        Args:
+            item: Indexed object
+
+        Returns:
+            True if the object was indexed
+        """
+        zone = self._zones.pop(id(item), None)
+        if zone is None:
+            return False
+
+        self._sets[zone.kind].remove(zone)
+        self.retired += 1
+        return True
+
+    def sync(
+        self,
+        items: Iterable[Any],
+        kind: str,
+        bounds: Callable[[Any], Tuple[Decimal, Decimal]],
+        key: Callable[[Any], Hashable],
+    ):
+        """
+        Make the zones of one kind match a fresh detection.
+
+        For analysis objects that are re-detected from a sliding
+        window (order blocks, liquidity pools). A zone whose key is
+        detected again keeps its place in the sorted lists and now
+        refers to the new object; new keys are inserted and keys no
+        longer detected are retired.
+
+        Args:
+            items: Detected objects
+            kind: Zone kind
+            bounds: Function giving an object's (bottom, top)
+            key: Function identifying an object across detections
+        """
+        zone_set = self._sets.get(kind)
+        previous = (
+            {key(zone.item): zone for zone in zone_set.by_bottom.zones}
+            if zone_set is not None
+            else {}
+        )
+
+        for item in items:
+            if id(item) in self._zones:
+                previous.pop(key(item), None)
+                continue
+            bottom, top = bounds(item)
+            zone = previous.pop(key(item), None)
+            if zone is not None and zone.bottom == bottom and zone.top == top:
+                del self._zones[id(zone.item)]
+                zone.item = item
+                self._zones[id(item)] = zone
+                continue
+            if zone is not None:
+                self.retire(zone.item)
+            self.insert(item, bottom, top, kind)
+
+        for zone in previous.values():
+            self.retire(zone.item)
+
+    def between(
+        self,
+        low: Optional[Decimal],
+        high: Optional[Decimal],
+        kind: Optional[str] = None,
+    ) -> List[Any]:
+        """
+        Get objects whose zones overlap a price range.
+
+        Args:
+            low: Lower bound (None for unbounded)
+            high: Upper bound (None for unbounded)
+            kind: Zone kind (all kinds if None)
+
+        Returns:
+            Objects in insertion order
+        """
+        started = time.perf_counter()
+        zones = [zone for zs in self._select(kind) for zone in zs.between(low, high)]
+        zones.sort(key=_seq)
+        self._record("between", started)
+        return [zone.item for zone in zones]
+
+    def stab(
+        self,
+        price: Decimal,
+        tolerance: Decimal = Decimal("0"),
+        kind: Optional[str] = None,
+    ) -> List[Any]:
+        """
+        Get objects whose zones contain a price.
+
+        Args:
+            price: Price to look up
+            tolerance: Distance by which zones are widened
+            kind: Zone kind (all kinds if None)
+
+        Returns:
+            Objects in insertion order
+        """
+        started = time.perf_counter()
+        low, high = price - tolerance, price + tolerance
+        zones = [zone for zs in self._select(kind) for zone in zs.between(low, high)]
+        zones.sort(key=_seq)
+        self._record("stab", started)
+        return [zone.item for zone in zones]
+
+    def nearest(
+        self, price: Decimal, k: int = 1, kind: Optional[str] = None
+    ) -> List[Any]:
+        """
+        Get the objects whose zones are closest to a price.
+
+        Args:
+            price: Price to look up
+            k: Maximum number of objects
+            kind: Zone kind (all kinds if None)
+
+        Returns:
+            Objects, closest first (containing zones first)
+        """
+        started = time.perf_counter()
+        zones = heapq.nsmallest(
+            k,
+            (zone for zs in self._select(kind) for zone in zs.nearest(price, k)),
+            key=lambda zone: (zone.distance(price), zone.seq),
+        )
+        self._record("nearest", started)
+        return [zone.item for zone in zones]
+
+    def in_order(self, items: List[Any]) -> List[Any]:
+        """
+        Sort indexed objects from several queries into insertion order.
+
+        Args:
+            items: Indexed objects
+
+        Returns:
+            Objects in insertion order
+        """
+        return sorted(items, key=lambda item: self._zones[id(item)].seq)
+
+    def zone(self, item: Any) -> Optional[PriceZone]:
+        """Get an object's zone, or None if it is not indexed."""
+        return self._zones.get(id(item))
+
+    def count(self, kind: Optional[str] = None) -> int:
+        """
+        Get number of indexed zones.
+
+        Args:
+            kind: Zone kind (all kinds if None)
+
+        Returns:
+            Zone count
+        """
+        return sum(len(zone_set) for zone_set in self._select(kind))
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get index status information.
+
+        Returns:
+            Zone counts and per-query call counts and timings
+        """
+        return {
+            "zones": len(self._zones),
+            "by_kind": {kind: len(zone_set) for kind, zone_set in self._sets.items()},
+            "inserted": self.inserted,
+            "retired": self.retired,
+            "queries": {
+                name: {
+                    "count": count,
+                    "avg_us": total / count * 1e6,
+                    "max_us": longest * 1e6,
+                }
+                for name, (count, total, longest) in self._timings.items()
+            },
+        }
+
+    def _select(self, kind: Optional[str]) -> List[_ZoneSet]:
+        """Get the zone sets a query covers."""
+        if kind is None:
+            return list(self._sets.values())
+        zone_set = self._sets.get(kind)
+        return [zone_set] if zone_set is not None else []
+
+    def _record(self, name: str, started: float):
+        """Record a query duration."""
+        elapsed = time.perf_counter() - started
+        stats = self._timings.get(name)
+        if stats is None:
+            self._timings[name] = [1, elapsed, elapsed]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+
+
+def _seq(zone: PriceZone) -> int:
+    """Sort key for insertion order."""
+    return zone.seq
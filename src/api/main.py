@@ -11,6 +11,7 @@ Provides REST API endpoints for:
 
 import asyncio
 import logging
+import os
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -34,10 +35,12 @@ from ..models.trade import Trade
 from ..models.market_data import Tick
 from ..models.candle import Candle
 from ..database.connection import db as database_instance
+from ..database.candle_writer import CandleWriter
 from ..analysis.smart_money_engine import SmartMoneyEngine
 from ..trading.signal_generator import SignalGenerator
 from ..trading.trade_manager import TradeManager
 from ..analysis.market_data_processor import MarketDataProcessor
+from ..analysis.warm_start import WarmStart
 from ..notifications.telegram_service import TelegramService
 from ..connectors.websocket_server import WebSocketServer
 from ..connectors import MT5Connector, MT5_AVAILABLE
@@ -86,6 +89,63 @@ market_data_processor: Optional[MarketDataProcessor] = None
 telegram_service: Optional[TelegramService] = None
 websocket_server: Optional[WebSocketServer] = None
 mt5_connector: Optional[MT5Connector] = None
+candle_writer: Optional[CandleWriter] = None
+candle_store_sync_task: Optional[asyncio.Task] = None
+
+
+def open_candle_store(purpose: str):
+    """
+    Open the configured candle store if its directory exists.
+    
+    Args:
+        purpose: What the store is needed for (used in the log message)
+    
+    Returns:
+        CandleStore, or None if there is no store or pyarrow is missing
+    """
+    directory = settings.market_data.candle_store_directory
+    if not os.path.isdir(directory):
+        return None
+    try:
+        from ..storage.candle_store import CandleStore
+        return CandleStore(directory)
+    except RuntimeError as e:
+        logger.warning(f"Candle store unavailable for {purpose}: {e}")
+        return None
+
+
+async def warm_start_market_data(
+    processor: MarketDataProcessor, engine: SmartMoneyEngine
+):
+    """
+    Hydrate candle windows from the candle store and database.
+    
+    Runs before live ticks are connected so the first candle close
+    already has enough history for SMC analysis.
+    """
+    md_config = settings.market_data
+    if not md_config.warm_start_enabled:
+        return None
+    
+    warm_start = WarmStart(
+        processor,
+        candle_store=open_candle_store("warm start"),
+        database=database_instance,
+        bars=md_config.warm_start_bars,
+        timeout=md_config.warm_start_timeout_seconds,
+    )
+    report = await warm_start.run(md_config.warm_start_symbols)
+    
+    # The engine keeps a running market structure; replay H1 history into it
+    symbol = md_config.warm_start_symbols[0] if md_config.warm_start_symbols else None
+    if symbol:
+        for candle in await processor.get_candles(symbol, "H1", md_config.window_size):
+            engine.market_structure.update_with_candle(candle)
+    
+    logger.info(
+        f"Warm start loaded {report.hydrated} candles in {report.elapsed_seconds:.2f}s"
+    )
+    return report
 
 
 @asynccontextmanager
@@ -97,6 +157,7 @@ async def lifespan(app: FastAPI):
     # Initialize services
     global smart_money_engine, signal_generator, trade_manager
     global market_data_processor, telegram_service, websocket_server, mt5_connector
+    global candle_writer, candle_store_sync_task
     
     try:
         # Initialize database
@@ -111,6 +172,7 @@ async def lifespan(app: FastAPI):
             trade_manager = TradeManager(session=session)
             
         market_data_processor = MarketDataProcessor()
+        await warm_start_market_data(market_data_processor, smart_money_engine)
         telegram_service = TelegramService()
         websocket_server = WebSocketServer()
         
@@ -127,12 +189,42 @@ async def lifespan(app: FastAPI):
         if mt5_connector:
             await mt5_connector.connect()
         
+        # Persist closed candles in the background
+        md_config = settings.market_data
+        if md_config.candle_writer_enabled:
+            candle_writer = CandleWriter(
+                database_instance,
+                queue_size=md_config.candle_writer_queue_size,
+                batch_size=md_config.candle_writer_batch_size,
+                flush_interval=md_config.candle_writer_flush_interval_seconds,
+            )
+            await candle_writer.start()
+            market_data_processor.add_candle_close_callback(
+                candle_writer.on_candle_close
+            )
+        
         # Set up service connections
         websocket_server.add_tick_handler(market_data_processor.process_tick)
         market_data_processor.add_signal_callback(trade_manager.open_trade)
         market_data_processor.add_signal_callback(telegram_service.send_signal_notification)
         trade_manager.add_trade_handler(telegram_service.send_trade_notification)
         
+        # Start shards, candle clock and analysis pool once callbacks are wired
+        await market_data_processor.start()
+        
+        # Mirror closed candles from the database into the candle store
+        candle_store = open_candle_store("sync")
+        if candle_store is not None:
+            from ..storage.candle_sync import CandleStoreSync
+            candle_store_sync = CandleStoreSync(candle_store, database_instance)
+            candle_store_sync_task = asyncio.create_task(
+                candle_store_sync.run(
+                    md_config.warm_start_symbols,
+                    md_config.timeframes,
+                    md_config.candle_store_sync_interval_seconds,
+                )
+            )
+        
         logger.info("All services started successfully")
         
     except Exception as e:
@@ -146,12 +238,23 @@ async def lifespan(app: FastAPI):
     
     try:
         # Stop services
+        if candle_store_sync_task:
+            candle_store_sync_task.cancel()
+            try:
+                await candle_store_sync_task
+            except asyncio.CancelledError:
+                pass
         if mt5_connector:
             await mt5_connector.disconnect()
         if websocket_server:
             await websocket_server.stop()
         if telegram_service:
             await telegram_service.stop()
+        # Stop the processor first so its final candle closes reach the writer
+        if market_data_processor:
+            await market_data_processor.stop()
+        if candle_writer:
+            await candle_writer.stop()
         
         # Close database
         await database_instance.disconnect()
@@ -229,6 +332,10 @@ async def get_status(token: str = Depends(verify_token)):
             "websocket_server": websocket_server.get_status() if websocket_server else None,
             "mt5_connector": mt5_connector.get_status() if mt5_connector else None
         },
+        "warm_start": (
+            market_data_processor.hydration if market_data_processor else None
+        ),
+        "candle_writer": candle_writer.get_status() if candle_writer else None,
         "timestamp": datetime.utcnow().isoformat()
     }
     return status
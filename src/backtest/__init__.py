@@ -0,0 +1,64 @@
+"""
+Backtesting module for XAUUSD Gold Trading System.
+
+Provides:
+- Deterministic tick and bar replay on a simulated clock
+- Parallel bar-by-bar backtesting with performance summaries
+- Grid, random and walk-forward SMC parameter optimization
+- Synthetic market generation for load and soak testing
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+from .replay import ReplayEngine, ReplayResult, bars_to_ticks
+from .engine import (
+    BacktestEngine,
+    BacktestResult,
+    TradeSimulator,
+    price_history_to_arrays,
+    resample,
+)
+from .metrics import daily_performance, summarize_trades
+from .optimizer import (
+    CandidateResult,
+    ParameterOptimizer,
+    apply_smc_overrides,
+    grid_candidates,
+    random_candidates,
+)
+from .results_store import OptimizationStore
+from .synthetic_market import (
+    LoadGenerator,
+    LoadReport,
+    MarketEvent,
+    MarketRegime,
+    SyntheticMarket,
+    SyntheticMarketConfig,
+    scenario_config,
+)
+
+__all__ = [
+    "ReplayEngine",
+    "ReplayResult",
+    "bars_to_ticks",
+    "BacktestEngine",
+    "BacktestResult",
+    "TradeSimulator",
+    "price_history_to_arrays",
+    "resample",
+    "daily_performance",
+    "summarize_trades",
+    "CandidateResult",
+    "ParameterOptimizer",
+    "apply_smc_overrides",
+    "grid_candidates",
+    "random_candidates",
+    "OptimizationStore",
+    "LoadGenerator",
+    "LoadReport",
+    "MarketEvent",
+    "MarketRegime",
+    "SyntheticMarket",
+    "SyntheticMarketConfig",
+    "scenario_config",
+]
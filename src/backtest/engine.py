@@ -0,0 +1,773 @@
+"""
+Backtest engine for XAUUSD Gold Trading System.
+
+Runs the live confluence analysis, signal generation and trade
+exit rules bar by bar over historical candle arrays. Date ranges
+are split into chunks whose signals are generated in a process
+pool; each chunk starts with enough history to fill the analysis
+windows. Trades are then managed in one sequential pass over the
+merged signals, so positions open at a chunk boundary carry over
+and results do not depend on how the range was split.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import ROUND_DOWN, Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from ..analysis.candle_aggregator import NANOS_PER_SECOND, TIMEFRAME_SECONDS
+from ..analysis.candle_buffer import CandleArrays, datetime_to_ns
+from ..analysis.confluence_analyzer import ConfluenceAnalyzer
+from ..config import get_settings
+from ..core.clock import SimulatedClock, use_clock
+from ..models.candle import Candle
+from ..models.signal import TradingSignal
+from ..models.trade import ExitReason, Trade
+from ..trading.signal_generator import SignalGenerator
+from .metrics import daily_performance, summarize_trades
+
+
+# Candles per timeframe passed to analysis (as in MarketDataProcessor)
+ANALYSIS_WINDOW = 50
+
+# Minimum H1 candles before analysis runs
+MIN_H1_CANDLES = 20
+
+# Fraction of the position closed at TP1
+TP1_CLOSE_FRACTION = Decimal("0.5")
+
+
+def _init_worker():
+    """Load settings once per worker process."""
+    get_settings()
+
+
+def _period_ns(timeframe: str) -> int:
+    """Get timeframe length in nanoseconds."""
+    return TIMEFRAME_SECONDS[timeframe] * NANOS_PER_SECOND
+
+
+def resample(arrays: CandleArrays, timeframe: str) -> CandleArrays:
+    """
+    Aggregate candles into a higher timeframe.
+
+    Args:
+        arrays: Source candles in time order
+        timeframe: Target timeframe (e.g. "H1", "H4")
+
+    Returns:
+        New CandleArrays with one row per target bucket
+    """
+    if len(arrays) == 0:
+        return arrays.copy()
+
+    period = _period_ns(timeframe)
+    buckets = arrays.timestamp - arrays.timestamp % period
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(arrays)] - 1
+
+    return CandleArrays(
+        timestamp=buckets[starts],
+        open=arrays.open[starts],
+        high=np.maximum.reduceat(arrays.high, starts),
+        low=np.minimum.reduceat(arrays.low, starts),
+        close=arrays.close[ends],
+        volume=np.add.reduceat(arrays.volume, starts),
+        instrument=arrays.instrument,
+        timeframe=timeframe,
+        fixed_point=arrays.fixed_point,
+    )
+
+
+def price_history_to_arrays(
+    rows: Iterable[Any],
+    instrument: Optional[str] = None,
+    timeframe: Optional[str] = None,
+) -> CandleArrays:
+    """
+    Convert ``PriceHistory`` rows to candle arrays.
+
+    Args:
+        rows: PriceHistory rows in any order
+        instrument: Instrument override
+        timeframe: Timeframe override
+
+    Returns:
+        CandleArrays sorted by timestamp
+    """
+    candles = [
+        Candle.from_trusted(
+            timestamp=row.timestamp,
+            open=Decimal(row.open_price),
+            high=Decimal(row.high_price),
+            low=Decimal(row.low_price),
+            close=Decimal(row.close_price),
+            volume=row.volume or 0,
+            timeframe=row.timeframe,
+            instrument=row.instrument,
+        )
+        for row in sorted(rows, key=lambda row: row.timestamp)
+    ]
+    return CandleArrays.from_candles(candles, instrument, timeframe)
+
+
+class TradeSimulator:
+    """
+    Bar-based trade lifecycle simulator.
+
+    Applies the ``TradeManager`` exit rules (stop loss, 50% close at
+    TP1, full close at TP2, move to breakeven) against each bar's
+    range. When a bar reaches both the stop and a target, the stop
+    is assumed to have been hit first.
+    """
+
+    def __init__(self, settings=None):
+        """
+        Initialize trade simulator.
+
+        Args:
+            settings: Application settings (loaded if None)
+        """
+        self.settings = settings or get_settings()
+        self.open_trades: List[Trade] = []
+        self.closed_trades: List[Trade] = []
+        self.realized_profit_loss = Decimal("0")
+
+        trading = self.settings.trading
+        self._lot_step = Decimal(str(trading.lot_size_step))
+        self._breakeven_distance = Decimal(trading.move_to_breakeven_pips) / Decimal(
+            "10000"
+        )
+
+    def can_open(self, at: datetime) -> bool:
+        """
+        Check concurrency and session limits.
+
+        Args:
+            at: Time of the prospective entry
+
+        Returns:
+            True if a trade may be opened
+        """
+        trading = self.settings.trading
+        if len(self.open_trades) >= trading.max_concurrent_trades:
+            return False
+        return bool(trading.can_trade_now(at.hour))
+
+    def open(self, signal: TradingSignal, at: datetime) -> Trade:
+        """
+        Fill a signal at its entry price.
+
+        Args:
+            signal: Signal to fill
+            at: Fill time
+
+        Returns:
+            Opened trade
+        """
+        trade = Trade(
+            direction=signal.direction,
+            position_size=signal.position_size,
+            profit_loss=Decimal("0"),
+            profit_loss_pips=Decimal("0"),
+            profit_loss_percentage=Decimal("0"),
+            signal_id=signal.signal_id,
+            instrument=signal.instrument,
+            stop_loss=signal.stop_loss,
+            take_profit_1=signal.take_profit_1,
+            take_profit_2=signal.take_profit_2,
+        )
+        trade.open_trade(signal.entry_price, at)
+        self.open_trades.append(trade)
+        return trade
+
+    def on_bar(self, candle: Candle, at: datetime):
+        """
+        Apply exit rules to open trades.
+
+        Args:
+            candle: Closed candle
+            at: Candle close time
+        """
+        for trade in list(self.open_trades):
+            self._check_exit(trade, candle, at)
+
+    def close_all(self, price: Decimal, at: datetime, reason: ExitReason):
+        """
+        Close every open trade.
+
+        Args:
+            price: Exit price
+            at: Exit time
+            reason: Exit reason
+        """
+        for trade in list(self.open_trades):
+            self._close(trade, price, at, reason)
+
+    def _check_exit(self, trade: Trade, candle: Candle, at: datetime):
+        """Check one trade against a bar."""
+        is_buy = trade.is_buy
+
+        def reached(level: Decimal) -> bool:
+            return candle.high >= level if is_buy else candle.low <= level
+
+        stopped = (
+            candle.low <= trade.stop_loss if is_buy else candle.high >= trade.stop_loss
+        )
+        if stopped:
+            self._close(trade, trade.stop_loss, at, ExitReason.SL_HIT)
+            return
+
+        if not trade.tp1_hit and reached(trade.take_profit_1):
+            size = (trade.position_size * TP1_CLOSE_FRACTION).quantize(
+                self._lot_step, rounding=ROUND_DOWN
+            )
+            if size > 0:
+                trade.partial_close(size, trade.take_profit_1, "TP1_HIT")
+            else:
+                trade.tp1_hit = True
+
+        if trade.take_profit_2 and reached(trade.take_profit_2):
+            self._close(trade, trade.take_profit_2, at, ExitReason.TP2_HIT)
+            return
+
+        if not trade.breakeven_moved and self._breakeven_distance > 0:
+            if is_buy:
+                level = trade.entry_price + self._breakeven_distance
+            else:
+                level = trade.entry_price - self._breakeven_distance
+            if reached(level):
+                trade.move_stop_to_breakeven()
+
+        trade.update_price(candle.close)
+
+    def _close(self, trade: Trade, price: Decimal, at: datetime, reason: ExitReason):
+        """Close a trade and move it to the closed list."""
+        trade.close_trade(price, at, reason)
+        self.open_trades.remove(trade)
+        self.closed_trades.append(trade)
+        self.realized_profit_loss += trade.profit_loss
+
+
+@dataclass
+class BacktestChunk:
+    """
+    Work unit for one date range.
+
+    Arrays start early enough to fill the analysis windows at
+    ``first`` and stop at the last candle closed by ``last``; trades
+    are managed afterwards over the full range.
+
+    Attributes:
+        m15: M15 candles
+        h1: H1 candles
+        h4: H4 candles
+        first: First M15 index evaluated for signals
+        last: M15 index after the last evaluated for signals
+        instrument: Trading instrument
+        offset: Index of ``m15[0]`` in the full M15 arrays
+    """
+
+    m15: CandleArrays
+    h1: CandleArrays
+    h4: CandleArrays
+    first: int
+    last: int
+    instrument: str = "XAUUSD"
+    offset: int = 0
+
+
+@dataclass
+class ChunkResult:
+    """Result of one backtest chunk."""
+
+    trades: List[Trade] = field(default_factory=list)
+    entries: List[Tuple[int, TradingSignal]] = field(default_factory=list)
+    signals: int = 0
+    bars: int = 0
+    analysis_errors: int = 0
+    pruned: bool = False
+
+
+class CandleFeatures:
+    """
+    Config-independent backtest inputs.
+
+    Candle objects and the H1/H4 window bounds for every M15 close
+    are computed once, so repeated simulations over the same data
+    (chunks, optimization candidates) only pay for the analysis.
+    """
+
+    def __init__(self, m15: CandleArrays, h1: CandleArrays, h4: CandleArrays):
+        """
+        Precompute features.
+
+        Args:
+            m15: M15 candles
+            h1: H1 candles
+            h4: H4 candles
+        """
+        self.instrument = m15.instrument or "XAUUSD"
+        self.m15 = m15.to_candles()
+        self.h1 = h1.to_candles()
+        self.h4 = h4.to_candles()
+
+        m15_close = m15.timestamp + _period_ns("M15")
+        self.h1_counts = np.searchsorted(
+            h1.timestamp + _period_ns("H1"), m15_close, side="right"
+        ).tolist()
+        self.h4_counts = np.searchsorted(
+            h4.timestamp + _period_ns("H4"), m15_close, side="right"
+        ).tolist()
+
+    def __len__(self) -> int:
+        return len(self.m15)
+
+
+async def _bar_signal(
+    features: CandleFeatures,
+    i: int,
+    generator: SignalGenerator,
+    result: ChunkResult,
+) -> Optional[TradingSignal]:
+    """
+    Run analysis and signal generation for M15 close ``i``.
+
+    The simulated clock must already be set to the bar close.
+    Analysis failures and signals are counted on ``result``.
+
+    Returns:
+        Generated signal or None
+    """
+    h1_count = features.h1_counts[i]
+    if h1_count < MIN_H1_CANDLES:
+        return None
+    h4_count = features.h4_counts[i]
+    h4_from = max(0, h4_count - ANALYSIS_WINDOW)
+    h1_from = max(0, h1_count - ANALYSIS_WINDOW)
+    candle = features.m15[i]
+    logger = logging.getLogger(__name__)
+
+    try:
+        analysis = ConfluenceAnalyzer().analyze_confluence(
+            h4_candles=features.h4[h4_from:h4_count],
+            h1_candles=features.h1[h1_from:h1_count],
+            m15_candles=features.m15[max(0, i + 1 - ANALYSIS_WINDOW) : i + 1],
+            current_price=candle.close,
+            instrument=features.instrument,
+        )
+    except Exception as e:
+        result.analysis_errors += 1
+        if result.analysis_errors == 1:
+            logger.warning(f"Backtest analysis failed at {candle.timestamp}: {e}")
+        return None
+
+    if not analysis.meets_threshold(generator.settings.smc.confluence_threshold):
+        return None
+
+    try:
+        signal = await generator.generate_signal(analysis, candle.close)
+    except ValueError as e:
+        logger.debug(f"Signal rejected at {candle.timestamp}: {e}")
+        return None
+
+    if signal is not None:
+        result.signals += 1
+    return signal
+
+
+async def simulate(
+    features: CandleFeatures,
+    first: int,
+    last: int,
+    should_stop: Optional[Callable[[TradeSimulator], bool]] = None,
+) -> ChunkResult:
+    """
+    Evaluate M15 closes ``first:last`` on a simulated clock.
+
+    Trades still open at ``last`` are managed on later bars, and
+    closed at the final price if the data runs out.
+
+    Args:
+        features: Precomputed candle features
+        first: First M15 index evaluated for signals
+        last: M15 index after the last evaluated for signals
+        should_stop: Called after each bar; returning True abandons the run
+
+    Returns:
+        Chunk result
+    """
+    settings = get_settings()
+    generator = SignalGenerator()
+    simulator = TradeSimulator(settings)
+    clock = SimulatedClock()
+    result = ChunkResult()
+    m15_period = timedelta(seconds=TIMEFRAME_SECONDS["M15"])
+
+    candle = None
+    with use_clock(clock):
+        for i in range(first, len(features)):
+            candle = features.m15[i]
+            closed_at = candle.timestamp + m15_period
+            clock.set(closed_at)
+            simulator.on_bar(candle, closed_at)
+
+            if i >= last:
+                if not simulator.open_trades:
+                    break
+                continue
+
+            result.bars += 1
+            if should_stop is not None and should_stop(simulator):
+                result.pruned = True
+                break
+
+            signal = await _bar_signal(features, i, generator, result)
+            if signal is not None and simulator.can_open(closed_at):
+                simulator.open(signal, closed_at)
+
+        # Out of data: close what is left at the final price
+        if candle is not None:
+            simulator.close_all(candle.close, clock.now(), ExitReason.MANUAL_CLOSE)
+
+    result.trades = simulator.closed_trades
+    return result
+
+
+async def scan_signals(features: CandleFeatures, first: int, last: int) -> ChunkResult:
+    """
+    Generate signals for M15 closes ``first:last`` without trading.
+
+    Signal generation does not depend on open trades, so chunks can
+    be scanned independently and their entries merged in time order
+    for ``simulate_trades``.
+
+    Args:
+        features: Precomputed candle features
+        first: First M15 index evaluated for signals
+        last: M15 index after the last evaluated for signals
+
+    Returns:
+        Chunk result with ``entries`` of (M15 index, signal)
+    """
+    generator = SignalGenerator()
+    clock = SimulatedClock()
+    result = ChunkResult()
+    m15_period = timedelta(seconds=TIMEFRAME_SECONDS["M15"])
+
+    with use_clock(clock):
+        for i in range(first, last):
+            clock.set(features.m15[i].timestamp + m15_period)
+            result.bars += 1
+            signal = await _bar_signal(features, i, generator, result)
+            if signal is not None:
+                result.entries.append((i, signal))
+    return result
+
+
+def simulate_trades(
+    m15: CandleArrays,
+    entries: Iterable[Tuple[int, TradingSignal]],
+    first: int,
+    last: int,
+    settings=None,
+) -> List[Trade]:
+    """
+    Manage trades for pre-generated signals in one sequential pass.
+
+    Fills and exits match ``simulate``: each bar's exits are applied
+    before its signal is filled, subject to ``TradeSimulator.can_open``.
+    Bars with no open trades and no signal are skipped without
+    building candles.
+
+    Args:
+        m15: M15 candles
+        entries: (M15 index, signal) pairs
+        first: First M15 index evaluated for signals
+        last: M15 index after the last evaluated for signals
+        settings: Application settings (loaded if None)
+
+    Returns:
+        Closed trades in exit order
+    """
+    simulator = TradeSimulator(settings)
+    clock = SimulatedClock()
+    pending = dict(entries)
+    m15_period = timedelta(seconds=TIMEFRAME_SECONDS["M15"])
+
+    candle = None
+    with use_clock(clock):
+        for i in range(first, len(m15)):
+            if i >= last and not simulator.open_trades:
+                break
+            if not simulator.open_trades and i not in pending:
+                continue
+            candle = m15.candle(i)
+            closed_at = candle.timestamp + m15_period
+            clock.set(closed_at)
+            simulator.on_bar(candle, closed_at)
+
+            signal = pending.get(i)
+            if signal is not None and simulator.can_open(closed_at):
+                simulator.open(signal, closed_at)
+
+        # Out of data: close what is left at the final price
+        if candle is not None:
+            simulator.close_all(candle.close, clock.now(), ExitReason.MANUAL_CLOSE)
+
+    return simulator.closed_trades
+
+
+def run_backtest_chunk(chunk: BacktestChunk) -> ChunkResult:
+    """
+    Generate signals for one chunk.
+
+    Module-level so it can be sent to worker processes.
+
+    Args:
+        chunk: Chunk to evaluate
+
+    Returns:
+        Chunk result with entries indexed into the full M15 arrays
+    """
+    features = CandleFeatures(chunk.m15, chunk.h1, chunk.h4)
+    result = asyncio.run(scan_signals(features, chunk.first, chunk.last))
+    result.entries = [(i + chunk.offset, signal) for i, signal in result.entries]
+    return result
+
+
+@dataclass
+class BacktestResult:
+    """
+    Outcome of a backtest run.
+
+    Attributes:
+        instrument: Trading instrument
+        start: First evaluated bar
+        end: Last evaluated bar
+        trades: Closed trades in entry order
+        signals: Signals generated
+        bars: M15 bars evaluated
+        analysis_errors: Bars where analysis raised
+        chunks: Chunks evaluated
+        elapsed_seconds: Wall time of the run
+    """
+
+    instrument: str
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    trades: List[Trade] = field(default_factory=list)
+    signals: int = 0
+    bars: int = 0
+    analysis_errors: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+
+    def summary(self, account_balance: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Summarize trades like a ``PerformanceMetric`` row.
+
+        Args:
+            account_balance: Starting balance (configured balance if None)
+
+        Returns:
+            Performance summary dictionary
+        """
+        if account_balance is None:
+            account_balance = get_settings().trading.account_balance
+        return summarize_trades(
+            self.trades, self.instrument, account_balance, self.signals
+        )
+
+    def daily(self, account_balance: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Summarize trades per exit date.
+
+        Args:
+            account_balance: Starting balance (configured balance if None)
+
+        Returns:
+            Daily performance summaries, oldest first
+        """
+        if account_balance is None:
+            account_balance = get_settings().trading.account_balance
+        return daily_performance(self.trades, self.instrument, account_balance)
+
+    def to_dict(self) -> dict:
+        """Convert backtest result to dictionary representation."""
+        return {
+            "instrument": self.instrument,
+            "start": self.start.isoformat() if self.start else None,
+            "end": self.end.isoformat() if self.end else None,
+            "trades": len(self.trades),
+            "signals": self.signals,
+            "bars": self.bars,
+            "analysis_errors": self.analysis_errors,
+            "chunks": self.chunks,
+            "elapsed_seconds": self.elapsed_seconds,
+        }
+
+
+class BacktestEngine:
+    """
+    Parallel bar-by-bar backtester.
+
+    Every M15 close is evaluated like a live candle close: analysis
+    sees the last ``ANALYSIS_WINDOW`` closed candles per timeframe,
+    signals are filled at the close and managed by ``TradeSimulator``
+    on the following bars.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunks: Optional[int] = None):
+        """
+        Initialize backtest engine.
+
+        Args:
+            max_workers: Worker processes (CPU count if None, 0 runs inline)
+            chunks: Date range chunks (twice the workers if None)
+        """
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        self.max_workers = max_workers
+        self.chunks = chunks or max(1, 2 * self.max_workers)
+        self.logger = logging.getLogger(__name__)
+
+    def run(
+        self,
+        m15: CandleArrays,
+        h1: Optional[CandleArrays] = None,
+        h4: Optional[CandleArrays] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> BacktestResult:
+        """
+        Backtest a date range.
+
+        Args:
+            m15: M15 candles, including history before ``start``
+            h1: H1 candles (resampled from M15 if None)
+            h4: H4 candles (resampled from M15 if None)
+            start: First bar open time to evaluate (data start if None)
+            end: Evaluate bars opening before this time (data end if None)
+
+        Returns:
+            Backtest result
+        """
+        h1 = h1 if h1 is not None else resample(m15, "H1")
+        h4 = h4 if h4 is not None else resample(m15, "H4")
+        instrument = m15.instrument or "XAUUSD"
+
+        first = (
+            int(np.searchsorted(m15.timestamp, datetime_to_ns(start))) if start else 0
+        )
+        last = (
+            int(np.searchsorted(m15.timestamp, datetime_to_ns(end)))
+            if end
+            else len(m15)
+        )
+        result = BacktestResult(instrument=instrument)
+        if first >= last:
+            return result
+
+        jobs = self._split(m15, h1, h4, first, last, instrument)
+        result.start = m15.candle(first).timestamp
+        result.end = m15.candle(last - 1).timestamp
+        result.chunks = len(jobs)
+
+        begin = time.perf_counter()
+        if self.max_workers > 0 and len(jobs) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(jobs)),
+                initializer=_init_worker,
+            ) as pool:
+                chunk_results = list(pool.map(run_backtest_chunk, jobs))
+        else:
+            chunk_results = [run_backtest_chunk(job) for job in jobs]
+
+        entries = []
+        for chunk_result in chunk_results:
+            entries.extend(chunk_result.entries)
+            result.signals += chunk_result.signals
+            result.bars += chunk_result.bars
+            result.analysis_errors += chunk_result.analysis_errors
+
+        result.trades = simulate_trades(m15, entries, first, last)
+        result.elapsed_seconds = time.perf_counter() - begin
+
+        result.trades.sort(key=lambda t: t.entry_time)
+        for trade_id, trade in enumerate(result.trades, start=1):
+            trade.trade_id = trade_id
+
+        self.logger.info(
+            f"Backtested {result.bars} {instrument} bars in "
+            f"{result.elapsed_seconds:.1f}s over {result.chunks} chunks: "
+            f"{result.signals} signals, {len(result.trades)} trades"
+        )
+        if result.analysis_errors:
+            self.logger.warning(
+                f"Analysis failed on {result.analysis_errors} of {result.bars} bars"
+            )
+        return result
+
+    def _split(
+        self,
+        m15: CandleArrays,
+        h1: CandleArrays,
+        h4: CandleArrays,
+        first: int,
+        last: int,
+        instrument: str,
+    ) -> List[BacktestChunk]:
+        """
+        Split an index range into chunks with warm-up history.
+
+        Each chunk holds only the candles its analysis windows read,
+        so the total copied is O(N) regardless of the chunk count.
+
+        Returns:
+            Chunks in time order
+        """
+        count = min(self.chunks, last - first)
+        bounds = np.linspace(first, last, count + 1).astype(int)
+        m15_close = m15.timestamp + _period_ns("M15")
+        h1_close = h1.timestamp + _period_ns("H1")
+        h4_close = h4.timestamp + _period_ns("H4")
+
+        jobs = []
+        for chunk_first, chunk_last in zip(bounds[:-1], bounds[1:]):
+            m15_from = max(0, chunk_first - ANALYSIS_WINDOW)
+            first_close = m15_close[chunk_first]
+            last_close = m15_close[chunk_last - 1]
+            h1_from = max(
+                0,
+                int(np.searchsorted(h1_close, first_close, side="right"))
+                - ANALYSIS_WINDOW,
+            )
+            h4_from = max(
+                0,
+                int(np.searchsorted(h4_close, first_close, side="right"))
+                - ANALYSIS_WINDOW,
+            )
+            h1_to = int(np.searchsorted(h1_close, last_close, side="right"))
+            h4_to = int(np.searchsorted(h4_close, last_close, side="right"))
+            jobs.append(
+                BacktestChunk(
+                    m15=m15.slice(m15_from, chunk_last).copy(),
+                    h1=h1.slice(h1_from, h1_to).copy(),
+                    h4=h4.slice(h4_from, h4_to).copy(),
+                    first=int(chunk_first) - m15_from,
+                    last=int(chunk_last) - m15_from,
+                    instrument=instrument,
+                    offset=int(m15_from),
+                )
+            )
+        return jobs
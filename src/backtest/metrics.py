@@ -0,0 +1,137 @@
+"""
+Backtest performance metrics for XAUUSD Gold Trading System.
+
+Summarizes simulated trades into the same statistics stored in
+the ``performance_metrics`` table, overall and per day.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import math
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List
+
+from ..models.trade import Trade
+
+
+def _trade_pips(trade: Trade) -> Decimal:
+    """Get realized pips including partial closes ($10 per pip per lot)."""
+    if not trade.position_size:
+        return Decimal("0")
+    return trade.profit_loss / (trade.position_size * Decimal("10"))
+
+
+def summarize_trades(
+    trades: Iterable[Trade],
+    instrument: str = "XAUUSD",
+    account_balance: float = 10000.0,
+    total_signals: int = 0,
+) -> Dict[str, Any]:
+    """
+    Summarize closed trades.
+
+    Keys match the ``PerformanceMetric`` columns. ``average_rr`` is the
+    realized reward:risk (average win over average loss) and
+    ``sharpe_ratio`` is annualized from daily returns.
+
+    Args:
+        trades: Closed trades
+        instrument: Trading instrument
+        account_balance: Starting balance for drawdown and returns
+        total_signals: Signals generated, including those not traded
+
+    Returns:
+        Performance summary dictionary
+    """
+    trades = sorted(
+        (t for t in trades if t.is_closed), key=lambda t: (t.exit_time, t.entry_time)
+    )
+    results = [float(t.profit_loss) for t in trades]
+    wins = [r for r in results if r > 0]
+    losses = [r for r in results if r < 0]
+
+    gross_profit = sum(wins)
+    gross_loss = -sum(losses)
+    average_win = gross_profit / len(wins) if wins else 0.0
+    average_loss = -gross_loss / len(losses) if losses else 0.0
+
+    # Equity curve drawdown
+    equity = peak = account_balance
+    max_drawdown = max_drawdown_percentage = 0.0
+    for result in results:
+        equity += result
+        peak = max(peak, equity)
+        drawdown = peak - equity
+        if drawdown > max_drawdown:
+            max_drawdown = drawdown
+            max_drawdown_percentage = drawdown / peak * 100 if peak > 0 else 0.0
+
+    # Daily returns
+    daily: Dict[date, float] = defaultdict(float)
+    for trade, result in zip(trades, results):
+        daily[trade.exit_time.date()] += result / account_balance
+    returns = list(daily.values())
+    sharpe_ratio = None
+    if len(returns) > 1:
+        mean = sum(returns) / len(returns)
+        variance = sum((r - mean) ** 2 for r in returns) / (len(returns) - 1)
+        if variance > 0:
+            sharpe_ratio = mean / math.sqrt(variance) * math.sqrt(252)
+
+    durations = [t.duration_minutes for t in trades if t.entry_time]
+
+    return {
+        "instrument": instrument,
+        "total_signals": total_signals,
+        "signals_filled": len(trades),
+        "total_trades": len(trades),
+        "winning_trades": len(wins),
+        "losing_trades": len(losses),
+        "breakeven_trades": len(results) - len(wins) - len(losses),
+        "win_rate": len(wins) / len(results) * 100 if results else None,
+        "average_rr": average_win / -average_loss if losses and wins else None,
+        "profit_factor": gross_profit / gross_loss if gross_loss > 0 else None,
+        "total_pips": float(sum(_trade_pips(t) for t in trades)),
+        "total_profit_loss": sum(results),
+        "largest_win": max(wins) if wins else None,
+        "largest_loss": min(losses) if losses else None,
+        "average_win": average_win if wins else None,
+        "average_loss": average_loss if losses else None,
+        "max_drawdown": max_drawdown,
+        "max_drawdown_percentage": max_drawdown_percentage,
+        "sharpe_ratio": sharpe_ratio,
+        "average_trade_duration_minutes": (
+            int(sum(durations) / len(durations)) if durations else None
+        ),
+    }
+
+
+def daily_performance(
+    trades: Iterable[Trade],
+    instrument: str = "XAUUSD",
+    account_balance: float = 10000.0,
+) -> List[Dict[str, Any]]:
+    """
+    Summarize closed trades per exit date.
+
+    Args:
+        trades: Closed trades
+        instrument: Trading instrument
+        account_balance: Balance used for daily drawdown and returns
+
+    Returns:
+        One summary per day with a ``metric_date`` key, oldest first
+    """
+    by_date: Dict[date, List[Trade]] = defaultdict(list)
+    for trade in trades:
+        if trade.is_closed:
+            by_date[trade.exit_time.date()].append(trade)
+
+    summaries = []
+    for metric_date in sorted(by_date):
+        summary = summarize_trades(by_date[metric_date], instrument, account_balance)
+        summary["metric_date"] = metric_date
+        summaries.append(summary)
+    return summaries
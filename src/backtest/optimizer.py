@@ -0,0 +1,479 @@
+"""
+Parameter optimization for XAUUSD Gold Trading System.
+
+Searches ``SMCConfig`` tunables with grid or random search and
+walk-forward validation. Candidates are backtested in worker
+processes that precompute the candle features once and reuse
+them for every candidate they evaluate.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import asyncio
+import itertools
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import logging
+
+import numpy as np
+
+from ..analysis.candle_buffer import CandleArrays, datetime_to_ns, ns_to_datetime
+from ..config import SMCConfig, get_settings
+from .engine import CandleFeatures, resample, simulate
+from .metrics import summarize_trades
+from .results_store import OptimizationStore
+
+
+# Discrete values, or a (low, high) range for random search
+ParameterSpace = Dict[str, Union[Sequence[Any], Tuple[float, float]]]
+
+
+def grid_candidates(space: ParameterSpace) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter space into every combination.
+
+    Args:
+        space: Parameter paths mapped to lists of values
+
+    Returns:
+        Candidate parameter dictionaries
+
+    Raises:
+        ValueError: If a parameter is given as a range
+    """
+    for path, values in space.items():
+        if isinstance(values, tuple):
+            raise ValueError(f"Grid search needs discrete values for {path}")
+
+    names = list(space)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(space[name] for name in names))
+    ]
+
+
+def random_candidates(
+    space: ParameterSpace, samples: int, seed: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Sample distinct candidates from a parameter space.
+
+    Lists are sampled uniformly; ``(low, high)`` ranges are sampled as
+    integers when both bounds are ints and as floats otherwise.
+
+    Args:
+        space: Parameter paths mapped to values or ranges
+        samples: Number of candidates wanted
+        seed: Random seed
+
+    Returns:
+        Up to ``samples`` distinct candidates
+    """
+    rng = random.Random(seed)
+    candidates: List[Dict[str, Any]] = []
+    seen = set()
+
+    for _ in range(samples * 10):
+        if len(candidates) >= samples:
+            break
+
+        params = {}
+        for path, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    params[path] = rng.randint(low, high)
+                else:
+                    params[path] = round(rng.uniform(low, high), 4)
+            else:
+                params[path] = rng.choice(list(values))
+
+        key = tuple(sorted(params.items()))
+        if key not in seen:
+            seen.add(key)
+            candidates.append(params)
+
+    return candidates
+
+
+def apply_smc_overrides(config: SMCConfig, params: Dict[str, Any]) -> SMCConfig:
+    """
+    Copy an SMC config with parameters replaced.
+
+    Args:
+        config: Base configuration (not modified)
+        params: Dotted paths relative to SMCConfig, e.g.
+            ``"fvg.min_size_pips"`` or ``"confluence_threshold"``
+
+    Returns:
+        New configuration
+
+    Raises:
+        ValueError: If a path does not name an SMC setting
+    """
+    config = config.model_copy(deep=True)
+    for path, value in params.items():
+        target = config
+        *parents, name = path.split(".")
+        for parent in parents:
+            target = getattr(target, parent, None)
+        if target is None or name not in type(target).model_fields:
+            raise ValueError(f"Unknown SMC parameter: {path}")
+        setattr(target, name, value)
+    return config
+
+
+# Per-process state, set up once by _init_worker
+_features: Optional[CandleFeatures] = None
+_base_smc: Optional[SMCConfig] = None
+
+
+def _init_worker(m15: CandleArrays, h1: CandleArrays, h4: CandleArrays):
+    """Precompute candle features once per worker process."""
+    global _features, _base_smc
+    _features = CandleFeatures(m15, h1, h4)
+    _base_smc = get_settings().smc
+
+
+def evaluate_candidate(
+    params: Dict[str, Any],
+    first: int,
+    last: int,
+    prune_loss_pct: Optional[float] = None,
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Backtest one candidate on the worker's cached features.
+
+    Module-level so it can be sent to worker processes.
+
+    Args:
+        params: SMC parameter overrides
+        first: First M15 index evaluated
+        last: M15 index after the last evaluated
+        prune_loss_pct: Abandon the candidate once its realized loss
+            exceeds this percentage of the account balance
+
+    Returns:
+        Tuple of (performance summary, pruned)
+    """
+    settings = get_settings()
+    balance = settings.trading.account_balance
+
+    should_stop = None
+    if prune_loss_pct:
+        limit = -Decimal(str(balance * prune_loss_pct / 100))
+
+        def should_stop(simulator) -> bool:
+            return simulator.realized_profit_loss < limit
+
+    settings.smc = apply_smc_overrides(_base_smc, params)
+    try:
+        result = asyncio.run(simulate(_features, first, last, should_stop))
+    finally:
+        settings.smc = _base_smc
+
+    summary = summarize_trades(
+        result.trades, _features.instrument, balance, result.signals
+    )
+    summary["bars"] = result.bars
+    summary["analysis_errors"] = result.analysis_errors
+    return summary, result.pruned
+
+
+@dataclass
+class CandidateResult:
+    """
+    Backtest outcome of one candidate on one window.
+
+    Attributes:
+        params: SMC parameter overrides
+        score: Objective value (None if undefined)
+        summary: Performance summary
+        pruned: True if the candidate was abandoned early
+        fold: Walk-forward fold (0 for a plain search)
+        phase: "train" or "test"
+        start: Window start
+        end: Window end
+    """
+
+    params: Dict[str, Any]
+    score: Optional[float]
+    summary: Dict[str, Any] = field(default_factory=dict)
+    pruned: bool = False
+    fold: int = 0
+    phase: str = "train"
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    @property
+    def rank_key(self) -> float:
+        """Sort key; pruned and undefined scores rank last."""
+        if self.pruned or self.score is None or math.isnan(self.score):
+            return -math.inf
+        return self.score
+
+    def to_dict(self) -> dict:
+        """Convert candidate result to dictionary representation."""
+        return {
+            "params": self.params,
+            "score": self.score,
+            "pruned": self.pruned,
+            "fold": self.fold,
+            "phase": self.phase,
+            "start": self.start.isoformat() if self.start else None,
+            "end": self.end.isoformat() if self.end else None,
+            "summary": self.summary,
+        }
+
+
+class ParameterOptimizer:
+    """
+    Grid, random and walk-forward search over SMC parameters.
+
+    Each worker receives the candle data once and builds
+    ``CandleFeatures`` in its initializer; tasks only carry the
+    candidate parameters and the index window to evaluate.
+    """
+
+    def __init__(
+        self,
+        space: ParameterSpace,
+        method: str = "grid",
+        samples: int = 20,
+        objective: str = "total_profit_loss",
+        max_workers: Optional[int] = None,
+        prune_loss_pct: Optional[float] = 3.0,
+        store: Optional[OptimizationStore] = None,
+        seed: int = 0,
+    ):
+        """
+        Initialize optimizer.
+
+        Args:
+            space: Parameter paths (relative to SMCConfig) and their values
+            method: "grid" or "random"
+            samples: Candidates drawn by random search
+            objective: Summary key to maximize
+            max_workers: Worker processes (CPU count if None, 0 runs inline)
+            prune_loss_pct: Loss, as % of balance, that prunes a candidate
+                (None disables pruning)
+            store: Results store (results are not persisted if None)
+            seed: Random search seed
+
+        Raises:
+            ValueError: If the method or a parameter path is invalid
+        """
+        if method == "grid":
+            self.candidates = grid_candidates(space)
+        elif method == "random":
+            self.candidates = random_candidates(space, samples, seed)
+        else:
+            raise ValueError(f"Unknown search method: {method}")
+
+        # Fail on bad paths before starting any workers
+        base = get_settings().smc
+        for params in self.candidates[:1]:
+            apply_smc_overrides(base, params)
+
+        self.space = space
+        self.method = method
+        self.objective = objective
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        self.max_workers = max_workers
+        self.prune_loss_pct = prune_loss_pct
+        self.store = store
+        self.run_id: Optional[int] = None
+        self.logger = logging.getLogger(__name__)
+
+    def search(
+        self,
+        m15: CandleArrays,
+        h1: Optional[CandleArrays] = None,
+        h4: Optional[CandleArrays] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[CandidateResult]:
+        """
+        Evaluate every candidate on one window.
+
+        Args:
+            m15: M15 candles, including warm-up history before ``start``
+            h1: H1 candles (resampled from M15 if None)
+            h4: H4 candles (resampled from M15 if None)
+            start: Window start (data start if None)
+            end: Window end (data end if None)
+
+        Returns:
+            Candidate results, best first
+        """
+        h1, h4 = self._higher_timeframes(m15, h1, h4)
+        with self._workers(m15, h1, h4) as evaluate:
+            first, last = self._bounds(m15, start, end)
+            results = self._evaluate(evaluate, self.candidates, first, last, m15)
+
+        results.sort(key=lambda r: r.rank_key, reverse=True)
+        self._record(results)
+        return results
+
+    def walk_forward(
+        self,
+        m15: CandleArrays,
+        h1: Optional[CandleArrays] = None,
+        h4: Optional[CandleArrays] = None,
+        train_days: int = 60,
+        test_days: int = 20,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[CandidateResult]:
+        """
+        Walk-forward optimization.
+
+        Each fold searches all candidates on ``train_days`` and then
+        evaluates the best candidate on the following ``test_days``;
+        folds advance by ``test_days``.
+
+        Args:
+            m15: M15 candles
+            h1: H1 candles (resampled from M15 if None)
+            h4: H4 candles (resampled from M15 if None)
+            train_days: In-sample window length
+            test_days: Out-of-sample window length
+            start: First training window start (data start if None)
+            end: Last test window end (data end if None)
+
+        Returns:
+            Out-of-sample results, one per fold
+        """
+        h1, h4 = self._higher_timeframes(m15, h1, h4)
+        if len(m15) == 0:
+            return []
+
+        start = start or ns_to_datetime(m15.timestamp[0])
+        end = end or ns_to_datetime(m15.timestamp[-1]) + timedelta(minutes=15)
+        train = timedelta(days=train_days)
+        test = timedelta(days=test_days)
+
+        folds = []
+        with self._workers(m15, h1, h4) as evaluate:
+            fold = 0
+            while start + train + test <= end:
+                fold += 1
+                train_first, train_last = self._bounds(m15, start, start + train)
+                trained = self._evaluate(
+                    evaluate, self.candidates, train_first, train_last, m15, fold
+                )
+                trained.sort(key=lambda r: r.rank_key, reverse=True)
+                self._record(trained)
+
+                best = trained[0]
+                test_first, test_last = self._bounds(
+                    m15, start + train, start + train + test
+                )
+                (tested,) = self._evaluate(
+                    evaluate, [best.params], test_first, test_last, m15, fold, "test"
+                )
+                self._record([tested])
+                folds.append(tested)
+
+                self.logger.info(
+                    f"Walk-forward fold {fold}: best {best.params} scored "
+                    f"{best.score} in sample, {tested.score} out of sample"
+                )
+                start += test
+
+        return folds
+
+    def _higher_timeframes(
+        self,
+        m15: CandleArrays,
+        h1: Optional[CandleArrays],
+        h4: Optional[CandleArrays],
+    ) -> Tuple[CandleArrays, CandleArrays]:
+        """Resample missing higher timeframes."""
+        return (
+            h1 if h1 is not None else resample(m15, "H1"),
+            h4 if h4 is not None else resample(m15, "H4"),
+        )
+
+    @staticmethod
+    def _bounds(
+        m15: CandleArrays, start: Optional[datetime], end: Optional[datetime]
+    ) -> Tuple[int, int]:
+        """Convert a time window to M15 indexes."""
+        first, last = 0, len(m15)
+        if start is not None:
+            first = int(np.searchsorted(m15.timestamp, datetime_to_ns(start)))
+        if end is not None:
+            last = int(np.searchsorted(m15.timestamp, datetime_to_ns(end)))
+        return first, last
+
+    @contextmanager
+    def _workers(self, m15: CandleArrays, h1: CandleArrays, h4: CandleArrays):
+        """Yield a function mapping evaluate_candidate over argument tuples."""
+        global _features, _base_smc
+
+        if self.max_workers <= 0 or len(self.candidates) <= 1:
+            previous = (_features, _base_smc)
+            _init_worker(m15, h1, h4)
+            try:
+                yield lambda tasks: [evaluate_candidate(*task) for task in tasks]
+            finally:
+                _features, _base_smc = previous
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(self.candidates)),
+            initializer=_init_worker,
+            initargs=(m15, h1, h4),
+        ) as pool:
+            yield lambda tasks: list(pool.map(evaluate_candidate, *zip(*tasks)))
+
+    def _evaluate(
+        self,
+        evaluate,
+        candidates: List[Dict[str, Any]],
+        first: int,
+        last: int,
+        m15: CandleArrays,
+        fold: int = 0,
+        phase: str = "train",
+    ) -> List[CandidateResult]:
+        """Evaluate candidates on one index window."""
+        tasks = [(params, first, last, self.prune_loss_pct) for params in candidates]
+        window_start = ns_to_datetime(m15.timestamp[first]) if first < last else None
+        window_end = ns_to_datetime(m15.timestamp[last - 1]) if first < last else None
+
+        results = []
+        for params, (summary, pruned) in zip(candidates, evaluate(tasks)):
+            score = summary.get(self.objective)
+            results.append(
+                CandidateResult(
+                    params=params,
+                    score=float(score) if score is not None else None,
+                    summary=summary,
+                    pruned=pruned,
+                    fold=fold,
+                    phase=phase,
+                    start=window_start,
+                    end=window_end,
+                )
+            )
+        return results
+
+    def _record(self, results: List[CandidateResult]):
+        """Persist results to the store."""
+        if self.store is None:
+            return
+        if self.run_id is None:
+            self.run_id = self.store.create_run(
+                self.method, self.objective, self.space
+            )
+        self.store.add_results(self.run_id, results)
@@ -0,0 +1,236 @@
+"""
+Optimization results store for XAUUSD Gold Trading System.
+
+Keeps optimization runs and per-candidate results in a local
+SQLite file so they can be compared and queried after the run.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..core.clock import utcnow
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS optimization_runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    method TEXT NOT NULL,
+    objective TEXT NOT NULL,
+    space TEXT NOT NULL,
+    notes TEXT
+);
+CREATE TABLE IF NOT EXISTS optimization_results (
+    result_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES optimization_runs(run_id),
+    fold INTEGER NOT NULL,
+    phase TEXT NOT NULL CHECK (phase IN ('train', 'test')),
+    params TEXT NOT NULL,
+    score REAL,
+    pruned INTEGER NOT NULL DEFAULT 0,
+    total_trades INTEGER,
+    win_rate REAL,
+    profit_factor REAL,
+    total_profit_loss REAL,
+    max_drawdown REAL,
+    start_time TEXT,
+    end_time TEXT,
+    summary TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_optimization_results_run
+    ON optimization_results (run_id, phase, score);
+"""
+
+
+class OptimizationStore:
+    """
+    SQLite store for optimization runs.
+
+    Parameters and full summaries are stored as JSON; the common
+    metrics are also stored as columns for filtering and sorting.
+    """
+
+    def __init__(self, path: str = "data/optimization.sqlite"):
+        """
+        Open or create the store.
+
+        Args:
+            path: Database file (":memory:" for a temporary store)
+        """
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def create_run(
+        self,
+        method: str,
+        objective: str,
+        space: Dict[str, Any],
+        notes: Optional[str] = None,
+    ) -> int:
+        """
+        Record a new optimization run.
+
+        Args:
+            method: Search method ("grid" or "random")
+            objective: Summary key being maximized
+            space: Parameter space searched
+            notes: Free-form notes
+
+        Returns:
+            Run ID
+        """
+        cursor = self._conn.execute(
+            "INSERT INTO optimization_runs"
+            " (created_at, method, objective, space, notes) VALUES (?, ?, ?, ?, ?)",
+            (
+                utcnow().isoformat(),
+                method,
+                objective,
+                json.dumps(space, default=str),
+                notes,
+            ),
+        )
+        self._conn.commit()
+        return cursor.lastrowid
+
+    def add_results(self, run_id: int, results: Sequence[Any]):
+        """
+        Store candidate results.
+
+        Args:
+            run_id: Run the results belong to
+            results: CandidateResult objects
+        """
+        rows = []
+        for result in results:
+            summary = result.summary
+            rows.append(
+                (
+                    run_id,
+                    result.fold,
+                    result.phase,
+                    json.dumps(result.params, sort_keys=True),
+                    result.score,
+                    int(result.pruned),
+                    summary.get("total_trades"),
+                    summary.get("win_rate"),
+                    summary.get("profit_factor"),
+                    summary.get("total_profit_loss"),
+                    summary.get("max_drawdown"),
+                    result.start.isoformat() if result.start else None,
+                    result.end.isoformat() if result.end else None,
+                    json.dumps(summary, default=str),
+                )
+            )
+
+        self._conn.executemany(
+            "INSERT INTO optimization_results (run_id, fold, phase, params, score,"
+            " pruned, total_trades, win_rate, profit_factor, total_profit_loss,"
+            " max_drawdown, start_time, end_time, summary)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self._conn.commit()
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """
+        Get all runs, newest first.
+
+        Returns:
+            Run dictionaries
+        """
+        rows = self._conn.execute(
+            "SELECT * FROM optimization_runs ORDER BY run_id DESC"
+        ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def results(
+        self,
+        run_id: int,
+        phase: Optional[str] = None,
+        fold: Optional[int] = None,
+        include_pruned: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get results of a run ordered by fold and score.
+
+        Args:
+            run_id: Run ID
+            phase: Only "train" or "test" results
+            fold: Only results of this fold
+            include_pruned: Include pruned candidates
+
+        Returns:
+            Result dictionaries
+        """
+        sql = "SELECT * FROM optimization_results WHERE run_id = ?"
+        params: List[Any] = [run_id]
+        if phase is not None:
+            sql += " AND phase = ?"
+            params.append(phase)
+        if fold is not None:
+            sql += " AND fold = ?"
+            params.append(fold)
+        if not include_pruned:
+            sql += " AND pruned = 0"
+        sql += " ORDER BY fold, score DESC"
+        return [self._row(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def best(
+        self, run_id: int, phase: str = "train", limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the best unpruned results of a run.
+
+        Args:
+            run_id: Run ID
+            phase: "train" or "test"
+            limit: Maximum results
+
+        Returns:
+            Result dictionaries, best first
+        """
+        rows = self._conn.execute(
+            "SELECT * FROM optimization_results"
+            " WHERE run_id = ? AND phase = ? AND pruned = 0 AND score IS NOT NULL"
+            " ORDER BY score DESC LIMIT ?",
+            (run_id, phase, limit),
+        ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """
+        Run an ad hoc read query.
+
+        Args:
+            sql: SQL statement
+            params: Statement parameters
+
+        Returns:
+            Row dictionaries
+        """
+        return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a row, decoding JSON columns."""
+        data = dict(row)
+        for key in ("params", "space", "summary"):
+            if data.get(key) is not None:
+                data[key] = json.loads(data[key])
+        return data
@@ -0,0 +1,679 @@
+"""
+Synthetic market generator for XAUUSD Gold Trading System.
+
+Generates realistic-looking XAUUSD tick streams for load and soak
+testing: trending, ranging and volatile regimes with random
+durations, clustered volatility, tick rates that follow the trading
+sessions, price jumps, and news events (such as NFP) that widen the
+spread and multiply the tick rate. Ticks are generated in vectorized
+chunks of tick journal records, and ``LoadGenerator`` paces them into
+a MarketDataProcessor or the WebSocket server while sampling memory.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+
+import numpy as np
+import psutil
+
+from ..analysis.candle_buffer import datetime_to_ns, ns_to_datetime
+from ..models.market_data import Tick
+from ..models.price import PRICE_SCALE, from_price_units
+from ..storage.tick_journal import RECORD_DTYPE
+
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_HOUR = 3600 * NS_PER_SECOND
+
+# Ticks per second by UTC hour: quiet Asia, London, the London/New York
+# overlap, then the thin hour around the 21:00 rollover
+SESSION_TICK_RATES = (
+    1.5, 1.5, 1.5, 1.5, 1.5, 1.5, 2.0, 3.0,
+    5.0, 5.0, 5.0, 5.0, 6.0, 8.0, 8.0, 8.0,
+    6.0, 4.0, 3.0, 3.0, 2.0, 0.8, 1.5, 1.5,
+)  # fmt: skip
+
+# Spread multiplier by UTC hour (widest over the rollover)
+SESSION_SPREADS = (
+    1.3, 1.3, 1.2, 1.2, 1.2, 1.2, 1.1, 1.0,
+    1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0,
+    1.0, 1.0, 1.1, 1.1, 1.2, 3.0, 1.8, 1.4,
+)  # fmt: skip
+
+# Largest chunk generated at once; also bounds the volatility recursion
+MAX_CHUNK = 256
+
+
+@dataclass(frozen=True)
+class MarketRegime:
+    """
+    A market regime.
+
+    Attributes:
+        name: Regime name
+        drift: Mean price change per hour
+        volatility: Multiplier of the base volatility
+        tick_rate: Multiplier of the session tick rate
+        spread: Multiplier of the base spread
+        mean_duration: Mean regime length in seconds
+    """
+
+    name: str
+    drift: float = 0.0
+    volatility: float = 1.0
+    tick_rate: float = 1.0
+    spread: float = 1.0
+    mean_duration: float = 3600.0
+
+
+DEFAULT_REGIMES = (
+    MarketRegime("ranging", 0.0, 0.8, 0.9, 1.0, 5400.0),
+    MarketRegime("trending_up", 4.0, 1.0, 1.1, 1.0, 3600.0),
+    MarketRegime("trending_down", -4.0, 1.0, 1.1, 1.0, 3600.0),
+    MarketRegime("volatile", 0.0, 2.5, 1.8, 1.6, 1200.0),
+)
+
+
+@dataclass(frozen=True)
+class MarketEvent:
+    """
+    A scheduled news release.
+
+    Attributes:
+        at: Release time (naive UTC)
+        duration_seconds: How long the reaction lasts
+        volatility: Volatility multiplier during the event
+        tick_rate: Tick rate multiplier during the event
+        spread: Spread multiplier during the event
+        gap: Price jump at release (random direction and size if None)
+        name: Event name
+    """
+
+    at: datetime
+    duration_seconds: float = 900.0
+    volatility: float = 6.0
+    tick_rate: float = 8.0
+    spread: float = 5.0
+    gap: Optional[float] = None
+    name: str = "news"
+
+    @classmethod
+    def nfp(cls, at: datetime) -> "MarketEvent":
+        """Non-farm payrolls release: a gap, then 20 minutes of turbulence."""
+        return cls(
+            at, 1200.0, volatility=8.0, tick_rate=10.0, spread=6.0, name="NFP"
+        )
+
+    @property
+    def start_ns(self) -> int:
+        """Release time in epoch nanoseconds."""
+        return datetime_to_ns(self.at)
+
+    @property
+    def end_ns(self) -> int:
+        """End of the reaction in epoch nanoseconds."""
+        return self.start_ns + int(self.duration_seconds * NS_PER_SECOND)
+
+
+@dataclass
+class SyntheticMarketConfig:
+    """
+    Synthetic market parameters.
+
+    Attributes:
+        symbol: Trading symbol
+        start: Time of the first tick (naive UTC)
+        start_price: Initial mid price
+        volatility: Base volatility in price per sqrt(second)
+        volatility_persistence: Per-tick AR(1) coefficient of log volatility
+        volatility_of_volatility: Per-tick shock size of log volatility
+        spread: Base spread
+        tick_rate_scale: Multiplier of the session tick rates
+        jumps_per_hour: Mean number of price jumps per hour
+        jump_size: Standard deviation of a jump
+        regimes: Regimes switched between at random
+        events: Scheduled news events
+        price_decimals: Decimal places of quoted prices
+    """
+
+    symbol: str = "XAUUSD"
+    start: datetime = datetime(2024, 1, 2)
+    start_price: float = 2000.0
+    volatility: float = 0.07
+    volatility_persistence: float = 0.995
+    volatility_of_volatility: float = 0.03
+    spread: float = 0.20
+    tick_rate_scale: float = 1.0
+    jumps_per_hour: float = 0.5
+    jump_size: float = 1.5
+    regimes: Tuple[MarketRegime, ...] = DEFAULT_REGIMES
+    events: List[MarketEvent] = field(default_factory=list)
+    price_decimals: int = 2
+
+    def __post_init__(self):
+        """Validate parameters."""
+        if not 0.5 <= self.volatility_persistence < 1:
+            raise ValueError(
+                "Volatility persistence must be in [0.5, 1), "
+                f"got {self.volatility_persistence}"
+            )
+        if self.tick_rate_scale <= 0:
+            raise ValueError(
+                f"Tick rate scale must be positive, got {self.tick_rate_scale}"
+            )
+        if not self.regimes:
+            raise ValueError("At least one regime is required")
+
+
+def scenario_config(
+    name: str,
+    start: Optional[datetime] = None,
+    tick_rate_scale: float = 1.0,
+    symbol: str = "XAUUSD",
+) -> SyntheticMarketConfig:
+    """
+    Build a named scenario.
+
+    Scenarios:
+        normal: Default regimes from ``start``
+        nfp: Starts five minutes before an NFP release
+        stress: A volatile regime only, with frequent jumps
+
+    Args:
+        name: Scenario name
+        start: First tick time (defaults to 2024-01-05 12:25 UTC for nfp,
+            2024-01-02 otherwise)
+        tick_rate_scale: Multiplier of the session tick rates
+        symbol: Trading symbol
+
+    Returns:
+        Market configuration
+
+    Raises:
+        ValueError: If the scenario is unknown
+    """
+    if name == "normal":
+        return SyntheticMarketConfig(
+            symbol=symbol,
+            start=start or datetime(2024, 1, 2),
+            tick_rate_scale=tick_rate_scale,
+        )
+    if name == "nfp":
+        start = start or datetime(2024, 1, 5, 12, 25)
+        return SyntheticMarketConfig(
+            symbol=symbol,
+            start=start,
+            tick_rate_scale=tick_rate_scale,
+            events=[MarketEvent.nfp(start + timedelta(minutes=5))],
+        )
+    if name == "stress":
+        return SyntheticMarketConfig(
+            symbol=symbol,
+            start=start or datetime(2024, 1, 2, 13),
+            tick_rate_scale=tick_rate_scale,
+            jumps_per_hour=12.0,
+            regimes=(replace(DEFAULT_REGIMES[3], mean_duration=86400.0),),
+        )
+    raise ValueError(f"Unknown scenario '{name}'. Must be one of: normal, nfp, stress")
+
+
+class SyntheticMarket:
+    """
+    Seeded synthetic tick generator.
+
+    Output is a function of the configuration and seed only, so a
+    load test can be rerun on identical data. Rates, regimes and
+    event multipliers are piecewise constant: each chunk stops at the
+    next hour, regime switch or event boundary.
+    """
+
+    def __init__(
+        self, config: Optional[SyntheticMarketConfig] = None, seed: Optional[int] = None
+    ):
+        """
+        Initialize synthetic market.
+
+        Args:
+            config: Market parameters
+            seed: Random seed
+        """
+        self.config = config or SyntheticMarketConfig()
+        self.rng = np.random.default_rng(seed)
+        self._unit = 10.0**-self.config.price_decimals
+        self._events = sorted(self.config.events, key=lambda event: event.at)
+
+        self.time_ns = datetime_to_ns(self.config.start)
+        self.mid = self.config.start_price
+        self.log_volatility = 0.0
+        self.regime = self.config.regimes[0]
+        self._regime_end_ns = self.time_ns
+        self._gapped = set()
+        self.generated = 0
+
+    def _switch_regime(self):
+        """Pick the next regime and its duration."""
+        regimes = self.config.regimes
+        self.regime = regimes[int(self.rng.integers(len(regimes)))]
+        duration = self.rng.exponential(self.regime.mean_duration)
+        self._regime_end_ns = self.time_ns + max(1, int(duration * NS_PER_SECOND))
+
+    def _active_event(self) -> Tuple[Optional[MarketEvent], int]:
+        """
+        Get the event in force now and the next event boundary.
+
+        Returns:
+            (active event or None, epoch-ns of the next start or end)
+        """
+        now = self.time_ns
+        for event in self._events:
+            if event.start_ns <= now < event.end_ns:
+                return event, event.end_ns
+            if event.start_ns > now:
+                return None, event.start_ns
+        return None, np.iinfo(np.int64).max
+
+    def generate(self, count: int) -> np.ndarray:
+        """
+        Generate the next ticks.
+
+        Args:
+            count: Number of ticks
+
+        Returns:
+            Tick journal records (epoch-ns and integer price units)
+        """
+        chunks = []
+        remaining = count
+        while remaining > 0:
+            chunk = self._generate_chunk(min(remaining, MAX_CHUNK))
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        if not chunks:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
+    def _generate_chunk(self, count: int) -> np.ndarray:
+        """Generate up to ``count`` ticks before the next boundary."""
+        config = self.config
+        rng = self.rng
+
+        if self.time_ns >= self._regime_end_ns:
+            self._switch_regime()
+        event, event_boundary = self._active_event()
+        hour = int(self.time_ns // NS_PER_HOUR % 24)
+        boundary = min(
+            (self.time_ns // NS_PER_HOUR + 1) * NS_PER_HOUR,
+            self._regime_end_ns,
+            event_boundary,
+        )
+
+        regime = self.regime
+        rate = SESSION_TICK_RATES[hour] * config.tick_rate_scale * regime.tick_rate
+        volatility = config.volatility * regime.volatility
+        spread = config.spread * SESSION_SPREADS[hour] * regime.spread
+        if event is not None:
+            rate *= event.tick_rate
+            volatility *= event.volatility
+            spread *= event.spread
+
+        # Arrival times; ticks past the boundary wait for the next chunk
+        gaps_ns = np.maximum(
+            1, (rng.exponential(1.0 / rate, count) * NS_PER_SECOND).astype(np.int64)
+        )
+        timestamps = self.time_ns + np.cumsum(gaps_ns)
+        count = max(1, int(np.searchsorted(timestamps, boundary, side="left")))
+        timestamps = timestamps[:count]
+        dt = gaps_ns[:count] / NS_PER_SECOND
+
+        # Log volatility follows an AR(1) per tick, in closed form:
+        # v[i] = phi^i * (v0 + sum_{k<=i} phi^-k * e[k])
+        phi = config.volatility_persistence
+        powers = phi ** np.arange(1, count + 1)
+        shocks = rng.normal(0.0, config.volatility_of_volatility, count)
+        log_volatility = powers * (self.log_volatility + np.cumsum(shocks / powers))
+        sigma = volatility * np.exp(log_volatility)
+
+        moves = regime.drift / 3600.0 * dt + sigma * np.sqrt(dt) * rng.normal(
+            size=count
+        )
+        jumps = rng.random(count) < config.jumps_per_hour * dt / 3600.0
+        if jumps.any():
+            moves[jumps] += rng.normal(0.0, config.jump_size, int(jumps.sum()))
+        if event is not None and event.at not in self._gapped:
+            self._gapped.add(event.at)
+            gap = event.gap
+            if gap is None:
+                gap = rng.choice((-1.0, 1.0)) * rng.uniform(2.0, 10.0)
+            moves[0] += gap
+
+        mid = np.maximum(self.mid + np.cumsum(moves), 100 * self._unit)
+
+        # Spreads widen with volatility, never below one price step
+        spreads = spread * np.clip(np.exp(log_volatility), 1.0, 4.0)
+        spreads = np.maximum(np.round(spreads / self._unit), 1) * self._unit
+        bid = np.round((mid - spreads / 2) / self._unit) * self._unit
+        ask = bid + spreads
+
+        records = np.empty(count, dtype=RECORD_DTYPE)
+        records["timestamp_ns"] = timestamps
+        records["bid"] = np.rint(bid * PRICE_SCALE)
+        records["ask"] = np.rint(ask * PRICE_SCALE)
+        records["last"] = records["bid"]
+        records["volume"] = 1 + rng.poisson(sigma / config.volatility)
+
+        self.time_ns = int(timestamps[-1])
+        self.mid = float(mid[-1])
+        self.log_volatility = float(log_volatility[-1])
+        self.generated += count
+        return records
+
+    def to_ticks(self, records: np.ndarray) -> List[Tick]:
+        """
+        Convert generated records to ticks.
+
+        Args:
+            records: Records from ``generate``
+
+        Returns:
+            Ticks in time order
+        """
+        symbol = self.config.symbol
+        return [
+            Tick.from_trusted(
+                symbol,
+                ns_to_datetime(timestamp_ns),
+                from_price_units(bid),
+                from_price_units(ask),
+                from_price_units(last),
+                volume,
+            )
+            for timestamp_ns, bid, ask, last, volume in records.tolist()
+        ]
+
+    def ticks(self, count: Optional[int] = None) -> Iterator[Tick]:
+        """
+        Iterate over generated ticks.
+
+        Args:
+            count: Number of ticks (unbounded if None)
+
+        Yields:
+            Ticks in time order
+        """
+        remaining = count
+        while remaining is None or remaining > 0:
+            size = MAX_CHUNK if remaining is None else min(remaining, MAX_CHUNK)
+            records = self.generate(size)
+            if remaining is not None:
+                remaining -= len(records)
+            yield from self.to_ticks(records)
+
+
+@dataclass
+class LoadReport:
+    """
+    Outcome of a load run.
+
+    Attributes:
+        target: What was loaded (processor or WebSocket URI)
+        scenario: Market scenario name
+        requested_rate: Target ticks per second (None for unpaced)
+        ticks_sent: Ticks delivered
+        elapsed_seconds: Wall time of the run
+        max_lag_seconds: Furthest the sender fell behind schedule
+        rss_start_mb: Resident memory at start
+        rss_end_mb: Resident memory at end
+        rss_peak_mb: Highest sampled resident memory
+        memory_samples: (elapsed seconds, RSS MB) samples
+        processor: Processor status at the end, if loaded directly
+    """
+
+    target: str
+    scenario: str = "custom"
+    requested_rate: Optional[float] = None
+    ticks_sent: int = 0
+    elapsed_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+    rss_start_mb: float = 0.0
+    rss_end_mb: float = 0.0
+    rss_peak_mb: float = 0.0
+    memory_samples: List[Tuple[float, float]] = field(default_factory=list)
+    processor: Optional[Dict[str, Any]] = None
+
+    @property
+    def ticks_per_second(self) -> float:
+        """Achieved delivery rate."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.ticks_sent / self.elapsed_seconds
+
+    @property
+    def memory_growth_mb(self) -> float:
+        """Resident memory growth over the run."""
+        return self.rss_end_mb - self.rss_start_mb
+
+    def to_dict(self) -> dict:
+        """Convert load report to dictionary."""
+        return {
+            "target": self.target,
+            "scenario": self.scenario,
+            "requested_rate": self.requested_rate,
+            "ticks_sent": self.ticks_sent,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "ticks_per_second": round(self.ticks_per_second, 1),
+            "max_lag_seconds": round(self.max_lag_seconds, 3),
+            "rss_start_mb": round(self.rss_start_mb, 1),
+            "rss_end_mb": round(self.rss_end_mb, 1),
+            "rss_peak_mb": round(self.rss_peak_mb, 1),
+            "memory_growth_mb": round(self.memory_growth_mb, 1),
+            "memory_samples": [
+                (round(at, 2), round(rss, 1)) for at, rss in self.memory_samples
+            ],
+            "processor": self.processor,
+        }
+
+
+def _rss_mb() -> float:
+    """Resident memory of this process in MB."""
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+class LoadGenerator:
+    """
+    Paces synthetic ticks into a consumer.
+
+    With a rate, ticks are sent in batches on a fixed schedule and
+    the report records how far the sender fell behind; without one
+    they are sent as fast as the consumer accepts them. With
+    ``live_timestamps`` ticks are restamped with the wall clock at
+    send time, so a live processor closes candles normally however
+    fast market time runs.
+    """
+
+    def __init__(
+        self,
+        market: SyntheticMarket,
+        rate: Optional[float] = None,
+        batch_size: int = 100,
+        live_timestamps: bool = False,
+        sample_interval: float = 1.0,
+        scenario: str = "custom",
+    ):
+        """
+        Initialize load generator.
+
+        Args:
+            market: Tick source
+            rate: Ticks per second (unpaced if None)
+            batch_size: Ticks sent per scheduling step
+            live_timestamps: Restamp ticks with the wall clock
+            sample_interval: Seconds between memory samples
+            scenario: Scenario name for the report
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        if batch_size <= 0:
+            raise ValueError(f"Batch size must be positive, got {batch_size}")
+
+        self.market = market
+        self.rate = rate
+        self.batch_size = batch_size
+        self.live_timestamps = live_timestamps
+        self.sample_interval = sample_interval
+        self.scenario = scenario
+        self.logger = logging.getLogger(__name__)
+        self._last_stamp_ns = 0
+
+    def _restamp(self, records: np.ndarray):
+        """Spread wall-clock timestamps over a batch."""
+        now_ns = time.time_ns()
+        start_ns = max(self._last_stamp_ns, now_ns - 1_000_000)
+        records["timestamp_ns"] = np.linspace(
+            start_ns, max(start_ns, now_ns), len(records)
+        ).astype(np.int64)
+        self._last_stamp_ns = int(records["timestamp_ns"][-1])
+
+    async def run(
+        self,
+        send: Callable[[np.ndarray], Awaitable[None]],
+        target: str,
+        count: Optional[int] = None,
+        duration: Optional[float] = None,
+    ) -> LoadReport:
+        """
+        Deliver ticks until the count or duration is reached.
+
+        Args:
+            send: Coroutine consuming a batch of records
+            target: Target name for the report
+            count: Ticks to send
+            duration: Seconds to run
+
+        Returns:
+            Load report
+
+        Raises:
+            ValueError: If neither count nor duration is given
+        """
+        if count is None and duration is None:
+            raise ValueError("A tick count or a duration is required")
+
+        report = LoadReport(target, self.scenario, self.rate)
+        report.rss_start_mb = report.rss_peak_mb = _rss_mb()
+        started = time.perf_counter()
+        next_sample = 0.0
+
+        while count is None or report.ticks_sent < count:
+            elapsed = time.perf_counter() - started
+            if duration is not None and elapsed >= duration:
+                break
+
+            if elapsed >= next_sample:
+                rss = _rss_mb()
+                report.memory_samples.append((elapsed, rss))
+                report.rss_peak_mb = max(report.rss_peak_mb, rss)
+                next_sample = elapsed + self.sample_interval
+
+            size = self.batch_size
+            if count is not None:
+                size = min(size, count - report.ticks_sent)
+            records = self.market.generate(size)
+            if self.live_timestamps:
+                self._restamp(records)
+
+            if self.rate is not None:
+                due = report.ticks_sent / self.rate
+                delay = due - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    report.max_lag_seconds = max(report.max_lag_seconds, -delay)
+
+            await send(records)
+            report.ticks_sent += len(records)
+
+        report.elapsed_seconds = time.perf_counter() - started
+        report.rss_end_mb = _rss_mb()
+        report.rss_peak_mb = max(report.rss_peak_mb, report.rss_end_mb)
+        self.logger.info(
+            f"Sent {report.ticks_sent} ticks to {target} in "
+            f"{report.elapsed_seconds:.1f}s ({report.ticks_per_second:,.0f} ticks/s), "
+            f"RSS {report.rss_start_mb:.0f} -> {report.rss_end_mb:.0f} MB"
+        )
+        return report
+
+    async def to_processor(
+        self,
+        processor: Any,
+        count: Optional[int] = None,
+        duration: Optional[float] = None,
+    ) -> LoadReport:
+        """
+        Feed a started MarketDataProcessor through ``process_tick``.
+
+        Args:
+            processor: Running MarketDataProcessor
+            count: Ticks to send
+            duration: Seconds to run
+
+        Returns:
+            Load report including the processor status
+        """
+
+        async def send(records: np.ndarray):
+            for tick in self.market.to_ticks(records):
+                await processor.process_tick(tick)
+
+        report = await self.run(send, "processor", count, duration)
+        report.processor = processor.get_status()
+        return report
+
+    async def to_websocket(
+        self,
+        uri: str,
+        count: Optional[int] = None,
+        duration: Optional[float] = None,
+    ) -> LoadReport:
+        """
+        Send tick messages to a WebSocket server.
+
+        Messages use epoch-millisecond timestamps, as the tick
+        decoders expect.
+
+        Args:
+            uri: Server URI (e.g. ws://localhost:8001)
+            count: Ticks to send
+            duration: Seconds to run
+
+        Returns:
+            Load report
+        """
+        import websockets
+
+        symbol = self.market.config.symbol
+
+        async with websockets.connect(uri) as websocket:
+
+            async def send(records: np.ndarray):
+                for timestamp_ns, bid, ask, _, volume in records.tolist():
+                    await websocket.send(
+                        json.dumps(
+                            {
+                                "type": "tick",
+                                "symbol": symbol,
+                                "timestamp": timestamp_ns // 1_000_000,
+                                "bid": str(from_price_units(bid)),
+                                "ask": str(from_price_units(ask)),
+                                "volume": volume,
+                            }
+                        )
+                    )
+
+            return await self.run(send, uri, count, duration)
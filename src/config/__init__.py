@@ -12,6 +12,7 @@ from .database import DatabaseConfig
 from .trading import TradingConfig
 from .smc import SMCConfig
 from .telegram import TelegramConfig
+from .market_data import MarketDataConfig
 
 __all__ = [
     "Settings",
@@ -20,4 +21,5 @@ __all__ = [
     "TradingConfig",
     "SMCConfig",
     "TelegramConfig",
+    "MarketDataConfig",
 ]
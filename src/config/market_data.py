@@ -0,0 +1,169 @@
+"""
+Market data configuration for XAUUSD Gold Trading System.
+
+Manages tick ingestion, candle aggregation and
+candle window parameters.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+from typing import List, Optional
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+SUPPORTED_TIMEFRAMES = ["M1", "M5", "M15", "H1", "H4", "D1"]
+OVERFLOW_POLICIES = ["block", "drop_oldest", "drop_newest"]
+
+
+class MarketDataConfig(BaseSettings):
+    """
+    Market data processing configuration.
+
+    Defines aggregated timeframes, candle window sizes
+    and gap handling for the tick-to-candle pipeline.
+    """
+
+    # Candle aggregation
+    timeframes: List[str] = Field(
+        default_factory=lambda: list(SUPPORTED_TIMEFRAMES), env="MD_TIMEFRAMES"
+    )
+    window_size: int = Field(default=200, ge=50, le=5000, env="MD_WINDOW_SIZE")
+
+    # Tick micro-batching
+    max_batch_size: int = Field(default=100, ge=1, le=1000, env="MD_MAX_BATCH_SIZE")
+    max_batch_latency_ms: float = Field(
+        default=50.0, ge=1.0, le=5000.0, env="MD_MAX_BATCH_LATENCY_MS"
+    )
+
+    # Per-symbol shards
+    shard_queue_size: int = Field(
+        default=5000, ge=100, le=100000, env="MD_SHARD_QUEUE_SIZE"
+    )
+    shard_overflow_policy: str = Field(
+        default="drop_oldest", env="MD_SHARD_OVERFLOW_POLICY"
+    )
+    tick_history_size: int = Field(
+        default=1000, ge=0, le=100000, env="MD_TICK_HISTORY_SIZE"
+    )
+
+    # Gap handling
+    fill_gaps: bool = Field(default=True, env="MD_FILL_GAPS")
+    max_gap_fill_bars: int = Field(
+        default=30, ge=0, le=1440, env="MD_MAX_GAP_FILL_BARS"
+    )
+    close_grace_seconds: float = Field(
+        default=2.0, ge=0.0, le=60.0, env="MD_CLOSE_GRACE_SECONDS"
+    )
+    candle_clock_interval_seconds: float = Field(
+        default=1.0, ge=0.1, le=60.0, env="MD_CANDLE_CLOCK_INTERVAL"
+    )
+
+    # Price representation
+    fixed_point_prices: bool = Field(default=False, env="MD_FIXED_POINT_PRICES")
+
+    # Tick journal
+    journal_enabled: bool = Field(default=False, env="MD_JOURNAL_ENABLED")
+    journal_directory: str = Field(default="data/tick_journal", env="MD_JOURNAL_DIR")
+    journal_segment_ticks: int = Field(
+        default=1 << 20, ge=1024, le=1 << 26, env="MD_JOURNAL_SEGMENT_TICKS"
+    )
+
+    # Historical candle store
+    candle_store_directory: str = Field(
+        default="data/candles", env="MD_CANDLE_STORE_DIR"
+    )
+    candle_store_sync_interval_seconds: float = Field(
+        default=900.0, ge=1.0, env="MD_CANDLE_STORE_SYNC_INTERVAL"
+    )
+
+    # Warm start
+    warm_start_enabled: bool = Field(default=True, env="MD_WARM_START_ENABLED")
+    warm_start_symbols: List[str] = Field(
+        default_factory=lambda: ["XAUUSD"], env="MD_WARM_START_SYMBOLS"
+    )
+    warm_start_bars: Optional[int] = Field(
+        default=None, ge=20, le=5000, env="MD_WARM_START_BARS"
+    )
+    warm_start_timeout_seconds: float = Field(
+        default=30.0, ge=1.0, le=600.0, env="MD_WARM_START_TIMEOUT"
+    )
+
+    # Closed candle persistence
+    candle_writer_enabled: bool = Field(default=True, env="MD_CANDLE_WRITER_ENABLED")
+    candle_writer_queue_size: int = Field(
+        default=10000, ge=100, le=1000000, env="MD_CANDLE_WRITER_QUEUE_SIZE"
+    )
+    candle_writer_batch_size: int = Field(
+        default=500, ge=1, le=2000, env="MD_CANDLE_WRITER_BATCH_SIZE"
+    )
+    candle_writer_flush_interval_seconds: float = Field(
+        default=1.0, ge=0.01, le=60.0, env="MD_CANDLE_WRITER_FLUSH_INTERVAL"
+    )
+
+    def validate(self) -> bool:
+        """
+        Validate market data configuration.
+
+        Returns:
+            True if configuration is valid
+
+        Raises:
+            ValueError: If configuration is invalid
+        """
+        errors = []
+
+        unknown = [tf for tf in self.timeframes if tf not in SUPPORTED_TIMEFRAMES]
+        if unknown:
+            errors.append(f"Unsupported timeframes: {', '.join(unknown)}")
+
+        if self.shard_overflow_policy not in OVERFLOW_POLICIES:
+            errors.append(
+                f"Unknown shard overflow policy: {self.shard_overflow_policy}"
+            )
+
+        for required in ("M15", "H1", "H4"):
+            if required not in self.timeframes:
+                errors.append(f"Timeframe {required} is required for SMC analysis")
+
+        if errors:
+            raise ValueError(
+                "Market data configuration validation failed:\n"
+                + "\n".join(f"- {error}" for error in errors)
+            )
+
+        return True
+
+    def to_dict(self) -> dict:
+        """Convert market data config to dictionary."""
+        return {
+            "timeframes": list(self.timeframes),
+            "window_size": self.window_size,
+            "max_batch_size": self.max_batch_size,
+            "max_batch_latency_ms": self.max_batch_latency_ms,
+            "shard_queue_size": self.shard_queue_size,
+            "shard_overflow_policy": self.shard_overflow_policy,
+            "tick_history_size": self.tick_history_size,
+            "fill_gaps": self.fill_gaps,
+            "max_gap_fill_bars": self.max_gap_fill_bars,
+            "close_grace_seconds": self.close_grace_seconds,
+            "candle_clock_interval_seconds": self.candle_clock_interval_seconds,
+            "fixed_point_prices": self.fixed_point_prices,
+            "journal_enabled": self.journal_enabled,
+            "journal_directory": self.journal_directory,
+            "journal_segment_ticks": self.journal_segment_ticks,
+            "candle_store_directory": self.candle_store_directory,
+            "candle_store_sync_interval_seconds": (
+                self.candle_store_sync_interval_seconds
+            ),
+            "warm_start_enabled": self.warm_start_enabled,
+            "warm_start_symbols": list(self.warm_start_symbols),
+            "warm_start_bars": self.warm_start_bars,
+            "warm_start_timeout_seconds": self.warm_start_timeout_seconds,
+            "candle_writer_enabled": self.candle_writer_enabled,
+            "candle_writer_queue_size": self.candle_writer_queue_size,
+            "candle_writer_batch_size": self.candle_writer_batch_size,
+            "candle_writer_flush_interval_seconds": (
+                self.candle_writer_flush_interval_seconds
+            ),
+        }
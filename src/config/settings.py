@@ -17,6 +17,7 @@ from .database import DatabaseConfig
 from .trading import TradingConfig
 from .smc import SMCConfig
 from .telegram import TelegramConfig
+from .market_data import MarketDataConfig
 
 
 class Settings(BaseSettings):
@@ -68,6 +69,7 @@ class Settings(BaseSettings):
     ws_port: int = Field(default=8001, env="WS_PORT")
     ws_heartbeat_interval: int = Field(default=30, env="WS_HEARTBEAT_INTERVAL")
     ws_max_connections: int = Field(default=100, env="WS_MAX_CONNECTIONS")
+    ws_tick_decoder: str = Field(default="auto", env="WS_TICK_DECODER")
 
     # Redis settings
     redis_host: str = Field(default="localhost", env="REDIS_HOST")
@@ -78,6 +80,9 @@ class Settings(BaseSettings):
     # Monitoring settings
     enable_metrics: bool = Field(default=True, env="ENABLE_METRICS")
     metrics_port: int = Field(default=9090, env="METRICS_PORT")
+    trace_sample_rate: float = Field(
+        default=0.01, ge=0.0, le=1.0, env="TRACE_SAMPLE_RATE"
+    )
     health_check_interval: int = Field(default=30, env="HEALTH_CHECK_INTERVAL")
 
     # Database settings (moved here for direct loading)
@@ -97,6 +102,7 @@ class Settings(BaseSettings):
     trading: TradingConfig = Field(default_factory=lambda: TradingConfig())
     smc: SMCConfig = Field(default_factory=lambda: SMCConfig())
     telegram: TelegramConfig = Field(default_factory=lambda: TelegramConfig())
+    market_data: MarketDataConfig = Field(default_factory=lambda: MarketDataConfig())
 
     class Config:
         env_file = ".env"
@@ -161,6 +167,12 @@ class Settings(BaseSettings):
         except ValueError as e:
             errors.append(f"SMC config error: {e}")
 
+        # Validate market data configuration
+        try:
+            self.market_data.validate()
+        except ValueError as e:
+            errors.append(f"Market data config error: {e}")
+
         # Validate database configuration
         try:
             self.database.validate()
@@ -78,6 +78,9 @@ class OrderBlockConfig(BaseSettings):
     avg_volume_periods: int = Field(
         default=20, ge=5, le=100, env="OB_AVG_VOLUME_PERIODS"
     )
+    volume_spike_std: float = Field(
+        default=1.0, ge=0.0, le=5.0, env="OB_VOLUME_SPIKE_STD"
+    )
 
     # Validation
     require_rejection: bool = Field(default=True, env="OB_REQUIRE_REJECTION")
@@ -100,6 +103,7 @@ class OrderBlockConfig(BaseSettings):
             "wick_ratio_threshold": self.wick_ratio_threshold,
             "min_volume_multiplier": self.min_volume_multiplier,
             "avg_volume_periods": self.avg_volume_periods,
+            "volume_spike_std": self.volume_spike_std,
             "require_rejection": self.require_rejection,
             "rejection_ratio": self.rejection_ratio,
             "min_touches": self.min_touches,
@@ -177,6 +181,7 @@ class StructureConfig(BaseSettings):
     structure_break_threshold: float = Field(
         default=0.8, ge=0.5, le=1.0, env="STRUCT_BREAK_THRESHOLD"
     )
+    swing_span: int = Field(default=2, ge=1, le=10, env="STRUCT_SWING_SPAN")
 
     # BOS and CHoCH
     bos_confirmation_candles: int = Field(
@@ -201,6 +206,7 @@ class StructureConfig(BaseSettings):
             "trend_strength_threshold": self.trend_strength_threshold,
             "min_swing_points": self.min_swing_points,
             "structure_break_threshold": self.structure_break_threshold,
+            "swing_span": self.swing_span,
             "bos_confirmation_candles": self.bos_confirmation_candles,
             "choch_confirmation_candles": self.choch_confirmation_candles,
             "range_threshold_percentage": self.range_threshold_percentage,
@@ -254,6 +260,15 @@ class SMCConfig(BaseSettings):
     require_multi_timeframe: bool = Field(default=True, env="SMC_REQUIRE_MTF")
     min_timeframes_aligned: int = Field(default=2, ge=1, le=3, env="SMC_MIN_TF_ALIGNED")
 
+    # Analysis execution (0 workers runs analysis inline on the event loop)
+    analysis_workers: int = Field(default=2, ge=0, le=32, env="SMC_ANALYSIS_WORKERS")
+    analysis_max_in_flight: int = Field(
+        default=4, ge=1, le=64, env="SMC_ANALYSIS_MAX_IN_FLIGHT"
+    )
+    analysis_timeout_seconds: float = Field(
+        default=30.0, ge=1.0, le=600.0, env="SMC_ANALYSIS_TIMEOUT"
+    )
+
     class Config:
         env_prefix = "SMC_"
 
@@ -372,6 +387,9 @@ class SMCConfig(BaseSettings):
             "analysis_buffer_candles": self.analysis_buffer_candles,
             "require_multi_timeframe": self.require_multi_timeframe,
             "min_timeframes_aligned": self.min_timeframes_aligned,
+            "analysis_workers": self.analysis_workers,
+            "analysis_max_in_flight": self.analysis_max_in_flight,
+            "analysis_timeout_seconds": self.analysis_timeout_seconds,
             "fvg": self.fvg.to_dict(),
             "order_block": self.order_block.to_dict(),
             "liquidity": self.liquidity.to_dict(),
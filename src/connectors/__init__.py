@@ -17,5 +17,12 @@ except ImportError:
     MT5_AVAILABLE = False
 
 from .websocket_server import WebSocketServer
+from .tick_decoder import TickDecoder, get_tick_decoder
 
-__all__ = ["MT5Connector", "WebSocketServer", "MT5_AVAILABLE"]
+__all__ = [
+    "MT5Connector",
+    "WebSocketServer",
+    "MT5_AVAILABLE",
+    "TickDecoder",
+    "get_tick_decoder",
+]
@@ -10,7 +10,6 @@ through WebSocket communication.
 import asyncio
 import json
 import logging
-import random
 from typing import Dict, List, Optional, Callable, Set
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -22,6 +21,7 @@ from ..models.market_data import Tick
 from ..models.candle import Candle
 from ..models.trade import Trade
 from ..config import get_settings
+from ..core.clock import utcnow
 
 
 class MT5Connector:
@@ -243,19 +243,29 @@ class MT5Connector:
 
     async def _stream_symbol_data(self, symbol: str):
         """Stream real-time data for symbol."""
-        mock_price = Decimal("2000.00")
+        mock_ticks = None
         while symbol in self.subscribed_symbols and self.is_connected:
             try:
                 if not self.mt5_initialized:
-                    # Generate mock tick
-                    mock_price += Decimal(str(random.uniform(-0.1, 0.1)))
-                    tick_data = Tick(
-                        symbol=symbol,
-                        timestamp=datetime.utcnow(),
-                        bid=mock_price,
-                        ask=mock_price + Decimal("0.2"),
-                        volume=random.randint(1, 10),
-                    )
+                    if mock_ticks is None:
+                        # Without a terminal, replay a synthetic market in real
+                        # time; imported here to keep the backtest package out
+                        # of live imports
+                        from ..backtest.synthetic_market import (
+                            SyntheticMarket,
+                            SyntheticMarketConfig,
+                        )
+
+                        mock_ticks = SyntheticMarket(
+                            SyntheticMarketConfig(
+                                symbol=symbol, start=utcnow()
+                            )
+                        ).ticks()
+                    tick_data = next(mock_ticks)
+                    # Always yield, even when the synthetic feed has fallen
+                    # behind the clock, so the loop cannot starve the event loop
+                    delay = (tick_data.timestamp - utcnow()).total_seconds()
+                    await asyncio.sleep(max(delay, 0))
                 else:
                     # Get tick data from MT5
                     tick = mt5.symbol_info_tick(symbol)
@@ -288,8 +298,9 @@ class MT5Connector:
                     except Exception as e:
                         self.logger.error(f"Error in tick handler: {e}")
 
-                # Wait before next tick
-                await asyncio.sleep(1.0 if not self.mt5_initialized else 0.1)
+                # Poll the terminal for the next tick
+                if self.mt5_initialized:
+                    await asyncio.sleep(0.1)
 
             except Exception as e:
                 self.logger.error(f"Error streaming data for {symbol}: {e}")
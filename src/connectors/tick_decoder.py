@@ -0,0 +1,214 @@
+"""
+Tick message decoders for XAUUSD Gold Trading System.
+
+Decodes tick messages from the MT5 connector with pluggable
+JSON, orjson and msgpack backends and builds ticks through
+the trusted constructor after a single validation pass.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Optional, Union
+
+from ..models.market_data import Tick
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+EPOCH = datetime(1970, 1, 1)
+
+# Millisecond offsets added to the cached whole-second base timestamp
+_MILLISECONDS = tuple(timedelta(milliseconds=ms) for ms in range(1000))
+
+Message = Union[str, bytes]
+
+
+def parse_price(value: Any) -> Decimal:
+    """
+    Parse a price field.
+
+    String prices convert directly; floats go through ``str`` so the
+    decimal keeps the quoted digits rather than the binary expansion.
+
+    Args:
+        value: Price as string, float or integer
+
+    Returns:
+        Decimal price
+    """
+    if value.__class__ is str:
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+class TickDecoder:
+    """
+    Standard library JSON tick decoder.
+
+    Subclasses override ``loads`` for faster wire formats; tick
+    construction is shared.
+    """
+
+    name = "json"
+
+    def __init__(self):
+        """Initialize tick decoder."""
+        self._second: Optional[int] = None
+        self._second_base: Optional[datetime] = None
+
+    def parse_timestamp(self, value: Any) -> datetime:
+        """
+        Parse a tick timestamp.
+
+        Integers are epoch milliseconds (UTC); strings are ISO 8601 for
+        connectors that have not switched to epoch timestamps. Ticks
+        arrive several times per second, so the whole-second datetime
+        is cached and only the millisecond offset is added per tick.
+
+        Args:
+            value: Epoch milliseconds or ISO 8601 string
+
+        Returns:
+            Naive UTC datetime
+        """
+        if value.__class__ is str:
+            return datetime.fromisoformat(value)
+
+        second, millisecond = divmod(int(value), 1000)
+        if second != self._second:
+            self._second = second
+            self._second_base = EPOCH + timedelta(seconds=second)
+        return self._second_base + _MILLISECONDS[millisecond]
+
+    def loads(self, message: Message) -> Dict[str, Any]:
+        """
+        Decode a raw message.
+
+        Args:
+            message: Raw WebSocket message
+
+        Returns:
+            Decoded message dictionary
+        """
+        return json.loads(message)
+
+    def decode_tick(self, data: Dict[str, Any]) -> Tick:
+        """
+        Build a tick from a decoded tick message.
+
+        Args:
+            data: Decoded message dictionary
+
+        Returns:
+            Tick instance
+
+        Raises:
+            KeyError: If a required field is missing
+            ValueError: If bid is not below ask
+        """
+        bid = parse_price(data["bid"])
+        ask = parse_price(data["ask"])
+        if bid >= ask:
+            raise ValueError(
+                f"Bid price ({bid}) cannot be greater than or equal to "
+                f"ask price ({ask})"
+            )
+
+        last = data.get("last")
+        return Tick.from_trusted(
+            data.get("symbol", "XAUUSD"),
+            self.parse_timestamp(data["timestamp"]),
+            bid,
+            ask,
+            parse_price(last) if last is not None else bid,
+            data.get("volume"),
+        )
+
+    def decode(self, message: Message) -> Tick:
+        """
+        Decode a raw tick message.
+
+        Args:
+            message: Raw WebSocket message
+
+        Returns:
+            Tick instance
+        """
+        return self.decode_tick(self.loads(message))
+
+
+class OrjsonTickDecoder(TickDecoder):
+    """JSON tick decoder backed by orjson."""
+
+    name = "orjson"
+
+    def loads(self, message: Message) -> Dict[str, Any]:
+        """Decode a raw JSON message with orjson."""
+        return orjson.loads(message)
+
+
+class MsgpackTickDecoder(TickDecoder):
+    """
+    Msgpack tick decoder.
+
+    Binary frames are msgpack; text frames still decode as JSON so
+    control messages from older clients keep working.
+    """
+
+    name = "msgpack"
+
+    def loads(self, message: Message) -> Dict[str, Any]:
+        """Decode a binary msgpack frame or a JSON text frame."""
+        if isinstance(message, str):
+            return json.loads(message)
+        return msgpack.unpackb(message, raw=False)
+
+
+TICK_DECODERS = {
+    "json": TickDecoder,
+    "orjson": OrjsonTickDecoder,
+    "msgpack": MsgpackTickDecoder,
+}
+
+_BACKENDS = {"orjson": orjson, "msgpack": msgpack}
+
+
+def get_tick_decoder(name: Optional[str] = "auto") -> TickDecoder:
+    """
+    Create a tick decoder.
+
+    ``auto`` picks orjson when installed and falls back to the
+    standard library.
+
+    Args:
+        name: Decoder name (auto, json, orjson, msgpack)
+
+    Returns:
+        Tick decoder
+
+    Raises:
+        ValueError: If the decoder is unknown or its backend is not installed
+    """
+    if name in (None, "auto"):
+        name = "orjson" if orjson is not None else "json"
+
+    if name not in TICK_DECODERS:
+        raise ValueError(
+            f"Unknown tick decoder '{name}'. Must be one of: auto, "
+            f"{', '.join(TICK_DECODERS)}"
+        )
+    if name in _BACKENDS and _BACKENDS[name] is None:
+        raise ValueError(f"Tick decoder '{name}' requires the {name} package")
+
+    return TICK_DECODERS[name]()
@@ -10,7 +10,8 @@ broadcasts real-time data, and manages client sessions.
 import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Set, Callable
+import time
+from typing import Dict, List, Optional, Set, Callable, Union
 from datetime import datetime
 from decimal import Decimal
 import websockets
@@ -18,6 +19,8 @@ from websockets.server import WebSocketServerProtocol
 
 from ..models.market_data import Tick
 from ..config import get_settings
+from ..monitoring.tracing import get_tracer
+from .tick_decoder import get_tick_decoder
 
 
 class WebSocketServer:
@@ -49,6 +52,8 @@ class WebSocketServer:
         # Message handlers
         self.tick_handlers: List[Callable] = []
         self.signal_handlers: List[Callable] = []
+        self.tracer = get_tracer()
+        self.decoder = get_tick_decoder(self.settings.ws_tick_decoder)
 
     def add_tick_handler(self, handler: Callable):
         """
@@ -130,16 +135,26 @@ class WebSocketServer:
             if websocket in self.clients:
                 self.clients.remove(websocket)
 
-    async def _handle_message(self, websocket: WebSocketServerProtocol, message: str):
+    async def _handle_message(
+        self, websocket: WebSocketServerProtocol, message: Union[str, bytes]
+    ):
         """Handle incoming message."""
+        received_at = time.perf_counter()
         try:
-            data = json.loads(message)
+            data = self.decoder.loads(message)
             message_type = data.get("type")
 
             if message_type == "tick":
-                # Handle tick data
+                # Handle tick data, tracing a sample through the pipeline
                 tick = self._parse_tick_data(data)
-                await self._handle_tick_message(tick)
+                trace = self.tracer.start_trace(
+                    "tick", started_at=received_at, symbol=tick.symbol
+                )
+                self.tracer.record_span(
+                    trace, "ws.decode", received_at, time.perf_counter()
+                )
+                with self.tracer.activate(trace):
+                    await self._handle_tick_message(tick)
 
             elif message_type == "signal":
                 # Handle signal data
@@ -168,14 +183,7 @@ class WebSocketServer:
 
     def _parse_tick_data(self, data: dict) -> Tick:
         """Parse tick data from message."""
-        return Tick(
-            symbol=data.get("symbol", "XAUUSD"),
-            timestamp=datetime.fromisoformat(data["timestamp"]),
-            bid=Decimal(str(data["bid"])),
-            ask=Decimal(str(data["ask"])),
-            last=Decimal(str(data.get("last", data["bid"]))),
-            volume=data.get("volume"),
-        )
+        return self.decoder.decode_tick(data)
 
     def _parse_signal_data(self, data: dict):
         """Parse signal data from message."""
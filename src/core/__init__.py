@@ -74,6 +74,16 @@ from .structured_logging import (
     setup_structured_logging,
 )
 
+from .clock import (
+    Clock,
+    SystemClock,
+    SimulatedClock,
+    get_clock,
+    set_clock,
+    use_clock,
+    utcnow,
+)
+
 __all__ = [
     "BoundedQueue",
     "AsyncBoundedQueue",
@@ -126,4 +136,11 @@ __all__ = [
     "performance_logger",
     "get_logger",
     "setup_structured_logging",
+    "Clock",
+    "SystemClock",
+    "SimulatedClock",
+    "get_clock",
+    "set_clock",
+    "use_clock",
+    "utcnow",
 ]
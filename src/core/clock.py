@@ -0,0 +1,115 @@
+"""
+Injectable clock for XAUUSD Gold Trading System.
+
+Analysis and trading code reads the current time through this
+module instead of calling ``datetime.utcnow()`` directly, so replays
+and backtests can run on simulated market time.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class Clock(ABC):
+    """Source of the current time (naive UTC)."""
+
+    @abstractmethod
+    def now(self) -> datetime:
+        """Get current time."""
+
+
+class SystemClock(Clock):
+    """Wall clock."""
+
+    def now(self) -> datetime:
+        """Get current wall clock time."""
+        return datetime.utcnow()
+
+
+class SimulatedClock(Clock):
+    """
+    Manually advanced clock for replays and tests.
+
+    Time only moves when ``set`` or ``advance`` is called and
+    never moves backwards.
+    """
+
+    def __init__(self, start: Optional[datetime] = None):
+        """
+        Initialize simulated clock.
+
+        Args:
+            start: Initial time (defaults to the epoch)
+        """
+        self._now = start or datetime(1970, 1, 1)
+
+    def now(self) -> datetime:
+        """Get simulated time."""
+        return self._now
+
+    def set(self, value: datetime):
+        """
+        Move clock to a time.
+
+        Args:
+            value: New time; earlier times are ignored
+        """
+        if value > self._now:
+            self._now = value
+
+    def advance(self, delta: timedelta):
+        """
+        Move clock forward.
+
+        Args:
+            delta: Time to advance
+        """
+        self._now += delta
+
+
+# Global clock
+_clock: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    """Get global clock."""
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """
+    Replace global clock.
+
+    Args:
+        clock: New clock
+
+    Returns:
+        Previous clock
+    """
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+@contextmanager
+def use_clock(clock: Clock):
+    """
+    Use a clock for the enclosed block.
+
+    Args:
+        clock: Clock to install
+    """
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+
+def utcnow() -> datetime:
+    """Get current time from the global clock (naive UTC)."""
+    return _clock.now()
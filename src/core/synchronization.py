@@ -127,16 +127,33 @@ class BoundedQueue:
 class AsyncBoundedQueue:
     """
     Async bounded queue with maximum capacity.
+
+    Overflow policies:
+        block: wait up to ``put_timeout`` for space, then drop the new item
+        drop_oldest: evict the oldest queued item to make room
+        drop_newest: reject the new item immediately
     """
 
-    def __init__(self, maxsize: int = 1000):
+    OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+    def __init__(
+        self, maxsize: int = 1000, overflow: str = "block", put_timeout: float = 1.0
+    ):
         """
         Initialize async bounded queue.
 
         Args:
             maxsize: Maximum queue size
+            overflow: Overflow policy (block, drop_oldest, drop_newest)
+            put_timeout: Maximum wait for space with the block policy
         """
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
         self.maxsize = maxsize
+        self.overflow = overflow
+        self.put_timeout = put_timeout
+        self.dropped = 0
         self._queue = asyncio.Queue(maxsize=maxsize)
         self.logger = logging.getLogger(__name__)
 
@@ -150,25 +167,81 @@ class AsyncBoundedQueue:
         Returns:
             True if item was added
         """
+        if self.overflow != "block":
+            return self.put_nowait(item)
+
         try:
-            await asyncio.wait_for(self._queue.put(item), timeout=1.0)
+            await asyncio.wait_for(self._queue.put(item), timeout=self.put_timeout)
             return True
         except asyncio.TimeoutError:
+            self.dropped += 1
             self.logger.warning(f"Async queue full, dropping item: {type(item)}")
             return False
 
-    async def get(self) -> Optional[T]:
+    def put_nowait(self, item: T) -> bool:
+        """
+        Add item to queue without waiting.
+
+        Args:
+            item: Item to add
+
+        Returns:
+            True if item was added
+        """
+        if self._queue.full():
+            if self.overflow != "drop_oldest":
+                self.dropped += 1
+                return False
+
+            self._queue.get_nowait()
+            self.dropped += 1
+
+        self._queue.put_nowait(item)
+        return True
+
+    async def get(self, timeout: Optional[float] = 1.0) -> Optional[T]:
         """
         Get item from queue.
 
+        Args:
+            timeout: Maximum wait in seconds (None waits indefinitely)
+
         Returns:
             Item or None if timeout
         """
+        if timeout is not None and timeout <= 0:
+            return None if self._queue.empty() else self._queue.get_nowait()
+
         try:
-            return await asyncio.wait_for(self._queue.get(), timeout=1.0)
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
         except asyncio.TimeoutError:
             return None
 
+    async def get_batch(
+        self, max_items: int, timeout: Optional[float] = 1.0
+    ) -> List[T]:
+        """
+        Get up to ``max_items`` items.
+
+        Waits for the first item, then takes whatever else is
+        already queued without waiting.
+
+        Args:
+            max_items: Maximum number of items
+            timeout: Maximum wait for the first item in seconds
+
+        Returns:
+            List of items (empty on timeout)
+        """
+        item = await self.get(timeout=timeout)
+        if item is None:
+            return []
+
+        items = [item]
+        while len(items) < max_items and not self._queue.empty():
+            items.append(self._queue.get_nowait())
+        return items
+
     def size(self) -> int:
         """Get current queue size."""
         return self._queue.qsize()
@@ -336,22 +409,21 @@ class SemaphoreManager:
         """
         try:
             await asyncio.wait_for(self._semaphore.acquire(), timeout=timeout)
-
-            async with self._lock:
-                self._current_count += 1
-
-            yield self
-
         except asyncio.TimeoutError:
             self.logger.error(f"Semaphore timeout for {self.name}")
             raise TimeoutError(
                 f"Failed to acquire semaphore {self.name} within {timeout}s"
             )
+
+        async with self._lock:
+            self._current_count += 1
+
+        try:
+            yield self
         finally:
-            if self._current_count > 0:
-                self._semaphore.release()
-                async with self._lock:
-                    self._current_count -= 1
+            self._semaphore.release()
+            async with self._lock:
+                self._current_count -= 1
 
     def current_count(self) -> int:
         """Get current usage count."""
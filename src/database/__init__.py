@@ -23,6 +23,8 @@ from .repositories import (
     PerformanceRepository,
     ConfigRepository,
 )
+from .history_import import HistoryImporter, ImportStats
+from .candle_writer import CandleWriter
 
 __all__ = [
     "Database",
@@ -39,4 +41,7 @@ __all__ = [
     "TradeRepository",
     "PerformanceRepository",
     "ConfigRepository",
+    "HistoryImporter",
+    "ImportStats",
+    "CandleWriter",
 ]
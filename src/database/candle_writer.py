@@ -0,0 +1,352 @@
+"""
+Batched candle persistence for XAUUSD Gold Trading System.
+
+Collects closed candles from the market data processor in a
+bounded queue and writes them to ``price_history`` in multi-row
+upserts from a background task, so the tick path never waits on
+the database.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+import logging
+
+from ..analysis.candle_aggregator import CandleCloseEvent
+from ..core.clock import utcnow
+from ..core.synchronization import AsyncBoundedQueue
+from ..models.candle import Candle
+from ..monitoring.metrics import get_registry
+
+
+UPSERT_COLUMNS = (
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "volume",
+    "tick_volume",
+    "spread",
+)
+
+
+def candle_to_row(candle: Candle) -> Dict[str, Any]:
+    """
+    Convert a candle to a ``price_history`` row.
+
+    Args:
+        candle: Closed candle
+
+    Returns:
+        Column values
+    """
+    return {
+        "instrument": candle.instrument,
+        "timeframe": candle.timeframe,
+        "timestamp": candle.timestamp,
+        "open_price": candle.open,
+        "high_price": candle.high,
+        "low_price": candle.low,
+        "close_price": candle.close,
+        "volume": candle.volume or 0,
+        "tick_volume": candle.tick_volume,
+        "spread": candle.spread,
+        "created_at": utcnow(),
+    }
+
+
+class CandleWriter:
+    """
+    Background writer for closed candles.
+
+    A batch is flushed when it reaches ``batch_size`` candles or
+    ``flush_interval`` seconds after its first candle, whichever
+    comes first. Failed or timed-out writes are kept and retried
+    with exponential backoff; while the database is down the queue
+    keeps absorbing candles and drops the oldest once full.
+    """
+
+    def __init__(
+        self,
+        database: Optional[Any] = None,
+        queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        write_timeout: float = 10.0,
+        max_retry_delay: float = 30.0,
+    ):
+        """
+        Initialize candle writer.
+
+        Args:
+            database: Database manager (defaults to the global instance)
+            queue_size: Maximum candles waiting to be written
+            batch_size: Maximum candles per upsert
+            flush_interval: Maximum seconds a candle waits for its batch
+            write_timeout: Seconds before a write is abandoned and retried
+            max_retry_delay: Upper bound of the retry backoff in seconds
+        """
+        if database is None:
+            from .connection import db as database
+
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.write_timeout = write_timeout
+        self.max_retry_delay = max_retry_delay
+        self.logger = logging.getLogger(__name__)
+
+        self.queue = AsyncBoundedQueue(maxsize=queue_size, overflow="drop_oldest")
+        self._retry: List[Candle] = []
+        self._retry_delay = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.is_running = False
+
+        # Stats
+        self.written = 0
+        self.skipped_filled = 0
+        self.failed_flushes = 0
+        self.last_flush_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        # Metrics
+        registry = get_registry()
+        self.queue_gauge = registry.gauge(
+            "candle_writer_queue_depth", "Closed candles waiting to be written"
+        )
+        self.flush_histogram = registry.histogram(
+            "candle_writer_flush_seconds",
+            "Latency of candle upsert batches",
+            buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+        )
+        self.written_counter = registry.counter(
+            "candle_writer_candles_written_total", "Candles written to price_history"
+        )
+        self.dropped_counter = registry.counter(
+            "candle_writer_candles_dropped_total",
+            "Candles dropped because the writer queue was full",
+        )
+
+    @property
+    def dropped(self) -> int:
+        """Candles dropped by queue overflow."""
+        return self.queue.dropped
+
+    def queue_depth(self) -> int:
+        """Candles queued or awaiting retry."""
+        return self.queue.size() + len(self._retry)
+
+    def submit(self, candle: Candle) -> bool:
+        """
+        Queue a closed candle without waiting.
+
+        Args:
+            candle: Closed candle
+
+        Returns:
+            True if queued without evicting an older candle
+        """
+        dropped = self.queue.dropped
+        self.queue.put_nowait(candle)
+        if self.queue.dropped != dropped:
+            self.dropped_counter.inc()
+        self.queue_gauge.set(self.queue_depth())
+        return self.queue.dropped == dropped
+
+    async def on_candle_close(self, event: CandleCloseEvent):
+        """
+        Candle close callback for ``MarketDataProcessor``.
+
+        Gap-fill candles synthesized for empty buckets are not broker
+        data and are never persisted, so they cannot overwrite real bars.
+
+        Args:
+            event: Candle close event
+        """
+        if event.filled:
+            self.skipped_filled += 1
+            return
+        self.submit(event.candle)
+
+    async def start(self):
+        """Start the background writer."""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._task = asyncio.create_task(self._writer_loop())
+        self.logger.info("Candle writer started")
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """
+        Stop the writer and try to write what is still queued.
+
+        Args:
+            drain_timeout: Maximum seconds spent writing remaining candles
+        """
+        self.is_running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        try:
+            await asyncio.wait_for(self.flush(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                f"Candle writer stopped with {self.queue_depth()} unwritten candles"
+            )
+        self.logger.info("Candle writer stopped")
+
+    async def flush(self) -> int:
+        """
+        Write everything currently queued.
+
+        Returns:
+            Number of candles written
+        """
+        written = 0
+        while self.queue_depth():
+            batch = self._retry + await self.queue.get_batch(
+                max(1, self.batch_size - len(self._retry)), timeout=0
+            )
+            self._retry = []
+            if not await self._write_batch(batch):
+                break
+            written += len(batch)
+        return written
+
+    async def _writer_loop(self):
+        """Collect batches and write them until stopped."""
+        while self.is_running:
+            try:
+                if self._retry_delay:
+                    await asyncio.sleep(self._retry_delay)
+
+                if self._retry:
+                    # Retry with whatever else arrived meanwhile, without waiting
+                    batch = self._retry + await self.queue.get_batch(
+                        max(1, self.batch_size - len(self._retry)), timeout=0
+                    )
+                    self._retry = []
+                else:
+                    batch = await self._collect(self.batch_size)
+                if batch:
+                    await self._write_batch(batch)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error in candle writer loop: {e}")
+
+    async def _collect(self, max_items: int) -> List[Candle]:
+        """Wait for candles until the batch is full or its time is up."""
+        batch = await self.queue.get_batch(max_items, timeout=self.flush_interval)
+        if not batch:
+            return batch
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < max_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            more = await self.queue.get_batch(max_items - len(batch), timeout=remaining)
+            if not more:
+                break
+            batch.extend(more)
+        return batch
+
+    async def _write_batch(self, batch: List[Candle]) -> bool:
+        """
+        Upsert a batch, keeping it for retry on failure.
+
+        Returns:
+            True if the batch was written
+        """
+        # The same candle may be queued twice (e.g. a retry plus a re-close);
+        # one upsert cannot touch a row twice, so keep the latest
+        unique: Dict[tuple, Candle] = {}
+        for candle in batch:
+            unique[(candle.instrument, candle.timeframe, candle.timestamp)] = candle
+        rows = [candle_to_row(candle) for candle in unique.values()]
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._upsert(rows), timeout=self.write_timeout)
+        except asyncio.CancelledError:
+            self._retry = batch
+            raise
+        except Exception as e:
+            self.failed_flushes += 1
+            self.last_error = str(e) or type(e).__name__
+            self._retry_delay = min(
+                self.max_retry_delay, max(self.flush_interval, self._retry_delay * 2)
+            )
+            # Bound the retry batch like the queue: oldest candles go first
+            overflow = len(batch) - self.queue.maxsize
+            if overflow > 0:
+                batch = batch[overflow:]
+                self.queue.dropped += overflow
+                self.dropped_counter.inc(overflow)
+            self._retry = batch
+            self.logger.warning(
+                f"Candle write failed ({self.last_error}), retrying "
+                f"{len(batch)} candles in {self._retry_delay:.1f}s"
+            )
+            return False
+        finally:
+            self.queue_gauge.set(self.queue_depth())
+
+        elapsed = time.perf_counter() - started
+        self.flush_histogram.observe(elapsed)
+        self.last_flush_seconds = elapsed
+        self._retry_delay = 0.0
+        self.written += len(rows)
+        self.written_counter.inc(len(rows))
+        return True
+
+    async def _upsert(self, rows: List[Dict[str, Any]]):
+        """
+        Write rows with multi-row INSERT ... ON CONFLICT DO UPDATE.
+
+        Retried backlogs can exceed ``batch_size``; they are split into
+        statements of at most ``batch_size`` rows in one transaction to
+        stay under the driver's bind parameter limit.
+        """
+        from sqlalchemy.dialects.postgresql import insert
+
+        from .models import PriceHistory
+
+        async with self.database.get_async_session() as session:
+            for start in range(0, len(rows), self.batch_size):
+                stmt = insert(PriceHistory).values(
+                    rows[start : start + self.batch_size]
+                )
+                stmt = stmt.on_conflict_do_update(
+                    constraint="uq_price_history",
+                    set_={column: stmt.excluded[column] for column in UPSERT_COLUMNS},
+                )
+                await session.execute(stmt)
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get writer status information.
+
+        Returns:
+            Status dictionary
+        """
+        return {
+            "is_running": self.is_running,
+            "queue_depth": self.queue_depth(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "skipped_filled": self.skipped_filled,
+            "failed_flushes": self.failed_flushes,
+            "retry_delay_seconds": self._retry_delay,
+            "last_flush_seconds": self.last_flush_seconds,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,294 @@
+"""
+Bulk historical bar import for XAUUSD Gold Trading System.
+
+Loads MetaTrader history exports into ``price_history`` with
+PostgreSQL binary COPY. Each validated chunk is copied into a temporary
+staging table and moved into ``price_history`` with a single
+``INSERT ... SELECT ... ON CONFLICT`` on
+(instrument, timeframe, timestamp), then committed.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import io
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+import logging
+
+import numpy as np
+
+from ..storage.history_files import HistoryBatch, read_history_file
+
+
+STAGING_TABLE = "price_history_staging"
+
+# Prices are staged as float8 so rows can be sent in binary COPY format
+CREATE_STAGING_SQL = f"""
+CREATE TEMPORARY TABLE IF NOT EXISTS {STAGING_TABLE} (
+    timestamp TIMESTAMP NOT NULL,
+    open_price DOUBLE PRECISION NOT NULL,
+    high_price DOUBLE PRECISION NOT NULL,
+    low_price DOUBLE PRECISION NOT NULL,
+    close_price DOUBLE PRECISION NOT NULL,
+    volume BIGINT,
+    tick_volume BIGINT,
+    spread INTEGER
+) ON COMMIT DELETE ROWS
+"""
+
+COPY_SQL = (
+    f"COPY {STAGING_TABLE} (timestamp, open_price, high_price, low_price,"
+    " close_price, volume, tick_volume, spread) FROM STDIN WITH (FORMAT binary)"
+)
+
+INSERT_SQL = f"""
+INSERT INTO price_history (
+    instrument, timeframe, timestamp, open_price, high_price, low_price,
+    close_price, volume, tick_volume, spread, created_at
+)
+SELECT %(instrument)s, %(timeframe)s, timestamp,
+    round(open_price::numeric, 5), round(high_price::numeric, 5),
+    round(low_price::numeric, 5), round(close_price::numeric, 5),
+    volume, tick_volume, spread, timezone('utc', now())
+FROM {STAGING_TABLE}
+ON CONFLICT ON CONSTRAINT uq_price_history
+"""
+
+ON_CONFLICT_SKIP = "DO NOTHING"
+ON_CONFLICT_REPLACE = """DO UPDATE SET
+    open_price = EXCLUDED.open_price,
+    high_price = EXCLUDED.high_price,
+    low_price = EXCLUDED.low_price,
+    close_price = EXCLUDED.close_price,
+    volume = EXCLUDED.volume,
+    tick_volume = EXCLUDED.tick_volume,
+    spread = EXCLUDED.spread
+"""
+
+COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + bytes(8)
+COPY_TRAILER = b"\xff\xff"
+
+# Microseconds between the Unix and PostgreSQL (2000-01-01) epochs
+PG_EPOCH_OFFSET_US = 946_684_800_000_000
+
+# One binary COPY tuple: field count, then (length, value) per field
+COPY_ROW_DTYPE = np.dtype(
+    [("fields", ">i2")]
+    + [
+        item
+        for name, kind in (
+            ("timestamp", ">i8"),
+            ("open", ">f8"),
+            ("high", ">f8"),
+            ("low", ">f8"),
+            ("close", ">f8"),
+            ("volume", ">i8"),
+            ("tick_volume", ">i8"),
+            ("spread", ">i4"),
+        )
+        for item in ((f"{name}_size", ">i4"), (name, kind))
+    ]
+)
+
+
+def batch_to_copy_binary(batch: HistoryBatch) -> bytes:
+    """
+    Encode a batch in PostgreSQL binary COPY format.
+
+    Every row has the same fixed-width layout, so the whole batch
+    is written through one structured NumPy array.
+
+    Args:
+        batch: Validated bars
+
+    Returns:
+        COPY payload matching ``COPY_SQL``
+    """
+    candles = batch.candles
+    rows = np.empty(len(batch), dtype=COPY_ROW_DTYPE)
+    rows["fields"] = 8
+    for name in COPY_ROW_DTYPE.names[2::2]:
+        rows[f"{name}_size"] = COPY_ROW_DTYPE[name].itemsize
+    rows["timestamp"] = candles.timestamp // 1000 - PG_EPOCH_OFFSET_US
+    rows["open"] = candles.open
+    rows["high"] = candles.high
+    rows["low"] = candles.low
+    rows["close"] = candles.close
+    rows["volume"] = candles.volume
+    rows["tick_volume"] = batch.tick_volume
+    rows["spread"] = batch.spread
+    return COPY_HEADER + rows.tobytes() + COPY_TRAILER
+
+
+@dataclass
+class ImportStats:
+    """
+    Progress of a history import.
+
+    Attributes:
+        path: Imported file
+        instrument: Trading instrument
+        timeframe: Bar timeframe
+        rows_read: Rows read from the file
+        rows_rejected: Rows dropped by validation
+        rows_loaded: Valid rows sent to the database
+        rows_inserted: Rows inserted (or updated when replacing)
+        started: ``time.perf_counter()`` at start
+        elapsed_seconds: Time spent so far
+    """
+
+    path: str
+    instrument: Optional[str] = None
+    timeframe: Optional[str] = None
+    rows_read: int = 0
+    rows_rejected: int = 0
+    rows_loaded: int = 0
+    rows_inserted: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def duplicates(self) -> int:
+        """Valid rows that were already stored."""
+        return self.rows_loaded - self.rows_inserted
+
+    @property
+    def rows_per_second(self) -> float:
+        """Read throughput."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.rows_read / self.elapsed_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert import stats to dictionary."""
+        return {
+            "path": self.path,
+            "instrument": self.instrument,
+            "timeframe": self.timeframe,
+            "rows_read": self.rows_read,
+            "rows_rejected": self.rows_rejected,
+            "rows_loaded": self.rows_loaded,
+            "rows_inserted": self.rows_inserted,
+            "duplicates": self.duplicates,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+class HistoryImporter:
+    """
+    Streams history exports into ``price_history`` through COPY.
+
+    Each chunk is committed on its own, so an interrupted import
+    keeps the chunks already loaded and can simply be rerun.
+    """
+
+    def __init__(
+        self,
+        database: Optional[Any] = None,
+        chunk_rows: int = 100_000,
+        replace: bool = False,
+        dry_run: bool = False,
+        candle_store: Optional[Any] = None,
+        progress: Optional[Callable[[ImportStats], None]] = None,
+    ):
+        """
+        Initialize history importer.
+
+        Args:
+            database: Database manager (defaults to the global instance)
+            chunk_rows: Rows per COPY batch
+            replace: Overwrite stored bars instead of skipping them
+            dry_run: Only read and validate files
+            candle_store: Optional CandleStore to also write imported bars to
+            progress: Called with the running stats after each chunk
+        """
+        if database is None and not dry_run:
+            from .connection import db as database
+
+        self.database = database
+        self.chunk_rows = chunk_rows
+        self.replace = replace
+        self.dry_run = dry_run
+        self.candle_store = candle_store
+        self.progress = progress
+        self.logger = logging.getLogger(__name__)
+
+    def import_file(
+        self,
+        path: str,
+        instrument: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        file_format: str = "auto",
+    ) -> ImportStats:
+        """
+        Import one history export.
+
+        Args:
+            path: Export file
+            instrument: Trading instrument
+            timeframe: Bar timeframe
+            file_format: "csv", "hst" or "auto"
+
+        Returns:
+            Import statistics
+        """
+        stats = ImportStats(path=path)
+        batches = read_history_file(
+            path, instrument, timeframe, file_format, self.chunk_rows
+        )
+
+        if self.dry_run:
+            for batch in batches:
+                self._record(stats, batch, 0)
+            return stats
+
+        conflict = ON_CONFLICT_REPLACE if self.replace else ON_CONFLICT_SKIP
+        connection = self.database.get_sync_engine().raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(CREATE_STAGING_SQL)
+            for batch in batches:
+                inserted = 0
+                if len(batch):
+                    payload = batch_to_copy_binary(batch)
+                    cursor.copy_expert(COPY_SQL, io.BytesIO(payload))
+                    cursor.execute(
+                        INSERT_SQL + conflict,
+                        {
+                            "instrument": batch.candles.instrument,
+                            "timeframe": batch.candles.timeframe,
+                        },
+                    )
+                    inserted = cursor.rowcount
+                connection.commit()
+                self._record(stats, batch, inserted)
+            cursor.close()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+        self.logger.info(
+            f"Imported {stats.rows_inserted} bars from {path} "
+            f"({stats.rows_rejected} rejected, {stats.duplicates} duplicates) "
+            f"at {stats.rows_per_second:,.0f} rows/s"
+        )
+        return stats
+
+    def _record(self, stats: ImportStats, batch: HistoryBatch, inserted: int):
+        """Add a chunk to the stats and report progress."""
+        stats.instrument = batch.candles.instrument
+        stats.timeframe = batch.candles.timeframe
+        stats.rows_read += batch.rows
+        stats.rows_rejected += batch.rejected
+        stats.rows_loaded += len(batch)
+        stats.rows_inserted += inserted
+        stats.elapsed_seconds = time.perf_counter() - stats.started
+
+        if self.candle_store is not None and len(batch) and not self.dry_run:
+            self.candle_store.write(batch.candles)
+        if self.progress is not None:
+            self.progress(stats)
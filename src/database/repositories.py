@@ -657,3 +657,49 @@ class PriceHistoryRepository(BaseRepository):
 
         except Exception as e:
             self._handle_error(e, "get_candles_by_timeframe")
+
+    def get_candles_after(
+        self,
+        instrument: str,
+        timeframe: str,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        limit: int = 10000,
+    ) -> List[PriceHistory]:
+        """
+        Get candles newer than a timestamp in ascending order.
+
+        Args:
+            instrument: Trading instrument
+            timeframe: Candle timeframe
+            after: Only candles after this time (exclusive)
+            before: Only candles before this time (exclusive)
+            limit: Maximum candles to return
+
+        Returns:
+            List of price history, oldest first
+        """
+        try:
+            instrument = str(instrument).strip()[:20]
+            timeframe = str(timeframe).strip()[:10]
+
+            conditions = [
+                PriceHistory.instrument == instrument,
+                PriceHistory.timeframe == timeframe,
+            ]
+            if after is not None:
+                conditions.append(PriceHistory.timestamp > after)
+            if before is not None:
+                conditions.append(PriceHistory.timestamp < before)
+
+            stmt = (
+                select(PriceHistory)
+                .where(and_(*conditions))
+                .order_by(asc(PriceHistory.timestamp))
+                .limit(limit)
+            )
+
+            return self.session.execute(stmt).scalars().all()
+
+        except Exception as e:
+            self._handle_error(e, "get_candles_after")
@@ -11,5 +11,15 @@ from .signal import TradingSignal
 from .trade import Trade
 from .candle import Candle
 from .market_data import Tick, MarketSnapshot
+from .price import PRICE_SCALE, to_price_units, from_price_units
 
-__all__ = ["TradingSignal", "Trade", "Candle", "Tick", "MarketSnapshot"]
+__all__ = [
+    "TradingSignal",
+    "Trade",
+    "Candle",
+    "Tick",
+    "MarketSnapshot",
+    "PRICE_SCALE",
+    "to_price_units",
+    "from_price_units",
+]
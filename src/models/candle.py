@@ -13,11 +13,25 @@ from decimal import Decimal
 from typing import Optional
 
 
-@dataclass
-class Candle:
+class _DerivedCache:
+    """
+    Slot for cached derived values.
+
+    Declared on a base class rather than as a dataclass field, so the
+    cache stays out of ``fields()``, ``asdict()`` and comparisons.
+    """
+
+    __slots__ = ("_derived",)
+
+
+@dataclass(slots=True)
+class Candle(_DerivedCache):
     """
     OHLC candle data structure.
 
+    Slotted to keep per-candle memory low. Body size, range and body
+    percentage are cached until a price field is reassigned.
+
     Attributes:
         timestamp: Candle timestamp
         open: Opening price
@@ -44,6 +58,8 @@ class Candle:
 
     def __post_init__(self):
         """Validate candle data after initialization."""
+        self._derived = None
+
         if self.high < self.low:
             raise ValueError(
                 f"High price ({self.high}) cannot be less than low price ({self.low})"
@@ -69,10 +85,85 @@ class Candle:
         """Check if candle is bearish (close < open)."""
         return self.close < self.open
 
+    @classmethod
+    def from_trusted(
+        cls,
+        timestamp: datetime,
+        open: Decimal,
+        high: Decimal,
+        low: Decimal,
+        close: Decimal,
+        volume: Optional[int] = None,
+        timeframe: Optional[str] = None,
+        instrument: Optional[str] = None,
+        tick_volume: Optional[int] = None,
+        spread: Optional[int] = None,
+    ) -> "Candle":
+        """
+        Create candle from already consistent OHLC values.
+
+        Skips ``__post_init__`` validation; intended for candles built
+        internally (aggregated bars, stored rows) whose high/low bounds
+        hold by construction.
+
+        Args:
+            timestamp: Candle timestamp
+            open: Opening price
+            high: Highest price
+            low: Lowest price
+            close: Closing price
+            volume: Trading volume
+            timeframe: Timeframe
+            instrument: Trading instrument
+            tick_volume: Tick volume
+            spread: Spread in points
+
+        Returns:
+            Candle instance
+        """
+        candle = object.__new__(cls)
+        candle.timestamp = timestamp
+        candle.open = open
+        candle.high = high
+        candle.low = low
+        candle.close = close
+        candle.volume = volume
+        candle.timeframe = timeframe
+        candle.instrument = instrument
+        candle.tick_volume = tick_volume
+        candle.spread = spread
+        candle._derived = None
+        return candle
+
+    def _get_derived(self) -> tuple:
+        """
+        Get cached (body size, total range, body percentage).
+
+        The cache remembers the price objects it was computed from and
+        is rebuilt if any of them has been replaced.
+        """
+        derived = self._derived
+        open, high, low, close = self.open, self.high, self.low, self.close
+        if (
+            derived is None
+            or derived[0] is not open
+            or derived[1] is not high
+            or derived[2] is not low
+            or derived[3] is not close
+        ):
+            body_size = abs(close - open)
+            total_range = high - low
+            body_percentage = (
+                float((body_size / total_range) * 100) if total_range else 0.0
+            )
+            derived = (open, high, low, close, body_size, total_range, body_percentage)
+            self._derived = derived
+        return derived
+
     @property
     def body_size(self) -> Decimal:
         """Calculate the size of candle body."""
-        return abs(self.close - self.open)
+        return self._get_derived()[4]
 
     @property
     def upper_wick(self) -> Decimal:
@@ -87,14 +178,12 @@ class Candle:
     @property
     def total_range(self) -> Decimal:
         """Calculate total candle range (high - low)."""
-        return self.high - self.low
+        return self._get_derived()[5]
 
     @property
     def body_percentage(self) -> float:
         """Calculate body size as percentage of total range."""
-        if self.total_range == 0:
-            return 0.0
-        return float((self.body_size / self.total_range) * 100)
+        return self._get_derived()[6]
 
     def is_doji(self, threshold: float = 0.1) -> bool:
         """
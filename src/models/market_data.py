@@ -13,12 +13,13 @@ from decimal import Decimal
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Tick:
     """
     Real-time tick data from MT5.
 
     Represents a single price tick with bid/ask prices and volume.
+    Slotted to keep tick history buffers compact.
     """
 
     symbol: str
@@ -63,6 +64,47 @@ class Tick:
             "spread_pips": float(self.spread_pips),
         }
 
+    @classmethod
+    def from_trusted(
+        cls,
+        symbol: str,
+        timestamp: datetime,
+        bid: Decimal,
+        ask: Decimal,
+        last: Optional[Decimal] = None,
+        volume: Optional[int] = None,
+        spread_points: Optional[int] = None,
+    ) -> "Tick":
+        """
+        Create tick from already validated values.
+
+        Skips ``__post_init__`` validation; callers (e.g. tick decoders)
+        must have checked that bid is below ask.
+
+        Args:
+            symbol: Trading symbol
+            timestamp: Tick time
+            bid: Bid price
+            ask: Ask price
+            last: Last traded price
+            volume: Tick volume
+            spread_points: Spread in points (computed if None)
+
+        Returns:
+            Tick instance
+        """
+        tick = object.__new__(cls)
+        tick.symbol = symbol
+        tick.timestamp = timestamp
+        tick.bid = bid
+        tick.ask = ask
+        tick.last = last
+        tick.volume = volume
+        tick.spread_points = (
+            int((ask - bid) * 10000) if spread_points is None else spread_points
+        )
+        return tick
+
     @classmethod
     def from_dict(cls, data: dict) -> "Tick":
         """Create tick from dictionary representation."""
@@ -0,0 +1,78 @@
+"""
+Fixed-point price representation for XAUUSD Gold Trading System.
+
+Prices are held internally as integer multiples of 1e-5 so
+hot loops compare and subtract plain ints instead of Decimals.
+Conversion to and from Decimal is exact and happens at the
+API, database and broker boundaries.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Union
+
+
+# Decimal places represented by one price unit
+PRICE_DECIMALS = 5
+PRICE_SCALE = 10**PRICE_DECIMALS
+
+_DECIMAL_SCALE = Decimal(PRICE_SCALE)
+
+PriceLike = Union[Decimal, str, int, float]
+
+
+def to_price_units(price: PriceLike, exact: bool = True) -> int:
+    """
+    Convert a price to integer price units.
+
+    Args:
+        price: Price as Decimal, string, int or float
+        exact: Reject prices finer than one unit; if False they are
+            rounded half-even to the nearest unit
+
+    Returns:
+        Price in units of 1e-5
+
+    Raises:
+        ValueError: If exact and the price has more than PRICE_DECIMALS
+            decimal places
+    """
+    if price.__class__ is not Decimal:
+        price = Decimal(str(price))
+
+    scaled = price * _DECIMAL_SCALE
+    units = int(scaled)
+    if units != scaled:
+        if exact:
+            raise ValueError(
+                f"Price {price} has more than {PRICE_DECIMALS} decimal places"
+            )
+        units = int(scaled.to_integral_value(rounding=ROUND_HALF_EVEN))
+    return units
+
+
+def from_price_units(units: int) -> Decimal:
+    """
+    Convert integer price units back to a Decimal price.
+
+    Args:
+        units: Price in units of 1e-5
+
+    Returns:
+        Exact Decimal price
+    """
+    return Decimal(int(units)) / _DECIMAL_SCALE
+
+
+def price_units_to_float(units: int) -> float:
+    """
+    Convert integer price units to float for display and metrics.
+
+    Args:
+        units: Price in units of 1e-5
+
+    Returns:
+        Float price
+    """
+    return units / PRICE_SCALE
@@ -13,6 +13,8 @@ from decimal import Decimal
 from typing import List, Optional, Literal
 from enum import Enum
 
+from ..core.clock import utcnow
+
 
 class SignalStatus(Enum):
     """Signal status enumeration."""
@@ -62,8 +64,8 @@ class TradingSignal:
     h1_context: Optional[str] = None
     m15_context: Optional[str] = None
     session: SessionType = SessionType.LONDON
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utcnow)
+    updated_at: datetime = field(default_factory=utcnow)
     expires_at: Optional[datetime] = None
     status: SignalStatus = SignalStatus.ACTIVE
     telegram_message_id: Optional[int] = None
@@ -159,19 +161,19 @@ class TradingSignal:
     @property
     def age_minutes(self) -> float:
         """Calculate signal age in minutes."""
-        return (datetime.utcnow() - self.created_at).total_seconds() / 60
+        return (utcnow() - self.created_at).total_seconds() / 60
 
     @property
     def is_expired(self) -> bool:
         """Check if signal has expired."""
         if self.expires_at is None:
             return False
-        return datetime.utcnow() > self.expires_at
+        return utcnow() > self.expires_at
 
     def update_status(self, status: SignalStatus):
         """Update signal status and timestamp."""
         self.status = status
-        self.updated_at = datetime.utcnow()
+        self.updated_at = utcnow()
 
     def is_price_near_entry(
         self, current_price: Decimal, tolerance_pips: Decimal = Decimal("5")
@@ -271,12 +273,12 @@ class TradingSignal:
         created_at = (
             datetime.fromisoformat(data["created_at"])
             if data.get("created_at")
-            else datetime.utcnow()
+            else utcnow()
         )
         updated_at = (
             datetime.fromisoformat(data["updated_at"])
             if data.get("updated_at")
-            else datetime.utcnow()
+            else utcnow()
         )
         expires_at = (
             datetime.fromisoformat(data["expires_at"])
@@ -14,6 +14,8 @@ from typing import List, Optional, Literal, Dict, Any
 from enum import Enum
 import json
 
+from ..core.clock import utcnow
+
 
 class TradeStatus(Enum):
     """Trade status enumeration."""
@@ -111,8 +113,8 @@ class Trade:
     tp2_hit: bool = False
     sl_hit: bool = False
     breakeven_moved: bool = False
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utcnow)
+    updated_at: datetime = field(default_factory=utcnow)
     notes: Optional[str] = None
 
     def __post_init__(self):
@@ -168,7 +170,7 @@ class Trade:
         if not self.entry_time:
             return None
 
-        end_time = self.exit_time or datetime.utcnow()
+        end_time = self.exit_time or utcnow()
         return (end_time - self.entry_time).total_seconds() / 60
 
     @property
@@ -229,7 +231,7 @@ class Trade:
         self.highest_price = entry_price
         self.lowest_price = entry_price
         self.status = TradeStatus.OPEN
-        self.updated_at = datetime.utcnow()
+        self.updated_at = utcnow()
 
     def update_price(self, current_price: Decimal):
         """
@@ -239,7 +241,7 @@ class Trade:
             current_price: New current price
         """
         self.current_price = current_price
-        self.updated_at = datetime.utcnow()
+        self.updated_at = utcnow()
 
         # Update price extremes
         if self.highest_price is None or current_price > self.highest_price:
@@ -296,10 +298,10 @@ class Trade:
 
         # Record partial close
         partial = PartialClose(
-            time=datetime.utcnow(), price=price, size=size, profit=profit, reason=reason
+            time=utcnow(), price=price, size=size, profit=profit, reason=reason
         )
         self.partial_closes.append(partial)
-        self.updated_at = datetime.utcnow()
+        self.updated_at = utcnow()
 
         # Update flags
         if reason == "TP1_HIT":
@@ -320,7 +322,7 @@ class Trade:
         self.exit_time = exit_time
         self.exit_reason = reason
         self.status = TradeStatus.CLOSED
-        self.updated_at = datetime.utcnow()
+        self.updated_at = utcnow()
 
         # Calculate final P&L
         if self.is_buy:
@@ -351,7 +353,7 @@ class Trade:
         if self.entry_price and not self.breakeven_moved:
             self.stop_loss = self.entry_price
             self.breakeven_moved = True
-            self.updated_at = datetime.utcnow()
+            self.updated_at = utcnow()
 
     def to_dict(self) -> dict:
         """Convert trade to dictionary representation."""
@@ -407,12 +409,12 @@ class Trade:
         created_at = (
             datetime.fromisoformat(data["created_at"])
             if data.get("created_at")
-            else datetime.utcnow()
+            else utcnow()
         )
         updated_at = (
             datetime.fromisoformat(data["updated_at"])
             if data.get("updated_at")
-            else datetime.utcnow()
+            else utcnow()
         )
         entry_time = (
             datetime.fromisoformat(data["entry_time"])
@@ -6,6 +6,7 @@ Provides:
 - Health checks
 - Performance monitoring
 - System monitoring
+- Tick-to-signal latency tracing
 """
 
 # Copyright (c) 2024 Simon Callaghan. All rights reserved.
@@ -23,6 +24,13 @@ from .metrics import (
     monitor_performance,
 )
 
+from .tracing import (
+    TraceContext,
+    Tracer,
+    current_trace,
+    get_tracer,
+)
+
 from .health import (
     HealthChecker,
     HealthCheck,
@@ -43,6 +51,10 @@ __all__ = [
     "get_system_metrics",
     "get_application_metrics",
     "monitor_performance",
+    "TraceContext",
+    "Tracer",
+    "current_trace",
+    "get_tracer",
     "HealthChecker",
     "HealthCheck",
     "HealthResult",
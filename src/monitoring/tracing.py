@@ -0,0 +1,229 @@
+"""
+Latency tracing for XAUUSD Gold Trading System.
+
+Carries a per-tick trace context through the tick-to-signal pipeline,
+records per-stage durations into histograms and logs sampled traces.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..logging_config import get_logger
+from .metrics import MetricsRegistry, get_registry
+
+
+# Span durations for tick pipeline stages (seconds)
+STAGE_BUCKETS = [
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+]
+
+_current_trace: ContextVar[Optional["TraceContext"]] = ContextVar(
+    "current_trace", default=None
+)
+
+
+class TraceContext:
+    """
+    Trace of a single tick or analysis run.
+
+    Attributes:
+        trace_id: Unique trace identifier
+        name: Trace name (e.g. tick, analysis)
+        started_at: perf_counter time the trace started
+        spans: Recorded (stage, offset, duration) tuples in seconds
+        attributes: Extra trace attributes
+    """
+
+    __slots__ = ("trace_id", "name", "started_at", "spans", "attributes")
+
+    def __init__(self, name: str, started_at: Optional[float] = None, **attributes):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.spans: List[Tuple[str, float, float]] = []
+        self.attributes: Dict[str, Any] = attributes
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the trace started."""
+        return time.perf_counter() - self.started_at
+
+    def to_dict(self) -> dict:
+        """Convert trace to dictionary representation."""
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "total_ms": round(self.elapsed * 1000, 3),
+            "spans": [
+                {
+                    "stage": stage,
+                    "offset_ms": round(offset * 1000, 3),
+                    "duration_ms": round(duration * 1000, 3),
+                }
+                for stage, offset, duration in self.spans
+            ],
+            "attributes": self.attributes,
+        }
+
+
+def current_trace() -> Optional[TraceContext]:
+    """Get trace active in the current context."""
+    return _current_trace.get()
+
+
+class Tracer:
+    """
+    Sampling tracer for the tick-to-signal pipeline.
+
+    Unsampled ticks carry no trace, so instrumented code paths only
+    pay for a context variable lookup.
+    """
+
+    def __init__(self, sample_rate: float = 0.01, registry: MetricsRegistry = None):
+        """
+        Initialize tracer.
+
+        Args:
+            sample_rate: Fraction of ticks traced (0.0 - 1.0)
+            registry: Metrics registry (global registry if None)
+        """
+        self.sample_rate = sample_rate
+        self.logger = get_logger("tracing")
+
+        registry = registry or get_registry()
+        self.stage_histogram = registry.histogram(
+            "pipeline_stage_duration_seconds",
+            "Duration of tick-to-signal pipeline stages",
+            buckets=STAGE_BUCKETS,
+            labels=["stage"],
+        )
+        self.trace_histogram = registry.histogram(
+            "pipeline_trace_duration_seconds",
+            "End-to-end duration of traced ticks and analysis runs",
+            buckets=STAGE_BUCKETS,
+            labels=["name"],
+        )
+
+    def start_trace(
+        self,
+        name: str,
+        force: bool = False,
+        started_at: Optional[float] = None,
+        **attributes,
+    ) -> Optional[TraceContext]:
+        """
+        Start a trace if sampled.
+
+        Args:
+            name: Trace name
+            force: Always trace (for infrequent operations)
+            started_at: perf_counter origin (defaults to now)
+            **attributes: Extra trace attributes
+
+        Returns:
+            Trace context or None if not sampled
+        """
+        if not force and (
+            self.sample_rate <= 0 or random.random() >= self.sample_rate
+        ):
+            return None
+        return TraceContext(name, started_at, **attributes)
+
+    @contextmanager
+    def activate(self, trace: Optional[TraceContext]):
+        """
+        Make a trace current for the enclosed block.
+
+        Args:
+            trace: Trace context (None clears the current trace)
+        """
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+
+    @contextmanager
+    def span(self, stage: str, trace: Optional[TraceContext] = None):
+        """
+        Time a pipeline stage.
+
+        Args:
+            stage: Stage name
+            trace: Trace context (current trace if None)
+        """
+        trace = trace or _current_trace.get()
+        if trace is None:
+            yield None
+            return
+
+        start = time.perf_counter()
+        try:
+            yield trace
+        finally:
+            self.record_span(trace, stage, start, time.perf_counter())
+
+    def record_span(
+        self, trace: Optional[TraceContext], stage: str, start: float, end: float
+    ):
+        """
+        Record a stage measured outside a span block.
+
+        Args:
+            trace: Trace context
+            stage: Stage name
+            start: perf_counter start time
+            end: perf_counter end time
+        """
+        if trace is None:
+            return
+
+        duration = end - start
+        trace.spans.append((stage, start - trace.started_at, duration))
+        self.stage_histogram.observe(duration, stage=stage)
+
+    def finish_trace(self, trace: Optional[TraceContext]):
+        """
+        Complete a trace and log it.
+
+        Args:
+            trace: Trace context
+        """
+        if trace is None:
+            return
+
+        self.trace_histogram.observe(trace.elapsed, name=trace.name)
+        self.logger.info(f"Trace: {trace.to_dict()}")
+
+
+# Global tracer
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Get global tracer configured from settings."""
+    global _tracer
+    if _tracer is None:
+        from ..config import get_settings
+
+        _tracer = Tracer(sample_rate=get_settings().trace_sample_rate)
+    return _tracer
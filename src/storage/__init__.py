@@ -0,0 +1,32 @@
+"""
+Storage module for XAUUSD Gold Trading System.
+
+Provides file-based market data storage:
+- Memory-mapped tick journal for capture and replay
+- Partitioned columnar candle history with database sync
+- Streaming readers for MetaTrader history exports
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+from .tick_journal import (
+    RECORD_DTYPE,
+    JournalSegment,
+    TickJournalReader,
+    TickJournalWriter,
+)
+from .candle_store import CandleStore
+from .candle_sync import CandleStoreSync, rows_to_arrays
+from .history_files import HistoryBatch, read_history_file
+
+__all__ = [
+    "RECORD_DTYPE",
+    "JournalSegment",
+    "TickJournalReader",
+    "TickJournalWriter",
+    "CandleStore",
+    "CandleStoreSync",
+    "rows_to_arrays",
+    "HistoryBatch",
+    "read_history_file",
+]
@@ -0,0 +1,352 @@
+"""
+Historical candle store for XAUUSD Gold Trading System.
+
+Columnar on-disk candle history in Arrow IPC files, partitioned
+hive-style by instrument, timeframe and month:
+
+    {root}/instrument=XAUUSD/timeframe=M15/month=2024-01/candles.arrow
+
+Files are uncompressed and sorted by timestamp so reads can
+memory-map them and hand NumPy views straight to ``CandleArrays``.
+Time range reads skip partitions outside the range and slice the
+remaining files with a binary search on the timestamp column.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+import logging
+
+import numpy as np
+
+from ..analysis.candle_buffer import CandleArrays, datetime_to_ns, ns_to_datetime
+from ..models.price import PRICE_SCALE
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+    ipc = None
+
+
+PARTITION_FILE = "candles.arrow"
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+
+def _schema():
+    """Get the Arrow schema of a partition file."""
+    return pa.schema(
+        [
+            ("timestamp", pa.timestamp("ns")),
+            ("open", pa.float64()),
+            ("high", pa.float64()),
+            ("low", pa.float64()),
+            ("close", pa.float64()),
+            ("volume", pa.int64()),
+        ]
+    )
+
+
+def _month_keys(timestamp: np.ndarray) -> np.ndarray:
+    """Get the month (datetime64[M]) of each epoch-ns timestamp."""
+    return timestamp.astype("datetime64[ns]").astype("datetime64[M]")
+
+
+def _month_name(month: np.datetime64) -> str:
+    """Format a month key as a partition value (YYYY-MM)."""
+    return str(month)[:7]
+
+
+class CandleStore:
+    """
+    Partitioned columnar candle history.
+
+    Writes merge into existing month partitions (rows with the same
+    timestamp are replaced) and swap the file in atomically, so a
+    reader never sees a partial partition.
+    """
+
+    def __init__(self, directory: str = "data/candles"):
+        """
+        Initialize candle store.
+
+        Args:
+            directory: Store root directory
+
+        Raises:
+            RuntimeError: If pyarrow is not installed
+        """
+        if pa is None:
+            raise RuntimeError("Candle store requires the pyarrow package")
+
+        self.directory = Path(directory)
+        self.logger = logging.getLogger(__name__)
+
+    def _series_directory(self, instrument: str, timeframe: str) -> Path:
+        """Get the directory holding one instrument/timeframe series."""
+        return (
+            self.directory / f"instrument={instrument}" / f"timeframe={timeframe}"
+        )
+
+    def _partition_path(self, instrument: str, timeframe: str, month: str) -> Path:
+        """Get the file of one month partition."""
+        return (
+            self._series_directory(instrument, timeframe)
+            / f"month={month}"
+            / PARTITION_FILE
+        )
+
+    def partitions(self, instrument: str, timeframe: str) -> List[str]:
+        """
+        Get the months stored for a series.
+
+        Args:
+            instrument: Trading instrument
+            timeframe: Candle timeframe
+
+        Returns:
+            Month names (YYYY-MM) in ascending order
+        """
+        series = self._series_directory(instrument, timeframe)
+        if not series.is_dir():
+            return []
+        return sorted(
+            path.parent.name.split("=", 1)[1]
+            for path in series.glob(f"month=*/{PARTITION_FILE}")
+        )
+
+    def _read_partition(self, path: Path):
+        """Memory-map a partition file and get its table."""
+        with pa.memory_map(str(path), "r") as source:
+            return ipc.open_file(source).read_all()
+
+    @staticmethod
+    def _columns(table):
+        """Get the table columns as NumPy arrays (views when possible)."""
+        timestamp = table.column("timestamp").to_numpy().view(np.int64)
+        prices = [table.column(name).to_numpy() for name in PRICE_COLUMNS]
+        volume = table.column("volume").to_numpy()
+        return timestamp, prices, volume
+
+    def write(self, arrays: CandleArrays) -> int:
+        """
+        Write candles into the store.
+
+        Args:
+            arrays: Candles with instrument and timeframe set, in any order
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            ValueError: If instrument or timeframe is missing
+        """
+        if not arrays.instrument or not arrays.timeframe:
+            raise ValueError("Candle arrays need an instrument and timeframe")
+        if not len(arrays):
+            return 0
+
+        if arrays.fixed_point:
+            prices = [getattr(arrays, name) / PRICE_SCALE for name in PRICE_COLUMNS]
+        else:
+            prices = [getattr(arrays, name) for name in PRICE_COLUMNS]
+
+        months = _month_keys(arrays.timestamp)
+        for month in np.unique(months):
+            rows = months == month
+            self._merge_partition(
+                arrays.instrument,
+                arrays.timeframe,
+                _month_name(month),
+                arrays.timestamp[rows],
+                [column[rows] for column in prices],
+                arrays.volume[rows],
+            )
+        return len(arrays)
+
+    def _merge_partition(
+        self,
+        instrument: str,
+        timeframe: str,
+        month: str,
+        timestamp: np.ndarray,
+        prices: List[np.ndarray],
+        volume: np.ndarray,
+    ):
+        """Merge rows into one month partition and replace its file."""
+        path = self._partition_path(instrument, timeframe, month)
+
+        if path.exists():
+            old_timestamp, old_prices, old_volume = self._columns(
+                self._read_partition(path)
+            )
+            timestamp = np.concatenate([old_timestamp, timestamp])
+            prices = [np.concatenate(pair) for pair in zip(old_prices, prices)]
+            volume = np.concatenate([old_volume, volume])
+
+        # Stable sort keeps new rows after old ones; keep the last of each run
+        order = np.argsort(timestamp, kind="stable")
+        ordered = timestamp[order]
+        keep = np.ones(len(ordered), dtype=bool)
+        keep[:-1] = ordered[1:] != ordered[:-1]
+        order = order[keep]
+
+        table = pa.Table.from_arrays(
+            [pa.array(timestamp[order].astype("datetime64[ns]"))]
+            + [pa.array(column[order], type=pa.float64()) for column in prices]
+            + [pa.array(volume[order], type=pa.int64())],
+            schema=_schema(),
+        )
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        with pa.OSFile(str(temp_path), "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, path)
+
+    def read(
+        self,
+        instrument: str,
+        timeframe: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        fixed_point: bool = False,
+    ) -> CandleArrays:
+        """
+        Read candles in a time range.
+
+        A range within one month returns views over the mapped file;
+        spanning several months concatenates them into new arrays.
+
+        Args:
+            instrument: Trading instrument
+            timeframe: Candle timeframe
+            start: First candle open time (inclusive)
+            end: Last candle open time (inclusive)
+            fixed_point: Return prices as int64 price units
+
+        Returns:
+            CandleArrays in time order
+        """
+        start_ns = datetime_to_ns(start) if start is not None else None
+        end_ns = datetime_to_ns(end) if end is not None else None
+        first_month = _month_name(_month_keys(np.int64(start_ns))) if start else None
+        last_month = _month_name(_month_keys(np.int64(end_ns))) if end else None
+
+        parts = []
+        for month in self.partitions(instrument, timeframe):
+            if first_month is not None and month < first_month:
+                continue
+            if last_month is not None and month > last_month:
+                break
+
+            table = self._read_partition(
+                self._partition_path(instrument, timeframe, month)
+            )
+            timestamp, prices, volume = self._columns(table)
+            lo = 0
+            hi = len(timestamp)
+            if start_ns is not None:
+                lo = int(np.searchsorted(timestamp, start_ns, side="left"))
+            if end_ns is not None:
+                hi = int(np.searchsorted(timestamp, end_ns, side="right"))
+            if hi > lo:
+                parts.append(
+                    (
+                        timestamp[lo:hi],
+                        [column[lo:hi] for column in prices],
+                        volume[lo:hi],
+                    )
+                )
+
+        if not parts:
+            return CandleArrays.empty(instrument, timeframe, fixed_point)
+
+        if len(parts) == 1:
+            timestamp, prices, volume = parts[0]
+        else:
+            timestamp = np.concatenate([part[0] for part in parts])
+            prices = [
+                np.concatenate([part[1][i] for part in parts])
+                for i in range(len(PRICE_COLUMNS))
+            ]
+            volume = np.concatenate([part[2] for part in parts])
+
+        if fixed_point:
+            prices = [
+                np.rint(column * PRICE_SCALE).astype(np.int64) for column in prices
+            ]
+
+        return CandleArrays(
+            timestamp, *prices, volume, instrument, timeframe, fixed_point
+        )
+
+    def tail(
+        self,
+        instrument: str,
+        timeframe: str,
+        count: int,
+        end: Optional[datetime] = None,
+    ) -> CandleArrays:
+        """
+        Read the latest candles, opening only the partitions needed.
+
+        Args:
+            instrument: Trading instrument
+            timeframe: Candle timeframe
+            count: Maximum candles to return
+            end: Last candle open time (inclusive)
+
+        Returns:
+            Up to ``count`` candles in time order
+        """
+        end_ns = datetime_to_ns(end) if end is not None else None
+        end_month = _month_name(_month_keys(np.int64(end_ns))) if end else None
+        needed = count
+        first_month = None
+        for month in reversed(self.partitions(instrument, timeframe)):
+            if needed <= 0:
+                break
+            if end_month is not None and month > end_month:
+                continue
+            first_month = month
+            table = self._read_partition(
+                self._partition_path(instrument, timeframe, month)
+            )
+            rows = table.num_rows
+            if end_ns is not None and month == end_month:
+                timestamp = table.column("timestamp").to_numpy().view(np.int64)
+                rows = int(np.searchsorted(timestamp, end_ns, side="right"))
+            needed -= rows
+
+        if first_month is None or count <= 0:
+            return CandleArrays.empty(instrument, timeframe)
+
+        start = datetime.strptime(first_month, "%Y-%m")
+        arrays = self.read(instrument, timeframe, start, end)
+        return arrays.slice(max(0, len(arrays) - count), len(arrays))
+
+    def last_timestamp(self, instrument: str, timeframe: str) -> Optional[datetime]:
+        """
+        Get the open time of the latest stored candle.
+
+        Args:
+            instrument: Trading instrument
+            timeframe: Candle timeframe
+
+        Returns:
+            Latest candle time, or None if the series is empty
+        """
+        for month in reversed(self.partitions(instrument, timeframe)):
+            table = self._read_partition(
+                self._partition_path(instrument, timeframe, month)
+            )
+            if table.num_rows:
+                timestamp = table.column("timestamp").to_numpy().view(np.int64)
+                return ns_to_datetime(timestamp[-1])
+        return None
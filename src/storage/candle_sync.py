@@ -0,0 +1,168 @@
+"""
+Candle store sync job for XAUUSD Gold Trading System.
+
+Mirrors closed candles from the ``price_history`` table into the
+columnar candle store, resuming after the latest stored candle.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Sequence
+import logging
+
+import numpy as np
+
+from ..analysis.candle_aggregator import TIMEFRAME_SECONDS
+from ..analysis.candle_buffer import CandleArrays, datetime_to_ns
+from ..core.clock import utcnow
+from .candle_store import CandleStore
+
+
+def rows_to_arrays(
+    rows: Sequence[Any], instrument: str, timeframe: str
+) -> CandleArrays:
+    """
+    Convert ``PriceHistory`` rows to candle arrays without building candles.
+
+    Args:
+        rows: PriceHistory rows in time order
+        instrument: Trading instrument
+        timeframe: Candle timeframe
+
+    Returns:
+        CandleArrays with float64 prices
+    """
+    count = len(rows)
+    return CandleArrays(
+        np.fromiter(
+            (datetime_to_ns(row.timestamp) for row in rows), np.int64, count
+        ),
+        np.fromiter((row.open_price for row in rows), np.float64, count),
+        np.fromiter((row.high_price for row in rows), np.float64, count),
+        np.fromiter((row.low_price for row in rows), np.float64, count),
+        np.fromiter((row.close_price for row in rows), np.float64, count),
+        np.fromiter((row.volume or 0 for row in rows), np.int64, count),
+        instrument,
+        timeframe,
+    )
+
+
+class CandleStoreSync:
+    """
+    Copies closed candles from the database into a candle store.
+
+    Only candles whose period has fully elapsed are copied, so the
+    forming candle is never mirrored.
+    """
+
+    def __init__(
+        self,
+        store: CandleStore,
+        database: Optional[Any] = None,
+        batch_size: int = 10000,
+    ):
+        """
+        Initialize sync job.
+
+        Args:
+            store: Destination candle store
+            database: Database manager (defaults to the global instance)
+            batch_size: Rows fetched per query
+        """
+        if batch_size <= 0:
+            raise ValueError(f"Batch size must be positive, got {batch_size}")
+
+        if database is None:
+            from ..database.connection import db as database
+
+        self.store = store
+        self.database = database
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(__name__)
+
+    def sync_series(
+        self, instrument: str, timeframe: str, now: Optional[datetime] = None
+    ) -> int:
+        """
+        Copy new closed candles of one series.
+
+        Args:
+            instrument: Trading instrument
+            timeframe: Candle timeframe
+            now: Current time (defaults to the active clock)
+
+        Returns:
+            Number of candles copied
+        """
+        from ..database.repositories import PriceHistoryRepository
+
+        before = (now or utcnow()) - timedelta(seconds=TIMEFRAME_SECONDS[timeframe])
+        after = self.store.last_timestamp(instrument, timeframe)
+        copied = 0
+
+        while True:
+            with self.database.get_session() as session:
+                rows = PriceHistoryRepository(session).get_candles_after(
+                    instrument, timeframe, after, before, self.batch_size
+                )
+                if not rows:
+                    break
+                arrays = rows_to_arrays(rows, instrument, timeframe)
+                after = rows[-1].timestamp
+
+            copied += self.store.write(arrays)
+            if len(rows) < self.batch_size:
+                break
+
+        if copied:
+            self.logger.info(f"Mirrored {copied} {instrument} {timeframe} candles")
+        return copied
+
+    def sync(
+        self, instruments: Iterable[str], timeframes: Iterable[str]
+    ) -> Dict[str, int]:
+        """
+        Copy new closed candles of several series.
+
+        Args:
+            instruments: Trading instruments
+            timeframes: Candle timeframes
+
+        Returns:
+            Candles copied per "INSTRUMENT/TIMEFRAME" series
+        """
+        timeframes = list(timeframes)
+        return {
+            f"{instrument}/{timeframe}": self.sync_series(instrument, timeframe)
+            for instrument in instruments
+            for timeframe in timeframes
+        }
+
+    async def run(
+        self,
+        instruments: Sequence[str],
+        timeframes: Sequence[str],
+        interval_seconds: float = 900.0,
+    ):
+        """
+        Sync periodically until cancelled.
+
+        Each pass runs in a worker thread so database and file I/O
+        do not block the event loop.
+
+        Args:
+            instruments: Trading instruments
+            timeframes: Candle timeframes
+            interval_seconds: Seconds between passes
+        """
+        while True:
+            try:
+                await asyncio.to_thread(self.sync, instruments, timeframes)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error syncing candle store: {e}")
+
+            await asyncio.sleep(interval_seconds)
@@ -0,0 +1,469 @@
+"""
+Historical bar file readers for XAUUSD Gold Trading System.
+
+Streams MetaTrader history exports in fixed-size chunks:
+- MT5 CSV exports (``<DATE> <TIME> <OPEN> ...`` header, tab or comma)
+- Headerless MT4 CSV exports (date, time, open, high, low, close, volume)
+- MT4 ``.hst`` history files (format versions 400 and 401)
+
+Each chunk is parsed and validated with NumPy column operations;
+rows that fail validation are dropped and counted.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import csv
+import re
+import struct
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..analysis.candle_buffer import CandleArrays
+
+
+NAT = np.iinfo(np.int64).min
+
+# Timeframes accepted by the price_history table, in minutes
+HISTORY_TIMEFRAMES = {
+    "M1": 1,
+    "M5": 5,
+    "M15": 15,
+    "M30": 30,
+    "H1": 60,
+    "H4": 240,
+    "D1": 1440,
+}
+_MINUTES_TO_TIMEFRAME = {minutes: tf for tf, minutes in HISTORY_TIMEFRAMES.items()}
+_FILENAME_TIMEFRAME = re.compile(
+    r"(?:^|[_\-.])(" + "|".join(HISTORY_TIMEFRAMES) + r")(?=[_\-.]|$)"
+)
+
+# version, copyright, symbol, period, digits, timesign, last sync, unused
+HST_HEADER = struct.Struct("<i64s12siiii52s")
+HST_DTYPES = {
+    400: np.dtype(
+        [
+            ("time", "<i4"),
+            ("open", "<f8"),
+            ("low", "<f8"),
+            ("high", "<f8"),
+            ("close", "<f8"),
+            ("volume", "<f8"),
+        ]
+    ),
+    401: np.dtype(
+        [
+            ("time", "<i8"),
+            ("open", "<f8"),
+            ("high", "<f8"),
+            ("low", "<f8"),
+            ("close", "<f8"),
+            ("tick_volume", "<i8"),
+            ("spread", "<i4"),
+            ("real_volume", "<i8"),
+        ]
+    ),
+}
+
+# Headerless MT4 CSV column order
+_MT4_COLUMNS = ("DATE", "TIME", "OPEN", "HIGH", "LOW", "CLOSE", "TICKVOL")
+# Columns read from CSV exports
+_CSV_FIELDS = _MT4_COLUMNS + ("VOL", "SPREAD")
+
+
+@dataclass
+class HistoryBatch:
+    """
+    Validated chunk of historical bars.
+
+    Attributes:
+        candles: Bars in time order without duplicate timestamps
+        tick_volume: Tick volume per bar
+        spread: Spread per bar in points
+        rows: Rows read from the file for this chunk
+        rejected: Rows dropped by validation
+    """
+
+    candles: CandleArrays
+    tick_volume: np.ndarray
+    spread: np.ndarray
+    rows: int
+    rejected: int
+
+    def __len__(self) -> int:
+        return len(self.candles)
+
+
+def timeframe_from_filename(path: str) -> Optional[str]:
+    """
+    Guess the timeframe from an export file name.
+
+    MT5 names exports like ``XAUUSD_M15_202401020000_202412312345.csv``.
+
+    Args:
+        path: File path
+
+    Returns:
+        Timeframe, or None if the name does not contain one
+    """
+    match = _FILENAME_TIMEFRAME.search(Path(path).stem.upper())
+    return match.group(1) if match else None
+
+
+def _to_float(values: Sequence[str]) -> np.ndarray:
+    """Parse a text column as float64, with NaN for unparsable values."""
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        parsed = np.empty(len(values), dtype=np.float64)
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = float(value)
+            except ValueError:
+                parsed[i] = np.nan
+        return parsed
+
+
+def _to_timestamp_ns(values: np.ndarray) -> np.ndarray:
+    """Parse ISO-like datetime strings to epoch-ns, with NAT if unparsable."""
+    try:
+        return values.astype("datetime64[ns]").view(np.int64)
+    except ValueError:
+        parsed = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = np.datetime64(value, "ns").astype(np.int64)
+            except ValueError:
+                parsed[i] = NAT
+        return parsed
+
+
+def validate_bars(
+    timestamp: np.ndarray,
+    open: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    tick_volume: np.ndarray,
+    spread: np.ndarray,
+    instrument: str,
+    timeframe: str,
+) -> HistoryBatch:
+    """
+    Validate parsed bars and drop bad and duplicate rows.
+
+    A bar is kept if its timestamp parsed and is aligned to the
+    timeframe, all prices are finite and positive, high and low
+    bound the open and close, and volumes are not negative. Of
+    several bars with the same timestamp the last one wins.
+
+    Args:
+        timestamp: Bar open times in epoch nanoseconds
+        open: Opening prices
+        high: Highest prices
+        low: Lowest prices
+        close: Closing prices
+        volume: Volumes
+        tick_volume: Tick volumes
+        spread: Spreads in points
+        instrument: Trading instrument
+        timeframe: Bar timeframe
+
+    Returns:
+        Validated batch
+    """
+    period = HISTORY_TIMEFRAMES[timeframe] * 60 * 1_000_000_000
+    with np.errstate(invalid="ignore"):
+        valid = (
+            (timestamp != NAT)
+            & (timestamp % period == 0)
+            & np.isfinite(open)
+            & np.isfinite(high)
+            & np.isfinite(low)
+            & np.isfinite(close)
+            & (low > 0)
+            & (high >= np.maximum(open, close))
+            & (low <= np.minimum(open, close))
+            & (volume >= 0)
+            & (tick_volume >= 0)
+        )
+
+    rows = np.flatnonzero(valid)
+    order = rows[np.argsort(timestamp[rows], kind="stable")]
+    ordered = timestamp[order]
+    keep = np.ones(len(order), dtype=bool)
+    keep[:-1] = ordered[1:] != ordered[:-1]
+    order = order[keep]
+
+    return HistoryBatch(
+        candles=CandleArrays(
+            timestamp[order],
+            open[order],
+            high[order],
+            low[order],
+            close[order],
+            volume[order].astype(np.int64),
+            instrument,
+            timeframe,
+        ),
+        tick_volume=tick_volume[order].astype(np.int64),
+        spread=spread[order].astype(np.int64),
+        rows=len(timestamp),
+        rejected=len(timestamp) - len(rows),
+    )
+
+
+def _csv_layout(first_row: List[str]) -> Tuple[List[str], bool]:
+    """Get column names of a CSV export and whether row one is a header."""
+    if first_row and first_row[0].startswith("<"):
+        return [name.strip("<>").upper() for name in first_row], True
+    return list(_MT4_COLUMNS[: len(first_row)]), False
+
+
+def _parse_csv_lines(
+    lines: List[str], delimiter: str, columns: List[str]
+) -> Dict[str, np.ndarray]:
+    """
+    Parse a chunk of CSV lines into named columns.
+
+    Uses ``np.loadtxt`` on the whole chunk and only falls back to
+    parsing field by field when the chunk contains malformed values.
+    """
+    wanted = [name for name in _CSV_FIELDS if name in columns]
+    numeric = [name for name in wanted if name not in ("DATE", "TIME")]
+    text = [name for name in wanted if name in ("DATE", "TIME")]
+
+    try:
+        values = np.loadtxt(
+            lines,
+            delimiter=delimiter,
+            usecols=[columns.index(name) for name in numeric],
+            ndmin=2,
+        )
+        stamps = np.loadtxt(
+            lines,
+            delimiter=delimiter,
+            usecols=[columns.index(name) for name in text],
+            dtype=str,
+            ndmin=2,
+        )
+        parsed = {name: values[:, i] for i, name in enumerate(numeric)}
+        parsed.update({name: stamps[:, i] for i, name in enumerate(text)})
+    except ValueError:
+        rows = [
+            row
+            for row in csv.reader(lines, delimiter=delimiter)
+            if len(row) >= len(columns)
+        ]
+        fields = list(zip(*rows)) or [()] * len(columns)
+        parsed = {
+            name: _to_float(fields[columns.index(name)]) for name in numeric
+        }
+        parsed.update(
+            {
+                name: np.array(fields[columns.index(name)], dtype=str)
+                for name in text
+            }
+        )
+    return parsed
+
+
+def read_mt5_csv(
+    path: str, instrument: str, timeframe: str, chunk_rows: int = 100_000
+) -> Iterator[HistoryBatch]:
+    """
+    Stream an MT5 or MT4 CSV export.
+
+    Dates may use dots or dashes; the time column may be missing
+    when the date column holds the full timestamp.
+
+    Args:
+        path: CSV file
+        instrument: Trading instrument
+        timeframe: Bar timeframe
+        chunk_rows: Rows per batch
+
+    Yields:
+        Validated batches in file order
+    """
+    with open(path) as handle:
+        first = handle.readline()
+        if not first.strip():
+            return
+        delimiter = "\t" if "\t" in first else ";" if ";" in first else ","
+        header = next(csv.reader([first], delimiter=delimiter))
+        columns, has_header = _csv_layout(header)
+        pending = [] if has_header else [first]
+
+        while True:
+            lines = pending + list(islice(handle, chunk_rows - len(pending)))
+            pending = []
+            lines = [line for line in lines if line.strip()]
+            if not lines:
+                break
+
+            parsed = _parse_csv_lines(lines, delimiter, columns)
+            count = len(parsed["OPEN"])
+            zeros = np.zeros(count)
+            stamps = np.char.replace(parsed["DATE"], ".", "-")
+            if "TIME" in parsed:
+                stamps = np.char.add(np.char.add(stamps, "T"), parsed["TIME"])
+            else:
+                stamps = np.char.replace(stamps, " ", "T")
+            tick_volume = parsed.get("TICKVOL", zeros)
+            real_volume = parsed.get("VOL", zeros)
+
+            yield validate_bars(
+                _to_timestamp_ns(stamps),
+                parsed["OPEN"],
+                parsed["HIGH"],
+                parsed["LOW"],
+                parsed["CLOSE"],
+                np.where(real_volume > 0, real_volume, tick_volume),
+                tick_volume,
+                np.nan_to_num(parsed.get("SPREAD", zeros)),
+                instrument,
+                timeframe,
+            )
+
+
+def read_hst_header(path: str) -> Tuple[int, str, Optional[str], int]:
+    """
+    Read an MT4 history file header.
+
+    Args:
+        path: HST file
+
+    Returns:
+        (format version, symbol, timeframe, price digits)
+
+    Raises:
+        ValueError: If the file is not a supported history file
+    """
+    with open(path, "rb") as handle:
+        data = handle.read(HST_HEADER.size)
+    if len(data) < HST_HEADER.size:
+        raise ValueError(f"{path} is not an HST history file")
+
+    version, _, symbol, period, digits, *_ = HST_HEADER.unpack(data)
+    if version not in HST_DTYPES:
+        raise ValueError(f"Unsupported HST format version {version}")
+    return (
+        version,
+        symbol.split(b"\0", 1)[0].decode("ascii", "replace"),
+        _MINUTES_TO_TIMEFRAME.get(period),
+        digits,
+    )
+
+
+def read_hst(
+    path: str,
+    instrument: Optional[str] = None,
+    timeframe: Optional[str] = None,
+    chunk_rows: int = 100_000,
+) -> Iterator[HistoryBatch]:
+    """
+    Stream an MT4 ``.hst`` history file.
+
+    Records are memory-mapped and converted a chunk at a time.
+
+    Args:
+        path: HST file
+        instrument: Instrument override (defaults to the header symbol)
+        timeframe: Timeframe override (defaults to the header period)
+        chunk_rows: Rows per batch
+
+    Yields:
+        Validated batches in file order
+
+    Raises:
+        ValueError: If the file or its period is not supported
+    """
+    version, symbol, period, _ = read_hst_header(path)
+    timeframe = timeframe or period
+    if timeframe not in HISTORY_TIMEFRAMES:
+        raise ValueError(f"{path} has an unsupported timeframe")
+
+    dtype = HST_DTYPES[version]
+    count = (Path(path).stat().st_size - HST_HEADER.size) // dtype.itemsize
+    if count <= 0:
+        return
+    records = np.memmap(
+        path, dtype=dtype, mode="r", offset=HST_HEADER.size, shape=count
+    )
+
+    for start in range(0, count, chunk_rows):
+        chunk = records[start : start + chunk_rows]
+        timestamp = chunk["time"].astype(np.int64) * 1_000_000_000
+        if version == 400:
+            tick_volume = chunk["volume"]
+            volume = tick_volume
+            spread = np.zeros(len(chunk))
+        else:
+            tick_volume = chunk["tick_volume"]
+            real_volume = chunk["real_volume"]
+            volume = np.where(real_volume > 0, real_volume, tick_volume)
+            spread = chunk["spread"]
+
+        yield validate_bars(
+            timestamp,
+            np.array(chunk["open"]),
+            np.array(chunk["high"]),
+            np.array(chunk["low"]),
+            np.array(chunk["close"]),
+            np.asarray(volume),
+            np.asarray(tick_volume),
+            np.asarray(spread),
+            instrument or symbol,
+            timeframe,
+        )
+
+
+def read_history_file(
+    path: str,
+    instrument: Optional[str] = None,
+    timeframe: Optional[str] = None,
+    file_format: str = "auto",
+    chunk_rows: int = 100_000,
+) -> Iterator[HistoryBatch]:
+    """
+    Stream a history export of any supported format.
+
+    Args:
+        path: Export file
+        instrument: Trading instrument (HST files default to their symbol)
+        timeframe: Bar timeframe (defaults to the HST header or file name)
+        file_format: "csv", "hst" or "auto" (by file extension)
+        chunk_rows: Rows per batch
+
+    Returns:
+        Iterator of validated batches
+
+    Raises:
+        ValueError: If the format, instrument or timeframe cannot be determined
+    """
+    if chunk_rows <= 0:
+        raise ValueError(f"Chunk size must be positive, got {chunk_rows}")
+
+    if file_format == "auto":
+        file_format = "hst" if Path(path).suffix.lower() == ".hst" else "csv"
+
+    if file_format == "hst":
+        return read_hst(path, instrument, timeframe, chunk_rows)
+    if file_format != "csv":
+        raise ValueError(f"Unknown history format '{file_format}'")
+
+    timeframe = timeframe or timeframe_from_filename(path)
+    if timeframe not in HISTORY_TIMEFRAMES:
+        raise ValueError(
+            f"Cannot determine timeframe of {path}; must be one of: "
+            f"{', '.join(HISTORY_TIMEFRAMES)}"
+        )
+    if not instrument:
+        raise ValueError("CSV imports need an instrument")
+    return read_mt5_csv(path, instrument, timeframe, chunk_rows)
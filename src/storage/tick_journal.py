@@ -0,0 +1,443 @@
+"""
+Tick journal for XAUUSD Gold Trading System.
+
+Append-only binary journal of received ticks stored in rolling
+memory-mapped segment files, for capture and replay.
+
+Each segment holds a fixed-size header followed by fixed-width
+records (epoch-ns, bid, ask, last, volume) with prices in integer
+price units. Sealed segments get a sparse timestamp index so range
+reads touch only the pages they need. Reads are zero-copy NumPy
+views over the mapped files.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import mmap
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from ..analysis.candle_buffer import datetime_to_ns, ns_to_datetime
+from ..models.market_data import Tick
+from ..models.price import from_price_units, to_price_units
+
+
+MAGIC = b"XTJRNL01"
+VERSION = 1
+
+# magic, version, record size, capacity, symbol, count, last ts, first ts
+HEADER = struct.Struct("<8sHHI16sQqq")
+HEADER_SIZE = 64
+# count and last timestamp are rewritten after every append
+_STATE = struct.Struct("<Qq")
+_STATE_OFFSET = 32
+
+RECORD = struct.Struct("<qqqqq")
+RECORD_DTYPE = np.dtype(
+    [
+        ("timestamp_ns", "<i8"),
+        ("bid", "<i8"),
+        ("ask", "<i8"),
+        ("last", "<i8"),
+        ("volume", "<i8"),
+    ]
+)
+
+SEGMENT_SUFFIX = ".tjs"
+INDEX_SUFFIX = ".tji"
+
+
+def _segment_path(directory: Path, sequence: int) -> Path:
+    """Get path of a segment file."""
+    return directory / f"{sequence:08d}{SEGMENT_SUFFIX}"
+
+
+def _read_header(mm) -> Tuple[int, int, str, int, int, int]:
+    """
+    Parse a segment header.
+
+    Returns:
+        (record size, capacity, symbol, count, first ts, last ts)
+
+    Raises:
+        ValueError: If the file is not a tick journal segment
+    """
+    magic, version, record_size, capacity, symbol, count, last_ts, first_ts = (
+        HEADER.unpack_from(mm, 0)
+    )
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a tick journal segment")
+    return (
+        record_size,
+        capacity,
+        symbol.rstrip(b"\0").decode(),
+        count,
+        first_ts,
+        last_ts,
+    )
+
+
+class TickJournalWriter:
+    """
+    Append-only tick journal writer for a single symbol.
+
+    Records are written straight into the mapped segment with
+    ``struct.pack_into``; the record count in the header is updated
+    after each record so readers never see a partial record. When a
+    segment is full it is sealed (index written) and a new one started.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        symbol: str,
+        segment_ticks: int = 1 << 20,
+        index_stride: int = 4096,
+    ):
+        """
+        Initialize tick journal writer.
+
+        Args:
+            directory: Journal root directory
+            symbol: Trading symbol
+            segment_ticks: Records per segment file
+            index_stride: Records between sparse index entries
+        """
+        if segment_ticks <= 0:
+            raise ValueError(f"Segment size must be positive, got {segment_ticks}")
+
+        self.directory = Path(directory) / symbol
+        self.symbol = symbol
+        self.segment_ticks = segment_ticks
+        self.index_stride = index_stride
+        self.logger = logging.getLogger(f"{__name__}.{symbol}")
+
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        self._sequence = 0
+        self._count = 0
+        self._capacity = 0
+        self.written = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Check if a segment is mapped."""
+        return self._mm is not None
+
+    def open(self):
+        """Open the journal, continuing the latest unsealed segment."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        segments = sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+        if segments:
+            latest = segments[-1]
+            sequence = int(latest.stem)
+            if not latest.with_suffix(INDEX_SUFFIX).exists():
+                self._map_segment(latest, sequence)
+                if self._count < self._capacity:
+                    return
+                self._seal()
+            self._create_segment(sequence + 1)
+        else:
+            self._create_segment(0)
+
+    def append(self, tick: Tick):
+        """
+        Append a tick.
+
+        Prices are rounded to the nearest price unit.
+
+        Args:
+            tick: Tick to record
+        """
+        self.append_raw(
+            datetime_to_ns(tick.timestamp),
+            to_price_units(tick.bid, exact=False),
+            to_price_units(tick.ask, exact=False),
+            to_price_units(tick.last, exact=False) if tick.last is not None else 0,
+            tick.volume or 0,
+        )
+
+    def append_raw(
+        self, timestamp_ns: int, bid: int, ask: int, last: int = 0, volume: int = 0
+    ):
+        """
+        Append a record from raw values.
+
+        Args:
+            timestamp_ns: Tick time in epoch nanoseconds
+            bid: Bid in price units
+            ask: Ask in price units
+            last: Last price in price units (0 if unknown)
+            volume: Tick volume
+        """
+        if self._mm is None:
+            self.open()
+        elif self._count >= self._capacity:
+            self._seal()
+            self._create_segment(self._sequence + 1)
+
+        mm = self._mm
+        count = self._count
+        RECORD.pack_into(
+            mm,
+            HEADER_SIZE + count * RECORD.size,
+            timestamp_ns,
+            bid,
+            ask,
+            last,
+            volume,
+        )
+        if count == 0:
+            struct.pack_into("<q", mm, _STATE_OFFSET + _STATE.size, timestamp_ns)
+        self._count = count + 1
+        _STATE.pack_into(mm, _STATE_OFFSET, self._count, timestamp_ns)
+        self.written += 1
+
+    def flush(self):
+        """Flush mapped pages to disk."""
+        if self._mm is not None:
+            self._mm.flush()
+
+    def close(self):
+        """Flush and unmap the current segment; it can be continued later."""
+        if self._mm is None:
+            return
+        self._mm.flush()
+        self._mm.close()
+        self._file.close()
+        self._mm = None
+        self._file = None
+
+    def _create_segment(self, sequence: int):
+        """Create and map a new preallocated segment."""
+        path = _segment_path(self.directory, sequence)
+        with open(path, "wb") as f:
+            f.truncate(HEADER_SIZE + self.segment_ticks * RECORD.size)
+            f.write(
+                HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    RECORD.size,
+                    self.segment_ticks,
+                    self.symbol.encode()[:16],
+                    0,
+                    0,
+                    0,
+                )
+            )
+        self._map_segment(path, sequence)
+        self.logger.debug(f"Started tick journal segment {path.name}")
+
+    def _map_segment(self, path: Path, sequence: int):
+        """Map an existing segment for appending."""
+        self._file = open(path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        record_size, capacity, _, count, _, _ = _read_header(self._mm)
+        if record_size != RECORD.size:
+            raise ValueError(f"Unsupported record size {record_size} in {path}")
+
+        self._sequence = sequence
+        self._capacity = capacity
+        self._count = count
+
+    def _seal(self):
+        """Write the sparse index for the current segment and unmap it."""
+        path = _segment_path(self.directory, self._sequence)
+        records = np.frombuffer(
+            self._mm, dtype=RECORD_DTYPE, count=self._count, offset=HEADER_SIZE
+        )
+        positions = np.arange(0, self._count, self.index_stride, dtype=np.int64)
+        index = np.column_stack((records["timestamp_ns"][positions], positions))
+        del records
+
+        tmp_path = path.with_suffix(INDEX_SUFFIX + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, index)
+        os.replace(tmp_path, path.with_suffix(INDEX_SUFFIX))
+        self.close()
+
+
+class JournalSegment:
+    """
+    Read-only view of a journal segment.
+
+    Attributes:
+        path: Segment file path
+        symbol: Trading symbol
+        count: Number of records at open time
+        first_ns: Timestamp of the first record
+        last_ns: Timestamp of the last record
+        records: Zero-copy structured array of the records
+        index: Sparse (timestamp, position) index, None if unsealed
+    """
+
+    def __init__(self, path: Path):
+        """
+        Map a segment file.
+
+        Args:
+            path: Segment file path
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, _, self.symbol, self.count, self.first_ns, self.last_ns = _read_header(
+            self._mm
+        )
+        self.records = np.frombuffer(
+            self._mm, dtype=RECORD_DTYPE, count=self.count, offset=HEADER_SIZE
+        )
+
+        index_path = path.with_suffix(INDEX_SUFFIX)
+        self.index: Optional[np.ndarray] = (
+            np.load(index_path) if index_path.exists() else None
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    def slice(self, start_ns: Optional[int], end_ns: Optional[int]) -> np.ndarray:
+        """
+        Get records with start_ns <= timestamp < end_ns.
+
+        Records are assumed to be in non-decreasing timestamp order.
+
+        Args:
+            start_ns: Inclusive start (None for the beginning)
+            end_ns: Exclusive end (None for the end)
+
+        Returns:
+            Zero-copy structured array view
+        """
+        timestamps = self.records["timestamp_ns"]
+        lo, hi = 0, self.count
+
+        if start_ns is not None:
+            lo = self._search(timestamps, start_ns)
+        if end_ns is not None:
+            hi = self._search(timestamps, end_ns)
+        return self.records[lo:max(lo, hi)]
+
+    def _search(self, timestamps: np.ndarray, value: int) -> int:
+        """Find the first position with timestamp >= value."""
+        lo, hi = 0, self.count
+        if self.index is not None and len(self.index):
+            # Narrow the search to one index stride
+            entry = int(np.searchsorted(self.index[:, 0], value, side="left"))
+            if entry > 0:
+                lo = int(self.index[entry - 1, 1])
+            if entry < len(self.index):
+                hi = int(self.index[entry, 1]) + 1
+        return lo + int(np.searchsorted(timestamps[lo:hi], value, side="left"))
+
+
+class TickJournalReader:
+    """Zero-copy reader over a symbol's journal segments."""
+
+    def __init__(self, directory: str, symbol: str):
+        """
+        Initialize tick journal reader.
+
+        Args:
+            directory: Journal root directory
+            symbol: Trading symbol
+        """
+        self.directory = Path(directory) / symbol
+        self.symbol = symbol
+
+    def segments(self) -> List[JournalSegment]:
+        """
+        Map all segments, oldest first.
+
+        Returns:
+            List of segments
+        """
+        if not self.directory.exists():
+            return []
+        return [
+            JournalSegment(path)
+            for path in sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+        ]
+
+    def read(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Read records in a time range.
+
+        Args:
+            start: Inclusive start time (naive UTC)
+            end: Exclusive end time (naive UTC)
+
+        Yields:
+            Zero-copy structured arrays, one per overlapping segment
+        """
+        start_ns = datetime_to_ns(start) if start is not None else None
+        end_ns = datetime_to_ns(end) if end is not None else None
+
+        for segment in self.segments():
+            if segment.count == 0:
+                continue
+            if start_ns is not None and segment.last_ns < start_ns:
+                continue
+            if end_ns is not None and segment.first_ns >= end_ns:
+                break
+
+            records = segment.slice(start_ns, end_ns)
+            if len(records):
+                yield records
+
+    def read_all(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> np.ndarray:
+        """
+        Read records in a time range into one array.
+
+        Copies when the range spans several segments.
+
+        Args:
+            start: Inclusive start time (naive UTC)
+            end: Exclusive end time (naive UTC)
+
+        Returns:
+            Structured array of records
+        """
+        chunks = list(self.read(start, end))
+        if not chunks:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        if len(chunks) == 1:
+            return chunks[0]
+        return np.concatenate(chunks)
+
+    def iter_ticks(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[Tick]:
+        """
+        Materialize journaled records as ticks.
+
+        Args:
+            start: Inclusive start time (naive UTC)
+            end: Exclusive end time (naive UTC)
+
+        Yields:
+            Tick objects in journal order
+        """
+        symbol = self.symbol
+        for records in self.read(start, end):
+            for timestamp_ns, bid, ask, last, volume in records.tolist():
+                yield Tick.from_trusted(
+                    symbol,
+                    ns_to_datetime(timestamp_ns),
+                    from_price_units(bid),
+                    from_price_units(ask),
+                    from_price_units(last) if last else None,
+                    volume,
+                )
@@ -17,6 +17,7 @@ from ..models.signal import TradingSignal, SignalStatus, SessionType
 from ..models.market_data import PriceLevel
 from ..analysis.confluence_analyzer import ConfluenceAnalysis
 from ..config import get_settings
+from ..core.clock import utcnow
 
 
 class SignalGenerator:
@@ -56,6 +57,8 @@ class SignalGenerator:
         direction, setup_type = self._determine_signal_direction(
             analysis, current_price
         )
+        if direction == "HOLD":
+            return None
 
         # Calculate entry price
         entry_price = self._calculate_entry_price(analysis, current_price, direction)
@@ -95,8 +98,8 @@ class SignalGenerator:
             h1_context=self._create_context_description(analysis.h1_analysis),
             m15_context=self._create_context_description(analysis.m15_analysis),
             session=self._get_current_session(),
-            created_at=datetime.utcnow(),
-            expires_at=datetime.utcnow()
+            created_at=utcnow(),
+            expires_at=utcnow()
             + timedelta(minutes=self.settings.trading.signal_expiry_minutes),
             status=SignalStatus.ACTIVE,
         )
@@ -115,7 +118,7 @@ class SignalGenerator:
         Returns:
             Unique signal identifier
         """
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = utcnow().strftime("%Y%m%d_%H%M%S")
         return f"XAU_{timestamp}_{uuid.uuid4().hex[:8]}"
 
     def _determine_signal_direction(
@@ -228,25 +231,20 @@ class SignalGenerator:
             Tuple of (stop_loss, tp1, tp2)
         """
         trading_config = self.settings.trading
-        sl_buffer_pips = trading_config.sl_buffer_pips / 10000  # Convert to price
+        # Convert to price
+        sl_buffer_pips = Decimal(trading_config.sl_buffer_pips) / Decimal("10000")
+        tp1_percentage = Decimal(str(trading_config.tp1_percentage))
+        tp2_percentage = Decimal(str(trading_config.tp2_percentage))
 
         if direction == "BUY":
             # Buy signal: SL below entry
             stop_loss = entry_price - sl_buffer_pips
-            tp1 = (
-                entry_price + (entry_price - stop_loss) * trading_config.tp1_percentage
-            )
-            tp2 = (
-                entry_price + (entry_price - stop_loss) * trading_config.tp2_percentage
-            )
+            tp1 = entry_price + (entry_price - stop_loss) * tp1_percentage
+            tp2 = entry_price + (entry_price - stop_loss) * tp2_percentage
         else:  # SELL signal: SL above entry
             stop_loss = entry_price + sl_buffer_pips
-            tp1 = (
-                entry_price - (stop_loss - entry_price) * trading_config.tp1_percentage
-            )
-            tp2 = (
-                entry_price - (stop_loss - entry_price) * trading_config.tp2_percentage
-            )
+            tp1 = entry_price - (stop_loss - entry_price) * tp1_percentage
+            tp2 = entry_price - (stop_loss - entry_price) * tp2_percentage
 
         return stop_loss, tp1, tp2
 
@@ -340,7 +338,7 @@ class SignalGenerator:
         Returns:
             Current session type
         """
-        current_hour = datetime.utcnow().hour
+        current_hour = utcnow().hour
         return SessionType(
             self.settings.trading.get_current_session(current_hour) or "LONDON"
         )
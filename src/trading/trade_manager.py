@@ -17,6 +17,7 @@ from ..models.trade import Trade, TradeStatus, ExitReason, PartialClose
 from ..models.signal import TradingSignal
 from ..database.repositories import TradeRepository
 from ..config import get_settings
+from ..core.clock import utcnow
 from ..core import trade_locks, trade_semaphore, signal_queue
 
 
@@ -42,7 +43,7 @@ class TradeManager:
 
         # Processing state
         self.is_running = False
-        self.last_price_check = datetime.utcnow()
+        self.last_price_check = utcnow()
 
         # Synchronization locks
         self._trade_lock = trade_locks
@@ -100,7 +101,7 @@ class TradeManager:
                         signal_id=signal.signal_id,
                         instrument=signal.instrument,
                         direction=signal.direction,
-                        entry_time=datetime.utcnow(),
+                        entry_time=utcnow(),
                         entry_price=signal.entry_price,
                         stop_loss=signal.stop_loss,
                         take_profit_1=signal.take_profit_1,
@@ -164,7 +165,7 @@ class TradeManager:
             return False
 
         # Check trading hours
-        current_hour = datetime.utcnow().hour
+        current_hour = utcnow().hour
         if not self.settings.trading.can_trade_now(current_hour):
             return False
 
@@ -178,7 +179,7 @@ class TradeManager:
             return
 
         # Check if we need to update prices
-        current_time = datetime.utcnow()
+        current_time = utcnow()
         if (current_time - self.last_price_check).total_seconds() < 30:
             return
 
@@ -353,7 +354,7 @@ class TradeManager:
 
             # Create partial close record
             partial_close = PartialClose(
-                time=datetime.utcnow(),
+                time=utcnow(),
                 price=close_price,
                 size=close_size,
                 profit=profit,
@@ -374,7 +375,7 @@ class TradeManager:
 
             # Save to database
             await self.trade_repo.close_trade(
-                trade.trade_id, close_price, datetime.utcnow(), reason
+                trade.trade_id, close_price, utcnow(), reason
             )
 
             self.logger.info(
@@ -498,7 +499,7 @@ class TradeManager:
             return False
 
         await self._close_trade(
-            trade, current_price, datetime.utcnow(), ExitReason(reason)
+            trade, current_price, utcnow(), ExitReason(reason)
         )
         return True
 
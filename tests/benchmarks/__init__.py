@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for XAUUSD Gold Trading System.
+
+Benchmarks are standalone scripts, not collected by pytest.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
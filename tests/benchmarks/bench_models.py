@@ -0,0 +1,145 @@
+"""
+Candle and tick model micro-benchmark.
+
+Measures per-object memory and construction cost of the slotted
+models against dict-backed equivalents, and the validated
+constructors against the trusted factories.
+
+Usage:
+    python -m tests.benchmarks.bench_models [--count N]
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import argparse
+import dataclasses
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.models.candle import Candle
+from src.models.market_data import Tick
+
+
+START = datetime(2024, 1, 2, 8, 0)
+
+# Dict-backed equivalents of the models, for the memory comparison
+DictCandle = dataclasses.make_dataclass(
+    "DictCandle",
+    [
+        (f.name, f.type, dataclasses.field(default=None))
+        for f in dataclasses.fields(Candle)
+    ],
+)
+DictTick = dataclasses.make_dataclass(
+    "DictTick",
+    [
+        (f.name, f.type, dataclasses.field(default=None))
+        for f in dataclasses.fields(Tick)
+    ],
+)
+
+
+def candle_values(count: int) -> list:
+    """Create OHLC tuples sharing nothing between candles."""
+    values = []
+    for i in range(count):
+        base = Decimal(2000) + Decimal(i % 500) / 10
+        values.append(
+            (
+                START + timedelta(minutes=15 * i),
+                base,
+                base + Decimal("1.5"),
+                base - Decimal("0.75"),
+                base + Decimal("0.5"),
+                100 + i % 50,
+            )
+        )
+    return values
+
+
+def measure(name: str, build, values: list) -> tuple:
+    """
+    Build objects and report construction time and retained memory.
+
+    Time and memory are measured in separate passes because
+    tracemalloc slows allocation down.
+
+    Returns:
+        (microseconds per object, bytes per object)
+    """
+    gc.collect()
+    start = time.perf_counter()
+    objects = [build(*v) for v in values]
+    elapsed = time.perf_counter() - start
+    del objects
+
+    gc.collect()
+    tracemalloc.start()
+    objects = [build(*v) for v in values]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_object_us = elapsed / len(values) * 1_000_000
+    # Exclude the list holding the objects
+    per_object_bytes = (retained - len(objects) * 8) / len(values)
+    print(f"{name:<32} {per_object_us:8.3f} us/obj {per_object_bytes:8.1f} B/obj")
+    return per_object_us, per_object_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Candle/tick model benchmark")
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    values = candle_values(args.count)
+    print(f"Candles ({args.count})")
+    measure(
+        "dict-backed dataclass",
+        lambda ts, o, h, l, c, v: DictCandle(ts, o, h, l, c, v, "M15", "XAUUSD"),
+        values,
+    )
+    measure(
+        "Candle (validated)",
+        lambda ts, o, h, l, c, v: Candle(ts, o, h, l, c, v, "M15", "XAUUSD"),
+        values,
+    )
+    measure(
+        "Candle.from_trusted",
+        lambda ts, o, h, l, c, v: Candle.from_trusted(
+            ts, o, h, l, c, v, "M15", "XAUUSD"
+        ),
+        values,
+    )
+
+    candles = [Candle.from_trusted(*v) for v in values]
+    start = time.perf_counter()
+    for _ in range(3):
+        for candle in candles:
+            candle.body_percentage
+    per_access = (time.perf_counter() - start) / (3 * len(candles)) * 1_000_000
+    print(f"{'body_percentage (cached)':<32} {per_access:8.3f} us/access")
+
+    print(f"\nTicks ({args.count})")
+    tick_values = [(ts, l, l + Decimal("0.25")) for ts, _, _, l, _, _ in values]
+    measure(
+        "dict-backed dataclass",
+        lambda ts, b, a: DictTick("XAUUSD", ts, b, a, b, 1, 25),
+        tick_values,
+    )
+    measure(
+        "Tick (validated)",
+        lambda ts, b, a: Tick("XAUUSD", ts, b, a, b, 1),
+        tick_values,
+    )
+    measure(
+        "Tick.from_trusted",
+        lambda ts, b, a: Tick.from_trusted("XAUUSD", ts, b, a, b, 1),
+        tick_values,
+    )
+
+
+if __name__ == "__main__":
+    main()
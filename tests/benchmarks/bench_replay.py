@@ -0,0 +1,73 @@
+"""
+Replay throughput benchmark.
+
+Replays a synthetic random walk through the market data processor
+on the simulated clock and reports ticks per second.
+
+Usage:
+    python -m tests.benchmarks.bench_replay [--ticks N] [--batch N]
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+
+from src.backtest.replay import ReplayEngine
+from src.models.market_data import Tick
+
+
+START = datetime(2024, 1, 2)
+SPREAD = Decimal("0.20")
+
+
+def make_ticks(count: int, seed: int = 3):
+    """Create a random walk of ticks three seconds apart."""
+    rng = np.random.default_rng(seed)
+    cents = (200_000 + np.cumsum(rng.integers(-30, 31, count))).tolist()
+    ticks = []
+    for i, price in enumerate(cents):
+        bid = Decimal(price) / 100
+        ticks.append(
+            Tick.from_trusted(
+                "XAUUSD", START + timedelta(seconds=3 * i), bid, bid + SPREAD, bid, 1
+            )
+        )
+    return ticks
+
+
+async def run(ticks, batch_size: int):
+    """Replay twice and check the runs agree."""
+    results = []
+    for _ in range(2):
+        engine = ReplayEngine(batch_size=batch_size)
+        results.append(await engine.replay_ticks(ticks))
+
+    first, second = results
+    print(
+        f"replay {first.ticks} ticks   {first.ticks_per_second:12,.0f} ticks/s "
+        f"({first.candles} candles, {len(first.signals)} signals)"
+    )
+    print(
+        f"deterministic         "
+        f"{first.signal_fingerprints() == second.signal_fingerprints()}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay benchmark")
+    parser.add_argument("--ticks", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(run(make_ticks(args.ticks), args.batch))
+
+
+if __name__ == "__main__":
+    main()
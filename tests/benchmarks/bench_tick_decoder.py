@@ -0,0 +1,124 @@
+"""
+Tick decode micro-benchmark.
+
+Compares the legacy WebSocket tick parsing path (json.loads,
+Decimal(str()) per field, ISO timestamps and validated Tick
+construction) with the pluggable decoders.
+
+Usage:
+    python -m tests.benchmarks.bench_tick_decoder [--messages N]
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.connectors.tick_decoder import get_tick_decoder, msgpack, orjson
+from src.models.market_data import Tick
+
+
+START = datetime(2024, 1, 2, 8, 0)
+
+
+def make_messages(count: int, epoch_ms: bool = True) -> list:
+    """Create tick message dictionaries with a random-walk price."""
+    messages = []
+    price = 2000.0
+    for i in range(count):
+        price += 0.05 if i % 3 else -0.07
+        timestamp = START + timedelta(milliseconds=250 * i)
+        messages.append(
+            {
+                "type": "tick",
+                "symbol": "XAUUSD",
+                "timestamp": (
+                    int((timestamp - datetime(1970, 1, 1)).total_seconds() * 1000)
+                    if epoch_ms
+                    else timestamp.isoformat()
+                ),
+                "bid": round(price, 2),
+                "ask": round(price + 0.25, 2),
+                "volume": 1 + i % 5,
+            }
+        )
+    return messages
+
+
+def legacy_decode(message: str) -> Tick:
+    """Tick parsing as done before the pluggable decoders."""
+    data = json.loads(message)
+    return Tick(
+        symbol=data.get("symbol", "XAUUSD"),
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+        bid=Decimal(str(data["bid"])),
+        ask=Decimal(str(data["ask"])),
+        last=Decimal(str(data.get("last", data["bid"]))),
+        volume=data.get("volume"),
+    )
+
+
+def run(name: str, decode, messages: list, repeat: int) -> float:
+    """
+    Time a decode function.
+
+    Returns:
+        Best per-message cost in microseconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            decode(message)
+        best = min(best, time.perf_counter() - start)
+
+    per_message = best / len(messages) * 1_000_000
+    print(f"{name:<28} {per_message:8.2f} us/msg")
+    return per_message
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick decode micro-benchmark")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    iso_messages = [json.dumps(m) for m in make_messages(args.messages, False)]
+    epoch_data = make_messages(args.messages)
+    json_messages = [json.dumps(m) for m in epoch_data]
+
+    baseline = run("legacy (json + iso)", legacy_decode, iso_messages, args.repeat)
+    results = {
+        "json": run(
+            "json + epoch ms",
+            get_tick_decoder("json").decode,
+            json_messages,
+            args.repeat,
+        )
+    }
+
+    if orjson is not None:
+        results["orjson"] = run(
+            "orjson + epoch ms",
+            get_tick_decoder("orjson").decode,
+            [orjson.dumps(m) for m in epoch_data],
+            args.repeat,
+        )
+    if msgpack is not None:
+        results["msgpack"] = run(
+            "msgpack + epoch ms",
+            get_tick_decoder("msgpack").decode,
+            [msgpack.packb(m) for m in epoch_data],
+            args.repeat,
+        )
+
+    print()
+    for name, cost in results.items():
+        print(f"{name:<28} {baseline / cost:8.2f}x faster than legacy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Tick journal micro-benchmark.
+
+Measures per-tick append cost and the time to scan a day of
+journaled XAUUSD ticks through the zero-copy reader.
+
+Usage:
+    python -m tests.benchmarks.bench_tick_journal [--ticks N]
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.analysis.candle_buffer import datetime_to_ns
+from src.storage.tick_journal import TickJournalReader, TickJournalWriter
+
+
+START = datetime(2024, 1, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick journal benchmark")
+    # ~10 ticks per second over 24 hours
+    parser.add_argument("--ticks", type=int, default=864_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    step_ns = int(86_400 * 1_000_000_000 / args.ticks)
+    start_ns = datetime_to_ns(START)
+    bids = (200_000_000 + np.cumsum(rng.integers(-50, 51, args.ticks))).tolist()
+
+    with tempfile.TemporaryDirectory() as directory:
+        writer = TickJournalWriter(directory, "XAUUSD")
+        writer.open()
+
+        begin = time.perf_counter()
+        for i, bid in enumerate(bids):
+            writer.append_raw(start_ns + i * step_ns, bid, bid + 25_000, 0, 1)
+        append_elapsed = time.perf_counter() - begin
+        writer.close()
+        print(
+            f"append_raw            {append_elapsed / args.ticks * 1e9:8.1f} ns/tick"
+        )
+
+        reader = TickJournalReader(directory, "XAUUSD")
+        begin = time.perf_counter()
+        records = reader.read_all()
+        high, low = records["bid"].max(), records["bid"].min()
+        scan_elapsed = time.perf_counter() - begin
+        print(
+            f"scan {len(records)} ticks   {scan_elapsed * 1000:8.2f} ms "
+            f"(range {low}-{high})"
+        )
+
+        begin = time.perf_counter()
+        window = reader.read_all(
+            START + timedelta(hours=13), START + timedelta(hours=14)
+        )
+        range_elapsed = time.perf_counter() - begin
+        print(
+            f"1h range read         {range_elapsed * 1000:8.2f} ms "
+            f"({len(window)} ticks)"
+        )
+
+
+if __name__ == "__main__":
+    main()
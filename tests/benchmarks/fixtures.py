@@ -0,0 +1,202 @@
+"""
+Benchmark data fixtures.
+
+Synthetic candles and ticks are generated from a seeded random
+walk with trending and ranging stretches and volatility bursts, so
+detectors find gaps, blocks and swings at realistic rates and every
+run sees the same data. Recorded fixtures load MetaTrader history
+exports through the history file readers.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List
+
+import numpy as np
+
+from src.analysis.candle_aggregator import TIMEFRAME_SECONDS
+from src.analysis.candle_buffer import CandleArrays, datetime_to_ns
+from src.backtest.engine import resample
+from src.backtest.replay import bars_to_ticks
+from src.models.candle import Candle
+from src.models.market_data import SwingPoint, Tick
+from src.storage.history_files import read_history_file
+
+
+START = datetime(2024, 1, 2)
+
+
+def synthetic_candles(
+    count: int,
+    timeframe: str = "M15",
+    seed: int = 11,
+    instrument: str = "XAUUSD",
+) -> CandleArrays:
+    """
+    Generate a reproducible candle series.
+
+    Args:
+        count: Number of candles
+        timeframe: Candle timeframe
+        seed: Random seed
+        instrument: Trading instrument
+
+    Returns:
+        Float price candles in time order
+    """
+    rng = np.random.default_rng(seed)
+    period_ns = TIMEFRAME_SECONDS[timeframe] * 1_000_000_000
+    scale = np.sqrt(TIMEFRAME_SECONDS[timeframe] / 900)
+
+    # Drift switches every ~50 candles; volatility bursts decay back
+    regimes = np.repeat(rng.normal(0, 0.6, count // 50 + 1), 50)[:count]
+    shocks = np.where(rng.random(count) < 0.02, rng.uniform(2, 5, count), 1.0)
+    volatility = 1 + np.convolve(shocks - 1, 0.9 ** np.arange(60))[:count]
+
+    moves = (regimes + rng.normal(0, 2.0, count) * volatility) * scale
+    close = np.round(2000 + np.cumsum(moves), 2)
+    open = np.round(np.r_[2000.0, close[:-1]] + rng.normal(0, 0.2, count), 2)
+    wick = np.abs(rng.normal(0, 1.2, (2, count))) * volatility * scale
+    high = np.round(np.maximum(open, close) + wick[0], 2)
+    low = np.round(np.minimum(open, close) - wick[1], 2)
+    volume = (rng.integers(50, 500, count) * volatility).astype(np.int64)
+
+    return CandleArrays(
+        timestamp=datetime_to_ns(START) + np.arange(count, dtype=np.int64) * period_ns,
+        open=open,
+        high=high,
+        low=low,
+        close=close,
+        volume=volume,
+        instrument=instrument,
+        timeframe=timeframe,
+    )
+
+
+def multi_timeframe(m15: CandleArrays) -> Dict[str, List[Candle]]:
+    """
+    Build consistent M15, H1 and H4 candles from M15 candles.
+
+    Args:
+        m15: M15 candles in time order
+
+    Returns:
+        Candle lists keyed by timeframe
+    """
+    return {
+        "M15": m15.to_candles(),
+        "H1": resample(m15, "H1").to_candles(),
+        "H4": resample(m15, "H4").to_candles(),
+    }
+
+
+def fractal_swings(candles: List[Candle], span: int = 2) -> List[SwingPoint]:
+    """
+    Find swing points as N-bar fractals, in time order.
+
+    Used to give the liquidity benchmarks realistic swing points
+    independently of ``MarketStructure``.
+
+    Args:
+        candles: Candles in time order
+        span: Candles on each side a pivot must exceed
+
+    Returns:
+        Swing highs and lows
+    """
+    high = np.array([float(c.high) for c in candles])
+    low = np.array([float(c.low) for c in candles])
+    swings = []
+    for i in range(span, len(candles) - span):
+        window = slice(i - span, i + span + 1)
+        for point_type, prices, extreme in (("HIGH", high, max), ("LOW", low, min)):
+            if prices[i] == extreme(prices[window]):
+                swings.append(
+                    SwingPoint(
+                        price=Decimal(str(prices[i])),
+                        timestamp=candles[i].timestamp,
+                        point_type=point_type,
+                        strength=0.5,
+                        volume=candles[i].volume,
+                        instrument=candles[i].instrument,
+                        confirmed=True,
+                    )
+                )
+    return swings
+
+
+def synthetic_ticks(count: int, seed: int = 11) -> List[Tick]:
+    """
+    Generate a reproducible tick stream.
+
+    Ticks follow the path of synthetic M1 candles, four per candle.
+
+    Args:
+        count: Number of ticks
+        seed: Random seed
+
+    Returns:
+        Ticks in time order
+    """
+    bars = synthetic_candles(count // 4 + 1, "M1", seed).to_candles()
+    return list(bars_to_ticks(bars, Decimal("0.20")))[:count]
+
+
+def tick_messages(ticks: List[Tick]) -> List[str]:
+    """
+    Encode ticks as WebSocket JSON messages with epoch-ms timestamps.
+
+    Args:
+        ticks: Ticks to encode
+
+    Returns:
+        JSON strings
+    """
+    epoch = datetime(1970, 1, 1)
+    return [
+        json.dumps(
+            {
+                "type": "tick",
+                "symbol": tick.symbol,
+                "timestamp": int((tick.timestamp - epoch).total_seconds() * 1000),
+                "bid": float(tick.bid),
+                "ask": float(tick.ask),
+                "volume": tick.volume,
+            }
+        )
+        for tick in ticks
+    ]
+
+
+def recorded_candles(
+    path: str, instrument: str = None, timeframe: str = None
+) -> CandleArrays:
+    """
+    Load a recorded MetaTrader history export (CSV or HST).
+
+    Args:
+        path: Export file
+        instrument: Trading instrument (defaults to the file name)
+        timeframe: Bar timeframe (defaults to the file name)
+
+    Returns:
+        Validated candles in time order
+    """
+    batches = [
+        batch.candles for batch in read_history_file(path, instrument, timeframe)
+    ]
+    if not batches:
+        raise ValueError(f"No bars in {path}")
+
+    first = batches[0]
+    return CandleArrays(
+        *(
+            np.concatenate([getattr(batch, name) for batch in batches])
+            for name in ("timestamp", "open", "high", "low", "close", "volume")
+        ),
+        instrument=first.instrument,
+        timeframe=first.timeframe,
+    )
@@ -0,0 +1,586 @@
+"""
+Analysis and ingest benchmark suite.
+
+Times the analysis hot paths and the tick ingest path at several
+data sizes, saves the results as a JSON baseline and compares runs
+against a baseline, flagging anything slower than the tolerance.
+
+Usage:
+    python -m tests.benchmarks.suite run [--sizes N ...] [--only NAME]
+        [--recorded FILE] [--output FILE] [--compare BASELINE]
+    python -m tests.benchmarks.suite compare BASELINE CURRENT [--tolerance F]
+    python -m tests.benchmarks.suite list
+
+``run`` exits with status 1 when ``--compare`` finds a regression, and
+so does ``compare``, so either can gate a CI job.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.analysis.candle_buffer import CandleArrays
+from src.analysis.confluence_analyzer import ConfluenceAnalysis
+from src.analysis.fvg_detector import FairValueGapDetector, FairValueGapTracker
+from src.analysis.liquidity_analyzer import LiquidityAnalyzer
+from src.analysis.market_data_processor import MarketDataProcessor
+from src.analysis.order_block_detector import OrderBlockDetector
+from src.analysis.structure_analyzer import MarketStructure
+from src.analysis.zone_index import PriceZoneIndex, ZoneKind
+from src.backtest.engine import resample
+from src.backtest.replay import bars_to_ticks
+from src.connectors.tick_decoder import get_tick_decoder, orjson
+from src.models.candle import Candle
+from src.models.market_data import Tick
+
+from .fixtures import (
+    fractal_swings,
+    multi_timeframe,
+    recorded_candles,
+    synthetic_candles,
+    synthetic_ticks,
+    tick_messages,
+)
+
+
+SCHEMA_VERSION = 1
+DEFAULT_TOLERANCE = 0.10
+
+
+class Dataset:
+    """
+    Candle and tick fixtures shared by the benchmarks.
+
+    Synthetic by default; with a recorded history export, benchmarks
+    use its latest bars instead (resampled where a coarser timeframe
+    is needed) and derive ticks from them.
+    """
+
+    def __init__(self, recorded: Optional[CandleArrays] = None, name: str = None):
+        self.recorded = recorded
+        self.name = name or "synthetic"
+        self._cache: Dict[Tuple, Any] = {}
+
+    def arrays(self, size: int, timeframe: str) -> CandleArrays:
+        """Get the latest ``size`` candles of a timeframe."""
+        key = ("arrays", size, timeframe)
+        if key not in self._cache:
+            if self.recorded is None:
+                arrays = synthetic_candles(size, timeframe)
+            else:
+                arrays = self.recorded
+                if arrays.timeframe != timeframe:
+                    arrays = resample(arrays, timeframe)
+                arrays = arrays.slice(max(0, len(arrays) - size), len(arrays))
+            self._cache[key] = arrays
+        return self._cache[key]
+
+    def candles(self, size: int, timeframe: str = "H1") -> List[Candle]:
+        """Get the latest ``size`` candles of a timeframe as Candle objects."""
+        key = ("candles", size, timeframe)
+        if key not in self._cache:
+            self._cache[key] = self.arrays(size, timeframe).to_candles()
+        return self._cache[key]
+
+    def ticks(self, size: int) -> List[Tick]:
+        """Get ``size`` ticks in time order."""
+        key = ("ticks", size)
+        if key not in self._cache:
+            if self.recorded is None:
+                ticks = synthetic_ticks(size)
+            else:
+                bars = self.arrays(size // 4 + 1, self.recorded.timeframe)
+                ticks = list(bars_to_ticks(bars.to_candles()))[:size]
+            self._cache[key] = ticks
+        return self._cache[key]
+
+
+@dataclass
+class Benchmark:
+    """
+    A benchmarked code path.
+
+    Attributes:
+        name: Result name
+        description: What is timed
+        sizes: Default data sizes (items handled per call)
+        setup: Builds the timed callable for a dataset and size
+    """
+
+    name: str
+    description: str
+    sizes: Tuple[int, ...]
+    setup: Callable[[Dataset, int], Callable[[], Any]]
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, description: str, sizes: Sequence[int]):
+    """Register a benchmark setup function."""
+
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, description, tuple(sizes), setup)
+        return setup
+
+    return register
+
+
+def _average_volume(candles: List[Candle]) -> float:
+    """Mean candle volume."""
+    return float(np.mean([c.volume or 0 for c in candles])) if candles else 0.0
+
+
+@benchmark("fvg.detect_fvgs", "FairValueGapDetector.detect_fvgs", (200, 1000, 10000))
+def _fvg_detect(dataset: Dataset, size: int):
+    detector = FairValueGapDetector()
+    candles = dataset.candles(size)
+    avg_volume = _average_volume(candles)
+    return lambda: detector.detect_fvgs(candles, avg_volume)
+
+
+@benchmark(
+    "fvg.scan",
+    "FairValueGapDetector.scan over candle arrays, no objects",
+    (200, 10000, 1000000),
+)
+def _fvg_scan(dataset: Dataset, size: int):
+    detector = FairValueGapDetector()
+    arrays = dataset.arrays(size, "H1")
+    avg_volume = float(arrays.volume.mean())
+    return lambda: detector.scan(arrays, avg_volume)
+
+
+@benchmark(
+    "fvg.detect_fvgs_arrays",
+    "FairValueGapDetector.detect_fvgs_arrays, building gap objects",
+    (200, 10000, 1000000),
+)
+def _fvg_detect_arrays(dataset: Dataset, size: int):
+    detector = FairValueGapDetector()
+    arrays = dataset.arrays(size, "H1")
+    avg_volume = float(arrays.volume.mean())
+    return lambda: detector.detect_fvgs_arrays(arrays, avg_volume)
+
+
+@benchmark(
+    "fvg.tracker",
+    "FairValueGapTracker closes and fills, four prices per H1 candle",
+    (200, 1000, 10000),
+)
+def _fvg_tracker(dataset: Dataset, size: int):
+    candles = dataset.candles(size)
+
+    def run():
+        tracker = FairValueGapTracker("H1")
+        for candle in candles:
+            for price in (candle.open, candle.low, candle.high, candle.close):
+                tracker.on_price(price, candle.timestamp)
+            tracker.on_candle(candle)
+        return tracker
+
+    return run
+
+
+@benchmark(
+    "order_block.detect_order_blocks",
+    "OrderBlockDetector.detect_order_blocks",
+    (200, 1000, 10000),
+)
+def _order_block_detect(dataset: Dataset, size: int):
+    detector = OrderBlockDetector()
+    candles = dataset.candles(size)
+    return lambda: detector.detect_order_blocks(candles)
+
+
+@benchmark(
+    "structure.update_with_candle",
+    "MarketStructure.update_with_candle over a fresh structure",
+    (200, 1000, 10000),
+)
+def _structure_update(dataset: Dataset, size: int):
+    candles = dataset.candles(size)
+
+    def run():
+        structure = MarketStructure()
+        for candle in candles:
+            structure.update_with_candle(candle)
+
+    return run
+
+
+@benchmark(
+    "liquidity.pools_and_sweeps",
+    "LiquidityAnalyzer pools, sweeps and flow from fractal swing points",
+    (200, 1000, 10000),
+)
+def _liquidity(dataset: Dataset, size: int):
+    analyzer = LiquidityAnalyzer()
+    candles = dataset.candles(size)
+    swing_points = fractal_swings(candles)
+    price = candles[-1].close
+
+    def run():
+        pools = analyzer.identify_liquidity_pools(swing_points, price)
+        sweeps = analyzer.detect_liquidity_sweeps(pools, candles, price)
+        return analyzer.analyze_liquidity_flow(pools, sweeps, price)
+
+    return run
+
+
+@benchmark(
+    "zones.stab",
+    "PriceZoneIndex.stab for each candle close over the window's FVG zones",
+    (200, 1000, 10000),
+)
+def _zone_stab(dataset: Dataset, size: int):
+    candles = dataset.candles(size)
+    index = PriceZoneIndex()
+    for fvg in FairValueGapDetector().detect_fvgs(candles):
+        index.insert(fvg, fvg.bottom_price, fvg.top_price, ZoneKind.FVG)
+    prices = [candle.close for candle in candles]
+
+    def run():
+        for price in prices:
+            index.stab(price)
+
+    return run
+
+
+@benchmark(
+    "confluence.analyze",
+    "ConfluenceAnalysis.analyze on M15/H1/H4 windows (size = H1 candles)",
+    (50, 200, 1000),
+)
+def _confluence(dataset: Dataset, size: int):
+    windows = multi_timeframe(dataset.arrays(size * 4, "M15"))
+    price = windows["M15"][-1].close
+    return lambda: ConfluenceAnalysis().analyze(
+        windows["H4"], windows["H1"], windows["M15"], price
+    )
+
+
+def _decode_benchmark(decoder_name: str):
+    def setup(dataset: Dataset, size: int):
+        decoder = get_tick_decoder(decoder_name)
+        messages = tick_messages(dataset.ticks(size))
+        if decoder_name == "orjson":
+            messages = [message.encode() for message in messages]
+
+        def run():
+            for message in messages:
+                decoder.decode(message)
+
+        return run
+
+    return setup
+
+
+benchmark(
+    "ticks.decode_json", "JSON tick message decoding", (1000, 10000, 100000)
+)(_decode_benchmark("json"))
+if orjson is not None:
+    benchmark(
+        "ticks.decode_orjson", "orjson tick message decoding", (1000, 10000, 100000)
+    )(_decode_benchmark("orjson"))
+
+
+async def _run_pipeline(ticks: List[Tick]):
+    """Push ticks through a started processor until its shards drain."""
+    processor = MarketDataProcessor()
+    await processor.start()
+    try:
+        for tick in ticks:
+            await processor.process_tick(tick)
+        while True:
+            handled = sum(
+                shard.processed_ticks + shard.queue.dropped
+                for shard in processor.shards.values()
+            )
+            if handled >= len(ticks):
+                break
+            await asyncio.sleep(0)
+    finally:
+        await processor.stop()
+
+
+@benchmark(
+    "processor.process_tick",
+    "MarketDataProcessor.process_tick through shard queues and aggregation",
+    (1000, 10000, 50000),
+)
+def _process_tick(dataset: Dataset, size: int):
+    ticks = dataset.ticks(size)
+    return lambda: asyncio.run(_run_pipeline(ticks))
+
+
+def measure(
+    run: Callable[[], Any], repeat: int = 5, min_time: float = 0.2
+) -> Dict[str, float]:
+    """
+    Time a callable.
+
+    The first call is a warm-up that also sizes the loop count, so
+    each of the ``repeat`` samples runs for about ``min_time``.
+
+    Returns:
+        Best and median seconds per call, loops per sample
+    """
+    start = time.perf_counter()
+    run()
+    first = time.perf_counter() - start
+    loops = max(1, int(min_time / first)) if first > 0 else 1000
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        samples.append((time.perf_counter() - start) / loops)
+
+    return {
+        "seconds": min(samples),
+        "median_seconds": statistics.median(samples),
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Get the current git commit, if any."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    dataset: Dataset,
+    names: Optional[Sequence[str]] = None,
+    sizes: Optional[Sequence[int]] = None,
+    repeat: int = 5,
+    min_time: float = 0.2,
+) -> Dict[str, Any]:
+    """
+    Run benchmarks.
+
+    A benchmark that raises is recorded with its error instead of
+    a timing, so one broken path does not hide the others.
+
+    Args:
+        dataset: Fixtures to benchmark with
+        names: Benchmark names or name prefixes (all if None)
+        sizes: Sizes overriding each benchmark's defaults
+        repeat: Samples per benchmark and size
+        min_time: Target seconds per sample
+
+    Returns:
+        Results document
+    """
+    selected = [
+        bench
+        for name, bench in BENCHMARKS.items()
+        if not names or any(name.startswith(prefix) for prefix in names)
+    ]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for bench in selected:
+        for size in sizes or bench.sizes:
+            key = f"{bench.name}[{size}]"
+            result: Dict[str, Any] = {"name": bench.name, "size": size}
+            try:
+                result.update(measure(bench.setup(dataset, size), repeat, min_time))
+                result["per_item_us"] = result["seconds"] / size * 1_000_000
+                print(
+                    f"{key:<44} {result['seconds'] * 1000:10.3f} ms "
+                    f"{result['per_item_us']:10.3f} us/item"
+                )
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+                print(f"{key:<44} ERROR {result['error']}")
+            results[key] = result
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "commit": _git_commit(),
+        "dataset": dataset.name,
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Dict[str, Any]]:
+    """
+    Compare two results documents.
+
+    Statuses: ``ok`` (within tolerance), ``faster``, ``regression``
+    (slower than tolerance, or newly failing), ``fixed`` (was failing),
+    ``error`` (failing in both), ``new`` and ``missing``.
+
+    Args:
+        baseline: Baseline results document
+        current: Current results document
+        tolerance: Allowed slowdown as a fraction (0.1 = 10%)
+
+    Returns:
+        One row per result name, in baseline order then new results
+    """
+    old = baseline["results"]
+    new = current["results"]
+    rows = []
+
+    for key in list(old) + [key for key in new if key not in old]:
+        before = old.get(key)
+        after = new.get(key)
+        row = {"key": key, "baseline": None, "current": None, "change": None}
+        if before is None:
+            row["status"] = "new"
+        elif after is None:
+            row["status"] = "missing"
+        elif "error" in after:
+            row["status"] = "error" if "error" in before else "regression"
+        elif "error" in before:
+            row["status"] = "fixed"
+        else:
+            row["baseline"] = before["seconds"]
+            row["current"] = after["seconds"]
+            row["change"] = after["seconds"] / before["seconds"] - 1
+            if row["change"] > tolerance:
+                row["status"] = "regression"
+            elif row["change"] < -tolerance:
+                row["status"] = "faster"
+            else:
+                row["status"] = "ok"
+        if after is not None and "error" not in after:
+            row["current"] = after["seconds"]
+        rows.append(row)
+
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], tolerance: float) -> bool:
+    """
+    Print a comparison table.
+
+    Returns:
+        True if any result regressed
+    """
+    print(f"\n{'benchmark':<44} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        baseline = (
+            f"{row['baseline'] * 1000:9.3f} ms" if row["baseline"] is not None else "-"
+        )
+        current = (
+            f"{row['current'] * 1000:9.3f} ms" if row["current"] is not None else "-"
+        )
+        change = f"{row['change']:+8.1%}" if row["change"] is not None else "-"
+        flag = "  <-- REGRESSION" if row["status"] == "regression" else ""
+        print(
+            f"{row['key']:<44} {baseline:>12} {current:>12} {change:>9} "
+            f"{row['status']}{flag}"
+        )
+
+    regressions = [row for row in rows if row["status"] == "regression"]
+    print(
+        f"\n{len(regressions)} regression(s) beyond {tolerance:.0%} "
+        f"across {len(rows)} result(s)"
+    )
+    return bool(regressions)
+
+
+def _load(path: str) -> Dict[str, Any]:
+    """Load a results document."""
+    with open(path) as f:
+        document = json.load(f)
+    if document.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"{path}: unsupported results schema {document.get('schema')}")
+    return document
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analysis and ingest benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks")
+    run_parser.add_argument("--only", nargs="+", help="Benchmark names or prefixes")
+    run_parser.add_argument("--sizes", nargs="+", type=int)
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--min-time", type=float, default=0.2)
+    run_parser.add_argument("--recorded", help="MT5 CSV or HST history export")
+    run_parser.add_argument("--instrument")
+    run_parser.add_argument("--timeframe")
+    run_parser.add_argument("--output", help="Write results JSON here")
+    run_parser.add_argument("--compare", help="Baseline results JSON")
+    run_parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+
+    commands.add_parser("list", help="List benchmarks")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for bench in BENCHMARKS.values():
+            sizes = ", ".join(str(size) for size in bench.sizes)
+            print(f"{bench.name:<36} [{sizes}] {bench.description}")
+        return 0
+
+    if args.command == "compare":
+        rows = compare(_load(args.baseline), _load(args.current), args.tolerance)
+        return 1 if print_comparison(rows, args.tolerance) else 0
+
+    # Analysis errors are recorded per benchmark; keep the output readable
+    logging.disable(logging.WARNING)
+    if args.recorded:
+        dataset = Dataset(
+            recorded_candles(args.recorded, args.instrument, args.timeframe),
+            name=args.recorded,
+        )
+    else:
+        dataset = Dataset()
+
+    document = run_suite(dataset, args.only, args.sizes, args.repeat, args.min_time)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        rows = compare(_load(args.compare), document, args.tolerance)
+        return 1 if print_comparison(rows, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""
+Tests for the backtesting subsystem.
+
+Covers the bar-based trade simulator, higher timeframe
+resampling, chunked backtest runs, performance summaries and
+SMC parameter optimization.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.analysis.candle_buffer import CandleArrays, datetime_to_ns
+from src.backtest import engine
+from src.backtest.engine import BacktestEngine, TradeSimulator, resample
+from src.backtest.metrics import summarize_trades
+from src.backtest.optimizer import (
+    ParameterOptimizer,
+    apply_smc_overrides,
+    grid_candidates,
+    random_candidates,
+)
+from src.backtest.results_store import OptimizationStore
+from src.backtest.synthetic_market import (
+    LoadGenerator,
+    SyntheticMarket,
+    scenario_config,
+)
+from src.config import get_settings
+from src.models.candle import Candle
+from src.models.signal import TradingSignal
+from src.models.trade import ExitReason
+
+
+START = datetime(2024, 1, 2, 9, 0)
+
+
+def make_signal(direction="BUY"):
+    """Create a signal with 1.00 risk around 2000.00."""
+    sign = 1 if direction == "BUY" else -1
+    return TradingSignal(
+        signal_id=f"TEST_{direction}",
+        direction=direction,
+        entry_price=Decimal("2000.00"),
+        stop_loss=Decimal("2000.00") - sign * Decimal("1.00"),
+        take_profit_1=Decimal("2000.00") + sign * Decimal("0.50"),
+        take_profit_2=Decimal("2000.00") + sign * Decimal("2.00"),
+        risk_reward_ratio=2.0,
+        position_size=Decimal("1.00"),
+        risk_percentage=1.0,
+        setup_type="FVG+OB",
+        market_structure="BOS",
+        confidence_score=0.9,
+    )
+
+
+def make_bar(minutes, low, high, close):
+    """Create an M15 bar."""
+    return Candle(
+        timestamp=START + timedelta(minutes=minutes),
+        open=Decimal(close),
+        high=Decimal(high),
+        low=Decimal(low),
+        close=Decimal(close),
+        volume=100,
+        timeframe="M15",
+        instrument="XAUUSD",
+    )
+
+
+def make_arrays(count, seed=1):
+    """Create a random walk of M15 candle arrays."""
+    rng = np.random.default_rng(seed)
+    timestamp = datetime_to_ns(START) + np.arange(count, dtype=np.int64) * 900 * 10**9
+    close = np.round(2000 + np.cumsum(rng.normal(0, 1.5, count)), 2)
+    open = np.r_[2000.0, close[:-1]]
+    high = np.round(np.maximum(open, close) + np.abs(rng.normal(0, 0.8, count)), 2)
+    low = np.round(np.minimum(open, close) - np.abs(rng.normal(0, 0.8, count)), 2)
+    volume = rng.integers(50, 500, count)
+    return CandleArrays(timestamp, open, high, low, close, volume, "XAUUSD", "M15")
+
+
+class TestTradeSimulator:
+    """Test trade exit rules applied to bars."""
+
+    def test_partial_close_then_target(self):
+        """Test TP1 closes half and TP2 closes the rest."""
+        simulator = TradeSimulator()
+        trade = simulator.open(make_signal(), START)
+
+        simulator.on_bar(make_bar(15, "1999.80", "2000.60", "2000.40"), START)
+        assert trade.tp1_hit
+        assert trade.remaining_position_size == Decimal("0.50")
+
+        closed_at = START + timedelta(minutes=30)
+        simulator.on_bar(make_bar(30, "2000.30", "2002.10", "2002.00"), closed_at)
+        assert simulator.closed_trades == [trade]
+        assert trade.exit_reason == ExitReason.TP2_HIT
+        assert trade.exit_time == closed_at
+        # 0.5 lots at +0.50 and 0.5 lots at +2.00, $10 per pip per lot
+        assert trade.profit_loss == Decimal("12.50")
+
+    def test_stop_assumed_first_on_wide_bar(self):
+        """Test a bar spanning stop and target is a stop out."""
+        simulator = TradeSimulator()
+        trade = simulator.open(make_signal("SELL"), START)
+
+        simulator.on_bar(make_bar(15, "1997.50", "2001.20", "2000.00"), START)
+        assert trade.exit_reason == ExitReason.SL_HIT
+        assert trade.exit_price == Decimal("2001.00")
+        assert not simulator.open_trades
+
+
+class TestResample:
+    """Test higher timeframe aggregation."""
+
+    def test_m15_to_h1(self):
+        """Test four M15 bars form one H1 bar."""
+        m15 = make_arrays(8)
+        h1 = resample(m15, "H1")
+
+        assert len(h1) == 2
+        assert h1.timestamp[1] == m15.timestamp[4]
+        assert h1.open[0] == m15.open[0]
+        assert h1.close[0] == m15.close[3]
+        assert h1.high[1] == m15.high[4:].max()
+        assert h1.low[1] == m15.low[4:].min()
+        assert h1.volume[0] == m15.volume[:4].sum()
+
+
+class TestBacktestEngine:
+    """Test chunked backtest runs."""
+
+    def test_chunks_match_single_run(self, monkeypatch):
+        """Test splitting the range does not change the result."""
+        m15 = make_arrays(300)
+        start = START + timedelta(hours=30)
+
+        async def every_bar(features, i, generator, result):
+            # Wide levels keep trades open across chunk boundaries
+            close = features.m15[i].close
+            sign = 1 if i % 2 else -1
+            result.signals += 1
+            return TradingSignal(
+                signal_id=f"TEST_{i}",
+                direction="BUY" if sign > 0 else "SELL",
+                entry_price=close,
+                stop_loss=close - sign * Decimal("6.00"),
+                take_profit_1=close + sign * Decimal("4.00"),
+                take_profit_2=close + sign * Decimal("12.00"),
+                risk_reward_ratio=2.0,
+                position_size=Decimal("1.00"),
+                risk_percentage=1.0,
+                setup_type="FVG+OB",
+                market_structure="BOS",
+                confidence_score=0.9,
+            )
+
+        monkeypatch.setattr(engine, "_bar_signal", every_bar)
+        single = BacktestEngine(max_workers=0, chunks=1).run(m15, start=start)
+        chunked = BacktestEngine(max_workers=0, chunks=6).run(m15, start=start)
+
+        assert chunked.chunks == 6
+        assert single.bars == chunked.bars == 180
+        assert single.signals == chunked.signals == 180
+        assert len(single.trades) > 0
+        assert [(t.entry_time, t.exit_time) for t in single.trades] == [
+            (t.entry_time, t.exit_time) for t in chunked.trades
+        ]
+
+class TestSummarizeTrades:
+    """Test performance summaries."""
+
+    def test_summary_statistics(self):
+        """Test win rate, profit factor and drawdown."""
+        simulator = TradeSimulator()
+        winner = simulator.open(make_signal(), START)
+        simulator.on_bar(make_bar(15, "2000.10", "2002.50", "2002.00"), START)
+        loser = simulator.open(make_signal(), START + timedelta(minutes=15))
+        simulator.on_bar(
+            make_bar(30, "1998.50", "2000.20", "1999.00"),
+            START + timedelta(minutes=30),
+        )
+
+        summary = summarize_trades(simulator.closed_trades, account_balance=1000.0)
+        assert winner.profit_loss == Decimal("12.50")
+        assert loser.profit_loss == Decimal("-10.00")
+        assert summary["total_trades"] == 2
+        assert summary["win_rate"] == 50.0
+        assert summary["profit_factor"] == 1.25
+        assert summary["max_drawdown"] == 10.0
+        assert summary["average_trade_duration_minutes"] == 7
+
+
+class TestParameterOptimizer:
+    """Test SMC parameter search and the results store."""
+
+    def test_candidates_and_overrides(self):
+        """Test candidate generation and config overrides."""
+        grid = grid_candidates(
+            {"fvg.min_size_pips": [3, 5], "confluence_threshold": [70.0, 80.0]}
+        )
+        assert len(grid) == 4
+        assert {"fvg.min_size_pips": 3, "confluence_threshold": 80.0} in grid
+
+        sampled = random_candidates({"order_block.lookback_candles": (10, 30)}, 5)
+        assert len(sampled) == 5
+        assert all(10 <= c["order_block.lookback_candles"] <= 30 for c in sampled)
+
+        base = get_settings().smc
+        before = base.fvg.min_size_pips
+        config = apply_smc_overrides(base, {"fvg.min_size_pips": before + 1})
+        assert config.fvg.min_size_pips == before + 1
+        assert base.fvg.min_size_pips == before
+        with pytest.raises(ValueError):
+            apply_smc_overrides(base, {"fvg.no_such_setting": 1})
+
+    def test_walk_forward_records_folds(self):
+        """Test walk-forward folds are evaluated and stored."""
+        store = OptimizationStore(":memory:")
+        optimizer_base = get_settings().smc
+        optimizer = ParameterOptimizer(
+            {"confluence_threshold": [70.0, 90.0]}, max_workers=0, store=store
+        )
+        folds = optimizer.walk_forward(make_arrays(4 * 96), train_days=1, test_days=1)
+
+        assert [result.fold for result in folds] == [1, 2, 3]
+        assert all(result.phase == "test" for result in folds)
+        assert store.runs()[0]["space"] == {"confluence_threshold": [70.0, 90.0]}
+        assert len(store.results(optimizer.run_id, phase="train")) == 6
+        assert len(store.results(optimizer.run_id, phase="test")) == 3
+        assert get_settings().smc is optimizer_base
+
+
+class TestSyntheticMarket:
+    """Test synthetic tick generation and load delivery."""
+
+    def test_seeded_and_well_formed(self):
+        """Test same seed gives same ticks, in order with bid below ask."""
+        first = SyntheticMarket(seed=5).generate(5000)
+        second = SyntheticMarket(seed=5).generate(5000)
+
+        assert (first == second).all()
+        assert (np.diff(first["timestamp_ns"]) > 0).all()
+        assert (first["bid"] < first["ask"]).all()
+
+    def test_news_event_raises_rate_and_spread(self):
+        """Test an NFP release multiplies tick rate and widens the spread."""
+        market = SyntheticMarket(scenario_config("nfp"), seed=2)
+        records = market.generate(20000)
+        release = datetime_to_ns(datetime(2024, 1, 5, 12, 30))
+        before = records[records["timestamp_ns"] < release]
+        during = records[
+            (records["timestamp_ns"] >= release)
+            & (records["timestamp_ns"] < release + 60 * 10**9)
+        ]
+
+        assert len(during) / 60 > 5 * len(before) / 300
+        spread = lambda r: (r["ask"] - r["bid"]).mean()  # noqa: E731
+        assert spread(during) > 3 * spread(before)
+
+    @pytest.mark.asyncio
+    async def test_load_generator_feeds_processor(self):
+        """Test paced delivery into a running processor with a report."""
+        from src.analysis.market_data_processor import MarketDataProcessor
+
+        processor = MarketDataProcessor()
+        await processor.start()
+        generator = LoadGenerator(
+            SyntheticMarket(seed=1), rate=20000, live_timestamps=True
+        )
+        try:
+            report = await generator.to_processor(processor, count=2000)
+        finally:
+            await processor.stop()
+
+        assert report.ticks_sent == 2000
+        assert processor.processed_ticks == 2000
+        assert report.rss_peak_mb >= report.rss_start_mb > 0
+        assert report.to_dict()["processor"]["processed_ticks"] == 2000
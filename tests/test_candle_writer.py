@@ -0,0 +1,152 @@
+"""
+Tests for batched candle persistence.
+
+Covers batch flushing on size and deadline, queue overflow,
+per-batch deduplication, retry with backoff and skipping of
+gap-fill candles.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.analysis.candle_aggregator import CandleCloseEvent
+from src.database.candle_writer import CandleWriter
+from src.models.candle import Candle
+
+
+START = datetime(2024, 1, 2, 8, 0)
+
+
+def make_candle(i, close="2000.50"):
+    """Create an M1 candle ``i`` minutes after START."""
+    return Candle(
+        timestamp=START + timedelta(minutes=i),
+        open=Decimal("2000.00"),
+        high=Decimal("2001.00"),
+        low=Decimal("1999.00"),
+        close=Decimal(close),
+        volume=100,
+        timeframe="M1",
+        instrument="XAUUSD",
+    )
+
+
+class RecordingWriter(CandleWriter):
+    """Candle writer that records upserted rows instead of using a database."""
+
+    def __init__(self, failures=0, **kwargs):
+        """Initialize writer that fails its first ``failures`` upserts."""
+        super().__init__(database=object(), **kwargs)
+        self.failures = failures
+        self.batches = []
+
+    async def _upsert(self, rows):
+        """Record rows, or fail while failures remain."""
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.batches.append(rows)
+
+
+class TestCandleWriter:
+    """Test the background candle writer."""
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_before_deadline(self):
+        """Test a batch is written as soon as it reaches batch_size."""
+        writer = RecordingWriter(batch_size=3, flush_interval=5.0)
+        await writer.start()
+        try:
+            for i in range(3):
+                writer.submit(make_candle(i))
+            await asyncio.sleep(0.1)
+        finally:
+            await writer.stop()
+
+        assert [len(rows) for rows in writer.batches] == [3]
+        assert writer.written == 3
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushes_on_deadline(self):
+        """Test a partial batch is written once flush_interval passes."""
+        writer = RecordingWriter(batch_size=100, flush_interval=0.05)
+        await writer.start()
+        writer.submit(make_candle(0))
+        writer.submit(make_candle(1))
+
+        await asyncio.sleep(0.02)
+        assert writer.batches == []
+        await asyncio.sleep(0.2)
+        await writer.stop()
+
+        assert [len(rows) for rows in writer.batches] == [2]
+
+    @pytest.mark.asyncio
+    async def test_overflow_drops_oldest(self):
+        """Test a full queue evicts the oldest candles."""
+        writer = RecordingWriter(queue_size=3)
+
+        accepted = [writer.submit(make_candle(i)) for i in range(5)]
+        await writer.flush()
+
+        assert accepted == [True, True, True, False, False]
+        assert writer.dropped == 2
+        assert [row["timestamp"] for row in writer.batches[0]] == [
+            make_candle(i).timestamp for i in (2, 3, 4)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_keeps_latest_duplicate(self):
+        """Test a candle queued twice is upserted once, latest version."""
+        writer = RecordingWriter()
+
+        writer.submit(make_candle(0, close="2000.10"))
+        writer.submit(make_candle(1))
+        writer.submit(make_candle(0, close="2000.90"))
+        await writer.flush()
+
+        rows = writer.batches[0]
+        assert len(rows) == 2
+        assert rows[0]["close_price"] == Decimal("2000.90")
+        assert writer.written == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_writes_retry_with_backoff(self):
+        """Test failed batches are kept and retried with growing delays."""
+        writer = RecordingWriter(failures=2, flush_interval=0.01, max_retry_delay=0.03)
+        writer.submit(make_candle(0))
+
+        delays = []
+        for _ in range(2):
+            assert await writer.flush() == 0
+            delays.append(writer._retry_delay)
+            assert writer.queue_depth() == 1
+        writer.submit(make_candle(1))
+        assert await writer.flush() == 2
+
+        assert delays == [0.01, 0.02]
+        assert writer.failed_flushes == 2
+        assert writer._retry_delay == 0.0
+        assert writer.last_error == "database unavailable"
+        assert len(writer.batches) == 1 and len(writer.batches[0]) == 2
+
+    @pytest.mark.asyncio
+    async def test_gap_fill_candles_are_not_persisted(self):
+        """Test synthesized candles for empty buckets are skipped."""
+        writer = RecordingWriter()
+
+        await writer.on_candle_close(
+            CandleCloseEvent("XAUUSD", "M1", make_candle(0), filled=True)
+        )
+        await writer.on_candle_close(CandleCloseEvent("XAUUSD", "M1", make_candle(1)))
+        await writer.flush()
+
+        assert [row["timestamp"] for row in writer.batches[0]] == [
+            make_candle(1).timestamp
+        ]
+        assert writer.get_status()["skipped_filled"] == 1
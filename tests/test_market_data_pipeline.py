@@ -0,0 +1,988 @@
+"""
+Tests for the market data pipeline.
+
+Covers columnar candle storage, the rolling window adapter,
+multi-timeframe candle aggregation, the per-symbol sharded
+tick ingestion, close-driven analysis scheduling, the
+analysis executor used by the market data processor,
+tick-to-signal latency tracing, tick message decoding, the
+tick journal, the historical candle store and its database sync,
+history file imports with their binary COPY encoding and
+warm-start hydration.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+import asyncio
+import dataclasses
+import pickle
+import struct
+from contextlib import contextmanager
+from itertools import islice
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+from src.models.candle import Candle
+from src.models.market_data import Tick
+from src.models.price import from_price_units, to_price_units
+from src.core.synchronization import AsyncBoundedQueue
+from src.analysis.candle_aggregator import CandleCloseEvent, MultiTimeframeAggregator
+from src.analysis.analysis_scheduler import AnalysisScheduler
+from src.analysis.analysis_executor import AnalysisExecutor
+from src.analysis.candle_buffer import (
+    CandleArrays,
+    CandleRingBuffer,
+    datetime_to_ns,
+    ns_to_datetime,
+)
+from src.analysis.market_data_processor import MarketDataProcessor, RollingWindow
+from src.analysis.symbol_shard import SymbolShard
+from src.config import get_settings
+from src.analysis.warm_start import WarmStart
+from src.monitoring.tracing import Tracer
+from src.connectors.tick_decoder import get_tick_decoder
+from src.storage.tick_journal import TickJournalReader, TickJournalWriter
+from src.storage.candle_store import CandleStore
+from src.storage.candle_sync import CandleStoreSync
+from src.database.history_import import batch_to_copy_binary
+from src.storage.history_files import (
+    HST_DTYPES,
+    HST_HEADER,
+    HistoryBatch,
+    read_history_file,
+    timeframe_from_filename,
+)
+from src.core.clock import SimulatedClock, use_clock, utcnow
+from src.backtest.engine import resample
+from src.backtest.replay import ReplayEngine, bars_to_ticks
+from src.backtest.synthetic_market import SyntheticMarket
+
+
+def make_candles(count, start=None, timeframe="M15"):
+    """Create a simple ascending candle sequence."""
+    start = start or datetime(2024, 1, 2, 8, 0)
+    candles = []
+    for i in range(count):
+        base = Decimal("2000.00") + Decimal(i)
+        candles.append(
+            Candle(
+                timestamp=start + timedelta(minutes=15 * i),
+                open=base,
+                high=base + Decimal("1.50"),
+                low=base - Decimal("0.75"),
+                close=base + Decimal("0.50"),
+                volume=100 + i,
+                timeframe=timeframe,
+                instrument="XAUUSD",
+            )
+        )
+    return candles
+
+
+def make_tick(timestamp, bid, volume=1):
+    """Create a tick with a fixed spread."""
+    bid = Decimal(str(bid))
+    return Tick(
+        symbol="XAUUSD",
+        timestamp=timestamp,
+        bid=bid,
+        ask=bid + Decimal("0.20"),
+        volume=volume,
+    )
+
+
+class TestCandleRingBuffer:
+    """Test columnar ring buffer."""
+
+    def test_epoch_conversion_round_trip(self):
+        """Test datetime <-> epoch nanosecond conversion."""
+        value = datetime(2024, 3, 15, 12, 30, 45, 123456)
+        assert ns_to_datetime(datetime_to_ns(value)) == value
+        assert datetime_to_ns(datetime(1970, 1, 1)) == 0
+
+    def test_latest_before_wrap(self):
+        """Test latest views before the buffer wraps."""
+        buffer = CandleRingBuffer(capacity=5)
+        for candle in make_candles(3):
+            buffer.append_candle(candle)
+
+        arrays = buffer.latest()
+        assert len(buffer) == 3
+        assert not buffer.is_full
+        assert list(arrays.open) == [2000.0, 2001.0, 2002.0]
+        assert list(buffer.latest(2).volume) == [101, 102]
+
+    def test_latest_after_wrap_is_contiguous(self):
+        """Test latest views stay ordered after wrapping."""
+        buffer = CandleRingBuffer(capacity=4)
+        candles = make_candles(11)
+        for candle in candles:
+            buffer.append_candle(candle)
+
+        arrays = buffer.latest()
+        assert len(arrays) == 4
+        assert buffer.is_full
+        assert list(arrays.open) == [2007.0, 2008.0, 2009.0, 2010.0]
+        assert arrays.timestamp[-1] == datetime_to_ns(candles[-1].timestamp)
+
+    def test_latest_is_zero_copy_and_read_only(self):
+        """Test latest returns read-only views over the buffer."""
+        buffer = CandleRingBuffer(capacity=4)
+        for candle in make_candles(6):
+            buffer.append_candle(candle)
+
+        arrays = buffer.latest(3)
+        assert arrays.close.base is not None
+        with pytest.raises(ValueError):
+            arrays.close[0] = 0.0
+
+    def test_materialized_candles_match_source(self):
+        """Test arrays materialize back into equivalent candles."""
+        candles = make_candles(3)
+        arrays = CandleArrays.from_candles(candles)
+        rebuilt = arrays.to_candles()
+
+        assert [c.close for c in rebuilt] == [c.close for c in candles]
+        assert [c.timestamp for c in rebuilt] == [c.timestamp for c in candles]
+        assert rebuilt[0].timeframe == "M15"
+
+    def test_arrays_are_picklable(self):
+        """Test copied arrays survive pickling for worker processes."""
+        buffer = CandleRingBuffer(capacity=4, instrument="XAUUSD", timeframe="H1")
+        for candle in make_candles(4):
+            buffer.append_candle(candle)
+
+        restored = pickle.loads(pickle.dumps(buffer.latest().copy()))
+        assert restored.instrument == "XAUUSD"
+        assert list(restored.high) == list(buffer.latest().high)
+
+    def test_fixed_point_buffer_round_trip(self):
+        """Test fixed-point buffers store int units and rebuild exact prices."""
+        candles = make_candles(3)
+        buffer = CandleRingBuffer(capacity=4, fixed_point=True)
+        for candle in candles:
+            buffer.append_candle(candle)
+
+        arrays = buffer.latest()
+        assert arrays.close.dtype.kind == "i"
+        assert arrays.close[0] == 200050000
+        assert [c.close for c in arrays.to_candles()] == [c.close for c in candles]
+        assert list(CandleArrays.from_candles(candles).price_units("close")) == list(
+            arrays.close
+        )
+
+
+class TestSlottedModels:
+    """Test slotted candle model and trusted construction."""
+
+    def test_trusted_candle_matches_validated(self):
+        """Test trusted candles equal validated ones and have no dict."""
+        candle = make_candles(1)[0]
+        trusted = Candle.from_trusted(
+            candle.timestamp,
+            candle.open,
+            candle.high,
+            candle.low,
+            candle.close,
+            candle.volume,
+            candle.timeframe,
+            candle.instrument,
+        )
+
+        assert trusted == candle
+        assert not hasattr(trusted, "__dict__")
+        assert pickle.loads(pickle.dumps(trusted)) == candle
+
+    def test_derived_cache_follows_price_changes(self):
+        """Test cached body metrics are rebuilt when prices are reassigned."""
+        candle = make_candles(1)[0]
+        assert candle.body_size == Decimal("0.50")
+        assert candle.total_range == Decimal("2.25")
+
+        candle.close = candle.high
+        assert candle.body_size == Decimal("1.50")
+        assert candle.body_percentage == pytest.approx(150 / 2.25)
+
+    def test_cache_is_not_a_field(self):
+        """Test the derived cache stays out of fields and asdict."""
+        candle = make_candles(1)[0]
+        assert candle.total_range == Decimal("2.25")
+
+        assert list(dataclasses.asdict(candle)) == [
+            "timestamp",
+            "open",
+            "high",
+            "low",
+            "close",
+            "volume",
+            "timeframe",
+            "instrument",
+            "tick_volume",
+            "spread",
+        ]
+        assert "_derived" not in repr(candle)
+
+
+class TestPriceUnits:
+    """Test fixed-point price conversion."""
+
+    def test_conversion_is_exact(self):
+        """Test prices round-trip through integer units."""
+        assert to_price_units(Decimal("2034.15")) == 203415000
+        assert to_price_units("0.00001") == 1
+        assert from_price_units(203415000) == Decimal("2034.15")
+        assert str(from_price_units(203400000)) == "2034"
+
+    def test_excess_precision_is_rejected(self):
+        """Test prices finer than one unit raise instead of rounding."""
+        with pytest.raises(ValueError):
+            to_price_units(Decimal("2034.123456"))
+
+
+class TestRollingWindow:
+    """Test rolling window adapter."""
+
+    def test_get_latest_returns_original_candles(self):
+        """Test adapter returns the stored candle objects."""
+        window = RollingWindow(size=3)
+        candles = make_candles(5)
+        for candle in candles:
+            window.add(candle)
+
+        latest = window.get_latest(2)
+        assert latest == candles[-2:]
+        assert latest[-1] is candles[-1]
+        assert len(window) == 3
+        assert window.is_full
+
+    def test_get_latest_on_empty_window(self):
+        """Test empty window returns no candles."""
+        window = RollingWindow(size=3)
+        assert window.get_latest(10) == []
+        assert len(window.get_arrays()) == 0
+
+
+class TestMultiTimeframeAggregator:
+    """Test clock-aligned candle aggregation."""
+
+    def test_buckets_are_clock_aligned(self):
+        """Test first tick mid-bucket still opens an aligned candle."""
+        aggregator = MultiTimeframeAggregator("XAUUSD", ["M15", "H1", "H4"])
+        aggregator.update(make_tick(datetime(2024, 1, 2, 9, 37, 12), 2000.0))
+
+        assert aggregator.current_candle("M15").timestamp == datetime(2024, 1, 2, 9, 30)
+        assert aggregator.current_candle("H1").timestamp == datetime(2024, 1, 2, 9, 0)
+        assert aggregator.current_candle("H4").timestamp == datetime(2024, 1, 2, 8, 0)
+
+    def test_ohlcv_and_close_event(self):
+        """Test ticks build OHLCV and close on the next bucket."""
+        aggregator = MultiTimeframeAggregator("XAUUSD", ["M15", "H1"])
+        start = datetime(2024, 1, 2, 9, 0)
+        for offset, price in enumerate([2000.0, 2003.0, 1998.5, 2001.0]):
+            assert aggregator.update(
+                make_tick(start + timedelta(minutes=offset), price, volume=2)
+            ) == []
+
+        events = aggregator.update(make_tick(start + timedelta(minutes=15), 2002.0))
+
+        assert [e.timeframe for e in events] == ["M15"]
+        candle = events[0].candle
+        assert candle.timestamp == start
+        assert (candle.open, candle.high, candle.low, candle.close) == (
+            Decimal("2000.0"),
+            Decimal("2003.0"),
+            Decimal("1998.5"),
+            Decimal("2001.0"),
+        )
+        assert candle.volume == 8
+        assert candle.tick_volume == 4
+        assert candle.timeframe == "M15"
+
+    def test_quiet_period_fills_empty_buckets(self):
+        """Test advancing the clock closes and fills empty buckets."""
+        aggregator = MultiTimeframeAggregator("XAUUSD", ["M15"])
+        aggregator.update(make_tick(datetime(2024, 1, 2, 9, 5), 2000.0))
+
+        events = aggregator.advance_to(datetime(2024, 1, 2, 10, 0))
+
+        assert [e.candle.timestamp.minute for e in events] == [0, 15, 30, 45]
+        assert [e.filled for e in events] == [False, True, True, True]
+        assert all(e.candle.close == Decimal("2000.0") for e in events)
+        assert aggregator.advance_to(datetime(2024, 1, 2, 10, 0)) == []
+
+    def test_long_gap_is_not_filled(self):
+        """Test gaps beyond the fill limit are treated as session breaks."""
+        aggregator = MultiTimeframeAggregator(
+            "XAUUSD", ["M15"], max_gap_fill_bars=4
+        )
+        aggregator.update(make_tick(datetime(2024, 1, 5, 21, 50), 2000.0))
+
+        events = aggregator.update(make_tick(datetime(2024, 1, 7, 23, 1), 2010.0))
+
+        assert len(events) == 1
+        assert not events[0].filled
+        assert aggregator.current_candle("M15").timestamp == datetime(2024, 1, 7, 23, 0)
+
+    def test_fixed_point_matches_decimal(self):
+        """Test integer-unit aggregation builds the same candles."""
+        start = datetime(2024, 1, 2, 9, 0)
+        ticks = [
+            make_tick(start + timedelta(minutes=i), 2000.0 + (i % 7) * 0.35)
+            for i in range(40)
+        ]
+        decimal_agg = MultiTimeframeAggregator("XAUUSD", timeframes=["M15"])
+        fixed_agg = MultiTimeframeAggregator(
+            "XAUUSD", timeframes=["M15"], fixed_point=True
+        )
+
+        decimal_events, fixed_events = [], []
+        for tick in ticks:
+            decimal_events.extend(decimal_agg.update(tick))
+            fixed_events.extend(fixed_agg.update(tick))
+
+        assert len(fixed_events) == 2
+        assert [e.candle for e in fixed_events] == [e.candle for e in decimal_events]
+
+    def test_fixed_point_rounds_sub_unit_quotes(self):
+        """Test quotes finer than one price unit are rounded, not rejected."""
+        aggregator = MultiTimeframeAggregator("XAUUSD", ["M15"], fixed_point=True)
+        aggregator.update(make_tick(datetime(2024, 1, 2, 9, 0), "2000.123456"))
+
+        assert aggregator.current_candle("M15").close == Decimal("2000.12346")
+
+    def test_late_ticks_are_dropped(self):
+        """Test ticks for already closed buckets are ignored."""
+        aggregator = MultiTimeframeAggregator("XAUUSD", ["M15"])
+        aggregator.update(make_tick(datetime(2024, 1, 2, 9, 20), 2000.0))
+        aggregator.update(make_tick(datetime(2024, 1, 2, 9, 10), 1990.0))
+
+        assert aggregator.late_ticks == 1
+        assert aggregator.current_candle("M15").low == Decimal("2000.0")
+
+
+class TestTickMicroBatching:
+    """Test deadline-based tick batching in symbol shards."""
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushes_on_deadline(self):
+        """Test a batch below the size limit is flushed after the deadline."""
+        processor = MarketDataProcessor()
+        await processor.start()
+        try:
+            start = datetime(2024, 1, 2, 9, 0)
+            await processor.process_tick(make_tick(start, 2000.0))
+            shard = processor.shards["XAUUSD"]
+            shard.max_batch_size = 50
+            shard.max_batch_latency = 0.02
+
+            for i in range(1, 3):
+                await processor.process_tick(
+                    make_tick(start + timedelta(seconds=i), 2000.0 + i)
+                )
+
+            await asyncio.sleep(0.2)
+
+            assert shard.queue.is_empty()
+            assert shard.processed_ticks == 3
+            assert shard.aggregator.current_candle("M15").tick_volume == 3
+        finally:
+            await processor.stop()
+
+    @pytest.mark.asyncio
+    async def test_bad_tick_does_not_drop_batch(self):
+        """Test a failing tick is skipped and the rest of its batch processed."""
+        batches = []
+
+        async def on_batch(shard, events):
+            batches.append(events)
+
+        shard = SymbolShard("XAUUSD", get_settings().market_data, on_batch)
+        start = datetime(2024, 1, 2, 9, 10)
+        ticks = [
+            make_tick(start + timedelta(minutes=i), 2000.0 + i) for i in range(10)
+        ]
+        ticks[3].timestamp = None
+
+        await shard._process_batch([(tick, 0.0, None) for tick in ticks])
+
+        assert shard.failed_ticks == 1
+        assert shard.get_status()["failed_ticks"] == 1
+        closes = [e.timeframe for e in batches[0] if not e.filled]
+        assert closes.count("M1") == 8 and "M15" in closes
+        assert shard.aggregator.current_candle("M1").close == Decimal("2009.0")
+
+    @pytest.mark.asyncio
+    async def test_symbols_have_independent_shards(self):
+        """Test each symbol gets its own candle state."""
+        processor = MarketDataProcessor()
+        await processor.start()
+        try:
+            start = datetime(2024, 1, 2, 9, 0)
+            await processor.process_tick(make_tick(start, 2000.0))
+            await processor.process_tick(
+                Tick(
+                    symbol="XAGUSD",
+                    timestamp=start,
+                    bid=Decimal("23.10"),
+                    ask=Decimal("23.12"),
+                    volume=1,
+                )
+            )
+            await processor.stop()
+
+            gold = processor.shards["XAUUSD"].aggregator.current_candle("M15")
+            silver = processor.shards["XAGUSD"].aggregator.current_candle("M15")
+            assert gold.close == Decimal("2000.0")
+            assert silver.close == Decimal("23.10")
+            assert len(await processor.get_recent_ticks("XAGUSD", 10)) == 1
+        finally:
+            await processor.stop()
+
+
+class TestLatencyTracing:
+    """Test trace propagation through the tick pipeline."""
+
+    def test_unsampled_ticks_carry_no_trace(self):
+        """Test a zero sample rate disables tracing unless forced."""
+        tracer = Tracer(sample_rate=0.0)
+        assert tracer.start_trace("tick") is None
+        assert tracer.start_trace("analysis", force=True) is not None
+
+        with tracer.span("noop") as trace:
+            assert trace is None
+
+    @pytest.mark.asyncio
+    async def test_trace_follows_tick_through_shard(self):
+        """Test the active trace is carried through the shard queue."""
+        processor = MarketDataProcessor()
+        await processor.start()
+        try:
+            tracer = processor.tracer
+            trace = tracer.start_trace("tick", force=True)
+            with tracer.activate(trace):
+                await processor.process_tick(
+                    make_tick(datetime(2024, 1, 2, 9, 0), 2000.0)
+                )
+            await processor.stop()
+
+            stages = [stage for stage, _, _ in trace.spans]
+            assert stages == [
+                "shard.queue_wait",
+                "shard.candle_update",
+                "shard.dispatch",
+            ]
+            assert all(duration >= 0 for _, _, duration in trace.spans)
+            assert trace.attributes["batch_size"] >= 1
+        finally:
+            await processor.stop()
+
+
+class TestTickDecoder:
+    """Test the fast tick decode path."""
+
+    def test_epoch_ms_matches_iso_message(self):
+        """Test epoch-millisecond and ISO messages decode to the same tick."""
+        decoder = get_tick_decoder("json")
+        iso = decoder.decode(
+            '{"symbol": "XAUUSD", "timestamp": "2024-01-02T08:00:01.250000",'
+            ' "bid": 2034.15, "ask": 2034.40, "volume": 3}'
+        )
+        epoch = decoder.decode(
+            '{"symbol": "XAUUSD", "timestamp": 1704182401250,'
+            ' "bid": "2034.15", "ask": "2034.40", "volume": 3}'
+        )
+        validated = Tick(
+            symbol="XAUUSD",
+            timestamp=datetime(2024, 1, 2, 8, 0, 1, 250000),
+            bid=Decimal("2034.15"),
+            ask=Decimal("2034.40"),
+            last=Decimal("2034.15"),
+            volume=3,
+        )
+
+        assert iso == epoch == validated
+
+    def test_crossed_prices_are_rejected(self):
+        """Test the decoder validates bid below ask once."""
+        decoder = get_tick_decoder("json")
+        with pytest.raises(ValueError):
+            decoder.decode_tick(
+                {"timestamp": 1704182401250, "bid": 2034.40, "ask": 2034.15}
+            )
+
+    def test_unknown_decoder_is_rejected(self):
+        """Test an unknown decoder name raises."""
+        with pytest.raises(ValueError):
+            get_tick_decoder("xml")
+
+
+class TestTickJournal:
+    """Test the memory-mapped tick journal."""
+
+    def test_segments_roll_and_round_trip(self, tmp_path):
+        """Test ticks survive rolling segments and reopening."""
+        start = datetime(2024, 1, 2, 9, 0)
+        ticks = [
+            make_tick(start + timedelta(seconds=i), 2000.0 + (i % 50) / 10)
+            for i in range(2500)
+        ]
+
+        writer = TickJournalWriter(str(tmp_path), "XAUUSD", segment_ticks=1000)
+        for tick in ticks[:1500]:
+            writer.append(tick)
+        writer.close()
+
+        writer = TickJournalWriter(str(tmp_path), "XAUUSD", segment_ticks=1000)
+        writer.open()
+        for tick in ticks[1500:]:
+            writer.append(tick)
+        writer.close()
+
+        reader = TickJournalReader(str(tmp_path), "XAUUSD")
+        assert [len(segment) for segment in reader.segments()] == [1000, 1000, 500]
+        assert list(reader.iter_ticks()) == ticks
+
+    def test_range_read_spans_segments(self, tmp_path):
+        """Test time range reads select records across segment boundaries."""
+        start = datetime(2024, 1, 2, 9, 0)
+        writer = TickJournalWriter(
+            str(tmp_path), "XAUUSD", segment_ticks=1024, index_stride=64
+        )
+        for i in range(3000):
+            writer.append(make_tick(start + timedelta(seconds=i), 2000.0))
+        writer.close()
+
+        records = TickJournalReader(str(tmp_path), "XAUUSD").read_all(
+            start + timedelta(seconds=1000), start + timedelta(seconds=1100)
+        )
+        assert len(records) == 100
+        assert records["timestamp_ns"][0] == datetime_to_ns(
+            start + timedelta(seconds=1000)
+        )
+
+
+class TestCandleStore:
+    """Test the partitioned columnar candle store."""
+
+    def test_partitions_merge_and_range_reads(self, tmp_path):
+        """Test month partitioning, upserts and time range reads."""
+        pytest.importorskip("pyarrow")
+        store = CandleStore(str(tmp_path))
+        start = datetime(2024, 1, 31, 12, 0)
+        candles = make_candles(200, start=start)
+        arrays = CandleArrays.from_candles(candles)
+
+        assert store.write(arrays.slice(0, 150)) == 150
+        assert store.write(arrays.slice(100, 200)) == 100
+        assert store.partitions("XAUUSD", "M15") == ["2024-01", "2024-02"]
+        assert store.last_timestamp("XAUUSD", "M15") == candles[-1].timestamp
+
+        everything = store.read("XAUUSD", "M15")
+        assert everything.to_candles() == candles
+
+        february = datetime(2024, 2, 1)
+        ranged = store.read(
+            "XAUUSD", "M15", february, february + timedelta(hours=1)
+        )
+        assert len(ranged) == 5
+        assert ranged.timestamp[0] == datetime_to_ns(february)
+        assert not ranged.timestamp.flags.owndata
+
+        fixed = store.read("XAUUSD", "M15", february, fixed_point=True)
+        assert fixed.fixed_point
+        assert fixed.close[0] == to_price_units(ranged.candle(0).close)
+
+    def test_missing_series_is_empty(self, tmp_path):
+        """Test reading an unknown series returns no rows."""
+        pytest.importorskip("pyarrow")
+        store = CandleStore(str(tmp_path))
+        assert len(store.read("XAUUSD", "H4")) == 0
+        assert store.last_timestamp("XAUUSD", "H4") is None
+
+
+class StubPriceHistoryDatabase:
+    """Database manager whose sessions hold ``price_history`` rows in memory."""
+
+    def __init__(self, candles):
+        """Initialize with rows built from candles."""
+        self.rows = [
+            SimpleNamespace(
+                timestamp=c.timestamp,
+                open_price=c.open,
+                high_price=c.high,
+                low_price=c.low,
+                close_price=c.close,
+                volume=c.volume,
+                instrument=c.instrument,
+                timeframe=c.timeframe,
+            )
+            for c in candles
+        ]
+
+    @contextmanager
+    def get_session(self):
+        """Yield the database itself as the session."""
+        yield self
+
+
+class StubPriceHistoryRepository:
+    """``PriceHistoryRepository`` stand-in reading a stub session."""
+
+    def __init__(self, session):
+        """Initialize repository."""
+        self.session = session
+
+    def get_candles_after(self, instrument, timeframe, after, before, limit):
+        """Get rows after ``after`` and before ``before``, oldest first."""
+        rows = [
+            row
+            for row in self.session.rows
+            if row.instrument == instrument
+            and row.timeframe == timeframe
+            and (after is None or row.timestamp > after)
+            and (before is None or row.timestamp < before)
+        ]
+        return rows[:limit]
+
+
+class TestCandleStoreSync:
+    """Test mirroring database candles into the candle store."""
+
+    @pytest.mark.asyncio
+    async def test_periodic_sync_copies_closed_candles(self, tmp_path, monkeypatch):
+        """Test the sync loop mirrors closed rows and resumes after them."""
+        pytest.importorskip("pyarrow")
+        repositories = pytest.importorskip("src.database.repositories")
+        monkeypatch.setattr(
+            repositories, "PriceHistoryRepository", StubPriceHistoryRepository
+        )
+        start = datetime(2024, 1, 2, 8, 0)
+        candles = make_candles(30, start=start)
+        database = StubPriceHistoryDatabase(candles[:20])
+        store = CandleStore(str(tmp_path))
+        sync = CandleStoreSync(store, database, batch_size=8)
+
+        # The 20th candle (12:45) is still forming at 12:50
+        clock = SimulatedClock(start + timedelta(hours=4, minutes=50))
+        with use_clock(clock):
+            task = asyncio.create_task(sync.run(["XAUUSD"], ["M15"], 0.01))
+            try:
+                await asyncio.sleep(0.1)
+                assert store.read("XAUUSD", "M15").to_candles() == candles[:19]
+
+                database.rows = StubPriceHistoryDatabase(candles).rows
+                clock.set(start + timedelta(hours=8))
+                await asyncio.sleep(0.1)
+            finally:
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+        assert store.read("XAUUSD", "M15").to_candles() == candles
+        assert sync.sync_series("XAUUSD", "M15", clock.now()) == 0
+
+
+class TestHistoryFiles:
+    """Test streaming MetaTrader history exports."""
+
+    def test_mt5_csv_validation_and_duplicates(self, tmp_path):
+        """Test bad, misaligned and duplicate bars are dropped."""
+        path = tmp_path / "XAUUSD_M15_202401020900_202401021000.csv"
+        path.write_text(
+            "<DATE>\t<TIME>\t<OPEN>\t<HIGH>\t<LOW>\t<CLOSE>"
+            "\t<TICKVOL>\t<VOL>\t<SPREAD>\n"
+            "2024.01.02\t09:15:00\t2060.50\t2061.00\t2060.00\t2060.80\t90\t0\t20\n"
+            "2024.01.02\t09:00:00\t2060.10\t2061.00\t2059.50\t2060.50\t120\t0\t20\n"
+            "2024.01.02\t09:30:00\t2060.50\t2060.00\t2059.50\t2060.50\t120\t0\t20\n"
+            "2024.01.02\t09:45:00\t2060.50\tn/a\t2059.50\t2060.50\t120\t0\t20\n"
+            "2024.01.02\t09:50:00\t2060.50\t2062.00\t2059.50\t2060.50\t120\t0\t20\n"
+            "2024.01.02\t09:00:00\t2060.20\t2061.00\t2059.50\t2060.50\t130\t0\t20\n"
+        )
+        assert timeframe_from_filename(str(path)) == "M15"
+
+        batches = list(read_history_file(str(path), "XAUUSD", chunk_rows=4))
+        assert [batch.rows for batch in batches] == [4, 2]
+        assert sum(batch.rejected for batch in batches) == 3
+
+        candles = [c for batch in batches for c in batch.candles.to_candles()]
+        assert [c.timestamp.minute for c in candles] == [0, 15, 0]
+        assert candles[0].open == Decimal("2060.1")
+        assert candles[2].open == Decimal("2060.2")
+        assert batches[1].tick_volume.tolist() == [130]
+
+    def test_hst_file(self, tmp_path):
+        """Test MT4 history files take symbol and timeframe from the header."""
+        records = np.zeros(10, dtype=HST_DTYPES[401])
+        records["time"] = 1704186000 + np.arange(10) * 3600
+        records["open"] = 2000.0
+        records["high"] = 2001.5
+        records["low"] = 1999.0
+        records["close"] = 2000.5
+        records["tick_volume"] = 42
+        path = tmp_path / "XAUUSD60.hst"
+        path.write_bytes(
+            HST_HEADER.pack(401, b"", b"XAUUSD", 60, 2, 0, 0, b"")
+            + records.tobytes()
+        )
+
+        batch = next(read_history_file(str(path)))
+        assert len(batch) == 10
+        assert batch.candles.instrument == "XAUUSD"
+        assert batch.candles.timeframe == "H1"
+        assert batch.candles.timestamp[0] == datetime_to_ns(datetime(2024, 1, 2, 9))
+        assert batch.candles.volume.tolist() == [42] * 10
+
+
+class TestHistoryImport:
+    """Test the binary COPY encoding used for bulk history imports."""
+
+    def test_copy_binary_layout(self):
+        """Test header, tuples and trailer decode as PostgreSQL expects."""
+        start = datetime(2024, 1, 2, 9, 0, 0, 250)
+        candles = CandleArrays.from_candles(make_candles(2, start=start))
+        batch = HistoryBatch(
+            candles=candles,
+            tick_volume=np.array([7, 8]),
+            spread=np.array([12, -3]),
+            rows=2,
+            rejected=0,
+        )
+
+        payload = batch_to_copy_binary(batch)
+
+        # Signature, flags and header extension length
+        assert payload[:11] == b"PGCOPY\n\xff\r\n\x00"
+        assert struct.unpack_from(">ii", payload, 11) == (0, 0)
+        assert payload[-2:] == b"\xff\xff"
+
+        offset = 19
+        for i, candle in enumerate(make_candles(2, start=start)):
+            (fields,) = struct.unpack_from(">h", payload, offset)
+            offset += 2
+            assert fields == 8
+
+            values = []
+            for fmt in (">q", ">d", ">d", ">d", ">d", ">q", ">q", ">i"):
+                (size,) = struct.unpack_from(">i", payload, offset)
+                assert size == struct.calcsize(fmt)
+                values.append(struct.unpack_from(fmt, payload, offset + 4)[0])
+                offset += 4 + size
+
+            pg_epoch = datetime(2000, 1, 1)
+            assert values[0] == (candle.timestamp - pg_epoch) // timedelta(
+                microseconds=1
+            )
+            assert values[1:5] == [
+                float(candle.open),
+                float(candle.high),
+                float(candle.low),
+                float(candle.close),
+            ]
+            assert values[5:] == [candle.volume, (7, 8)[i], (12, -3)[i]]
+
+        assert offset == len(payload) - 2
+
+
+class TestWarmStart:
+    """Test hydrating candle windows at boot."""
+
+    @pytest.mark.asyncio
+    async def test_hydrates_closed_candles_from_store(self, tmp_path):
+        """Test windows fill from the store without the forming candle."""
+        pytest.importorskip("pyarrow")
+        store = CandleStore(str(tmp_path))
+        start = datetime(2024, 1, 2, 0, 0)
+        m15 = make_candles(120, start=start)
+        h1 = resample(CandleArrays.from_candles(m15), "H1")
+        store.write(CandleArrays.from_candles(m15))
+        store.write(h1)
+
+        processor = MarketDataProcessor()
+        # The last M15 (29:45) and H1 (29:00) candles are still forming
+        with use_clock(SimulatedClock(start + timedelta(hours=29, minutes=55))):
+            report = await WarmStart(processor, candle_store=store, bars=50).run(
+                ["XAUUSD"]
+            )
+
+        shard = processor.shards["XAUUSD"]
+        assert len(shard.windows["M15"]) == 50
+        assert len(shard.windows["H1"]) == 29
+        assert len(shard.windows["H4"]) == 0
+        assert shard.get_candles("M15", 1)[0] == m15[-2]
+        assert shard.windows["H1"].get_arrays(1).timestamp[0] == h1.timestamp[-2]
+        assert shard.last_close["M15"] == m15[-1].timestamp
+        assert report.hydrated == 79
+        assert processor.hydration["hydrated"] == 79
+
+
+class TestReplay:
+    """Test deterministic replay on the simulated clock."""
+
+    def test_simulated_clock_is_installed_and_restored(self):
+        """Test the simulated clock drives utcnow only inside the block."""
+        clock = SimulatedClock(datetime(2024, 1, 2, 9, 0))
+        with use_clock(clock):
+            clock.advance(timedelta(minutes=5))
+            clock.set(datetime(2024, 1, 2, 8, 0))
+            assert utcnow() == datetime(2024, 1, 2, 9, 5)
+        assert utcnow() > datetime(2024, 1, 2, 9, 5)
+
+    @pytest.mark.asyncio
+    async def test_bar_replay_rebuilds_candles(self):
+        """Test replayed bars close the same M15 candles on every run."""
+        bars = make_candles(12)
+        results = []
+        for _ in range(2):
+            engine = ReplayEngine(batch_size=7)
+            results.append(await engine.replay_bars(bars))
+            assert engine.clock.now() == bars[-1].timestamp + timedelta(
+                seconds=675
+            )
+
+        first, second = results
+        assert first.ticks == second.ticks == 48
+        assert first.candles == second.candles
+        assert first.signal_fingerprints() == second.signal_fingerprints()
+
+        rebuilt = await engine.processor.get_candles("XAUUSD", "M15")
+        assert len(rebuilt) == 11
+        assert [(c.open, c.high, c.low, c.close) for c in rebuilt] == [
+            (c.open, c.high, c.low, c.close) for c in bars[: len(rebuilt)]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_does_not_change_results(self):
+        """Test replays see each close at its tick's time for any batch size."""
+        ticks = list(islice(SyntheticMarket(seed=3).ticks(), 20000))
+        runs = []
+        for batch_size in (1, 100):
+            engine = ReplayEngine(batch_size=batch_size)
+            closes = []
+
+            async def record(candle):
+                closes.append((candle.timeframe, candle.timestamp, utcnow()))
+
+            engine.processor.add_new_candle_callback(record)
+            result = await engine.replay_ticks(ticks)
+            runs.append((result.signal_fingerprints(), closes))
+
+        assert runs[0] == runs[1]
+        closes = runs[0][1]
+        assert len(closes) > 200
+        tick_times = {tick.timestamp for tick in ticks}
+        assert all(seen in tick_times for _, _, seen in closes)
+
+    def test_bars_to_ticks_path(self):
+        """Test bullish bars visit the low before the high."""
+        ticks = list(bars_to_ticks(make_candles(1)))
+        assert [t.bid for t in ticks] == [
+            Decimal("2000.00"),
+            Decimal("1999.25"),
+            Decimal("2001.50"),
+            Decimal("2000.50"),
+        ]
+        assert sum(t.volume for t in ticks) == 100
+
+
+class TestAsyncBoundedQueue:
+    """Test overflow policies of the async bounded queue."""
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_evicts_head(self):
+        """Test drop_oldest keeps the newest items."""
+        queue = AsyncBoundedQueue(maxsize=3, overflow="drop_oldest")
+        for i in range(5):
+            assert await queue.put(i)
+
+        assert queue.dropped == 2
+        assert await queue.get_batch(10) == [2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_rejects_item(self):
+        """Test drop_newest rejects items when full."""
+        queue = AsyncBoundedQueue(maxsize=2, overflow="drop_newest")
+        assert queue.put_nowait(1)
+        assert queue.put_nowait(2)
+        assert not queue.put_nowait(3)
+
+        assert queue.dropped == 1
+        assert await queue.get_batch(10, timeout=0) == [1, 2]
+        assert await queue.get_batch(10, timeout=0) == []
+
+
+class TestAnalysisScheduler:
+    """Test close-driven analysis scheduling."""
+
+    def make_close(self, timeframe, timestamp, symbol="XAUUSD", filled=False):
+        """Create a candle close event."""
+        candle = make_candles(1, start=timestamp, timeframe=timeframe)[0]
+        return CandleCloseEvent(symbol, timeframe, candle, filled=filled)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_and_filled_closes_are_ignored(self):
+        """Test a bar is scheduled once and gap fills are skipped."""
+        scheduler = AnalysisScheduler(handler=None)
+        bar = datetime(2024, 1, 2, 9, 0)
+
+        assert scheduler.schedule(self.make_close("M15", bar))
+        assert not scheduler.schedule(self.make_close("M15", bar))
+        assert not scheduler.schedule(
+            self.make_close("M15", bar + timedelta(minutes=15), filled=True)
+        )
+        assert not scheduler.schedule(self.make_close("M1", bar))
+        assert scheduler.pending_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesces_pending_runs_per_symbol(self):
+        """Test simultaneous closes produce one run for the highest timeframe."""
+        runs = []
+
+        async def handler(request):
+            runs.append(request)
+
+        scheduler = AnalysisScheduler(handler)
+        bar = datetime(2024, 1, 2, 8, 0)
+        scheduler.schedule(self.make_close("M15", datetime(2024, 1, 2, 11, 45)))
+        scheduler.schedule(self.make_close("H1", datetime(2024, 1, 2, 11, 0)))
+        scheduler.schedule(self.make_close("H4", bar))
+        scheduler.schedule(self.make_close("M15", bar, symbol="XAGUSD"))
+
+        await scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+        assert [r.symbol for r in runs] == ["XAUUSD", "XAGUSD"]
+        assert runs[0].timeframe == "H4"
+        assert runs[0].bar_timestamp == bar
+        assert set(runs[0].timeframes) == {"M15", "H1", "H4"}
+
+
+class TestAnalysisExecutor:
+    """Test process pool analysis offload."""
+
+    @pytest.mark.asyncio
+    async def test_process_pool_matches_inline(self):
+        """Test worker results match inline analysis."""
+        arrays = CandleArrays.from_candles(make_candles(5, timeframe="H1"))
+        results = []
+
+        for workers in (0, 1):
+            executor = AnalysisExecutor(max_workers=workers, max_in_flight=2)
+            executor.start()
+            try:
+                results.append(
+                    await executor.analyze(
+                        arrays, arrays, arrays, Decimal("2003.00"), instrument="XAUUSD"
+                    )
+                )
+                assert executor.in_flight == 0
+            finally:
+                await executor.shutdown()
+
+        inline, pooled = results
+        assert pooled.instrument == inline.instrument == "XAUUSD"
+        assert pooled.overall_score == inline.overall_score
+        assert pooled.setup_type == inline.setup_type
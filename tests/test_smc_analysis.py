@@ -0,0 +1,497 @@
+"""
+Tests for the Smart Money Concepts analyzers.
+
+Covers Fair Value Gap detection, incremental gap tracking, order block
+detection, the price zone index (including the long-lived block and
+pool indexes) and incremental swing detection.
+"""
+
+# Copyright (c) 2024 Simon Callaghan. All rights reserved.
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.analysis.candle_buffer import CandleArrays, datetime_to_ns
+from src.analysis.confluence_analyzer import ConfluenceAnalyzer
+from src.analysis.fvg_detector import (
+    FairValueGapDetector,
+    FairValueGapTracker,
+    FairValueGapType,
+)
+from src.analysis.liquidity_analyzer import LiquidityAnalyzer, LiquidityPool
+from src.analysis.order_block_detector import (
+    OrderBlock,
+    OrderBlockDetector,
+    rolling_volume_stats,
+)
+from src.analysis.structure_analyzer import MarketStructure
+from src.analysis.zone_index import PriceZoneIndex, ZoneKind
+from src.core.clock import SimulatedClock, use_clock
+from src.models.candle import Candle
+
+
+START = datetime(2024, 1, 2)
+
+
+def make_bars(rows, timeframe="H1"):
+    """Create candles from (open, high, low, close) rows one period apart."""
+    step = timedelta(hours=1)
+    return [
+        Candle(
+            timestamp=START + step * i,
+            open=Decimal(str(o)),
+            high=Decimal(str(h)),
+            low=Decimal(str(l)),
+            close=Decimal(str(c)),
+            volume=100 + i,
+            timeframe=timeframe,
+            instrument="XAUUSD",
+        )
+        for i, (o, h, l, c) in enumerate(rows)
+    ]
+
+
+def random_walk(count, seed=4):
+    """Create float candle arrays from a random walk."""
+    rng = np.random.default_rng(seed)
+    close = np.round(2000 + np.cumsum(rng.normal(0, 2.0, count)), 2)
+    open = np.round(np.r_[2000.0, close[:-1]], 2)
+    wick = np.round(np.abs(rng.normal(0, 1.0, (2, count))), 2)
+    return CandleArrays(
+        timestamp=datetime_to_ns(START)
+        + np.arange(count, dtype=np.int64) * 3600 * 10**9,
+        open=open,
+        high=np.maximum(open, close) + wick[0],
+        low=np.minimum(open, close) - wick[1],
+        close=close,
+        volume=rng.integers(50, 500, count),
+        instrument="XAUUSD",
+        timeframe="H1",
+    )
+
+
+class TestFairValueGapDetector:
+    """Test vectorized Fair Value Gap detection."""
+
+    def test_bullish_and_bearish_gaps(self):
+        """Test gaps between the first and third candle are found."""
+        candles = make_bars(
+            [
+                (2000.0, 2001.0, 1999.0, 2000.5),
+                (2000.5, 2006.0, 2000.4, 2005.5),  # displacement up
+                (2005.5, 2007.0, 2003.0, 2006.5),  # low above 2001.0
+                (2006.5, 2007.0, 2004.0, 2004.5),
+                (2004.5, 2004.6, 1998.0, 1998.5),  # displacement down
+                (1998.5, 2000.0, 1997.0, 1999.0),  # high below 2004.0
+            ]
+        )
+
+        fvgs = FairValueGapDetector().detect_fvgs(candles, avg_volume=100)
+
+        assert [fvg.type for fvg in fvgs] == [
+            FairValueGapType.BULLISH,
+            FairValueGapType.BEARISH,
+        ]
+        assert (fvgs[0].bottom_price, fvgs[0].top_price) == (
+            Decimal("2001.0"),
+            Decimal("2003.0"),
+        )
+        assert (fvgs[1].bottom_price, fvgs[1].top_price) == (
+            Decimal("2000.0"),
+            Decimal("2004.0"),
+        )
+        assert fvgs[0].middle_candle is candles[1]
+
+    def test_matches_scalar_reference(self):
+        """Test list and array paths agree with the per-pattern reference."""
+        detector = FairValueGapDetector()
+        arrays = random_walk(3000)
+        candles = arrays.to_candles()
+        avg_volume = float(arrays.volume.mean())
+
+        expected = []
+        for i in range(len(candles) - 2):
+            fvg = detector._analyze_pattern(candles[i : i + 3], avg_volume)
+            if fvg and fvg.is_valid(detector.config.min_strength):
+                expected.append(fvg)
+
+        assert expected
+        for fvgs in (
+            detector.detect_fvgs(candles, avg_volume),
+            detector.detect_fvgs_arrays(arrays, avg_volume),
+        ):
+            assert [
+                (f.type, f.top_price, f.bottom_price, f.timestamp) for f in fvgs
+            ] == [(f.type, f.top_price, f.bottom_price, f.timestamp) for f in expected]
+            assert np.allclose(
+                [f.strength for f in fvgs], [f.strength for f in expected]
+            )
+        assert len(detector.scan(arrays, avg_volume)["index"]) == len(expected)
+
+
+class TestFairValueGapTracker:
+    """Test incremental open gap tracking."""
+
+    def test_fills_on_price(self):
+        """Test gaps open on the completing candle and fill on price."""
+        candles = make_bars(
+            [
+                (2000.0, 2001.0, 1999.0, 2000.5),
+                (2000.5, 2006.0, 2000.4, 2005.5),
+                (2005.5, 2007.0, 2003.0, 2006.5),
+            ]
+        )
+        tracker = FairValueGapTracker("H1")
+
+        added = [fvg for candle in candles for fvg in tracker.on_candle(candle)]
+
+        assert len(added) == 1 and len(tracker) == 1
+        assert tracker.on_price(Decimal("2002.0"), START) == []
+        filled = tracker.on_price(Decimal("2001.0"), START)
+        assert filled == added and filled[0].filled
+        assert len(tracker) == 0 and tracker.open_gaps() == []
+
+    def test_matches_full_rescan(self):
+        """Test open gaps match detection over the whole history."""
+        candles = random_walk(1500).to_candles()
+        tracker = FairValueGapTracker("H1", max_age_minutes=600)
+        detector = tracker.detector
+        tolerance = Decimal("0.0002")
+
+        fed = 0
+        for n in (300, 900, 1500):
+            for candle in candles[fed:n]:
+                tracker.on_candle(candle)
+            fed = n
+
+            now = candles[n - 1].timestamp + timedelta(hours=1)
+            expected = []
+            for fvg in detector.detect_fvgs(candles[:n]):
+                later = [c for c in candles[:n] if c.timestamp > fvg.timestamp]
+                if fvg.type == FairValueGapType.BULLISH:
+                    filled = any(c.low <= fvg.bottom_price + tolerance for c in later)
+                else:
+                    filled = any(c.high >= fvg.top_price - tolerance for c in later)
+                age = now - fvg.timestamp
+                if not filled and age <= timedelta(minutes=600):
+                    expected.append(fvg.timestamp)
+
+            assert expected
+            assert [fvg.timestamp for fvg in tracker.open_gaps()] == expected
+            assert tracker.zone_index.between(None, None) == tracker.open_gaps()
+
+        status = tracker.get_status()
+        assert status["zone_index"]["retired"] == status["filled"] + status["expired"]
+
+
+class TestPriceZoneIndex:
+    """Test price zone index queries."""
+
+    @pytest.fixture
+    def zones(self):
+        """Create random zones, some of them retired, plus an index of them."""
+        rng = np.random.default_rng(7)
+        index = PriceZoneIndex()
+        zones = []
+        for i in range(400):
+            bottom = Decimal(str(round(rng.uniform(1900, 2100), 2)))
+            top = bottom + Decimal(str(round(rng.uniform(0, 8) * (i % 3 > 0), 2)))
+            item = object()
+            index.insert(item, bottom, top, (ZoneKind.FVG, ZoneKind.LIQUIDITY)[i % 2])
+            zones.append((item, bottom, top))
+        for item, _, _ in zones[::5]:
+            assert index.retire(item)
+        return index, [zone for i, zone in enumerate(zones) if i % 5]
+
+    def test_queries_match_linear_scan(self, zones):
+        """Test stabbing, range and nearest-k queries against a scan."""
+        index, live = zones
+
+        for price in (Decimal("1899"), Decimal("1987.5"), Decimal("2050.01")):
+            tolerance = Decimal("1.5")
+            assert index.stab(price, tolerance) == [
+                item
+                for item, bottom, top in live
+                if bottom - tolerance <= price <= top + tolerance
+            ]
+            assert index.between(None, price) == [
+                item for item, bottom, _ in live if bottom <= price
+            ]
+            assert index.between(price, price + 10) == [
+                item
+                for item, bottom, top in live
+                if bottom <= price + 10 and top >= price
+            ]
+
+            distances = sorted(
+                max(bottom - price, price - top, Decimal("0"))
+                for _, bottom, top in live
+            )
+            nearest = index.nearest(price, k=5)
+            assert [
+                index.zone(item).distance(price) for item in nearest
+            ] == distances[:5]
+
+        assert index.count() == len(live)
+        status = index.get_status()
+        assert status["retired"] == 80
+        assert status["queries"]["stab"]["count"] == 3
+
+    def test_active_gaps_match_scan(self):
+        """Test indexed active gap lookups return the scanned results."""
+        candles = random_walk(600).to_candles()
+        detector = FairValueGapDetector()
+        fvgs = detector.detect_fvgs(candles)
+        index = PriceZoneIndex()
+        for fvg in fvgs:
+            index.insert(fvg, fvg.bottom_price, fvg.top_price, ZoneKind.FVG)
+
+        with use_clock(SimulatedClock(candles[-1].timestamp)):
+            for candle in candles[-20:]:
+                scanned = detector.get_active_fvgs(fvgs, candle.close, 6000)
+                assert scanned
+                assert (
+                    detector.get_active_fvgs(fvgs, candle.close, 6000, index=index)
+                    == scanned
+                )
+
+
+    def test_live_indexes_match_scanned_analysis(self):
+        """Test synced block and pool indexes give the scanned analysis."""
+        candles = random_walk(400, seed=7).to_candles()
+        ob_index, pool_index = PriceZoneIndex(), PriceZoneIndex()
+
+        for end in range(50, len(candles)):
+            window = candles[end - 50 : end]
+            price = window[-1].close
+            with use_clock(SimulatedClock(window[-1].timestamp)):
+                scanned = ConfluenceAnalyzer().analyze_confluence(
+                    window, window, window, price
+                )
+                indexed = ConfluenceAnalyzer().analyze_confluence(
+                    window,
+                    window,
+                    window,
+                    price,
+                    ob_index=ob_index,
+                    pool_index=pool_index,
+                )
+
+            assert indexed.to_dict() == scanned.to_dict()
+            assert ob_index.between(None, None) == indexed.order_blocks
+            assert len(pool_index) == len(indexed.liquidity_pools)
+
+        assert ob_index.retired > 0
+        assert ob_index.inserted == ob_index.retired + len(ob_index)
+
+    def test_synced_pools_match_scanned_sweeps(self, monkeypatch):
+        """Test sync keeps re-detected zones and sweeps match the scan."""
+        analyzer = LiquidityAnalyzer()
+        index = PriceZoneIndex()
+
+        def detect(prices):
+            return [
+                LiquidityPool(
+                    Decimal(price), 0.5, ("HIGH", "LOW")[i % 2], START, "XAUUSD"
+                )
+                for i, price in enumerate(prices)
+            ]
+
+        def sync(pools):
+            index.sync(
+                pools,
+                ZoneKind.LIQUIDITY,
+                bounds=lambda pool: (pool.price, pool.price),
+                key=lambda pool: (pool.type, pool.price, pool.timestamp),
+            )
+
+        sync(detect(["1990", "1995", "2010", "2020"]))
+        pools = detect(["1990", "1995", "2010", "2030"])
+        sync(pools)
+
+        assert index.between(None, None) == pools
+        assert (index.inserted, index.retired) == (5, 1)
+
+        # Record the pools the price has swept instead of building sweeps
+        extension = Decimal(str(analyzer.config.sweep_extension_pips))
+        swept = []
+
+        def sweep_pattern(pool, candles, price):
+            beyond = price - pool.price if pool.type == "HIGH" else pool.price - price
+            if beyond >= extension:
+                swept.append(pool)
+
+        monkeypatch.setattr(analyzer, "_analyze_sweep_pattern", sweep_pattern)
+        for price in ("1985", "2000", "2040"):
+            analyzer.detect_liquidity_sweeps(pools, [], Decimal(price))
+            scanned, swept[:] = swept[:], []
+            analyzer.detect_liquidity_sweeps(pools, [], Decimal(price), index)
+            assert scanned and swept == scanned
+            swept.clear()
+
+
+class TestOrderBlockDetector:
+    """Test vectorized order block detection."""
+
+    def test_rolling_volume_stats(self):
+        """Test running-sum statistics against per-window NumPy."""
+        volume = np.random.default_rng(3).integers(0, 1000, 200)
+
+        mean, std = rolling_volume_stats(volume, 20)
+
+        for i in (1, 7, 20, 21, 199):
+            window = volume[max(0, i - 20) : i]
+            assert mean[i] == pytest.approx(window.mean())
+            assert std[i] == pytest.approx(window.std())
+        assert mean[0] == std[0] == 0
+
+    def test_matches_scalar_reference(self):
+        """Test list and array paths agree with the per-candle reference."""
+        detector = OrderBlockDetector()
+        arrays = random_walk(3000, seed=9)
+        candles = arrays.to_candles()
+        mean, std = rolling_volume_stats(arrays.volume, 20)
+        avg_volume = detector._average_volume(arrays.volume)
+
+        expected = []
+        for i in range(detector.config.lookback_candles, len(candles)):
+            if detector._is_potential_order_block(
+                candles[i], candles, i, mean[i], std[i]
+            ):
+                ob = OrderBlock(
+                    detector._determine_block_type(candles[i], candles, i),
+                    candles[i],
+                )
+                ob.calculate_strength(avg_volume)
+                if ob.is_valid():
+                    expected.append((ob.type, ob.timestamp, ob.strength))
+
+        assert expected
+        for blocks in (
+            detector.detect_order_blocks(candles),
+            detector.detect_order_blocks_arrays(arrays),
+        ):
+            assert [(ob.type, ob.timestamp, ob.strength) for ob in blocks] == expected
+
+    def test_indexed_touches_match_scan(self):
+        """Test indexed active block lookups touch the same blocks."""
+        detector = OrderBlockDetector()
+        candles = random_walk(600).to_candles()
+        scanned = [OrderBlock("BULLISH", candle) for candle in candles[::3]]
+        indexed = [OrderBlock("BULLISH", candle) for candle in candles[::3]]
+        index = PriceZoneIndex()
+        for ob in indexed:
+            index.insert(ob, ob.low, ob.high, ZoneKind.ORDER_BLOCK)
+
+        with use_clock(SimulatedClock(candles[-1].timestamp)):
+            for candle in candles[-50:]:
+                detector.get_active_order_blocks(scanned, candle.close, 6000)
+                detector.get_active_order_blocks(
+                    indexed, candle.close, 6000, index=index
+                )
+
+        touches = [ob.touches for ob in scanned]
+        assert any(touches)
+        assert [ob.touches for ob in indexed] == touches
+
+
+class TestMarketStructure:
+    """Test incremental fractal swing detection."""
+
+    @staticmethod
+    def fractals(candles, span):
+        """Find (timestamp, price) of fractal highs and lows by brute force."""
+        highs, lows = [], []
+        for i in range(span, len(candles) - span):
+            before, after = candles[i - span : i], candles[i + 1 : i + span + 1]
+            candle = candles[i]
+            if all(c.high < candle.high for c in before) and all(
+                c.high <= candle.high for c in after
+            ):
+                highs.append((candle.timestamp, candle.high))
+            if all(c.low > candle.low for c in before) and all(
+                c.low >= candle.low for c in after
+            ):
+                lows.append((candle.timestamp, candle.low))
+        return highs, lows
+
+    def test_swings_match_fractal_reference(self):
+        """Test confirmed swings match a full rescan, delayed by the span."""
+        candles = random_walk(2000, seed=11).to_candles()
+        structure = MarketStructure()
+        capacity = structure.swing_highs.maxlen
+
+        fed = 0
+        for n in (3, 50, 700, 2000):
+            for candle in candles[fed:n]:
+                structure.update_with_candle(candle)
+            fed = n
+
+            highs, lows = self.fractals(candles[:n], structure.swing_span)
+            assert [
+                (sp.timestamp, sp.price) for sp in structure.swing_highs
+            ] == highs[-capacity:]
+            assert [
+                (sp.timestamp, sp.price) for sp in structure.swing_lows
+            ] == lows[-capacity:]
+
+        assert len(structure.swing_highs) == capacity
+        assert all(sp.confirmed for sp in structure.swing_lows)
+
+    def test_equal_prices_yield_one_swing(self):
+        """Test flat candles and equal highs do not duplicate swings."""
+        structure = MarketStructure()
+        candles = make_bars(
+            [(2000.0, 2000.0, 2000.0, 2000.0)] * 10
+            + [
+                (2000.0, 2003.0, 1999.0, 2002.0),  # only low below the flat run
+                (2002.0, 2005.0, 2001.0, 2004.0),  # first of two equal highs
+                (2004.0, 2005.0, 2002.0, 2003.0),
+                (2003.0, 2004.0, 2001.5, 2002.0),
+                (2002.0, 2003.0, 2001.0, 2001.5),
+            ]
+        )
+
+        for candle in candles:
+            structure.update_with_candle(candle)
+
+        assert [sp.timestamp for sp in structure.swing_highs] == [
+            candles[11].timestamp
+        ]
+        assert [sp.timestamp for sp in structure.swing_lows] == [
+            candles[10].timestamp
+        ]
+
+    def test_running_sums_match_stored_swings(self):
+        """Test running averages and trend strength against the buffers."""
+        candles = random_walk(3000, seed=5).to_candles()
+        by_time = {candle.timestamp: candle for candle in candles}
+        structure = MarketStructure()
+        period = structure.trend_period
+
+        for candle in candles:
+            structure.update_with_candle(candle)
+
+        swings = [*structure.swing_highs, *structure.swing_lows]
+        ranges = [float(by_time[sp.timestamp].total_range) for sp in swings]
+        assert structure._get_average_volume() == pytest.approx(
+            np.mean([sp.volume for sp in swings])
+        )
+        assert structure._get_average_range() == pytest.approx(np.mean(ranges))
+
+        highs = [sp.price for sp in structure.swing_highs][-period:]
+        lows = [sp.price for sp in structure.swing_lows][-period:]
+        high_score = sum(
+            1.0 if b > a else -0.5 if b < a else 0.0 for a, b in zip(highs, highs[1:])
+        )
+        low_score = sum(
+            1.0 if b < a else -0.5 if b > a else 0.0 for a, b in zip(lows, lows[1:])
+        )
+        steps = max(len(highs), len(lows)) - 1
+        assert structure.trend_strength == pytest.approx(
+            (max(0.0, high_score / steps) + max(0.0, low_score / steps)) / 2
+        )
+        assert len(structure.get_structure_summary()["swing_highs"]) == 10